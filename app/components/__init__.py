@@ -1,17 +1,33 @@
 """
 Package components untuk PahamKode
-Mengelola UI components yang reusable
+Mengelola UI components yang reusable (re-export lazy, di-import saat dipakai)
 """
 
-from .sidebar import render_sidebar
-from .autentikasi import render_login_page, render_register_page
-from .tim_developer import (
-    render_developer_card,
-    render_social_media_links,
-    render_developer_info_footer,
-    get_developer_info,
-    DEVELOPER_INFO
-)
+from typing import TYPE_CHECKING
+
+from utils.lazy_loader import buat_lazy_loader
+
+if TYPE_CHECKING:
+    from .sidebar import render_sidebar
+    from .autentikasi import render_login_page, render_register_page
+    from .tim_developer import (
+        render_developer_card,
+        render_social_media_links,
+        render_developer_info_footer,
+        get_developer_info,
+        DEVELOPER_INFO
+    )
+
+__getattr__, __dir__ = buat_lazy_loader(__name__, {
+    "render_sidebar": (".sidebar", "render_sidebar"),
+    "render_login_page": (".autentikasi", "render_login_page"),
+    "render_register_page": (".autentikasi", "render_register_page"),
+    "render_developer_card": (".tim_developer", "render_developer_card"),
+    "render_social_media_links": (".tim_developer", "render_social_media_links"),
+    "render_developer_info_footer": (".tim_developer", "render_developer_info_footer"),
+    "get_developer_info": (".tim_developer", "get_developer_info"),
+    "DEVELOPER_INFO": (".tim_developer", "DEVELOPER_INFO"),
+})
 
 __all__ = [
     "render_sidebar",
@@ -5,6 +5,8 @@ CATATAN:
 - Menggunakan st.session_state untuk session management
 - Terintegrasi dengan autentikasi_service
 - Auto-redirect setelah login berhasil
+- Login hanya ada di st.session_state (tidak ada token di URL); multi worker mengandalkan
+  sticky session ip_hash di nginx, jadi browser tetap dilayani worker yang sama
 """
 
 import streamlit as st
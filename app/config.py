@@ -13,6 +13,8 @@ class Settings(BaseSettings):
     # Database Configuration
     DATABASE_URL: str = ""
     DATABASE_NAME: str = "pahamkode-db"
+    DATABASE_MIN_POOL_SIZE: int = 2  # Koneksi yang tetap dibuka (dibuka saat warm-up)
+    QUERY_PARALEL_WORKERS: int = 8  # Thread query paralel dashboard (database/kumpulan_query.py), 0 = berurutan
     
     # JWT Authentication
     JWT_SECRET_KEY: str = "dev-secret-key-change-in-production"
@@ -38,9 +40,96 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"  # development, production
     LOG_LEVEL: str = "INFO"
     
+    # Catalogue Cache (topik, sumber daya, exercises)
+    KATALOG_INTERVAL_CEK_VERSI: int = 30  # Detik antar pengecekan versi katalog
+    KATALOG_INTERVAL_CEK_VERSI_WATCHER: int = 600  # Cek versi cadangan saat watcher perubahan aktif
+    
+    # Watcher perubahan data (lihat services/watcher_service.py): invalidasi cache & live feed admin
+    WATCHER_AKTIF: bool = True
+    WATCHER_MODE: str = "auto"  # auto (change stream, fallback polling), change_stream, polling
+    WATCHER_INTERVAL_POLLING: float = 5.0  # Detik antar polling jika change stream tidak didukung
+    
+    # Cache statistik dashboard admin (dibagi semua session admin, lewat backend bersama)
+    DASHBOARD_CACHE_TTL_DETIK: int = 30  # Umur maksimal tanpa watcher
+    DASHBOARD_CACHE_MAKS_UMUR_DETIK: int = 600  # Umur maksimal saat watcher aktif (invalidasi via event)
+    DASHBOARD_CACHE_JEDA_MIN_DETIK: int = 10  # Jeda minimal hitung ulang saat banyak event masuk
+    DASHBOARD_LIVE_INTERVAL_DETIK: int = 5  # Interval refresh live feed dashboard
+    
+    # Backend state bersama antar proses worker (lihat utils/backend_bersama.py)
+    BACKEND_BERSAMA_URL: str = "memori://"  # memori:// (satu worker) atau redis://127.0.0.1:6390/0
+    BACKEND_BERSAMA_PREFIX: str = "pahamkode:"
+    BACKEND_BERSAMA_TIMEOUT_DETIK: float = 1.0
+    
+    # Rate limit login (state di backend bersama, berlaku untuk semua worker)
+    LOGIN_MAKS_GAGAL: int = 5  # Percobaan gagal per email sebelum login dikunci sementara
+    LOGIN_JENDELA_DETIK: int = 900  # Jendela hitung percobaan gagal / lama penguncian
+    
+    # Export (file hasil export ditulis ke disk, lalu diserahkan ke download button)
+    EXPORT_DIR: str = ""  # Kosong = <tempdir>/pahamkode-export
+    EXPORT_MAKS_UMUR_JAM: int = 6  # File export lebih tua dari ini dihapus otomatis
+    EXPORT_KOHORT_BATCH: int = 1000  # Dokumen per batch cursor untuk export kohort (admin)
+    EXPORT_KOHORT_MAKS_DOKUMEN_PER_DETIK: int = 2000  # Throttle supaya app live tidak terganggu
+    EXPORT_KOHORT_BARIS_PER_CHUNK: int = 100000  # Baris per file .csv.gz (fallback tanpa pyarrow)
+    
+    # Laporan PDF (render di worker process, hasil di-cache di disk)
+    PDF_WORKERS: int = 2  # Jumlah worker process render PDF
+    PDF_TIMEOUT_DETIK: int = 120  # Batas waktu tunggu satu render
+    PDF_CACHE_MAKS_UMUR_JAM: int = 24  # PDF cache lebih tua dari ini dihapus otomatis
+    
+    # Snapshot penguasaan (time series per mahasiswa & topik untuk delta / tren)
+    SNAPSHOT_MAKS_TITIK: int = 90  # Titik (1 per hari) yang disimpan per topik, sisanya dipangkas
+    SNAPSHOT_JENDELA_TREN: int = 7  # Jumlah titik terakhir untuk hitung delta & tren
+    SNAPSHOT_AMBANG_TREN: float = 0.5  # Kemiringan minimal (% per hari) untuk membaik / menurun
+    
+    # Model penguasaan (beban error yang meluruh eksponensial, lihat services/penguasaan_service.py)
+    PENGUASAAN_PARUH_WAKTU_HARI: float = 7.0  # Setelah N hari, bobot satu error tinggal separuh
+    PENGUASAAN_SKALA: float = 3.0  # Beban error yang membuat penguasaan = 50%
+    
+    # Deteksi submisi hampir identik (MinHash/LSH, lihat services/duplikat_service.py)
+    DUPLIKAT_AMBANG_MAHASISWA: float = 0.85  # Kemiripan minimal untuk pakai ulang analisis submisi sendiri
+    DUPLIKAT_AMBANG_GLOBAL: float = 0.95  # Kemiripan minimal untuk pakai ulang analisis mahasiswa lain
+    DUPLIKAT_AMBANG_PESAN: float = 0.7  # Kemiripan minimal pesan error saja (kode tidak mendominasi)
+    DUPLIKAT_JENDELA_HARI: int = 30  # Umur submisi yang dimuat ke index saat proses start
+    DUPLIKAT_INTERVAL_SINKRON: int = 30  # Detik antar sinkron submisi baru (dari proses lain) ke index
+    
+    # Pre-classifier lokal (aturan + ast) sebelum LLM, lihat services/klasifikasi_service.py
+    KLASIFIKASI_LOKAL_AKTIF: bool = True
+    KLASIFIKASI_LOKAL_AMBANG: float = 0.8  # Keyakinan minimal supaya hasil lokal dipakai tanpa LLM
+    
+    # Anggaran token prompt analisis per request (lihat utils/anggaran_prompt.py)
+    PROMPT_ANGGARAN_TOKEN: int = 3000  # Total prompt (template + kode + traceback + riwayat)
+    PROMPT_RADIUS_BARIS: int = 8  # Baris di sekitar lokasi error yang dipertahankan saat kode dipotong
+    
+    # Kompresi teks panjang submisi_error (lihat utils/kompresi.py)
+    KOMPRESI_TEKS_AMBANG_BYTE: int = 512  # 0 = simpan teks apa adanya
+    
+    # Retensi & arsip data lama (lihat services/retensi_service.py, scripts/retensi_data.py)
+    RETENSI_METRIK_HARI: int = 90  # Metrik mentah (metrik_ai, metrik_api) disimpan N hari, lebih lama cukup rollup harian
+    RETENSI_SUBMISI_SEMESTER: int = 4  # Submisi dari N semester terakhir (termasuk berjalan) tetap di submisi_error
+    ARSIP_TUJUAN: str = "koleksi"  # koleksi (submisi_error_arsip) atau file (JSONL gzip di ARSIP_DIR)
+    ARSIP_DIR: str = "arsip"  # Relatif ke direktori kerja (root project)
+    
+    # Kuota token LLM harian (lihat services/kuota_service.py), GitHub Models: 150K token/hari
+    LLM_KUOTA_TOKEN_HARIAN: int = 150000  # 0 = tanpa batas
+    LLM_ESTIMASI_TOKEN_OUTPUT: int = 800  # Perkiraan token jawaban saat cek kuota sebelum request
+    LLM_KUOTA_INTERVAL_SINKRON: int = 60  # Detik antar sinkron pemakaian dari metrik_ai (multi proses)
+    
+    # LLM palsu untuk load test / pengukuran tanpa kuota (lihat utils/llm_palsu.py)
+    USE_FAKE_LLM: bool = False
+    FAKE_LLM_LATENSI_MS: float = 1500.0  # Median latensi (lognormal) / rata-rata (normal, konstan)
+    FAKE_LLM_DISTRIBUSI: str = "lognormal"  # konstan, normal, lognormal
+    FAKE_LLM_SEBARAN: float = 0.4
+    FAKE_LLM_TINGKAT_GAGAL: float = 0.0  # Proporsi panggilan yang melempar exception
+    FAKE_LLM_TINGKAT_RUSAK: float = 0.0  # Proporsi jawaban yang bukan JSON valid
+    FAKE_LLM_SEED: int = 42
+    
     # Streamlit Configuration
     STREAMLIT_PORT: int = 8501
     
+    # Startup Warm-up & Readiness (lihat app/startup.py)
+    READINESS_HOST: str = "127.0.0.1"
+    READINESS_PORT: int = 8502
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
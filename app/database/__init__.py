@@ -3,26 +3,55 @@ Database Package - PyMongo Connection & Models
 
 CATATAN: Tidak menggunakan ORM (seperti Prisma), native MongoDB operations
 untuk fleksibilitas maksimal dengan Azure Cosmos DB.
+Re-export bersifat lazy supaya pymongo baru di-import saat benar-benar dipakai.
 """
 
-# Export koneksi
-from .koneksi import dapatkan_koneksi_database, dapatkan_database, tutup_koneksi_database
-
-# Export models
-from .models import (
-    Pengguna,
-    SubmisiError,
-    PolaError,
-    ProgressBelajar,
-    MetrikAI,
-    SumberDaya,
-    TopikPembelajaran,
-    Exercise,
-    MetrikAPI
-)
-
-# Export queries
-from .queries import DatabaseQueries
+from typing import TYPE_CHECKING
+
+from utils.lazy_loader import buat_lazy_loader
+
+if TYPE_CHECKING:
+    # Export koneksi
+    from .koneksi import dapatkan_koneksi_database, dapatkan_database, tutup_koneksi_database
+
+    # Export models
+    from .models import (
+        Pengguna,
+        SubmisiError,
+        PolaError,
+        ProgressBelajar,
+        SnapshotPenguasaan,
+        MetrikAI,
+        SumberDaya,
+        TopikPembelajaran,
+        Exercise,
+        MetrikAPI
+    )
+
+    # Export queries
+    from .queries import DatabaseQueries
+    from .kumpulan_query import KumpulanQuery
+
+__getattr__, __dir__ = buat_lazy_loader(__name__, {
+    # Koneksi
+    'dapatkan_koneksi_database': ('.koneksi', 'dapatkan_koneksi_database'),
+    'dapatkan_database': ('.koneksi', 'dapatkan_database'),
+    'tutup_koneksi_database': ('.koneksi', 'tutup_koneksi_database'),
+    # Models
+    'Pengguna': ('.models', 'Pengguna'),
+    'SubmisiError': ('.models', 'SubmisiError'),
+    'PolaError': ('.models', 'PolaError'),
+    'ProgressBelajar': ('.models', 'ProgressBelajar'),
+    'SnapshotPenguasaan': ('.models', 'SnapshotPenguasaan'),
+    'MetrikAI': ('.models', 'MetrikAI'),
+    'SumberDaya': ('.models', 'SumberDaya'),
+    'TopikPembelajaran': ('.models', 'TopikPembelajaran'),
+    'Exercise': ('.models', 'Exercise'),
+    'MetrikAPI': ('.models', 'MetrikAPI'),
+    # Queries
+    'DatabaseQueries': ('.queries', 'DatabaseQueries'),
+    'KumpulanQuery': ('.kumpulan_query', 'KumpulanQuery'),
+})
 
 __all__ = [
     # Koneksi
@@ -34,6 +63,7 @@ __all__ = [
     'SubmisiError',
     'PolaError',
     'ProgressBelajar',
+    'SnapshotPenguasaan',
     'MetrikAI',
     'SumberDaya',
     'TopikPembelajaran',
@@ -41,4 +71,5 @@ __all__ = [
     'MetrikAPI',
     # Queries
     'DatabaseQueries',
+    'KumpulanQuery',
 ]
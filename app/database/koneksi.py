@@ -25,6 +25,7 @@ def dapatkan_koneksi_database() -> MongoClient:
             serverSelectionTimeoutMS=5000,  # 5 detik timeout
             connectTimeoutMS=10000,  # 10 detik timeout untuk initial connection
             socketTimeoutMS=30000,  # 30 detik untuk operasi socket
+            minPoolSize=settings.DATABASE_MIN_POOL_SIZE,  # Pool tetap hangat setelah warm-up
         )
         
         # Test koneksi
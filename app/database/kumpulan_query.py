@@ -0,0 +1,143 @@
+"""
+Kumpulan Query - Jalankan query baca independen secara paralel lalu gabungkan hasilnya
+
+CATATAN:
+- Dashboard mahasiswa & admin menjalankan 6-10 query independen berurutan, jadi latensi
+  halaman = jumlah semua query. PyMongo melepas GIL selama menunggu balasan server, sehingga
+  query di thread terpisah benar-benar tumpang tindih: latensi mendekati query paling lambat
+- Service mendeklarasikan set query dengan tambah(nama, method, *args, **kwargs), lalu
+  jalankan() mengembalikan dict nama → hasil. Method boleh berupa nama method DatabaseQueries
+  (string) atau callable apa pun
+- Satu thread pool per proses (settings.QUERY_PARALEL_WORKERS, 0 = berurutan) dibagi semua
+  session; MongoClient thread-safe dan connection pool-nya dipakai bersama
+- KumpulanQuery yang dijalankan dari dalam thread pool (nested) dieksekusi berurutan, supaya
+  tidak deadlock saat semua worker pool sedang menunggu
+- Exception query dilempar ulang setelah semua query selesai (sama seperti versi berurutan);
+  method DatabaseQueries yang menangkap error sendiri tetap mengembalikan default-nya
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Query:
+    """Satu query yang dideklarasikan"""
+    fungsi: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+_lokal = threading.local()
+_lock_executor = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _tandai_thread_pool() -> None:
+    _lokal.di_pool = True
+
+
+def _dapatkan_executor() -> Optional[ThreadPoolExecutor]:
+    """Thread pool process-wide (None jika paralel dimatikan)"""
+    global _executor
+    if settings.QUERY_PARALEL_WORKERS <= 0:
+        return None
+    if _executor is None:
+        with _lock_executor:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.QUERY_PARALEL_WORKERS,
+                    thread_name_prefix="pahamkode-query",
+                    initializer=_tandai_thread_pool
+                )
+    return _executor
+
+
+class KumpulanQuery:
+    """
+    Set query baca independen yang dijalankan bersamaan
+
+    Contoh:
+        hasil = (
+            KumpulanQuery(queries)
+            .tambah("total", "hitung_total_submisi", id_mahasiswa)
+            .tambah("pola", "ambil_pola_mahasiswa", id_mahasiswa, tampilan="ringkasan")
+            .jalankan()
+        )
+    """
+
+    def __init__(self, queries: Any = None):
+        self.queries = queries
+        self._query: Dict[str, _Query] = {}
+        # Durasi per query (detik) dari jalankan() terakhir, untuk log & benchmark
+        self.durasi: Dict[str, float] = {}
+        self.durasi_total = 0.0
+
+    def tambah(self, nama: str, method: Union[str, Callable[..., Any]], *args: Any, **kwargs: Any) -> "KumpulanQuery":
+        """
+        Deklarasikan satu query
+
+        Args:
+            nama: Key hasil di dict jalankan()
+            method: Nama method DatabaseQueries atau callable
+        """
+        if nama in self._query:
+            raise ValueError(f"Query '{nama}' sudah dideklarasikan")
+        fungsi = getattr(self.queries, method) if isinstance(method, str) else method
+        self._query[nama] = _Query(fungsi, args, kwargs)
+        return self
+
+    def _eksekusi(self, nama: str) -> Any:
+        query = self._query[nama]
+        mulai = time.perf_counter()
+        try:
+            return query.fungsi(*query.args, **query.kwargs)
+        finally:
+            self.durasi[nama] = time.perf_counter() - mulai
+
+    def jalankan(self) -> Dict[str, Any]:
+        """
+        Jalankan semua query (paralel jika memungkinkan) dan tunggu semuanya selesai
+
+        Returns:
+            Dict nama → hasil, urutan sama dengan deklarasi
+
+        Raises:
+            Exception pertama (urutan deklarasi) dari query yang gagal
+        """
+        self.durasi = {}
+        mulai = time.perf_counter()
+        executor = _dapatkan_executor()
+        try:
+            if executor is None or len(self._query) < 2 or getattr(_lokal, "di_pool", False):
+                return {nama: self._eksekusi(nama) for nama in self._query}
+
+            futures = {nama: executor.submit(self._eksekusi, nama) for nama in self._query}
+            hasil: Dict[str, Any] = {}
+            error: Optional[BaseException] = None
+            for nama, future in futures.items():
+                try:
+                    hasil[nama] = future.result()
+                except Exception as e:
+                    logger.error(f"Query paralel '{nama}' gagal: {str(e)}")
+                    error = error or e
+            if error is not None:
+                raise error
+            return hasil
+        finally:
+            self.durasi_total = time.perf_counter() - mulai
+            if self.durasi:
+                terlama = max(self.durasi, key=self.durasi.get)
+                logger.debug(
+                    f"{len(self._query)} query selesai dalam {self.durasi_total * 1000:.0f} ms "
+                    f"(berurutan {sum(self.durasi.values()) * 1000:.0f} ms, "
+                    f"terlama {terlama} {self.durasi[terlama] * 1000:.0f} ms)"
+                )
@@ -2,18 +2,105 @@
 Models Database - MongoDB Schemas dengan Dataclasses
 Definisi struktur data untuk semua collections di database
 
-CATATAN: Menggunakan dataclasses (bukan ORM) untuk fleksibilitas maksimal dengan MongoDB
+CATATAN:
+- Menggunakan dataclasses (bukan ORM) untuk fleksibilitas maksimal dengan MongoDB
+- Semua model memakai @model_bson: dataclass dengan __slots__ (tanpa __dict__ per instance,
+  list ribuan submisi jauh lebih hemat memori) plus to_dict / from_dict yang di-generate sekali
+  saat import (dict literal & argumen posisional, tanpa loop fields() per panggilan)
+- to_dict: semua field kecuali _id (hanya jika ada) dan field `_manual()`; model yang butuh
+  field turunan / kompresi menulis to_dict sendiri di atas _dict_dasar()
+- from_dict: field dokumen yang tidak ada diisi default model; key dokumen yang bukan field
+  (mis. kata_cari) diabaikan
+- Model slotted tidak menerima atribut di luar field (AttributeError)
 """
 
-from dataclasses import dataclass, field
+from dataclasses import MISSING, Field, dataclass, field, fields
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union, get_args, get_origin
 from bson import ObjectId
 
+from utils.kompresi import AMBANG_BYTE, FIELD_SUBMISI, dekompres_dokumen, kompres_dokumen
+from utils.pencarian import buat_kata_cari
+
+
+# ==================== GENERATOR ENCODE / DECODE ====================
+
+def _manual(default: Any = None) -> Any:
+    """Field yang tidak ikut dict dasar (ditulis manual oleh to_dict model, atau tidak disimpan)"""
+    return field(default=default, metadata={"manual": True})
+
+
+def _opsional(tipe: Any) -> bool:
+    return get_origin(tipe) is Union and type(None) in get_args(tipe)
+
+
+def _kompilasi(nama: str, sumber: str, namespace: Dict[str, Any], cls: type) -> Any:
+    exec(compile(sumber, f"<model_bson {cls.__name__}.{nama}>", "exec"), namespace)
+    fungsi = namespace[nama]
+    fungsi.__qualname__ = f"{cls.__name__}.{nama}"
+    return fungsi
+
+
+def _argumen_decode(f: Field, namespace: Dict[str, Any]) -> str:
+    """Ekspresi sumber untuk satu argumen posisional constructor di from_dict"""
+    key = repr(f.name)
+    if f.default_factory is not MISSING:
+        namespace[f"_f_{f.name}"] = f.default_factory
+        return f"data[{key}] if {key} in data else _f_{f.name}()"
+    if f.default is not MISSING:
+        if f.default is None:
+            return f"get({key})"
+        namespace[f"_d_{f.name}"] = f.default
+        return f"get({key}, _d_{f.name})"
+    return f"get({key})" if _opsional(f.type) else f"data[{key}]"
+
+
+def model_bson(cls: type) -> type:
+    """
+    Decorator model: @dataclass(slots=True) + generate _dict_dasar, to_dict & from_dict
+    
+    to_dict / from_dict yang ditulis di class tidak ditimpa; versi generated tetap tersedia
+    sebagai _dict_dasar() dan _dari_dict() untuk dipakai di dalamnya.
+    """
+    manual_to_dict = "to_dict" in cls.__dict__
+    manual_from_dict = "from_dict" in cls.__dict__
+    cls = dataclass(slots=True)(cls)
+    semua = fields(cls)
+    disimpan = [f for f in semua if f.name != "_id" and not f.metadata.get("manual")]
+    isi_dict = ", ".join(f"{f.name!r}: self.{f.name}" for f in disimpan)
+    
+    cls._dict_dasar = _kompilasi(
+        "_dict_dasar", f"def _dict_dasar(self):\n    return {{{isi_dict}}}\n", {}, cls
+    )
+    
+    if not manual_to_dict:
+        to_dict = _kompilasi("to_dict", (
+            "def to_dict(self):\n"
+            f"    data = {{{isi_dict}}}\n"
+            "    if self._id:\n"
+            "        data['_id'] = self._id\n"
+            "    return data\n"
+        ), {}, cls)
+        to_dict.__doc__ = "Convert ke dict untuk MongoDB"
+        cls.to_dict = to_dict
+    
+    namespace: Dict[str, Any] = {}
+    argumen = ",\n        ".join(_argumen_decode(f, namespace) for f in semua)
+    dari_dict = _kompilasi("_dari_dict", (
+        "def _dari_dict(cls, data):\n"
+        "    get = data.get\n"
+        f"    return cls(\n        {argumen}\n    )\n"
+    ), namespace, cls)
+    dari_dict.__doc__ = "Create instance dari MongoDB document"
+    cls._dari_dict = classmethod(dari_dict)
+    if not manual_from_dict:
+        cls.from_dict = cls._dari_dict
+    return cls
+
 
 # ==================== USER MODELS ====================
 
-@dataclass
+@model_bson
 class Pengguna:
     """Model untuk collection 'users' - Mahasiswa & Admin"""
     email: str
@@ -28,39 +115,17 @@ class Pengguna:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert ke dict untuk MongoDB insert/update"""
-        data = {
-            "email": self.email,
-            "nama": self.nama,
-            "password_hash": self.password_hash,
-            "role": self.role,
-            "status": self.status,
-            "tingkat_kemahiran": self.tingkat_kemahiran,
-            "created_at": self.created_at,
-            "last_login": self.last_login
-        }
+        data = self._dict_dasar()
+        # Field turunan untuk prefix search ber-index (lihat utils/pencarian.py)
+        data["kata_cari"] = buat_kata_cari(self.nama, self.email)
         if self._id:
             data["_id"] = self._id
         return data
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Pengguna':
-        """Create instance dari MongoDB document"""
-        return cls(
-            email=data["email"],
-            nama=data.get("nama"),
-            password_hash=data["password_hash"],
-            role=data.get("role", "mahasiswa"),
-            status=data.get("status", "aktif"),
-            tingkat_kemahiran=data.get("tingkat_kemahiran", "pemula"),
-            created_at=data.get("created_at", datetime.now()),
-            last_login=data.get("last_login"),
-            _id=data.get("_id")
-        )
 
 
 # ==================== ERROR SUBMISSION MODELS ====================
 
-@dataclass
+@model_bson
 class SubmisiError:
     """Model untuk collection 'submisi_error' - Error submissions dengan AI analysis"""
     id_mahasiswa: ObjectId
@@ -75,34 +140,45 @@ class SubmisiError:
     saran_perbaikan: Optional[str] = None
     topik_terkait: List[str] = field(default_factory=list)
     saran_latihan: Optional[str] = None
+    minhash: Optional[bytes] = _manual()  # Signature MinHash kode + pesan error (utils/minhash.py)
+    duplikat_dari: Optional[ObjectId] = _manual()  # Submisi asal jika analisis dipakai ulang
+    kemiripan: Optional[float] = _manual()  # Kemiripan dengan duplikat_dari (0-1)
+    diff_kode: Optional[str] = _manual()  # Diff dengan kode duplikat_dari (hanya untuk UI, tidak disimpan)
     created_at: datetime = field(default_factory=datetime.now)
     _id: Optional[ObjectId] = None
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert ke dict untuk MongoDB"""
-        data = {
-            "id_mahasiswa": self.id_mahasiswa,
-            "kode": self.kode,
-            "pesan_error": self.pesan_error,
-            "bahasa": self.bahasa,
-            "tipe_error": self.tipe_error,
-            "penyebab_utama": self.penyebab_utama,
-            "kesenjangan_konsep": self.kesenjangan_konsep,
-            "level_bloom": self.level_bloom,
-            "penjelasan": self.penjelasan,
-            "saran_perbaikan": self.saran_perbaikan,
-            "topik_terkait": self.topik_terkait,
-            "saran_latihan": self.saran_latihan,
-            "created_at": self.created_at
-        }
+    def to_dict(self, ambang_kompresi: int = AMBANG_BYTE) -> Dict[str, Any]:
+        """
+        Convert ke dict untuk MongoDB
+        
+        Teks panjang (kode, pesan_error, penjelasan, saran) dikompres ke Binary jika ≥ ambang_kompresi
+        byte (0 = tanpa kompresi), lihat utils/kompresi.py
+        """
+        data = self._dict_dasar()
+        kompres_dokumen(data, ambang=ambang_kompresi)
+        if self.minhash is not None:
+            data["minhash"] = self.minhash
+        if self.duplikat_dari:
+            data["duplikat_dari"] = self.duplikat_dari
+            data["kemiripan"] = self.kemiripan
         if self._id:
             data["_id"] = self._id
         return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SubmisiError':
+        """Create instance dari MongoDB document (field teks terkompres didekompres dulu)"""
+        for nama in FIELD_SUBMISI:
+            # Binary adalah subclass bytes; subtype dicek oleh dekompres_dokumen
+            if isinstance(data.get(nama), bytes):
+                data = dekompres_dokumen(dict(data))
+                break
+        return cls._dari_dict(data)
 
 
 # ==================== PATTERN MODELS ====================
 
-@dataclass
+@model_bson
 class PolaError:
     """Model untuk collection 'pola_error' - Detected error patterns"""
     id_mahasiswa: ObjectId
@@ -115,28 +191,11 @@ class PolaError:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     _id: Optional[ObjectId] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert ke dict untuk MongoDB"""
-        data = {
-            "id_mahasiswa": self.id_mahasiswa,
-            "jenis_kesalahan": self.jenis_kesalahan,
-            "frekuensi": self.frekuensi,
-            "kejadian_pertama": self.kejadian_pertama,
-            "kejadian_terakhir": self.kejadian_terakhir,
-            "deskripsi_miskonsepsi": self.deskripsi_miskonsepsi,
-            "sumber_daya_direkomendasikan": self.sumber_daya_direkomendasikan,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at
-        }
-        if self._id:
-            data["_id"] = self._id
-        return data
 
 
 # ==================== PROGRESS MODELS ====================
 
-@dataclass
+@model_bson
 class ProgressBelajar:
     """Model untuk collection 'progress_belajar' - Learning progress per topik"""
     id_mahasiswa: ObjectId
@@ -145,30 +204,33 @@ class ProgressBelajar:
     jumlah_error_di_topik: int = 0
     tanggal_error_terakhir: Optional[datetime] = None
     tren_perbaikan: Optional[str] = None  # "membaik", "stagnan", "menurun"
+    penguasaan_delta: float = 0.0  # Perubahan penguasaan dalam jendela tren (dari snapshot)
+    beban_error: float = 0.0  # Jumlah error berbobot peluruhan (state model penguasaan)
+    beban_diperbarui: Optional[datetime] = None  # Waktu beban_error terakhir dihitung
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     _id: Optional[ObjectId] = None
+
+
+@model_bson
+class SnapshotPenguasaan:
+    """
+    Model untuk collection 'snapshot_penguasaan' - Time series penguasaan per (mahasiswa, topik)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert ke dict untuk MongoDB"""
-        data = {
-            "id_mahasiswa": self.id_mahasiswa,
-            "topik": self.topik,
-            "tingkat_penguasaan": self.tingkat_penguasaan,
-            "jumlah_error_di_topik": self.jumlah_error_di_topik,
-            "tanggal_error_terakhir": self.tanggal_error_terakhir,
-            "tren_perbaikan": self.tren_perbaikan,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at
-        }
-        if self._id:
-            data["_id"] = self._id
-        return data
+    Satu dokumen per pasangan. `titik` append-only dengan downsampling: maksimal satu titik
+    per bucket hari ({"b": bucket, "p": penguasaan, "e": jumlah_error}), dipangkas ke N titik terakhir.
+    """
+    id_mahasiswa: ObjectId
+    topik: str
+    titik: List[Dict[str, Any]] = field(default_factory=list)
+    bucket_terakhir: Optional[datetime] = None
+    updated_at: datetime = field(default_factory=datetime.now)
+    _id: Optional[ObjectId] = None
 
 
 # ==================== AI METRICS MODELS ====================
 
-@dataclass
+@model_bson
 class MetrikAI:
     """Model untuk collection 'metrik_ai' - AI model usage tracking untuk admin"""
     id_submisi: Optional[ObjectId] = None
@@ -180,31 +242,18 @@ class MetrikAI:
     waktu_respons: float = 0.0  # Dalam detik
     status_berhasil: bool = True
     error_message: Optional[str] = None
+    sumber: str = "llm"  # llm, lokal (pre-classifier aturan), duplikat (analisis dipakai ulang)
+    token_dihemat: int = 0  # Token prompt dipangkas anggaran prompt (utils/anggaran_prompt.py), atau seluruh prompt jika duplikat
+    sumber_token: str = "tokenizer"  # provider (usage respons LLM) atau tokenizer (offline)
+    token_input_lokal: int = 0  # Hitungan tokenizer offline, dicatat juga saat usage provider ada
+    token_output_lokal: int = 0
     created_at: datetime = field(default_factory=datetime.now)
     _id: Optional[ObjectId] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert ke dict untuk MongoDB"""
-        data = {
-            "id_submisi": self.id_submisi,
-            "model": self.model,
-            "token_input": self.token_input,
-            "token_output": self.token_output,
-            "total_token": self.total_token,
-            "biaya": self.biaya,
-            "waktu_respons": self.waktu_respons,
-            "status_berhasil": self.status_berhasil,
-            "error_message": self.error_message,
-            "created_at": self.created_at
-        }
-        if self._id:
-            data["_id"] = self._id
-        return data
 
 
 # ==================== LEARNING RESOURCES MODELS ====================
 
-@dataclass
+@model_bson
 class SumberDaya:
     """Model untuk collection 'sumber_daya' - Learning resources (managed by admin)"""
     judul: str
@@ -219,30 +268,11 @@ class SumberDaya:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     _id: Optional[ObjectId] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert ke dict untuk MongoDB"""
-        data = {
-            "judul": self.judul,
-            "deskripsi": self.deskripsi,
-            "tipe": self.tipe,
-            "url": self.url,
-            "konten": self.konten,
-            "topik_terkait": self.topik_terkait,
-            "tingkat_kesulitan": self.tingkat_kesulitan,
-            "durasi": self.durasi,
-            "dibuat_oleh": self.dibuat_oleh,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at
-        }
-        if self._id:
-            data["_id"] = self._id
-        return data
 
 
 # ==================== TOPIC MODELS ====================
 
-@dataclass
+@model_bson
 class TopikPembelajaran:
     """Model untuk collection 'topik_pembelajaran' - Learning topics (managed by admin)"""
     nama: str
@@ -256,29 +286,11 @@ class TopikPembelajaran:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     _id: Optional[ObjectId] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert ke dict untuk MongoDB"""
-        data = {
-            "nama": self.nama,
-            "deskripsi": self.deskripsi,
-            "kategori": self.kategori,
-            "tingkat_kesulitan": self.tingkat_kesulitan,
-            "prerequisite": self.prerequisite,
-            "tujuan_pembelajaran": self.tujuan_pembelajaran,
-            "estimasi_waktu": self.estimasi_waktu,
-            "total_error": self.total_error,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at
-        }
-        if self._id:
-            data["_id"] = self._id
-        return data
 
 
 # ==================== EXERCISE MODELS ====================
 
-@dataclass
+@model_bson
 class Exercise:
     """Model untuk collection 'exercises' - Practice exercises"""
     judul: str
@@ -295,32 +307,11 @@ class Exercise:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     _id: Optional[ObjectId] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert ke dict untuk MongoDB"""
-        data = {
-            "judul": self.judul,
-            "deskripsi": self.deskripsi,
-            "topik": self.topik,
-            "tingkat_kesulitan": self.tingkat_kesulitan,
-            "instruksi": self.instruksi,
-            "kode_pemula": self.kode_pemula,
-            "solusi_referensi": self.solusi_referensi,
-            "test_cases": self.test_cases,
-            "poin_belajar": self.poin_belajar,
-            "estimasi_waktu": self.estimasi_waktu,
-            "dibuat_oleh": self.dibuat_oleh,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at
-        }
-        if self._id:
-            data["_id"] = self._id
-        return data
 
 
 # ==================== API METRICS MODELS ====================
 
-@dataclass
+@model_bson
 class MetrikAPI:
     """Model untuk collection 'metrik_api' - API performance tracking"""
     endpoint: str
@@ -332,19 +323,3 @@ class MetrikAPI:
     error_message: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.now)
     _id: Optional[ObjectId] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert ke dict untuk MongoDB"""
-        data = {
-            "endpoint": self.endpoint,
-            "method": self.method,
-            "status_code": self.status_code,
-            "waktu_respons": self.waktu_respons,
-            "user_agent": self.user_agent,
-            "ip_address": self.ip_address,
-            "error_message": self.error_message,
-            "created_at": self.created_at
-        }
-        if self._id:
-            data["_id"] = self._id
-        return data
@@ -8,9 +8,11 @@ CATATAN:
 - Logging untuk monitoring
 """
 
+from pymongo import ASCENDING, DESCENDING, ReadPreference, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
 from pymongo.database import Database
 from pymongo.collection import Collection
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from bson import ObjectId
 from datetime import datetime, timedelta
 import logging
@@ -19,9 +21,65 @@ from database.models import (
     Pengguna, SubmisiError, PolaError, ProgressBelajar,
     MetrikAI, SumberDaya, TopikPembelajaran, Exercise, MetrikAPI
 )
+from utils.kompresi import FIELD_SUBMISI, dekompres_dokumen
+from utils.pencarian import query_prefix
 
 logger = logging.getLogger(__name__)
 
+# Proyeksi per tampilan (view) untuk query list: None = dokumen lengkap.
+# Field berat (kode, pesan_error, penjelasan, saran_perbaikan, minhash) hanya ada di "detail"
+PROYEKSI_SUBMISI: Dict[str, Optional[Dict[str, int]]] = {
+    # List riwayat, dashboard, detail admin
+    "ringkasan": {
+        "tipe_error": 1, "bahasa": 1, "level_bloom": 1, "penyebab_utama": 1,
+        "kesenjangan_konsep": 1, "topik_terkait": 1, "created_at": 1
+    },
+    # Konteks riwayat untuk prompt AI & hitungan per waktu
+    "konteks": {"_id": 0, "tipe_error": 1, "kesenjangan_konsep": 1, "created_at": 1},
+    "detail": None,
+}
+PROYEKSI_POLA: Dict[str, Optional[Dict[str, int]]] = {
+    "ringkasan": {"jenis_kesalahan": 1, "frekuensi": 1, "deskripsi_miskonsepsi": 1, "kejadian_terakhir": 1},
+    "konteks": {"_id": 0, "jenis_kesalahan": 1, "frekuensi": 1},
+    "detail": None,
+}
+
+# Akumulator $group metrik mentah per jenis. Semuanya penjumlahan supaya hasil data mentah dan
+# rollup harian (metrik_harian) bisa digabung; rata-rata dihitung setelah digabung
+AKUMULATOR_METRIK: Dict[str, Dict[str, Any]] = {
+    "ai": {
+        "total_request": {"$sum": 1},
+        "total_token": {"$sum": "$total_token"},
+        "token_dihemat": {"$sum": {"$ifNull": ["$token_dihemat", 0]}},
+        "total_biaya": {"$sum": "$biaya"},
+        "total_waktu_respons": {"$sum": "$waktu_respons"},
+        "sukses_count": {"$sum": {"$cond": ["$status_berhasil", 1, 0]}},
+    },
+    "api": {
+        "total_request": {"$sum": 1},
+        "total_waktu": {"$sum": "$waktu_respons"},
+        "request_berhasil": {"$sum": {"$cond": [{"$lt": ["$status_code", 400]}, 1, 0]}},
+        "request_error": {"$sum": {"$cond": [{"$gte": ["$status_code", 400]}, 1, 0]}},
+    },
+}
+# Dimensi rollup per jenis: (nama field di metrik_harian, ekspresi dari dokumen mentah)
+DIMENSI_METRIK: Dict[str, Tuple[str, Any]] = {
+    "ai": ("sumber", {"$ifNull": ["$sumber", "llm"]}),
+    "api": ("endpoint", "$endpoint"),
+}
+
+
+def _kunci_tipe(tipe_error: str) -> str:
+    """Nama tipe error sebagai key sub-dokumen (titik diganti, mis. requests.HTTPError)"""
+    return tipe_error.replace(".", "\uff0e")
+
+
+def _proyeksi_tampilan(proyeksi: Dict[str, Optional[Dict[str, int]]], tampilan: str) -> Optional[Dict[str, int]]:
+    """Proyeksi untuk tampilan (ringkasan / konteks / detail)"""
+    if tampilan not in proyeksi:
+        raise ValueError(f"Tampilan tidak dikenal: {tampilan} (pilihan: {', '.join(proyeksi)})")
+    return proyeksi[tampilan]
+
 
 class DatabaseQueries:
     """Database operations untuk semua collections"""
@@ -37,6 +95,11 @@ class DatabaseQueries:
         self.topik_pembelajaran: Collection = db.topik_pembelajaran
         self.exercises: Collection = db.exercises
         self.metrik_api: Collection = db.metrik_api
+        self.meta_aplikasi: Collection = db.meta_aplikasi
+        self.snapshot_penguasaan: Collection = db.snapshot_penguasaan
+        self.metrik_harian: Collection = db.metrik_harian
+        self.submisi_error_arsip: Collection = db.submisi_error_arsip
+        self.ringkasan_arsip_mahasiswa: Collection = db.ringkasan_arsip_mahasiswa
     
     
     # ==================== USER OPERATIONS ====================
@@ -91,6 +154,32 @@ class DatabaseQueries:
             logger.error(f"Error update last login: {str(e)}")
             return False
     
+    def _query_mahasiswa(
+        self,
+        filter_status: Optional[str] = None,
+        filter_tingkat: Optional[str] = None,
+        search_query: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Bangun filter MongoDB untuk daftar mahasiswa (dipakai list & count)"""
+        query: Dict[str, Any] = {"role": "mahasiswa"}
+        
+        # Filter by status
+        if filter_status:
+            query["status"] = filter_status
+        
+        # Filter by tingkat kemahiran
+        if filter_tingkat:
+            query["tingkat_kemahiran"] = filter_tingkat
+        
+        # Search by prefix nama / email - range query pada kata_cari (pakai index),
+        # bukan $regex tanpa anchor yang selalu collection scan
+        if search_query:
+            kondisi_prefix = query_prefix(search_query)
+            if kondisi_prefix:
+                query["kata_cari"] = kondisi_prefix
+        
+        return query
+    
     def daftar_semua_mahasiswa(
         self, 
         skip: int = 0, 
@@ -101,33 +190,23 @@ class DatabaseQueries:
     ) -> List[Dict[str, Any]]:
         """Ambil daftar mahasiswa dengan pagination & filter - Admin function"""
         try:
-            query: Dict[str, Any] = {"role": "mahasiswa"}
-            
-            # Filter by status
-            if filter_status:
-                query["status"] = filter_status
-            
-            # Filter by tingkat kemahiran
-            if filter_tingkat:
-                query["tingkat_kemahiran"] = filter_tingkat
-            
-            # Search by nama or email
-            if search_query:
-                query["$or"] = [
-                    {"nama": {"$regex": search_query, "$options": "i"}},
-                    {"email": {"$regex": search_query, "$options": "i"}}
-                ]
-            
+            query = self._query_mahasiswa(filter_status, filter_tingkat, search_query)
             cursor = self.users.find(query).sort("created_at", -1).skip(skip).limit(limit)
             return list(cursor)
         except Exception as e:
             logger.error(f"Error daftar mahasiswa: {str(e)}")
             return []
     
-    def hitung_total_mahasiswa(self) -> int:
-        """Hitung total mahasiswa - Admin analytics"""
+    def hitung_total_mahasiswa(
+        self,
+        filter_status: Optional[str] = None,
+        filter_tingkat: Optional[str] = None,
+        search_query: Optional[str] = None
+    ) -> int:
+        """Hitung total mahasiswa (opsional dengan filter yang sama dengan daftar) - Admin analytics"""
         try:
-            return self.users.count_documents({"role": "mahasiswa"})
+            query = self._query_mahasiswa(filter_status, filter_tingkat, search_query)
+            return self.users.count_documents(query)
         except Exception as e:
             logger.error(f"Error hitung total mahasiswa: {str(e)}")
             return 0
@@ -149,49 +228,298 @@ class DatabaseQueries:
         self, 
         id_mahasiswa: str, 
         limit: int = 20,
-        skip: int = 0
+        skip: int = 0,
+        tampilan: str = "detail"
     ) -> List[Dict[str, Any]]:
-        """Ambil riwayat submisi mahasiswa dengan pagination"""
+        """
+        Ambil riwayat submisi mahasiswa dengan pagination
+        
+        tampilan "ringkasan" / "konteks" tidak mengirim kode & penjelasan (lihat PROYEKSI_SUBMISI);
+        field berat satu submisi diambil saat dibuka dengan ambil_detail_submisi()
+        """
+        proyeksi = _proyeksi_tampilan(PROYEKSI_SUBMISI, tampilan)
         try:
             cursor = self.submisi_error.find(
-                {"id_mahasiswa": ObjectId(id_mahasiswa)}
+                {"id_mahasiswa": ObjectId(id_mahasiswa)},
+                proyeksi
             ).sort("created_at", -1).skip(skip).limit(limit)
-            return list(cursor)
+            return [dekompres_dokumen(dokumen) for dokumen in cursor]
         except Exception as e:
             logger.error(f"Error ambil riwayat: {str(e)}")
             return []
     
+    def _filter_submisi_periode(
+        self,
+        id_mahasiswa: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Filter submisi mahasiswa dengan rentang created_at (dipakai index id_mahasiswa + created_at)"""
+        query: Dict[str, Any] = {"id_mahasiswa": ObjectId(id_mahasiswa)}
+        rentang: Dict[str, datetime] = {}
+        if date_from:
+            rentang["$gte"] = date_from
+        if date_to:
+            rentang["$lte"] = date_to
+        if rentang:
+            query["created_at"] = rentang
+        return query
+    
+    def iterasi_submisi_periode(
+        self,
+        id_mahasiswa: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        proyeksi: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream submisi mahasiswa dalam rentang tanggal (terbaru dulu) per batch cursor
+        
+        Tidak ada limit dan tidak di-load ke list: dipakai export supaya riwayat
+        panjang ikut terekspor lengkap dengan memori konstan. Error di tengah
+        stream dilempar ulang (export parsial tidak boleh dianggap sukses).
+        """
+        query = self._filter_submisi_periode(id_mahasiswa, date_from, date_to)
+        cursor = self.submisi_error.find(query, proyeksi).sort("created_at", -1).batch_size(batch_size)
+        try:
+            for dokumen in cursor:
+                yield dekompres_dokumen(dokumen)
+        except Exception as e:
+            logger.error(f"Error iterasi submisi periode: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+    
+    def ringkasan_submisi_periode(
+        self,
+        id_mahasiswa: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Hitung total submisi & jumlah per tipe error dalam rentang tanggal (aggregation)
+        
+        Submisi yang sudah diarsipkan (ringkasan_arsip_mahasiswa) ikut dihitung jika rentang
+        mencakup seluruh periode arsip (date_from kosong).
+        
+        Returns:
+            Dictionary dengan total dan per_tipe (list (tipe_error, jumlah) urut terbanyak)
+        """
+        try:
+            pipeline = [
+                {"$match": self._filter_submisi_periode(id_mahasiswa, date_from, date_to)},
+                {"$group": {"_id": "$tipe_error", "jumlah": {"$sum": 1}}}
+            ]
+            jumlah_tipe: Dict[str, int] = {}
+            for hasil in self.submisi_error.aggregate(pipeline):
+                tipe = hasil["_id"] or "Unknown"
+                jumlah_tipe[tipe] = jumlah_tipe.get(tipe, 0) + hasil["jumlah"]
+            
+            arsip = self.ambil_ringkasan_arsip(id_mahasiswa) if date_from is None else None
+            if arsip and (date_to is None or date_to >= arsip["terakhir"]):
+                for kunci, jumlah in (arsip.get("per_tipe") or {}).items():
+                    tipe = kunci.replace("\uff0e", ".")
+                    jumlah_tipe[tipe] = jumlah_tipe.get(tipe, 0) + jumlah
+            
+            per_tipe = sorted(jumlah_tipe.items(), key=lambda item: item[1], reverse=True)
+            return {
+                "total": sum(jumlah for _, jumlah in per_tipe),
+                "per_tipe": per_tipe
+            }
+        except Exception as e:
+            logger.error(f"Error ringkasan submisi periode: {str(e)}")
+            return {"total": 0, "per_tipe": []}
+    
     def hitung_submisi_by_tipe(self, id_mahasiswa: str, tipe_error: str) -> int:
-        """Hitung jumlah error dengan tipe tertentu (untuk pattern detection)"""
+        """Hitung jumlah error dengan tipe tertentu (untuk pattern detection), termasuk yang diarsipkan"""
         try:
-            return self.submisi_error.count_documents({
+            jumlah = self.submisi_error.count_documents({
                 "id_mahasiswa": ObjectId(id_mahasiswa),
                 "tipe_error": tipe_error
             })
+            arsip = self.ambil_ringkasan_arsip(id_mahasiswa)
+            if arsip:
+                jumlah += int((arsip.get("per_tipe") or {}).get(_kunci_tipe(tipe_error), 0))
+            return jumlah
         except Exception as e:
             logger.error(f"Error hitung submisi by tipe: {str(e)}")
             return 0
     
-    def ambil_submisi_terakhir(self, id_mahasiswa: str, jumlah: int = 5) -> List[Dict[str, Any]]:
-        """Ambil N submisi terakhir untuk konteks AI"""
+    def ambil_submisi_terakhir(
+        self,
+        id_mahasiswa: str,
+        jumlah: int = 5,
+        tampilan: str = "konteks"
+    ) -> List[Dict[str, Any]]:
+        """Ambil N submisi terakhir untuk konteks AI (default hanya tipe_error & kesenjangan_konsep)"""
+        proyeksi = _proyeksi_tampilan(PROYEKSI_SUBMISI, tampilan)
         try:
             cursor = self.submisi_error.find(
-                {"id_mahasiswa": ObjectId(id_mahasiswa)}
+                {"id_mahasiswa": ObjectId(id_mahasiswa)},
+                proyeksi
             ).sort("created_at", -1).limit(jumlah)
-            return list(cursor)
+            return [dekompres_dokumen(dokumen) for dokumen in cursor]
         except Exception as e:
             logger.error(f"Error ambil submisi terakhir: {str(e)}")
             return []
     
     def hitung_total_submisi(self, id_mahasiswa: Optional[str] = None) -> int:
-        """Hitung total submisi (global atau per mahasiswa)"""
+        """Hitung total submisi (global atau per mahasiswa), termasuk yang diarsipkan"""
         try:
             query = {"id_mahasiswa": ObjectId(id_mahasiswa)} if id_mahasiswa else {}
-            return self.submisi_error.count_documents(query)
+            total = self.submisi_error.count_documents(query)
+            if id_mahasiswa:
+                arsip = self.ambil_ringkasan_arsip(id_mahasiswa)
+                return total + int(arsip.get("total_submisi", 0) if arsip else 0)
+            hasil = list(self.ringkasan_arsip_mahasiswa.aggregate([
+                {"$group": {"_id": None, "total": {"$sum": "$total_submisi"}}}
+            ]))
+            return total + (int(hasil[0]["total"]) if hasil else 0)
         except Exception as e:
             logger.error(f"Error hitung total submisi: {str(e)}")
             return 0
     
+    def ambil_submisi_by_id(
+        self,
+        id_submisi: Any,
+        proyeksi: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Ambil satu submisi berdasarkan ID"""
+        try:
+            return dekompres_dokumen(self.submisi_error.find_one({"_id": ObjectId(str(id_submisi))}, proyeksi))
+        except Exception as e:
+            logger.error(f"Error ambil submisi by id: {str(e)}")
+            return None
+    
+    def ambil_detail_submisi(self, id_submisi: Any, id_mahasiswa: str) -> Optional[Dict[str, Any]]:
+        """Ambil submisi lengkap milik mahasiswa (lazy load saat item riwayat dibuka)"""
+        try:
+            return dekompres_dokumen(self.submisi_error.find_one(
+                {"_id": ObjectId(str(id_submisi)), "id_mahasiswa": ObjectId(id_mahasiswa)},
+                {"minhash": 0}
+            ))
+        except Exception as e:
+            logger.error(f"Error ambil detail submisi: {str(e)}")
+            return None
+    
+    def ambil_submisi_by_ids(
+        self,
+        id_submisi_list: List[Any],
+        proyeksi: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Ambil beberapa submisi sekaligus ($in _id)"""
+        try:
+            return [dekompres_dokumen(dokumen) for dokumen in self.submisi_error.find(
+                {"_id": {"$in": [ObjectId(str(id_submisi)) for id_submisi in id_submisi_list]}},
+                proyeksi
+            )]
+        except Exception as e:
+            logger.error(f"Error ambil submisi by ids: {str(e)}")
+            return []
+    
+    def catat_pengulangan_submisi(self, id_submisi: Any, waktu: datetime) -> bool:
+        """Tandai submisi dikirim ulang (hampir identik) tanpa membuat dokumen baru"""
+        try:
+            result = self.submisi_error.update_one(
+                {"_id": ObjectId(str(id_submisi))},
+                {"$inc": {"jumlah_pengulangan": 1}, "$set": {"pengulangan_terakhir": waktu}}
+            )
+            return result.modified_count > 0
+        except Exception as e:
+            logger.error(f"Error catat pengulangan submisi: {str(e)}")
+            return False
+    
+    def iterasi_signature_submisi(
+        self,
+        sejak: datetime,
+        batch_size: int = 2000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream signature MinHash submisi yang dibuat setelah `sejak` (urut waktu naik)"""
+        cursor = self.submisi_error.find(
+            {"created_at": {"$gt": sejak}, "minhash": {"$exists": True}},
+            {"id_mahasiswa": 1, "tipe_error": 1, "minhash": 1, "created_at": 1}
+        ).sort("created_at", 1).batch_size(batch_size)
+        try:
+            for dokumen in cursor:
+                yield dokumen
+        except Exception as e:
+            logger.error(f"Error iterasi signature submisi: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+    
+    def iterasi_submisi_tanpa_minhash(self, batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Stream submisi lama yang belum punya signature MinHash, per batch (untuk backfill)"""
+        cursor = self.submisi_error.find(
+            {"minhash": {"$exists": False}},
+            {"kode": 1, "pesan_error": 1, "bahasa": 1}
+        ).batch_size(batch_size)
+        batch: List[Dict[str, Any]] = []
+        try:
+            for dokumen in cursor:
+                batch.append(dekompres_dokumen(dokumen))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            cursor.close()
+    
+    def simpan_minhash_bulk(self, entri: List[Tuple[Any, bytes]]) -> int:
+        """Simpan signature MinHash beberapa submisi (list (id_submisi, signature bytes))"""
+        if not entri:
+            return 0
+        try:
+            self.submisi_error.bulk_write(
+                [UpdateOne({"_id": id_submisi}, {"$set": {"minhash": sig}}) for id_submisi, sig in entri],
+                ordered=False
+            )
+            return len(entri)
+        except Exception as e:
+            logger.error(f"Error simpan minhash bulk: {str(e)}")
+            raise
+    
+    def iterasi_teks_submisi(self, terkompresi: bool, batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream field teks mentah submisi per batch untuk migrasi kompresi (tanpa dekompres)
+        
+        terkompresi=False: submisi yang masih punya field teks berupa string
+        terkompresi=True: submisi yang punya field Binary (untuk dikembalikan ke string)
+        """
+        tipe = "binData" if terkompresi else "string"
+        proyeksi = {nama: 1 for nama in FIELD_SUBMISI}
+        cursor = self.submisi_error.find(
+            {"$or": [{nama: {"$type": tipe}} for nama in FIELD_SUBMISI]},
+            proyeksi
+        ).sort("_id", 1).batch_size(batch_size)
+        batch: List[Dict[str, Any]] = []
+        try:
+            for dokumen in cursor:
+                batch.append(dokumen)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            cursor.close()
+    
+    def simpan_teks_submisi_bulk(self, entri: List[Tuple[Any, Dict[str, Any]]]) -> int:
+        """Tulis ulang field teks beberapa submisi (list (id_submisi, {field: nilai}))"""
+        if not entri:
+            return 0
+        try:
+            result = self.submisi_error.bulk_write(
+                [UpdateOne({"_id": id_submisi}, {"$set": nilai}) for id_submisi, nilai in entri],
+                ordered=False
+            )
+            return result.modified_count
+        except Exception as e:
+            logger.error(f"Error simpan teks submisi bulk: {str(e)}")
+            raise
+    
     
     # ==================== PATTERN OPERATIONS ====================
     
@@ -231,11 +559,13 @@ class DatabaseQueries:
             logger.error(f"Error update pola: {str(e)}")
             raise
     
-    def ambil_pola_mahasiswa(self, id_mahasiswa: str) -> List[Dict[str, Any]]:
-        """Ambil semua pola error mahasiswa (sorted by frekuensi)"""
+    def ambil_pola_mahasiswa(self, id_mahasiswa: str, tampilan: str = "detail") -> List[Dict[str, Any]]:
+        """Ambil semua pola error mahasiswa (sorted by frekuensi), proyeksi sesuai PROYEKSI_POLA"""
+        proyeksi = _proyeksi_tampilan(PROYEKSI_POLA, tampilan)
         try:
             cursor = self.pola_error.find(
-                {"id_mahasiswa": ObjectId(id_mahasiswa)}
+                {"id_mahasiswa": ObjectId(id_mahasiswa)},
+                proyeksi
             ).sort("frekuensi", -1)
             return list(cursor)
         except Exception as e:
@@ -279,41 +609,6 @@ class DatabaseQueries:
     
     # ==================== PROGRESS OPERATIONS ====================
     
-    def buat_atau_update_progress(
-        self,
-        id_mahasiswa: str,
-        topik: str,
-        tingkat_penguasaan: Optional[int] = None
-    ) -> None:
-        """Update progress belajar mahasiswa untuk topik tertentu"""
-        try:
-            update_fields: Dict[str, Any] = {
-                "updated_at": datetime.now(),
-                "tanggal_error_terakhir": datetime.now()
-            }
-            
-            if tingkat_penguasaan is not None:
-                update_fields["tingkat_penguasaan"] = tingkat_penguasaan
-            
-            self.progress_belajar.update_one(
-                {
-                    "id_mahasiswa": ObjectId(id_mahasiswa),
-                    "topik": topik
-                },
-                {
-                    "$set": update_fields,
-                    "$inc": {"jumlah_error_di_topik": 1},
-                    "$setOnInsert": {
-                        "created_at": datetime.now()
-                    }
-                },
-                upsert=True
-            )
-            logger.info(f"Progress updated untuk topik: {topik}")
-        except Exception as e:
-            logger.error(f"Error update progress: {str(e)}")
-            raise
-    
     def ambil_progress_mahasiswa(self, id_mahasiswa: str) -> List[Dict[str, Any]]:
         """Ambil semua progress belajar mahasiswa"""
         try:
@@ -341,6 +636,199 @@ class DatabaseQueries:
             logger.error(f"Error hitung rata-rata penguasaan: {str(e)}")
             return 0.0
     
+    def ambil_progress_topik(self, id_mahasiswa: str, topik_list: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Ambil progress beberapa topik sekaligus (state model penguasaan), key = topik"""
+        try:
+            cursor = self.progress_belajar.find(
+                {"id_mahasiswa": ObjectId(id_mahasiswa), "topik": {"$in": topik_list}},
+                {"topik": 1, "tingkat_penguasaan": 1, "jumlah_error_di_topik": 1, "beban_error": 1,
+                 "beban_diperbarui": 1}
+            )
+            return {dokumen["topik"]: dokumen for dokumen in cursor}
+        except Exception as e:
+            logger.error(f"Error ambil progress topik: {str(e)}")
+            return {}
+    
+    def catat_error_progress_bulk(
+        self,
+        id_mahasiswa: str,
+        topik_list: List[str],
+        pipeline: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Catat satu error untuk beberapa topik dalam satu bulk_write (model penguasaan)
+        
+        Args:
+            pipeline: Update pipeline per topik (penguasaan_service.pipeline_tambah_error); beban
+                dihitung dari state dokumen saat update, aman untuk submisi bersamaan
+        """
+        if not topik_list:
+            return
+        try:
+            operasi = [
+                UpdateOne({"id_mahasiswa": ObjectId(id_mahasiswa), "topik": topik}, pipeline, upsert=True)
+                for topik in topik_list
+            ]
+            self.progress_belajar.bulk_write(operasi, ordered=False)
+            logger.info(f"Progress updated untuk {len(topik_list)} topik")
+        except Exception as e:
+            logger.error(f"Error catat error progress: {str(e)}")
+            raise
+    
+    def simpan_penguasaan_bulk(self, state: Dict[Tuple[str, str], Dict[str, Any]]) -> int:
+        """
+        Tulis hasil recompute penguasaan (key (id_mahasiswa, topik)) ke progress_belajar
+        
+        Returns:
+            Jumlah operasi yang ditulis
+        """
+        if not state:
+            return 0
+        sekarang = datetime.now()
+        operasi = [
+            UpdateOne(
+                {"id_mahasiswa": ObjectId(id_mahasiswa), "topik": topik},
+                {
+                    "$set": {
+                        "tingkat_penguasaan": nilai["tingkat_penguasaan"],
+                        "beban_error": nilai["beban_error"],
+                        "beban_diperbarui": nilai["beban_diperbarui"],
+                        "jumlah_error_di_topik": nilai["jumlah_error_di_topik"],
+                        "tanggal_error_terakhir": nilai["tanggal_error_terakhir"],
+                        "updated_at": sekarang
+                    },
+                    "$setOnInsert": {"created_at": nilai["beban_diperbarui"]}
+                },
+                upsert=True
+            )
+            for (id_mahasiswa, topik), nilai in state.items()
+        ]
+        try:
+            self.progress_belajar.bulk_write(operasi, ordered=False)
+            return len(operasi)
+        except Exception as e:
+            logger.error(f"Error simpan penguasaan bulk: {str(e)}")
+            raise
+    
+    def iterasi_batch_progress(self, batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Stream semua progress belajar per batch (untuk snapshot periodik)"""
+        proyeksi = {
+            "id_mahasiswa": 1, "topik": 1, "tingkat_penguasaan": 1, "jumlah_error_di_topik": 1,
+            "beban_error": 1, "beban_diperbarui": 1
+        }
+        cursor = self.progress_belajar.find({}, proyeksi).sort("_id", 1).batch_size(batch_size)
+        batch: List[Dict[str, Any]] = []
+        try:
+            for dokumen in cursor:
+                batch.append(dokumen)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        except Exception as e:
+            logger.error(f"Error iterasi progress: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+    
+    def simpan_tren_progress_bulk(self, entri: List[Dict[str, Any]]) -> int:
+        """
+        Simpan tren_perbaikan & penguasaan_delta hasil snapshot ke progress_belajar
+        
+        Args:
+            entri: List dict {id_mahasiswa, topik, tren_perbaikan, penguasaan_delta} dan
+                opsional tingkat_penguasaan (skor yang sudah diluruhkan ke waktu snapshot)
+        
+        Returns:
+            Jumlah dokumen yang berubah
+        """
+        if not entri:
+            return 0
+        try:
+            operasi = [
+                UpdateOne(
+                    {"id_mahasiswa": ObjectId(item["id_mahasiswa"]), "topik": item["topik"]},
+                    {"$set": {
+                        field: item[field]
+                        for field in ("tren_perbaikan", "penguasaan_delta", "tingkat_penguasaan")
+                        if field in item
+                    }}
+                )
+                for item in entri
+            ]
+            return self.progress_belajar.bulk_write(operasi, ordered=False).modified_count
+        except Exception as e:
+            logger.error(f"Error simpan tren progress: {str(e)}")
+            raise
+    
+    
+    # ==================== MASTERY SNAPSHOT OPERATIONS ====================
+    
+    def ambil_snapshot_batch(
+        self,
+        id_mahasiswa_list: List[Any],
+        topik_list: List[str],
+        jumlah_titik: int
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Ambil snapshot (hanya N titik terakhir) untuk sekumpulan pasangan mahasiswa-topik
+        
+        Returns:
+            Dict (id_mahasiswa str, topik) → dokumen snapshot
+        """
+        try:
+            cursor = self.snapshot_penguasaan.find(
+                {
+                    "id_mahasiswa": {"$in": [ObjectId(str(id_mhs)) for id_mhs in id_mahasiswa_list]},
+                    "topik": {"$in": topik_list}
+                },
+                {"id_mahasiswa": 1, "topik": 1, "bucket_terakhir": 1, "titik": {"$slice": -jumlah_titik}}
+            )
+            return {(str(dokumen["id_mahasiswa"]), dokumen["topik"]): dokumen for dokumen in cursor}
+        except Exception as e:
+            logger.error(f"Error ambil snapshot batch: {str(e)}")
+            return {}
+    
+    def simpan_snapshot_bulk(self, entri: List[Dict[str, Any]], maks_titik: int) -> int:
+        """
+        Tulis titik snapshot untuk banyak pasangan sekaligus (snapshot periodik)
+        
+        Args:
+            entri: List dict {id_mahasiswa, topik, titik, ganti_bucket}; ganti_bucket=True
+                jika bucket titik sudah ada (nilai diganti), False jika titik baru di-append
+            maks_titik: Batas panjang array titik
+        
+        Returns:
+            Jumlah operasi yang ditulis
+        """
+        if not entri:
+            return 0
+        sekarang = datetime.now()
+        operasi = []
+        for item in entri:
+            filter_pasangan = {"id_mahasiswa": ObjectId(str(item["id_mahasiswa"])), "topik": item["topik"]}
+            if item["ganti_bucket"]:
+                operasi.append(UpdateOne(
+                    {**filter_pasangan, "titik.b": item["titik"]["b"]},
+                    {"$set": {"titik.$": item["titik"], "updated_at": sekarang}}
+                ))
+            else:
+                operasi.append(UpdateOne(
+                    filter_pasangan,
+                    {
+                        "$push": {"titik": {"$each": [item["titik"]], "$slice": -maks_titik}},
+                        "$set": {"bucket_terakhir": item["titik"]["b"], "updated_at": sekarang}
+                    },
+                    upsert=True
+                ))
+        try:
+            self.snapshot_penguasaan.bulk_write(operasi, ordered=False)
+            return len(operasi)
+        except Exception as e:
+            logger.error(f"Error simpan snapshot bulk: {str(e)}")
+            raise
+    
     
     # ==================== AI METRICS OPERATIONS ====================
     
@@ -353,50 +841,38 @@ class DatabaseQueries:
             logger.error(f"Error simpan metrik AI: {str(e)}")
             raise
     
+    def total_token_llm_sejak(self, sejak: datetime) -> int:
+        """Total token panggilan LLM (sumber llm) sejak waktu tertentu - untuk kuota harian"""
+        try:
+            pipeline = [
+                {"$match": {"created_at": {"$gte": sejak}, "sumber": {"$in": ["llm", None]}}},
+                {"$group": {"_id": None, "total": {"$sum": "$total_token"}}}
+            ]
+            hasil = list(self.metrik_ai.aggregate(pipeline))
+            return int(hasil[0]["total"]) if hasil else 0
+        except Exception as e:
+            logger.error(f"Error total token LLM: {str(e)}")
+            raise
+    
     def ambil_statistik_ai(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> Dict[str, Any]:
-        """Ambil statistik AI usage - Admin monitoring"""
-        try:
-            query: Dict[str, Any] = {}
-            if start_date or end_date:
-                query["created_at"] = {}
-                if start_date:
-                    query["created_at"]["$gte"] = start_date
-                if end_date:
-                    query["created_at"]["$lte"] = end_date
-            
-            pipeline = [
-                {"$match": query},
-                {
-                    "$group": {
-                        "_id": None,
-                        "total_request": {"$sum": 1},
-                        "total_token": {"$sum": "$total_token"},
-                        "total_biaya": {"$sum": "$biaya"},
-                        "rata_rata_waktu_respons": {"$avg": "$waktu_respons"},
-                        "sukses_count": {
-                            "$sum": {"$cond": ["$status_berhasil", 1, 0]}
-                        }
-                    }
-                }
-            ]
+        """Ambil statistik AI usage - Admin monitoring (metrik mentah + rollup harian)"""
+        try:
+            per_sumber = self._statistik_metrik("ai", start_date, end_date, per_dimensi=True)
+            # Statistik utama = panggilan LLM; analisis lokal & duplikat dihitung sebagai offload
+            stats = dict(per_sumber.get("llm") or {nama: 0 for nama in AKUMULATOR_METRIK["ai"]})
+            total_waktu = stats.pop("total_waktu_respons")
+            stats["rata_rata_waktu_respons"] = (total_waktu / stats["total_request"]) if stats["total_request"] > 0 else 0.0
+            stats["success_rate"] = (stats["sukses_count"] / stats["total_request"] * 100) if stats["total_request"] > 0 else 0.0
             
-            result = list(self.metrik_ai.aggregate(pipeline))
-            if result:
-                stats = result[0]
-                stats["success_rate"] = (stats["sukses_count"] / stats["total_request"] * 100) if stats["total_request"] > 0 else 0
-                return stats
-            else:
-                return {
-                    "total_request": 0,
-                    "total_token": 0,
-                    "total_biaya": 0.0,
-                    "rata_rata_waktu_respons": 0.0,
-                    "success_rate": 0.0
-                }
+            total_semua = sum(hasil["total_request"] for hasil in per_sumber.values())
+            stats["total_offload"] = total_semua - stats["total_request"]
+            stats["offload_rate"] = (stats["total_offload"] / total_semua * 100) if total_semua > 0 else 0.0
+            stats["per_sumber"] = {sumber: hasil["total_request"] for sumber, hasil in per_sumber.items()}
+            return stats
         except Exception as e:
             logger.error(f"Error ambil statistik AI: {str(e)}")
             return {}
@@ -543,11 +1019,11 @@ class DatabaseQueries:
             logger.error(f"Error daftar topik: {str(e)}")
             return []
     
-    def increment_error_count_topik(self, nama_topik: str) -> None:
-        """Increment error count untuk topik (untuk tracking kesulitan)"""
+    def increment_error_count_topik_bulk(self, nama_topik_list: List[str]) -> None:
+        """Increment error count beberapa topik sekaligus (satu update_many)"""
         try:
-            self.topik_pembelajaran.update_one(
-                {"nama": nama_topik},
+            self.topik_pembelajaran.update_many(
+                {"nama": {"$in": nama_topik_list}},
                 {"$inc": {"total_error": 1}}
             )
         except Exception as e:
@@ -626,6 +1102,157 @@ class DatabaseQueries:
             return []
     
     
+    # ==================== BULK EXPORT OPERATIONS ====================
+    
+    def ambil_id_mahasiswa_kohort(
+        self,
+        filter_tingkat: Optional[str] = None,
+        filter_status: Optional[str] = None
+    ) -> List[ObjectId]:
+        """Ambil _id mahasiswa dalam satu kohort (filter tingkat / status) - Admin export"""
+        try:
+            query = self._query_mahasiswa(filter_status, filter_tingkat)
+            return [doc["_id"] for doc in self.users.find(query, {"_id": 1})]
+        except Exception as e:
+            logger.error(f"Error ambil kohort mahasiswa: {str(e)}")
+            return []
+    
+    def iterasi_submisi_mahasiswa_kohort(
+        self,
+        id_mahasiswa_list: List[ObjectId],
+        batch_size: int = 1000,
+        termasuk_arsip: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream submisi (id_mahasiswa, topik_terkait, created_at) sekumpulan mahasiswa, urut waktu naik
+
+        termasuk_arsip: lanjutkan dengan submisi_error_arsip (urut waktu per collection, bukan gabungan)
+        """
+        nama_koleksi = ["submisi_error"] + (["submisi_error_arsip"] if termasuk_arsip else [])
+        for nama in nama_koleksi:
+            cursor = self._koleksi_export(nama).find(
+                {"id_mahasiswa": {"$in": id_mahasiswa_list}},
+                {"_id": 0, "id_mahasiswa": 1, "topik_terkait": 1, "created_at": 1}
+            ).sort("created_at", 1).batch_size(batch_size)
+            try:
+                for dokumen in cursor:
+                    yield dokumen
+            except Exception as e:
+                logger.error(f"Error iterasi submisi kohort ({nama}): {str(e)}")
+                raise
+            finally:
+                cursor.close()
+    
+    def _koleksi_export(self, nama_koleksi: str) -> Collection:
+        """Collection untuk bulk export: baca dari secondary jika ada, supaya primary tetap untuk app"""
+        return self.db.get_collection(
+            nama_koleksi,
+            read_preference=ReadPreference.SECONDARY_PREFERRED
+        )
+    
+    def hitung_dokumen_export(self, nama_koleksi: str, query: Dict[str, Any]) -> int:
+        """Hitung jumlah dokumen yang akan diekspor (untuk progress)"""
+        try:
+            return self._koleksi_export(nama_koleksi).count_documents(query)
+        except Exception as e:
+            logger.error(f"Error hitung dokumen export {nama_koleksi}: {str(e)}")
+            return 0
+    
+    def iterasi_batch_export(
+        self,
+        nama_koleksi: str,
+        query: Dict[str, Any],
+        proyeksi: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream dokumen collection per batch (list berukuran maksimal batch_size)
+        
+        Urut _id supaya deterministik; error di tengah stream dilempar ulang.
+        """
+        cursor = self._koleksi_export(nama_koleksi).find(query, proyeksi).sort("_id", 1).batch_size(batch_size)
+        dekompres = nama_koleksi == "submisi_error"
+        batch: List[Dict[str, Any]] = []
+        try:
+            for dokumen in cursor:
+                batch.append(dekompres_dokumen(dokumen) if dekompres else dokumen)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        except Exception as e:
+            logger.error(f"Error iterasi export {nama_koleksi}: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+    
+    
+    # ==================== CATALOGUE VERSION OPERATIONS ====================
+    
+    def ambil_versi_katalog(self) -> Optional[int]:
+        """Ambil versi katalog (topik, sumber daya, exercises) - None jika gagal dibaca"""
+        try:
+            doc = self.meta_aplikasi.find_one({"_id": "versi_katalog"}, {"versi": 1})
+            return int(doc["versi"]) if doc else 0
+        except Exception as e:
+            logger.error(f"Error ambil versi katalog: {str(e)}")
+            return None
+    
+    def naikkan_versi_katalog(self) -> Optional[int]:
+        """Naikkan versi katalog setelah konten berubah (dipanggil oleh admin CRUD)"""
+        try:
+            doc = self.meta_aplikasi.find_one_and_update(
+                {"_id": "versi_katalog"},
+                {
+                    "$inc": {"versi": 1},
+                    "$set": {"updated_at": datetime.now()}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return int(doc["versi"]) if doc else None
+        except Exception as e:
+            logger.error(f"Error naikkan versi katalog: {str(e)}")
+            return None
+    
+    
+    # ==================== CHANGE FEED OPERATIONS ====================
+    
+    def _koleksi_feed(self, nama_koleksi: str) -> Collection:
+        """Collection yang insert-nya dipantau lewat polling (fallback change stream)"""
+        if nama_koleksi not in ("submisi_error", "users"):
+            raise ValueError(f"Collection tidak dipantau: {nama_koleksi}")
+        return self.db[nama_koleksi]
+    
+    def id_dokumen_terbaru(self, nama_koleksi: str) -> Optional[ObjectId]:
+        """_id terbesar di collection (titik awal polling), None jika kosong"""
+        try:
+            dokumen = self._koleksi_feed(nama_koleksi).find_one({}, {"_id": 1}, sort=[("_id", DESCENDING)])
+            return dokumen["_id"] if dokumen else None
+        except Exception as e:
+            logger.error(f"Error id dokumen terbaru {nama_koleksi}: {str(e)}")
+            raise
+    
+    def ambil_dokumen_setelah(
+        self,
+        nama_koleksi: str,
+        id_terakhir: Optional[ObjectId],
+        field: Tuple[str, ...],
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Dokumen baru dengan _id > id_terakhir (urut _id), hanya field yang diminta"""
+        try:
+            query = {"_id": {"$gt": id_terakhir}} if id_terakhir is not None else {}
+            cursor = self._koleksi_feed(nama_koleksi).find(
+                query, {nama: 1 for nama in field}
+            ).sort("_id", ASCENDING).limit(limit)
+            return list(cursor)
+        except Exception as e:
+            logger.error(f"Error ambil dokumen setelah {id_terakhir} ({nama_koleksi}): {str(e)}")
+            raise
+    
+    
     # ==================== API METRICS OPERATIONS ====================
     
     def simpan_metrik_api(self, metrik: Dict[str, Any]) -> ObjectId:
@@ -642,36 +1269,12 @@ class DatabaseQueries:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> Dict[str, Any]:
-        """Ambil statistik API performance - Admin monitoring"""
-        try:
-            query: Dict[str, Any] = {}
-            if start_date or end_date:
-                query["created_at"] = {}
-                if start_date:
-                    query["created_at"]["$gte"] = start_date
-                if end_date:
-                    query["created_at"]["$lte"] = end_date
-            
-            pipeline = [
-                {"$match": query},
-                {
-                    "$group": {
-                        "_id": None,
-                        "total_request": {"$sum": 1},
-                        "rata_rata_waktu": {"$avg": "$waktu_respons"},
-                        "request_berhasil": {
-                            "$sum": {"$cond": [{"$lt": ["$status_code", 400]}, 1, 0]}
-                        },
-                        "request_error": {
-                            "$sum": {"$cond": [{"$gte": ["$status_code", 400]}, 1, 0]}
-                        }
-                    }
-                }
-            ]
-            
-            result = list(self.metrik_api.aggregate(pipeline))
-            if result:
-                stats = result[0]
+        """Ambil statistik API performance - Admin monitoring (metrik mentah + rollup harian)"""
+        try:
+            result = self._statistik_metrik("api", start_date, end_date, per_dimensi=False)
+            if result.get(None, {}).get("total_request"):
+                stats = result[None]
+                stats["rata_rata_waktu"] = stats.pop("total_waktu") / stats["total_request"]
                 stats["success_rate"] = (stats["request_berhasil"] / stats["total_request"] * 100) if stats["total_request"] > 0 else 0
                 return stats
             else:
@@ -685,6 +1288,275 @@ class DatabaseQueries:
             return {}
     
     
+    # ==================== RETENTION & ARCHIVE OPERATIONS ====================
+    
+    def _koleksi_metrik(self, jenis: str) -> Collection:
+        """Collection metrik mentah per jenis (ai → metrik_ai, api → metrik_api)"""
+        if jenis not in AKUMULATOR_METRIK:
+            raise ValueError(f"Jenis metrik tidak dikenal: {jenis} (pilihan: {', '.join(AKUMULATOR_METRIK)})")
+        return self.metrik_ai if jenis == "ai" else self.metrik_api
+    
+    def ambil_meta_retensi(self, jenis: str) -> Dict[str, Any]:
+        """State retensi metrik (rollup_sampai, batas_mentah) dari meta_aplikasi, {} jika belum pernah jalan"""
+        try:
+            return self.meta_aplikasi.find_one({"_id": f"retensi_metrik_{jenis}"}) or {}
+        except Exception as e:
+            logger.error(f"Error ambil meta retensi {jenis}: {str(e)}")
+            return {}
+    
+    def simpan_meta_retensi(self, jenis: str, data: Dict[str, Any]) -> None:
+        """Simpan state retensi metrik (dipanggil setelah rollup tersimpan, sebelum data mentah dihapus)"""
+        try:
+            self.meta_aplikasi.update_one(
+                {"_id": f"retensi_metrik_{jenis}"},
+                {"$set": {**data, "updated_at": datetime.now()}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error simpan meta retensi {jenis}: {str(e)}")
+            raise
+    
+    def _statistik_metrik(
+        self,
+        jenis: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        per_dimensi: bool
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Jumlah akumulator metrik (AKUMULATOR_METRIK) dari data mentah + rollup harian
+        
+        Data mentah dipakai sejak batas_mentah (meta retensi), hari sebelumnya hanya tersisa
+        sebagai rollup di metrik_harian (berbutir harian: start_date dibulatkan ke awal hari).
+        
+        Returns:
+            Dict dimensi (sumber / endpoint, atau None jika per_dimensi=False) → jumlah per akumulator
+        """
+        nama_dimensi, ekspresi = DIMENSI_METRIK[jenis]
+        akumulator = AKUMULATOR_METRIK[jenis]
+        batas_mentah: Optional[datetime] = self.ambil_meta_retensi(jenis).get("batas_mentah")
+        hasil: Dict[Any, Dict[str, Any]] = {}
+        
+        def tambahkan(baris: Dict[str, Any]) -> None:
+            total = hasil.setdefault(baris["_id"], {nama: 0 for nama in akumulator})
+            for nama in akumulator:
+                total[nama] += baris.get(nama) or 0
+        
+        rentang: Dict[str, datetime] = {}
+        mulai_mentah = max(start_date, batas_mentah) if start_date and batas_mentah else (start_date or batas_mentah)
+        if mulai_mentah:
+            rentang["$gte"] = mulai_mentah
+        if end_date:
+            rentang["$lte"] = end_date
+        pipeline = [
+            {"$match": {"created_at": rentang} if rentang else {}},
+            {"$group": {"_id": ekspresi if per_dimensi else None, **akumulator}}
+        ]
+        for baris in self._koleksi_metrik(jenis).aggregate(pipeline):
+            tambahkan(baris)
+        
+        if batas_mentah and (start_date is None or start_date < batas_mentah):
+            rentang_hari: Dict[str, datetime] = {"$lt": batas_mentah}
+            if start_date:
+                rentang_hari["$gte"] = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+            if end_date:
+                rentang_hari["$lte"] = end_date
+            pipeline = [
+                {"$match": {"jenis": jenis, "tanggal": rentang_hari}},
+                {"$group": {
+                    "_id": f"${nama_dimensi}" if per_dimensi else None,
+                    **{nama: {"$sum": f"${nama}"} for nama in akumulator}
+                }}
+            ]
+            for baris in self.metrik_harian.aggregate(pipeline):
+                tambahkan(baris)
+        return hasil
+    
+    def agregasi_metrik_harian(self, jenis: str, sejak: datetime, sampai: datetime) -> List[Dict[str, Any]]:
+        """
+        Rollup metrik mentah per hari & dimensi untuk rentang [sejak, sampai)
+        
+        Returns:
+            List dokumen metrik_harian (_id deterministik "jenis:YYYY-MM-DD:dimensi" → aman diulang)
+        """
+        nama_dimensi, ekspresi = DIMENSI_METRIK[jenis]
+        pipeline = [
+            {"$match": {"created_at": {"$gte": sejak, "$lt": sampai}}},
+            {"$group": {
+                "_id": {"hari": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}}, "dimensi": ekspresi},
+                **AKUMULATOR_METRIK[jenis]
+            }}
+        ]
+        try:
+            entri = []
+            for baris in self._koleksi_metrik(jenis).aggregate(pipeline):
+                kunci = baris.pop("_id")
+                entri.append({
+                    "_id": f"{jenis}:{kunci['hari']}:{kunci['dimensi']}",
+                    "jenis": jenis,
+                    "tanggal": datetime.strptime(kunci["hari"], "%Y-%m-%d"),
+                    nama_dimensi: kunci["dimensi"],
+                    **baris
+                })
+            return entri
+        except Exception as e:
+            logger.error(f"Error agregasi metrik harian {jenis}: {str(e)}")
+            raise
+    
+    def simpan_metrik_harian_bulk(self, entri: List[Dict[str, Any]]) -> int:
+        """Upsert rollup harian (dokumen hari yang sama diganti, bukan ditambah)"""
+        if not entri:
+            return 0
+        sekarang = datetime.now()
+        operasi = [ReplaceOne({"_id": item["_id"]}, {**item, "updated_at": sekarang}, upsert=True) for item in entri]
+        try:
+            self.metrik_harian.bulk_write(operasi, ordered=False)
+            return len(operasi)
+        except Exception as e:
+            logger.error(f"Error simpan metrik harian bulk: {str(e)}")
+            raise
+    
+    def waktu_metrik_tertua(self, jenis: str) -> Optional[datetime]:
+        """created_at metrik mentah paling lama (None jika collection kosong)"""
+        try:
+            dokumen = self._koleksi_metrik(jenis).find_one({}, {"created_at": 1}, sort=[("created_at", ASCENDING)])
+            return dokumen.get("created_at") if dokumen else None
+        except Exception as e:
+            logger.error(f"Error waktu metrik tertua {jenis}: {str(e)}")
+            raise
+    
+    def hapus_metrik_sebelum(self, jenis: str, batas: datetime) -> int:
+        """Hapus metrik mentah dengan created_at < batas (sudah tercakup rollup harian)"""
+        try:
+            return self._koleksi_metrik(jenis).delete_many({"created_at": {"$lt": batas}}).deleted_count
+        except Exception as e:
+            logger.error(f"Error hapus metrik {jenis}: {str(e)}")
+            raise
+    
+    def pasang_ttl_metrik(self, jenis: str, detik: int) -> str:
+        """
+        Pasang TTL index pada metrik mentah supaya server menghapus dokumen lama sendiri
+        
+        MongoDB: index created_at_-1 (init_database) diganti versi TTL. Cosmos DB hanya
+        mendukung TTL di `_ts` (waktu tulis terakhir = waktu insert untuk metrik).
+        
+        Returns:
+            Field TTL ("created_at" / "_ts"), atau "" jika TTL tidak didukung
+            (penghapusan tetap lewat hapus_metrik_sebelum)
+        """
+        koleksi = self._koleksi_metrik(jenis)
+        for field, arah in (("created_at", DESCENDING), ("_ts", ASCENDING)):
+            nama = f"{field}_{arah}"
+            index = koleksi.index_information().get(nama)
+            if index and index.get("expireAfterSeconds") == detik:
+                return field
+            try:
+                if index:
+                    koleksi.drop_index(nama)
+                koleksi.create_index([(field, arah)], name=nama, expireAfterSeconds=detik, background=True)
+                logger.info(f"TTL metrik {jenis}: {field} {detik} detik")
+                return field
+            except OperationFailure as e:
+                logger.warning(f"TTL {field} metrik {jenis} tidak didukung: {str(e)}")
+                if index:
+                    # Kembalikan index biasa yang sempat di-drop
+                    koleksi.create_index([(field, arah)], name=nama, background=True)
+        return ""
+    
+    def ringkasan_submisi_sebelum(self, batas: datetime) -> Dict[str, int]:
+        """Jumlah submisi dengan created_at < batas per mahasiswa (kandidat arsip)"""
+        try:
+            pipeline = [
+                {"$match": {"created_at": {"$lt": batas}}},
+                {"$group": {"_id": "$id_mahasiswa", "jumlah": {"$sum": 1}}}
+            ]
+            return {str(hasil["_id"]): hasil["jumlah"] for hasil in self.submisi_error.aggregate(pipeline)}
+        except Exception as e:
+            logger.error(f"Error ringkasan submisi sebelum {batas}: {str(e)}")
+            raise
+    
+    def ambil_submisi_sebelum(self, id_mahasiswa: str, batas: datetime, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Batch submisi tertua (created_at < batas) satu mahasiswa, urut (created_at, _id)
+        
+        Dokumen dikembalikan apa adanya (field teks tetap terkompresi) untuk dipindah ke arsip.
+        """
+        try:
+            cursor = self.submisi_error.find(
+                {"id_mahasiswa": ObjectId(id_mahasiswa), "created_at": {"$lt": batas}}
+            ).sort([("created_at", ASCENDING), ("_id", ASCENDING)]).limit(limit)
+            return list(cursor)
+        except Exception as e:
+            logger.error(f"Error ambil submisi sebelum {batas}: {str(e)}")
+            raise
+    
+    def simpan_arsip_submisi_bulk(self, dokumen: List[Dict[str, Any]]) -> int:
+        """Salin submisi ke submisi_error_arsip (upsert per _id, aman diulang)"""
+        if not dokumen:
+            return 0
+        sekarang = datetime.now()
+        operasi = [ReplaceOne({"_id": item["_id"]}, {**item, "diarsipkan_at": sekarang}, upsert=True) for item in dokumen]
+        try:
+            self.submisi_error_arsip.bulk_write(operasi, ordered=False)
+            return len(operasi)
+        except Exception as e:
+            logger.error(f"Error simpan arsip submisi bulk: {str(e)}")
+            raise
+    
+    def hapus_submisi_by_ids(self, id_submisi_list: List[Any]) -> int:
+        """Hapus submisi dari collection utama (setelah tersalin ke arsip)"""
+        if not id_submisi_list:
+            return 0
+        try:
+            return self.submisi_error.delete_many({"_id": {"$in": id_submisi_list}}).deleted_count
+        except Exception as e:
+            logger.error(f"Error hapus submisi by ids: {str(e)}")
+            raise
+    
+    def ambil_ringkasan_arsip(self, id_mahasiswa: str) -> Optional[Dict[str, Any]]:
+        """Ringkasan submisi yang sudah diarsipkan (total, per_tipe, rentang waktu) satu mahasiswa"""
+        try:
+            return self.ringkasan_arsip_mahasiswa.find_one({"_id": ObjectId(id_mahasiswa)})
+        except Exception as e:
+            logger.error(f"Error ambil ringkasan arsip: {str(e)}")
+            return None
+    
+    def tambah_ringkasan_arsip(
+        self,
+        id_mahasiswa: str,
+        dokumen: List[Dict[str, Any]],
+        kursor: Dict[str, Any]
+    ) -> None:
+        """
+        Tambahkan batch submisi yang diarsipkan ke ringkasan mahasiswa
+        
+        Args:
+            dokumen: Submisi yang belum pernah dihitung (created_at, _id setelah kursor lama)
+            kursor: {"created_at", "_id"} submisi terakhir yang dihitung, supaya batch yang
+                diulang setelah gagal hapus tidak terhitung dua kali
+        """
+        if not dokumen:
+            return
+        inc: Dict[str, int] = {"total_submisi": len(dokumen)}
+        for item in dokumen:
+            kunci = f"per_tipe.{_kunci_tipe(item.get('tipe_error') or 'Unknown')}"
+            inc[kunci] = inc.get(kunci, 0) + 1
+        try:
+            self.ringkasan_arsip_mahasiswa.update_one(
+                {"_id": ObjectId(id_mahasiswa)},
+                {
+                    "$inc": inc,
+                    "$min": {"pertama": min(item["created_at"] for item in dokumen)},
+                    "$max": {"terakhir": max(item["created_at"] for item in dokumen)},
+                    "$set": {"kursor": kursor, "updated_at": datetime.now()}
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error tambah ringkasan arsip: {str(e)}")
+            raise
+    
+    
     # ==================== ADMIN ANALYTICS QUERIES ====================
     
     def pertumbuhan_mahasiswa(self, days: int = 30) -> List[Dict[str, Any]]:
@@ -6,6 +6,8 @@ CATATAN:
 - Session-based authentication dengan st.session_state
 - Role routing: Admin → admin pages, Mahasiswa → mahasiswa pages
 - Auto-redirect based on user role
+- Lazy loading: pymongo, services & koneksi database baru dibuka saat halaman
+  login/register atau halaman setelah login dibutuhkan, bukan di landing page
 """
 
 import streamlit as st
@@ -13,8 +15,6 @@ import logging
 from datetime import datetime
 
 from config import settings
-from database.koneksi import dapatkan_database
-from database.queries import DatabaseQueries
 
 # Setup logging
 logging.basicConfig(
@@ -55,23 +55,37 @@ def inisialisasi_session_state():
     if "pengguna" not in st.session_state:
         st.session_state.pengguna = None
     
-    # Database connection
+    # UI state
+    if "page" not in st.session_state:
+        st.session_state.page = "landing"
+
+
+def pastikan_koneksi_database():
+    """
+    Buka koneksi database & DatabaseQueries di session state (sekali per session).
+    
+    Dipanggil sebelum halaman yang butuh database (login, register, dashboard),
+    sehingga landing page bisa tampil tanpa menunggu import pymongo & koneksi Cosmos DB.
+    """
     if "db" not in st.session_state:
+        from database.koneksi import dapatkan_database
+        
         try:
             st.session_state.db = dapatkan_database()
             logger.info("Database connection initialized")
+            
+            # Idempotent: sudah di-start oleh warm-up jika lewat app/startup.py
+            from services.watcher_service import mulai_watcher
+            mulai_watcher(st.session_state.db)
         except Exception as e:
             logger.error(f"Failed to connect to database: {str(e)}")
             st.error("❌ Gagal koneksi ke database. Silakan coba lagi nanti.")
             st.stop()
     
-    # Database queries instance
     if "queries" not in st.session_state:
+        from database.queries import DatabaseQueries
+        
         st.session_state.queries = DatabaseQueries(st.session_state.db)
-    
-    # UI state
-    if "page" not in st.session_state:
-        st.session_state.page = "landing"
 
 
 # ==================== LANDING PAGE (Not Authenticated) ====================
@@ -205,13 +219,16 @@ def main():
             tampilkan_landing_page()
         elif st.session_state.page == "login":
             # Import here to avoid circular import
+            pastikan_koneksi_database()
             from components.autentikasi import render_login_page
             render_login_page()
         elif st.session_state.page == "register":
+            pastikan_koneksi_database()
             from components.autentikasi import render_register_page
             render_register_page()
     else:
         # Authenticated - route based on role
+        pastikan_koneksi_database()
         role = pengguna.get("role", "mahasiswa")
         
         # Show sidebar with navigation
@@ -11,14 +11,17 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import logging
 import sys
+import time
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from components.sidebar import render_sidebar
-from services.admin_service import ambil_dashboard_statistik
+from config import settings
+from services.admin_service import ambil_dashboard_statistik_cache, ambil_feed_perubahan
 from services.autentikasi_service import require_admin
+from services.watcher_service import status_watcher
 from utils.helpers import format_number, format_percentage, format_relative_time
 
 logger = logging.getLogger(__name__)
@@ -62,9 +65,13 @@ queries = st.session_state.queries
 # Initialize stats to prevent unbound variable error
 stats = None
 
+if "dashboard_live" not in st.session_state:
+    st.session_state.dashboard_live = False
+
 with st.spinner("📊 Memuat statistik..."):
     try:
-        stats = ambil_dashboard_statistik(queries)
+        # Cache per proses, dihitung ulang saat ada submisi / registrasi baru (watcher)
+        stats = ambil_dashboard_statistik_cache(queries, paksa=st.session_state.pop("dashboard_paksa_refresh", False))
     except Exception as e:
         logger.error(f"Error loading dashboard stats: {str(e)}")
         st.error(f"❌ Error memuat statistik: {str(e)}")
@@ -76,6 +83,43 @@ if not stats:
     st.stop()
 
 
+# ==================== LIVE FEED ====================
+
+watcher = status_watcher()
+
+col_judul, col_toggle = st.columns([3, 1])
+with col_judul:
+    st.subheader("🔴 Live: Submisi & Registrasi Terbaru")
+with col_toggle:
+    st.session_state.dashboard_live = st.toggle(
+        "Live update",
+        value=st.session_state.dashboard_live,
+        disabled=not watcher["aktif"],
+        help=f"Halaman diperbarui setiap {settings.DASHBOARD_LIVE_INTERVAL_DETIK} detik; "
+             "statistik hanya dihitung ulang jika ada data baru"
+    )
+
+if watcher["aktif"]:
+    _, feed = ambil_feed_perubahan(limit=10)
+    if feed:
+        for item in feed:
+            if item["jenis"] == "submisi":
+                st.markdown(
+                    f"📝 **{item.get('tipe_error') or 'Unknown'}** ({item.get('bahasa') or '-'}, "
+                    f"{item.get('level_bloom') or '-'}) - mahasiswa `…{str(item.get('id_mahasiswa'))[-6:]}` "
+                    f"· {format_relative_time(item['waktu'])}"
+                )
+            else:
+                st.markdown(f"👤 Registrasi: **{item.get('nama') or item.get('email')}** · {format_relative_time(item['waktu'])}")
+    else:
+        st.caption("Belum ada submisi atau registrasi sejak server berjalan.")
+    st.caption(f"Sumber event: {watcher['sumber']}")
+else:
+    st.info("ℹ️ Live feed tidak tersedia: watcher perubahan database belum aktif.")
+
+st.markdown("---")
+
+
 # ==================== KEY METRICS ====================
 
 st.subheader("📈 Metrik Utama")
@@ -270,8 +314,24 @@ with col_ai:
     st.metric("Total Request", format_number(ai_stats.get("total_request", 0), 0))
     st.metric("Success Rate", f"{ai_stats.get('success_rate', 0):.1f}%")
     st.metric("Avg Response Time", f"{ai_stats.get('rata_rata_waktu_respons', 0):.2f}s")
-    st.metric("Total Tokens", format_number(ai_stats.get("total_token", 0), 0))
+    st.metric(
+        "Total Tokens",
+        format_number(ai_stats.get("total_token", 0), 0),
+        help=f"Token prompt dihemat (anggaran prompt & analisis duplikat): {format_number(ai_stats.get('token_dihemat', 0), 0)}"
+    )
     st.metric("Total Cost", f"${ai_stats.get('total_biaya', 0):.4f}")
+    st.metric(
+        "Offload (tanpa LLM)",
+        f"{ai_stats.get('offload_rate', 0):.1f}%",
+        help="Analisis dari pre-classifier lokal atau submisi hampir identik, tanpa panggilan LLM"
+    )
+    kuota = ai_stats.get("kuota_harian") or {}
+    if kuota.get("kuota"):
+        st.metric(
+            "Kuota Token Hari Ini",
+            f"{kuota.get('persen', 0):.1f}%",
+            help=f"{format_number(kuota.get('terpakai', 0), 0)} dari {format_number(kuota['kuota'], 0)} token"
+        )
 
 with col_api:
     st.subheader("⚡ API Performance (7 hari)")
@@ -289,6 +349,7 @@ st.markdown("---")
 # ==================== REFRESH BUTTON ====================
 
 if st.button("🔄 Refresh Dashboard", type="primary"):
+    st.session_state.dashboard_paksa_refresh = True
     st.rerun()
 
 
@@ -296,6 +357,14 @@ if st.button("🔄 Refresh Dashboard", type="primary"):
 
 st.markdown(f"""
 <div style='text-align: center; color: gray; margin-top: 2rem;'>
-<small>Dashboard diperbarui: {format_relative_time(datetime.now())}</small>
+<small>Statistik dihitung: {format_relative_time(stats.get("timestamp", datetime.now()))}</small>
 </div>
 """, unsafe_allow_html=True)
+
+
+# ==================== LIVE UPDATE ====================
+
+# Rerun murah: statistik dari cache, feed dari bus event in-memory
+if st.session_state.dashboard_live and watcher["aktif"]:
+    time.sleep(settings.DASHBOARD_LIVE_INTERVAL_DETIK)
+    st.rerun()
@@ -24,6 +24,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from components.sidebar import render_sidebar
 from services.admin_service import ambil_analitik_global
+from services.laporan_pdf_service import buat_pdf_kohort
+from services.analitik_service import distribusi
+from services.export_kohort_service import mulai_export_kohort, daftar_job_export, batalkan_job_export
 from services.autentikasi_service import require_admin
 from utils.helpers import format_number, format_percentage, format_datetime
 
@@ -311,19 +314,23 @@ try:
         # Statistics
         col1, col2, col3, col4 = st.columns(4)
         
-        penguasaan_values = [p["tingkat_penguasaan_avg"] for p in performance_dist]
+        stat_penguasaan = distribusi(df_perf["tingkat_penguasaan_avg"].to_numpy())
         
         with col1:
-            st.metric("Rata-rata", f"{sum(penguasaan_values) / len(penguasaan_values):.1f}%")
+            st.metric("Rata-rata", f"{stat_penguasaan['rata']:.1f}%")
         
         with col2:
-            st.metric("Median", f"{sorted(penguasaan_values)[len(penguasaan_values)//2]:.1f}%")
+            st.metric(
+                "Median",
+                f"{stat_penguasaan['median']:.1f}%",
+                help=f"P25 {stat_penguasaan['p25']:.1f}% · P75 {stat_penguasaan['p75']:.1f}% · P90 {stat_penguasaan['p90']:.1f}%"
+            )
         
         with col3:
-            st.metric("Min", f"{min(penguasaan_values):.1f}%")
+            st.metric("Min", f"{stat_penguasaan['min']:.1f}%")
         
         with col4:
-            st.metric("Max", f"{max(penguasaan_values):.1f}%")
+            st.metric("Max", f"{stat_penguasaan['max']:.1f}%")
     else:
         st.info("Tidak ada data distribusi performa.")
     
@@ -415,9 +422,126 @@ try:
             )
     
     with col2:
-        st.info("Export PDF akan tersedia di versi mendatang.")
+        if st.button("📑 Export ke PDF", use_container_width=True):
+            try:
+                with st.spinner("Generating PDF report..."):
+                    path_pdf, dari_cache = buat_pdf_kohort(analytics)
+                
+                with open(path_pdf, "rb") as file_pdf:
+                    st.download_button(
+                        label="⬇️ Download PDF",
+                        data=file_pdf,
+                        file_name=f"analytics_global_{period_type}_{datetime.now().strftime('%Y%m%d')}.pdf",
+                        mime="application/pdf",
+                        use_container_width=True
+                    )
+                if dari_cache:
+                    st.caption("Diambil dari cache (data tidak berubah)")
+            except Exception as e:
+                logger.error(f"Error generating PDF analitik: {e}")
+                st.error(f"❌ Error generating PDF: {str(e)}")
 
 
 except Exception as e:
     logger.error(f"Error loading analytics: {e}")
     st.error(f"❌ Error: {str(e)}")
+
+
+# ==================== EXPORT KOHORT (BACKGROUND JOB) ====================
+
+st.markdown("---")
+st.markdown("### 🗄️ Export Data Kohort")
+st.caption(
+    "Export mentah submisi, pola error, dan progress untuk seluruh kohort. "
+    "Berjalan di background (satu job sekaligus, dibatasi laju) sehingga aplikasi tetap responsif."
+)
+
+with st.form("form_export_kohort"):
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        koleksi_export = st.multiselect(
+            "Data",
+            options=["submisi_error", "pola_error", "progress_belajar"],
+            default=["submisi_error", "pola_error", "progress_belajar"],
+            format_func=lambda x: {
+                "submisi_error": "Submisi Error",
+                "pola_error": "Pola Error",
+                "progress_belajar": "Progress Belajar"
+            }[x]
+        )
+    
+    with col2:
+        export_tingkat = st.selectbox("Tingkat Kemahiran", options=["Semua", "pemula", "menengah", "mahir"])
+        export_status = st.selectbox("Status Mahasiswa", options=["Semua", "aktif", "suspended", "nonaktif"])
+    
+    with col3:
+        st.markdown(f"**Periode:** mengikuti selector di atas (`{period_type}`)")
+    
+    mulai_export = st.form_submit_button("🚀 Mulai Export", type="primary", use_container_width=True)
+
+if mulai_export:
+    if not koleksi_export:
+        st.warning("Pilih minimal satu jenis data.")
+    else:
+        try:
+            hari_periode = {"7_hari": 7, "30_hari": 30, "90_hari": 90}.get(str(period_type))
+            job = mulai_export_kohort(
+                queries,
+                koleksi_export,
+                date_from=datetime.now() - timedelta(days=hari_periode) if hari_periode else None,
+                date_to=datetime.now() if hari_periode else None,
+                filter_tingkat=None if export_tingkat == "Semua" else export_tingkat,
+                filter_status=None if export_status == "Semua" else export_status,
+                id_admin=str(st.session_state.pengguna["_id"])
+            )
+            st.success(f"✅ Job export `{job.id_job}` diantrikan (format: {job.format})")
+        except Exception as e:
+            logger.error(f"Error mulai export kohort: {e}")
+            st.error(f"❌ Error: {str(e)}")
+
+daftar_job = daftar_job_export()
+
+if daftar_job:
+    for job in daftar_job:
+        ikon_status = {
+            "antri": "⏳", "berjalan": "🔄", "selesai": "✅", "gagal": "❌", "dibatalkan": "⛔"
+        }.get(job.status, "❔")
+        
+        with st.container(border=True):
+            col1, col2 = st.columns([4, 1])
+            
+            with col1:
+                st.markdown(
+                    f"{ikon_status} **Job `{job.id_job}`** — {job.status} · "
+                    f"{', '.join(job.koleksi)} · {job.format} · dibuat {format_datetime(job.dibuat_pada)}"
+                )
+                st.progress(job.persentase / 100)
+                st.caption(
+                    f"{format_number(job.dokumen_diproses, 0)} / {format_number(job.total_dokumen, 0)} dokumen"
+                    f"{f' · sedang: {job.koleksi_aktif}' if job.koleksi_aktif else ''} · "
+                    f"{job.dokumen_per_detik:.0f} dok/detik · {job.byte_ditulis / 1024 / 1024:.2f} MB"
+                )
+                if job.error and job.status == "gagal":
+                    st.error(job.error)
+            
+            with col2:
+                if job.status in ("antri", "berjalan"):
+                    if st.button("⛔ Batalkan", key=f"batal_{job.id_job}", use_container_width=True):
+                        batalkan_job_export(job.id_job)
+                        st.rerun()
+                elif job.status == "selesai" and job.path_hasil and Path(job.path_hasil).exists():
+                    with open(job.path_hasil, "rb") as file_hasil:
+                        st.download_button(
+                            label="⬇️ Download",
+                            data=file_hasil,
+                            file_name=Path(job.path_hasil).name,
+                            mime="application/zip",
+                            key=f"unduh_{job.id_job}",
+                            use_container_width=True
+                        )
+    
+    if st.button("🔄 Refresh Status Export", use_container_width=True):
+        st.rerun()
+else:
+    st.info("Belum ada job export kohort.")
@@ -6,6 +6,7 @@ CRITICAL ADMIN FEATURE 🔴
 - Miskonsepsi yang paling sering muncul
 - Topik yang paling sulit
 - Rekomendasi kurikulum berdasarkan data
+- Klaster kesalahan identik (submisi hampir sama lintas mahasiswa)
 """
 
 import streamlit as st
@@ -23,7 +24,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from components.sidebar import render_sidebar
 from services.admin_service import ambil_pola_insights
 from services.autentikasi_service import require_admin
-from utils.helpers import format_number, get_severity_color
+from services.duplikat_service import kelompokkan_kesalahan_identik
+from utils.helpers import format_number, get_severity_color, truncate_text
 
 logger = logging.getLogger(__name__)
 
@@ -335,6 +337,35 @@ try:
     st.markdown("---")
     
     
+    # ==================== IDENTICAL MISTAKE CLUSTERS ====================
+    
+    st.markdown("### ♻️ Klaster Kesalahan Identik")
+    st.caption("Submisi dengan kode & error hampir sama (MinHash/LSH), dikelompokkan lintas mahasiswa.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        hari_klaster = st.selectbox("Periode", [7, 14, 30], format_func=lambda hari: f"{hari} hari terakhir",
+                                    key="pola_klaster_hari")
+    with col2:
+        ambang_klaster = st.slider("Kemiripan minimal", 0.6, 1.0, 0.8, 0.05, key="pola_klaster_ambang")
+    
+    klaster_identik = kelompokkan_kesalahan_identik(queries, ambang=ambang_klaster, hari=hari_klaster)
+    
+    if klaster_identik:
+        for nomor, klaster in enumerate(klaster_identik, start=1):
+            with st.expander(
+                f"#{nomor} {klaster['tipe_error']} - {klaster['jumlah_submisi']} submisi, "
+                f"{klaster['jumlah_mahasiswa']} mahasiswa"
+            ):
+                for contoh in klaster["contoh"][:1]:
+                    st.code(contoh.get("kode", ""), language="python")
+                    st.caption(truncate_text(contoh.get("pesan_error", ""), 200))
+    else:
+        st.info("Belum ada klaster kesalahan identik pada periode ini.")
+    
+    st.markdown("---")
+    
+    
     # ==================== ACTIONABLE INSIGHTS ====================
     
     st.markdown("### 💡 Actionable Insights")
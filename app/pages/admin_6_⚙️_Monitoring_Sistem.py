@@ -346,6 +346,57 @@ try:
     st.markdown("---")
     
     
+    # ==================== CHANGE WATCHER ====================
+    
+    st.markdown("### 🔔 Watcher Perubahan Database")
+    
+    watcher = health.get("watcher", {})
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric(
+            "Status",
+            "Aktif" if watcher.get("aktif") else ("Berjalan" if watcher.get("berjalan") else "Mati"),
+            help="Aktif = event mengalir; cache memakai TTL pendek jika tidak aktif"
+        )
+    
+    with col2:
+        st.metric("Mode", watcher.get("mode") or "-")
+    
+    with col3:
+        st.metric("Event Diterima", format_number(watcher.get("urutan", 0)))
+    
+    st.markdown("---")
+    
+    
+    # ==================== SHARED BACKEND ====================
+    
+    st.markdown("### 🗄️ Backend Bersama Worker")
+    
+    backend_bersama = health.get("backend_bersama", {})
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric(
+            "Status",
+            "Tersambung" if backend_bersama.get("tersambung") else "Terputus",
+            help="Kuota LLM, rate limit login, job export & cache dashboard dibagi lewat backend ini"
+        )
+    
+    with col2:
+        st.metric("Jenis", backend_bersama.get("jenis") or "-")
+    
+    with col3:
+        st.metric("Alamat", backend_bersama.get("alamat", "in-process"))
+    
+    if backend_bersama.get("jenis") == "memori":
+        st.caption("ℹ️ Backend memori hanya berlaku untuk satu proses worker; gunakan redis:// jika WORKERS > 1")
+    
+    st.markdown("---")
+    
+    
     # ==================== SYSTEM RESOURCES ====================
     
     st.markdown("### 💻 System Resources")
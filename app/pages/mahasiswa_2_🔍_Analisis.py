@@ -20,6 +20,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from components.sidebar import render_sidebar
 from services.analisis_service import proses_analisis_error, ambil_rekomendasi_belajar
+from services.kuota_service import KuotaHabisError
 from services.autentikasi_service import is_mahasiswa
 from utils.helpers import capitalize_first
 
@@ -192,6 +193,10 @@ if analyze_button:
                     # Convert SubmisiError to dict untuk UI
                     hasil = submisi.to_dict()
                     
+                    # Analisis dipakai ulang dari submisi hampir identik
+                    if submisi.diff_kode is not None:
+                        hasil["diff_kode"] = submisi.diff_kode
+                    
                     # Add pattern alert if any
                     if pattern_alert:
                         hasil["pattern_alert"] = pattern_alert
@@ -202,6 +207,8 @@ if analyze_button:
                 else:
                     st.error("❌ Analisis gagal. Silakan coba lagi.")
                 
+            except KuotaHabisError as e:
+                st.warning(f"⏳ {str(e)}")
             except Exception as e:
                 logger.error(f"Error during analysis: {e}")
                 st.error(f"❌ Error saat analisis: {str(e)}")
@@ -215,6 +222,17 @@ if st.session_state.analysis_result:
     st.markdown("---")
     st.markdown("## 📊 Hasil Analisis")
     
+    if hasil.get("duplikat_dari"):
+        st.info(
+            f"♻️ Kode ini {hasil.get('kemiripan', 0) * 100:.0f}% mirip dengan submisi sebelumnya, "
+            f"jadi analisis yang sama ditampilkan. Perhatikan bagian yang berubah di bawah."
+        )
+        if hasil.get("diff_kode"):
+            with st.expander("🔀 Perubahan dari Submisi Sebelumnya"):
+                st.code(hasil["diff_kode"], language="diff")
+        else:
+            st.caption("Tidak ada perubahan kode dibanding submisi sebelumnya.")
+    
     
     # ==================== ERROR TYPE & BLOOM LEVEL ====================
     
@@ -118,6 +118,10 @@ st.markdown("---")
 if "history_page" not in st.session_state:
     st.session_state.history_page = 0
 
+# ID submisi yang detailnya (kode & penjelasan) sudah dibuka; hanya ID yang disimpan di session
+if "riwayat_dibuka" not in st.session_state:
+    st.session_state.riwayat_dibuka = set()
+
 
 # ==================== FETCH HISTORY ====================
 
@@ -132,9 +136,9 @@ try:
         days = {"7_hari": 7, "30_hari": 30, "90_hari": 90}.get(periode, 30)
         start_date = datetime.now() - timedelta(days=days)
     
-    # Fetch from database
+    # Fetch from database (tampilan ringkasan: tanpa kode & penjelasan, dimuat saat dibuka)
     skip = st.session_state.history_page * items_per_page
-    riwayat = queries.ambil_riwayat_submisi(id_mahasiswa, limit=items_per_page, skip=skip)
+    riwayat = queries.ambil_riwayat_submisi(id_mahasiswa, limit=items_per_page, skip=skip, tampilan="ringkasan")
     
     # Apply filters
     filtered_riwayat = riwayat
@@ -168,9 +172,12 @@ try:
         st.info("Tidak ada riwayat yang cocok dengan filter.")
     else:
         for submisi in filtered_riwayat:
+            id_submisi = str(submisi["_id"])
+            dibuka = id_submisi in st.session_state.riwayat_dibuka
             with st.expander(
                 f"🔹 {submisi.get('tipe_error', 'Unknown Error')} - {submisi.get('bahasa', 'N/A').title()} "
-                f"({format_relative_time(submisi.get('created_at', datetime.now()))})"
+                f"({format_relative_time(submisi.get('created_at', datetime.now()))})",
+                expanded=dibuka
             ):
                 # Metadata
                 col1, col2, col3 = st.columns(3)
@@ -195,19 +202,36 @@ try:
                 st.markdown("#### 🧠 Kesenjangan Konsep")
                 st.warning(submisi.get("kesenjangan_konsep", "N/A"))
                 
+                # Related topics
+                if submisi.get("topik_terkait"):
+                    st.markdown("**Topik Terkait:**")
+                    st.markdown(", ".join(submisi["topik_terkait"][:5]))
+                
+                # Field berat dimuat hanya untuk item yang dibuka
+                if not dibuka:
+                    if st.button("📖 Tampilkan kode & penjelasan", key=f"riwayat_detail_{id_submisi}"):
+                        st.session_state.riwayat_dibuka.add(id_submisi)
+                        st.rerun()
+                    continue
+                
+                detail = queries.ambil_detail_submisi(id_submisi, id_mahasiswa)
+                if not detail:
+                    st.warning("Detail submisi tidak ditemukan.")
+                    continue
+                
                 # Code snippet
-                if submisi.get("kode"):
+                if detail.get("kode"):
                     st.markdown("#### 💻 Kode")
-                    st.code(submisi["kode"][:500] + ("..." if len(submisi["kode"]) > 500 else ""), language=bahasa)
+                    st.code(detail["kode"][:500] + ("..." if len(detail["kode"]) > 500 else ""), language=bahasa)
                 
                 # Error message
-                if submisi.get("pesan_error"):
+                if detail.get("pesan_error"):
                     st.markdown("#### ❌ Error Message")
-                    st.code(submisi["pesan_error"][:300] + ("..." if len(submisi["pesan_error"]) > 300 else ""))
+                    st.code(detail["pesan_error"][:300] + ("..." if len(detail["pesan_error"]) > 300 else ""))
                 
                 # Full explanation (NO nested expander - display directly)
                 st.markdown("#### 📖 Penjelasan Lengkap")
-                penjelasan = submisi.get("penjelasan", "N/A")
+                penjelasan = detail.get("penjelasan") or "N/A"
                 if len(penjelasan) > 500:
                     st.markdown(penjelasan[:500] + "...")
                     st.caption("ℹ️ Penjelasan dipotong untuk tampilan. Lihat detail lengkap di halaman Analisis.")
@@ -215,19 +239,14 @@ try:
                     st.markdown(penjelasan)
                 
                 # Fix suggestion (NO nested expander - display directly)
-                if submisi.get("saran_perbaikan"):
+                if detail.get("saran_perbaikan"):
                     st.markdown("#### 💡 Saran Perbaikan")
-                    saran = submisi["saran_perbaikan"]
+                    saran = detail["saran_perbaikan"]
                     if len(saran) > 400:
                         st.code(saran[:400] + "...", language=bahasa)
                         st.caption("ℹ️ Saran dipotong untuk tampilan.")
                     else:
                         st.code(saran, language=bahasa)
-                
-                # Related topics
-                if submisi.get("topik_terkait"):
-                    st.markdown("**Topik Terkait:**")
-                    st.markdown(", ".join(submisi["topik_terkait"][:5]))
 
 
 except Exception as e:
@@ -244,6 +263,7 @@ col1, col2, col3 = st.columns([1, 8, 1])
 with col1:
     if st.button("◀️ Sebelumnya", disabled=(st.session_state.history_page == 0), key="riwayat_btn_prev"):
         st.session_state.history_page -= 1
+        st.session_state.riwayat_dibuka.clear()
         st.rerun()
 
 with col2:
@@ -252,4 +272,5 @@ with col2:
 with col3:
     if st.button("Selanjutnya ▶️", key="riwayat_btn_next"):
         st.session_state.history_page += 1
+        st.session_state.riwayat_dibuka.clear()
         st.rerun()
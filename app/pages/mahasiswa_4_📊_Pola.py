@@ -10,7 +10,6 @@ MAHASISWA FEATURE 🟡
 import streamlit as st
 import plotly.express as px
 from datetime import datetime
-import pandas as pd
 import logging
 import sys
 from pathlib import Path
@@ -20,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from components.sidebar import render_sidebar
 from services.autentikasi_service import is_mahasiswa
+from services.analitik_service import frame_pola, ringkasan_pola, urut_pola, dokumen_urut
 from utils.helpers import format_number, format_datetime, get_severity_color
 
 logger = logging.getLogger(__name__)
@@ -88,18 +88,20 @@ try:
     
     st.markdown("### 📈 Ringkasan Pola")
     
+    # Muat sekali ke frame kolumnar, statistik & urutan dihitung vectorized
+    df_semua_pola = urut_pola(frame_pola(pola_list))
+    ringkasan = ringkasan_pola(df_semua_pola)
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.metric("Total Pola Terdeteksi", format_number(len(pola_list)))
     
     with col2:
-        total_freq = sum(p.get("frekuensi", 0) for p in pola_list)
-        st.metric("Total Occurrence", format_number(total_freq))
+        st.metric("Total Occurrence", format_number(ringkasan["total_frekuensi"]))
     
     with col3:
-        avg_freq = total_freq / len(pola_list) if pola_list else 0
-        st.metric("Rata-rata Frekuensi", f"{avg_freq:.1f}")
+        st.metric("Rata-rata Frekuensi", f"{ringkasan['avg_frekuensi']:.1f}")
     
     st.markdown("---")
     
@@ -108,17 +110,11 @@ try:
     
     st.markdown("### 📊 Visualisasi Pola")
     
-    # Sort by frequency
-    sorted_pola = sorted(pola_list, key=lambda x: x.get("frekuensi", 0), reverse=True)
+    # Sorted by frequency (dokumen asli dipakai untuk kartu detail)
+    sorted_pola = dokumen_urut(pola_list, df_semua_pola)
     
-    # Create DataFrame for visualization
-    df_pola = pd.DataFrame([
-        {
-            "jenis_kesalahan": p["jenis_kesalahan"],
-            "frekuensi": p.get("frekuensi", 0)
-        }
-        for p in sorted_pola[:10]
-    ])
+    # Top 10 for visualization
+    df_pola = df_semua_pola.head(10)[["jenis_kesalahan", "frekuensi"]]
     
     # Bar chart
     fig_pola = px.bar(
@@ -197,14 +193,14 @@ try:
     st.markdown("### 💡 Insights & Rekomendasi")
     
     # Generate insights based on patterns
-    high_freq_patterns = [p for p in sorted_pola if p.get("frekuensi", 0) >= 5]
+    high_freq_patterns = ringkasan["pola_frekuensi_tinggi"]
     
     if high_freq_patterns:
         st.warning(f"""
         ⚠️ **Perhatian!**
         
         Anda memiliki **{len(high_freq_patterns)} pola** dengan frekuensi tinggi (≥5 kali):
-        {', '.join([p['jenis_kesalahan'] for p in high_freq_patterns[:3]])}
+        {', '.join(high_freq_patterns[:3])}
         
         **Rekomendasi:** Fokus mempelajari konsep-konsep terkait pola ini untuk mengurangi error serupa di masa depan.
         """)
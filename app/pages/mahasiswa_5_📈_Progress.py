@@ -11,7 +11,6 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-import pandas as pd
 import logging
 import sys
 from pathlib import Path
@@ -21,6 +20,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from components.sidebar import render_sidebar
 from services.autentikasi_service import is_mahasiswa
+from services.analitik_service import frame_progress, ringkasan_progress, filter_urut_progress, dokumen_urut
 from utils.helpers import format_number
 
 logger = logging.getLogger(__name__)
@@ -87,22 +87,23 @@ try:
     
     st.markdown("### 📊 Statistik Keseluruhan")
     
+    # Muat sekali ke frame kolumnar, semua statistik dihitung vectorized
+    df_progress = frame_progress(progress_list)
+    ringkasan = ringkasan_progress(df_progress)
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric("Total Topik Dipelajari", format_number(len(progress_list)))
     
     with col2:
-        avg_penguasaan = sum(p.get("tingkat_penguasaan", 0) for p in progress_list) / len(progress_list)
-        st.metric("Rata-rata Penguasaan", f"{avg_penguasaan:.1f}%")
+        st.metric("Rata-rata Penguasaan", f"{ringkasan['avg_penguasaan']:.1f}%")
     
     with col3:
-        total_errors = sum(p.get("jumlah_error_di_topik", 0) for p in progress_list)
-        st.metric("Total Error di Semua Topik", format_number(total_errors))
+        st.metric("Total Error di Semua Topik", format_number(ringkasan["total_error"]))
     
     with col4:
-        improving = len([p for p in progress_list if p.get("tren_perbaikan") == "membaik"])
-        st.metric("Topik yang Membaik", format_number(improving))
+        st.metric("Topik yang Membaik", format_number(ringkasan["jumlah_membaik"]))
     
     st.markdown("---")
     
@@ -111,23 +112,9 @@ try:
     
     st.markdown("### 📊 Visualisasi Progress")
     
-    # Create DataFrame
-    df_progress = pd.DataFrame([
-        {
-            "topik": p["topik"],
-            "tingkat_penguasaan": p.get("tingkat_penguasaan", 0),
-            "jumlah_error": p.get("jumlah_error_di_topik", 0),
-            "tren": p.get("tren_perbaikan", "stagnan")
-        }
-        for p in progress_list
-    ])
-    
-    # Sort by penguasaan
-    df_progress = df_progress.sort_values("tingkat_penguasaan", ascending=True)
-    
     # Bar chart - Color-coded by mastery level
     fig_progress = px.bar(
-        df_progress,
+        df_progress.sort_values("tingkat_penguasaan", ascending=True),
         x="tingkat_penguasaan",
         y="topik",
         orientation="h",
@@ -171,21 +158,11 @@ try:
             key="sort_by"
         )
     
-    # Apply filters
-    filtered_progress = progress_list
-    
-    if filter_tren != "Semua":
-        filtered_progress = [p for p in filtered_progress if p.get("tren_perbaikan") == filter_tren]
-    
-    # Apply sorting
-    if sort_by == "penguasaan_asc":
-        filtered_progress = sorted(filtered_progress, key=lambda x: x.get("tingkat_penguasaan", 0))
-    elif sort_by == "penguasaan_desc":
-        filtered_progress = sorted(filtered_progress, key=lambda x: x.get("tingkat_penguasaan", 0), reverse=True)
-    elif sort_by == "error_count_asc":
-        filtered_progress = sorted(filtered_progress, key=lambda x: x.get("jumlah_error_di_topik", 0))
-    else:  # error_count_desc
-        filtered_progress = sorted(filtered_progress, key=lambda x: x.get("jumlah_error_di_topik", 0), reverse=True)
+    # Apply filters & sorting (vectorized pada frame, lalu dipetakan ke dokumen asli)
+    filtered_progress = dokumen_urut(
+        progress_list,
+        filter_urut_progress(df_progress, filter_tren, str(sort_by))
+    )
     
     st.markdown(f"*Menampilkan {len(filtered_progress)} dari {len(progress_list)} topik*")
     
@@ -269,15 +246,15 @@ try:
     
     st.markdown("### 💡 Insights & Rekomendasi")
     
-    # Find weak topics (penguasaan < 60%)
-    weak_topics = [p for p in progress_list if p.get("tingkat_penguasaan", 0) < 60]
+    # Find weak topics (penguasaan < 60%), terlemah dulu
+    weak_topics = ringkasan["topik_lemah"]
     
     if weak_topics:
         st.warning(f"""
         ⚠️ **Topik yang Perlu Diperkuat:**
         
         Anda memiliki **{len(weak_topics)} topik** dengan penguasaan < 60%:
-        {', '.join([p['topik'] for p in weak_topics[:5]])}
+        {', '.join(weak_topics[:5])}
         
         **Rekomendasi:** Fokus mempelajari topik-topik ini untuk meningkatkan kemampuan.
         """)
@@ -285,14 +262,14 @@ try:
         st.success("🎉 Selamat! Semua topik dikuasai dengan baik (≥60%)!")
     
     # Find improving topics
-    improving_topics = [p for p in progress_list if p.get("tren_perbaikan") == "membaik"]
+    improving_topics = ringkasan["topik_membaik"]
     
     if improving_topics:
         st.success(f"""
         ✅ **Progress Positif!**
         
         **{len(improving_topics)} topik** menunjukkan tren perbaikan:
-        {', '.join([p['topik'] for p in improving_topics[:5]])}
+        {', '.join(improving_topics[:5])}
         
         Pertahankan momentum belajar Anda!
         """)
@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from components.sidebar import render_sidebar
 from services.autentikasi_service import is_mahasiswa
+from services.katalog_service import ambil_sumber_daya_katalog, cari_sumber_daya_by_topik, cari_katalog
 from utils.helpers import format_number
 
 logger = logging.getLogger(__name__)
@@ -153,11 +154,11 @@ st.markdown("---")
 # ==================== FETCH RESOURCES ====================
 
 try:
-    # Get all resources
-    all_resources = queries.daftar_semua_sumber_daya()
+    # Get all resources (shared catalogue cache, tanpa query per page load)
+    all_resources = ambil_sumber_daya_katalog(queries)
     
-    # Apply filters
-    filtered_resources = all_resources
+    # Apply filters - pencarian teks via index BM25 (urut relevansi)
+    filtered_resources = cari_katalog(queries, filter_topik, "sumber_daya") if filter_topik else all_resources
     
     if filter_tipe != "Semua":
         filtered_resources = [r for r in filtered_resources if r.get("tipe") == filter_tipe]
@@ -165,14 +166,6 @@ try:
     if filter_tingkat != "Semua":
         filtered_resources = [r for r in filtered_resources if r.get("tingkat_kesulitan") == filter_tingkat]
     
-    if filter_topik:
-        search_lower = filter_topik.lower()
-        filtered_resources = [
-            r for r in filtered_resources
-            if any(search_lower in str(t).lower() for t in r.get("topik_terkait", []))
-            or search_lower in r.get("judul", "").lower()
-        ]
-    
     total = len(filtered_resources)
     
     st.markdown(f"**Menampilkan {total} dari {len(all_resources)} resources**")
@@ -196,11 +189,8 @@ try:
         **{', '.join(weak_topics[:3])}**
         """)
         
-        # Filter resources by weak topics
-        recommended_resources = [
-            r for r in all_resources
-            if any(topic in r.get("topik_terkait", []) for topic in weak_topics)
-        ]
+        # Resources untuk weak topics (lookup inverted index katalog)
+        recommended_resources = cari_sumber_daya_by_topik(queries, weak_topics, limit=5)
         
         if recommended_resources:
             for resource in recommended_resources[:5]:
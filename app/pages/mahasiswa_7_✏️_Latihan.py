@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from components.sidebar import render_sidebar
 from services.autentikasi_service import is_mahasiswa
+from services.katalog_service import ambil_exercises_katalog, cari_exercises_by_topik, cari_katalog
 from utils.helpers import format_number
 
 logger = logging.getLogger(__name__)
@@ -158,23 +159,15 @@ st.markdown("---")
 # ==================== FETCH EXERCISES ====================
 
 try:
-    # Get all exercises
-    all_exercises = queries.daftar_semua_exercises()
+    # Get all exercises (shared catalogue cache, tanpa query per page load)
+    all_exercises = ambil_exercises_katalog(queries)
     
-    # Apply filters
-    filtered_exercises = all_exercises
+    # Apply filters - pencarian teks via index BM25 (urut relevansi)
+    filtered_exercises = cari_katalog(queries, filter_topik, "exercises") if filter_topik else all_exercises
     
     if filter_tingkat != "Semua":
         filtered_exercises = [e for e in filtered_exercises if e.get("tingkat_kesulitan") == filter_tingkat]
     
-    if filter_topik:
-        search_lower = filter_topik.lower()
-        filtered_exercises = [
-            e for e in filtered_exercises
-            if search_lower in e.get("topik", "").lower()
-            or search_lower in e.get("judul", "").lower()
-        ]
-    
     total = len(filtered_exercises)
     
     st.markdown(f"**Menampilkan {total} dari {len(all_exercises)} exercises**")
@@ -198,11 +191,8 @@ try:
         **{', '.join(weak_topics[:3])}**
         """)
         
-        # Filter exercises by weak topics
-        recommended_exercises = [
-            e for e in all_exercises
-            if e.get("topik") in weak_topics
-        ]
+        # Exercises untuk weak topics (lookup inverted index katalog)
+        recommended_exercises = cari_exercises_by_topik(queries, weak_topics, limit=3)
         
         if recommended_exercises:
             for exercise in recommended_exercises[:3]:
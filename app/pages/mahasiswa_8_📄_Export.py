@@ -3,7 +3,8 @@ Mahasiswa - Export Progress
 
 MAHASISWA FEATURE (NEW) 🟡
 - Export progress report
-- PDF/CSV format
+- CSV / Excel (XLSX) format, di-stream dari database (lihat services/export_service.py)
+- PDF dengan grafik, dirender di worker process & di-cache (lihat services/laporan_pdf_service.py)
 - Share dengan mentor/instructor
 """
 
@@ -11,8 +12,6 @@ import streamlit as st
 import pandas as pd
 import logging
 from datetime import datetime, timedelta
-from io import BytesIO
-from typing import Any
 import sys
 from pathlib import Path
 
@@ -21,6 +20,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from components.sidebar import render_sidebar
 from services.autentikasi_service import is_mahasiswa
+from services.export_service import siapkan_data_laporan, export_csv_submisi, export_xlsx_laporan
+from services.laporan_pdf_service import buat_pdf_mahasiswa
 from utils.helpers import format_datetime, format_percentage, format_number
 
 logger = logging.getLogger(__name__)
@@ -106,7 +107,7 @@ with col2:
     
     export_format = st.radio(
         "Format File",
-        options=["CSV", "PDF (Coming Soon)"],
+        options=["CSV", "Excel (XLSX)", "PDF"],
         key="export_format"
     )
 
@@ -120,14 +121,13 @@ st.markdown("### 👀 Preview Report")
 # Initialize variables BEFORE try block to avoid "possibly unbound" warnings
 date_from = None
 date_to = None
-riwayat = []
 pola = []
 progress = []
 total_submisi = 0
 total_pola = 0
 avg_penguasaan = 0.0
-error_counts = {}
 top_errors = []
+data_laporan = None
 
 try:
     # Determine date range
@@ -156,30 +156,16 @@ try:
         date_from = datetime.combine(date_start, datetime.min.time())
         date_to = datetime.combine(date_end, datetime.max.time())
     
-    # Fetch data
-    riwayat = queries.ambil_riwayat_submisi(id_mahasiswa, limit=1000)
-    pola = queries.ambil_pola_mahasiswa(id_mahasiswa)
-    progress = queries.ambil_progress_mahasiswa(id_mahasiswa)
-    
-    # Filter by date if needed
-    if date_from and date_to:
-        riwayat = [
-            r for r in riwayat
-            if date_from <= r.get("created_at", datetime.now()) <= date_to
-        ]
+    # Fetch data - periode difilter di database, total & top errors via aggregation
+    data_laporan = siapkan_data_laporan(queries, id_mahasiswa, date_from, date_to)
+    pola = data_laporan["pola"]
+    progress = data_laporan["progress"]
     
     # Calculate stats
-    total_submisi = len(riwayat)
+    total_submisi = data_laporan["total_submisi"]
     total_pola = len(pola)
-    avg_penguasaan = sum(p.get("tingkat_penguasaan", 0) for p in progress) / len(progress) if progress else 0
-    
-    # Top errors
-    error_counts = {}
-    for r in riwayat:
-        tipe = r.get("tipe_error", "Unknown")
-        error_counts[tipe] = error_counts.get(tipe, 0) + 1
-    
-    top_errors = sorted(error_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+    avg_penguasaan = data_laporan["avg_penguasaan"]
+    top_errors = data_laporan["top_errors"]
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -275,107 +261,67 @@ st.markdown("### 🚀 Generate & Download Report")
 
 if st.button("📥 Generate Report", type="primary", use_container_width=True):
     
-    if export_format == "CSV":
+    if export_format in ("CSV", "Excel (XLSX)"):
         try:
-            # Generate CSV report
-            with st.spinner("Generating CSV report..."):
-                
-                # Prepare data
-                report_data = {
-                    "Info Mahasiswa": {
-                        "Nama": pengguna.get("nama", "N/A"),
-                        "Email": pengguna.get("email", "N/A"),
-                        "Tingkat Kemahiran": pengguna.get("tingkat_kemahiran", "N/A"),
-                        "Report Generated": format_datetime(datetime.now()),
-                        "Periode": f"{format_datetime(date_from) if date_from else 'Semua'} - {format_datetime(date_to) if date_to else 'Sekarang'}"
-                    },
-                    "Summary": {
-                        "Total Submisi": total_submisi,
-                        "Total Pola": total_pola,
-                        "Rata-rata Penguasaan": f"{avg_penguasaan:.1f}%",
-                        "Topik Dipelajari": len(progress)
-                    }
-                }
-                
-                # Create Excel file with multiple sheets
-                output: Any = BytesIO()  # Type: IO[bytes]
-                with pd.ExcelWriter(output, engine='xlsxwriter') as writer:  # type: ignore
-                    # Info sheet
-                    df_info = pd.DataFrame([report_data["Info Mahasiswa"]]).T
-                    df_info.columns = ["Value"]
-                    df_info.to_excel(writer, sheet_name='Info')
-                    
-                    # Summary sheet
-                    df_summary = pd.DataFrame([report_data["Summary"]]).T
-                    df_summary.columns = ["Value"]
-                    df_summary.to_excel(writer, sheet_name='Summary')
-                    
-                    # Progress sheet
-                    if progress:
-                        df_progress = pd.DataFrame([
-                            {
-                                "Topik": p.get("topik", "N/A"),
-                                "Penguasaan (%)": p.get("tingkat_penguasaan", 0),
-                                "Jumlah Error": p.get("jumlah_error_di_topik", 0),
-                                "Tren": p.get("tren_perbaikan", "N/A"),
-                            }
-                            for p in progress
-                        ])
-                        df_progress.to_excel(writer, sheet_name='Progress', index=False)
-                    
-                    # Errors sheet
-                    if top_errors:
-                        df_errors = pd.DataFrame([
-                            {"Tipe Error": tipe, "Jumlah": count}
-                            for tipe, count in top_errors
-                        ])
-                        df_errors.to_excel(writer, sheet_name='Top Errors', index=False)
-                    
-                    # Pola sheet
-                    if pola:
-                        df_pola = pd.DataFrame([
-                            {
-                                "Jenis Kesalahan": p.get("jenis_kesalahan", "N/A"),
-                                "Frekuensi": p.get("frekuensi", 0),
-                                "Kejadian Terakhir": format_datetime(p.get("kejadian_terakhir")),
-                                "Misconception": p.get("deskripsi_miskonsepsi", "N/A"),
-                            }
-                            for p in pola
-                        ])
-                        df_pola.to_excel(writer, sheet_name='Pola Kesalahan', index=False)
-                
-                output.seek(0)
-                
-                # Download button
+            nama_file = f"pahamkode_report_{pengguna.get('nama', 'mahasiswa')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            
+            if export_format == "CSV":
+                # Riwayat submisi lengkap dalam periode, di-stream baris per baris
+                with st.spinner("Generating CSV report..."):
+                    path_export, jumlah_baris = export_csv_submisi(queries, id_mahasiswa, date_from, date_to)
+                mime = "text/csv"
+                nama_file += ".csv"
+            else:
+                # Info, summary, progress, errors, pola + riwayat submisi lengkap
+                with st.spinner("Generating Excel report..."):
+                    path_export, jumlah_baris = export_xlsx_laporan(
+                        queries,
+                        pengguna,
+                        data_laporan or siapkan_data_laporan(queries, id_mahasiswa, date_from, date_to),
+                        date_from,
+                        date_to
+                    )
+                mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                nama_file += ".xlsx"
+            
+            # Download button
+            with open(path_export, "rb") as file_export:
                 st.download_button(
-                    label="📥 Download Excel Report",
-                    data=output,
-                    file_name=f"pahamkode_report_{pengguna.get('nama', 'mahasiswa')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    label=f"📥 Download {export_format} Report",
+                    data=file_export,
+                    file_name=nama_file,
+                    mime=mime,
                     use_container_width=True
                 )
-                
-                st.success("✅ Report berhasil di-generate!")
+            
+            st.success(f"✅ Report berhasil di-generate! ({format_number(jumlah_baris, 0)} submisi)")
         
         except Exception as e:
-            logger.error(f"Error generating CSV: {e}")
+            logger.error(f"Error generating {export_format}: {e}")
             st.error(f"❌ Error generating report: {str(e)}")
     
     else:  # PDF
-        st.warning("""
-        **PDF Export Coming Soon!**
-        
-        Untuk saat ini, silakan gunakan format Excel/CSV.
-        PDF export dengan visualisasi charts akan segera hadir.
-        """)
-
-
-        st.warning("""
-        **PDF Export Coming Soon!**
+        try:
+            nama_file = f"pahamkode_report_{pengguna.get('nama', 'mahasiswa')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            
+            # Render di worker process; laporan yang datanya tidak berubah diambil dari cache
+            with st.spinner("Generating PDF report..."):
+                path_pdf, dari_cache = buat_pdf_mahasiswa(queries, pengguna, date_from, date_to, data_laporan)
+            
+            with open(path_pdf, "rb") as file_pdf:
+                st.download_button(
+                    label="📥 Download PDF Report",
+                    data=file_pdf,
+                    file_name=nama_file,
+                    mime="application/pdf",
+                    use_container_width=True
+                )
+            
+            st.success("✅ Report PDF siap!" + (" (dari cache, data tidak berubah)" if dari_cache else ""))
         
-        Untuk saat ini, silakan gunakan format Excel/CSV.
-        PDF export dengan visualisasi charts akan segera hadir.
-        """)
+        except Exception as e:
+            logger.error(f"Error generating PDF: {e}")
+            st.error(f"❌ Error generating report: {str(e)}")
 
 
 # ==================== INFO SECTION ====================
@@ -396,6 +342,11 @@ st.info("""
 - 🎯 Progress per Topik
 - 🔴 Top Errors
 - 🔁 Pola Kesalahan Berulang
+- 📜 Riwayat Submisi lengkap sesuai periode
+
+**Format CSV:** riwayat submisi lengkap sesuai periode (satu baris per submisi)
+
+**Format PDF:** ringkasan, grafik top errors & penguasaan topik, tabel progress dan pola kesalahan
 """)
 
 
@@ -6,53 +6,130 @@ CATATAN:
 - Analisis Service: Main error analysis orchestration
 - Autentikasi Service: Session-based auth
 - Admin Service: Admin operations & analytics
+- Katalog Service: Shared in-memory cache untuk topik, sumber daya, exercises
+- Analitik Service: Statistik progress, pola & kohort secara vectorized (pandas/NumPy)
+- Re-export bersifat lazy: submodule baru di-import saat nama pertama kali diakses
 """
 
-# AI Service
-from .ai_service import (
-    analisis_error_semantik as ai_analisis_error_semantik,
-    HasilAnalisis,
-    dapatkan_llm,
-    hitung_token_estimasi,
-    hitung_biaya_estimasi
-)
+from typing import TYPE_CHECKING
 
-# Analisis Service
-from .analisis_service import (
-    proses_analisis_error,
-    format_hasil_analisis,
-    ambil_rekomendasi_belajar,
-    hitung_statistik_mahasiswa
-)
+from utils.lazy_loader import buat_lazy_loader
 
-# Autentikasi Service
-from .autentikasi_service import (
-    registrasi_pengguna,
-    login_pengguna,
-    logout_pengguna,
-    hash_password,
-    verify_password,
-    is_admin,
-    is_mahasiswa,
-    require_login,
-    require_admin,
-    update_profil_mahasiswa,
-    ubah_password
-)
+if TYPE_CHECKING:
+    # AI Service
+    from .ai_service import (
+        analisis_error_semantik as ai_analisis_error_semantik,
+        HasilAnalisis,
+        dapatkan_llm,
+        hitung_token_estimasi,
+        hitung_biaya_estimasi
+    )
+
+    # Analisis Service
+    from .analisis_service import (
+        proses_analisis_error,
+        format_hasil_analisis,
+        ambil_rekomendasi_belajar,
+        hitung_statistik_mahasiswa
+    )
+
+    # Autentikasi Service
+    from .autentikasi_service import (
+        registrasi_pengguna,
+        login_pengguna,
+        logout_pengguna,
+        hash_password,
+        verify_password,
+        is_admin,
+        is_mahasiswa,
+        require_login,
+        require_admin,
+        update_profil_mahasiswa,
+        ubah_password
+    )
+
+    # Admin Service
+    from .admin_service import (
+        ambil_daftar_mahasiswa,
+        suspend_mahasiswa,
+        aktifkan_mahasiswa,
+        ambil_dashboard_statistik,
+        ambil_analitik_global,
+        ambil_pola_insights,
+        kelola_sumber_daya,
+        kelola_topik,
+        kelola_exercise,
+        ambil_system_health
+    )
 
-# Admin Service
-from .admin_service import (
-    ambil_daftar_mahasiswa,
-    suspend_mahasiswa,
-    aktifkan_mahasiswa,
-    ambil_dashboard_statistik,
-    ambil_analitik_global,
-    ambil_pola_insights,
-    kelola_sumber_daya,
-    kelola_topik,
-    kelola_exercise,
-    ambil_system_health
-)
+    # Katalog Service
+    from .katalog_service import (
+        ambil_topik_katalog,
+        ambil_sumber_daya_katalog,
+        ambil_exercises_katalog,
+        cari_sumber_daya_by_topik,
+        cari_exercises_by_topik,
+        cari_katalog,
+        invalidasi_katalog
+    )
+
+    # Analitik Service
+    from .analitik_service import (
+        distribusi,
+        ringkasan_progress,
+        ringkasan_pola,
+        statistik_kohort
+    )
+
+__getattr__, __dir__ = buat_lazy_loader(__name__, {
+    # AI Service
+    'ai_analisis_error_semantik': ('.ai_service', 'analisis_error_semantik'),
+    'HasilAnalisis': ('.ai_service', 'HasilAnalisis'),
+    'dapatkan_llm': ('.ai_service', 'dapatkan_llm'),
+    'hitung_token_estimasi': ('.ai_service', 'hitung_token_estimasi'),
+    'hitung_biaya_estimasi': ('.ai_service', 'hitung_biaya_estimasi'),
+    # Analisis Service
+    'proses_analisis_error': ('.analisis_service', 'proses_analisis_error'),
+    'format_hasil_analisis': ('.analisis_service', 'format_hasil_analisis'),
+    'ambil_rekomendasi_belajar': ('.analisis_service', 'ambil_rekomendasi_belajar'),
+    'hitung_statistik_mahasiswa': ('.analisis_service', 'hitung_statistik_mahasiswa'),
+    # Autentikasi Service
+    'registrasi_pengguna': ('.autentikasi_service', 'registrasi_pengguna'),
+    'login_pengguna': ('.autentikasi_service', 'login_pengguna'),
+    'logout_pengguna': ('.autentikasi_service', 'logout_pengguna'),
+    'hash_password': ('.autentikasi_service', 'hash_password'),
+    'verify_password': ('.autentikasi_service', 'verify_password'),
+    'is_admin': ('.autentikasi_service', 'is_admin'),
+    'is_mahasiswa': ('.autentikasi_service', 'is_mahasiswa'),
+    'require_login': ('.autentikasi_service', 'require_login'),
+    'require_admin': ('.autentikasi_service', 'require_admin'),
+    'update_profil_mahasiswa': ('.autentikasi_service', 'update_profil_mahasiswa'),
+    'ubah_password': ('.autentikasi_service', 'ubah_password'),
+    # Admin Service
+    'ambil_daftar_mahasiswa': ('.admin_service', 'ambil_daftar_mahasiswa'),
+    'suspend_mahasiswa': ('.admin_service', 'suspend_mahasiswa'),
+    'aktifkan_mahasiswa': ('.admin_service', 'aktifkan_mahasiswa'),
+    'ambil_dashboard_statistik': ('.admin_service', 'ambil_dashboard_statistik'),
+    'ambil_analitik_global': ('.admin_service', 'ambil_analitik_global'),
+    'ambil_pola_insights': ('.admin_service', 'ambil_pola_insights'),
+    'kelola_sumber_daya': ('.admin_service', 'kelola_sumber_daya'),
+    'kelola_topik': ('.admin_service', 'kelola_topik'),
+    'kelola_exercise': ('.admin_service', 'kelola_exercise'),
+    'ambil_system_health': ('.admin_service', 'ambil_system_health'),
+    # Katalog Service
+    'ambil_topik_katalog': ('.katalog_service', 'ambil_topik_katalog'),
+    'ambil_sumber_daya_katalog': ('.katalog_service', 'ambil_sumber_daya_katalog'),
+    'ambil_exercises_katalog': ('.katalog_service', 'ambil_exercises_katalog'),
+    'cari_sumber_daya_by_topik': ('.katalog_service', 'cari_sumber_daya_by_topik'),
+    'cari_exercises_by_topik': ('.katalog_service', 'cari_exercises_by_topik'),
+    'cari_katalog': ('.katalog_service', 'cari_katalog'),
+    'invalidasi_katalog': ('.katalog_service', 'invalidasi_katalog'),
+    # Analitik Service
+    'distribusi': ('.analitik_service', 'distribusi'),
+    'ringkasan_progress': ('.analitik_service', 'ringkasan_progress'),
+    'ringkasan_pola': ('.analitik_service', 'ringkasan_pola'),
+    'statistik_kohort': ('.analitik_service', 'statistik_kohort'),
+})
 
 __all__ = [
     # AI Service
@@ -89,4 +166,17 @@ __all__ = [
     'kelola_topik',
     'kelola_exercise',
     'ambil_system_health',
+    # Katalog Service
+    'ambil_topik_katalog',
+    'ambil_sumber_daya_katalog',
+    'ambil_exercises_katalog',
+    'cari_sumber_daya_by_topik',
+    'cari_exercises_by_topik',
+    'cari_katalog',
+    'invalidasi_katalog',
+    # Analitik Service
+    'distribusi',
+    'ringkasan_progress',
+    'ringkasan_pola',
+    'statistik_kohort',
 ]
@@ -5,15 +5,34 @@ CATATAN:
 - User management (suspend, activate, view all mahasiswa)
 - Analytics & monitoring (global patterns, top errors, AI usage)
 - Content management (resources, topics, exercises)
+  → setiap CRUD yang berhasil menaikkan versi katalog (services/katalog_service.py)
 - System health monitoring
+- Statistik dashboard di-cache di backend bersama (dibagi semua worker) dan diinvalidasi lewat
+  bus event (watcher_service); live feed membaca event terbaru dari bus tanpa query database
 """
 
 import logging
+import threading
+import time
+import uuid
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+from config import settings
+from database.kumpulan_query import KumpulanQuery
 from database.queries import DatabaseQueries
 from database.models import SumberDaya, TopikPembelajaran, Exercise
+from services.analitik_service import frame_progress, ringkasan_progress
+from services.katalog_service import (
+    ambil_sumber_daya_katalog,
+    ambil_topik_katalog,
+    ambil_exercises_katalog,
+    invalidasi_katalog
+)
+from services.kuota_service import status_kuota
+from services.watcher_service import status_watcher
+from utils.backend_bersama import BackendBersamaError, dapatkan_backend
+from utils.bus_event import OPERASI_TIDAK_DIKETAHUI, EventPerubahan, bus_perubahan
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +72,11 @@ def ambil_daftar_mahasiswa(
             search_query=search_query
         )
         
-        total_count = queries.hitung_total_mahasiswa()
+        total_count = queries.hitung_total_mahasiswa(
+            filter_status=filter_status,
+            filter_tingkat=filter_tingkat,
+            search_query=search_query
+        )
         
         # Enhance dengan statistik tambahan untuk setiap mahasiswa
         enhanced_list = []
@@ -62,7 +85,7 @@ def ambil_daftar_mahasiswa(
             
             # Get statistik error
             total_submisi = queries.hitung_total_submisi(id_mhs)
-            pola_count = len(queries.ambil_pola_mahasiswa(id_mhs))
+            pola_count = len(queries.ambil_pola_mahasiswa(id_mhs, tampilan="konteks"))
             rata_penguasaan = queries.hitung_rata_rata_penguasaan(id_mhs)
             
             enhanced_list.append({
@@ -147,44 +170,44 @@ def ambil_dashboard_statistik(queries: DatabaseQueries) -> Dict[str, Any]:
         Dictionary dengan berbagai metrik untuk dashboard
     """
     try:
-        # 1. User statistics
-        total_mahasiswa = queries.hitung_total_mahasiswa()
-        
-        # 2. Error statistics
-        total_submisi = queries.hitung_total_submisi()
-        
-        # 3. Growth (last 30 days)
-        pertumbuhan = queries.pertumbuhan_mahasiswa(days=30)
-        
-        # 4. Top errors
-        top_errors = queries.top_errors_global(limit=10)
-        
-        # 5. Global patterns
-        pola_global = queries.ambil_pola_global(limit=10)
-        
-        # 6. Mahasiswa dengan kesulitan terbanyak
-        mahasiswa_kesulitan = queries.mahasiswa_dengan_kesulitan_terbanyak(limit=5)
-        
-        # 7. Topik paling sulit
-        topik_sulit = queries.topik_paling_sulit(limit=10)
-        
-        # 8. AI metrics (last 7 days)
+        # Query saling independen: dijalankan paralel, latensi ≈ query paling lambat
         start_date = datetime.now() - timedelta(days=7)
-        ai_stats = queries.ambil_statistik_ai(start_date=start_date)
-        
-        # 9. API metrics (last 7 days)
-        api_stats = queries.ambil_statistik_api(start_date=start_date)
+        hasil = (
+            KumpulanQuery(queries)
+            # 1. User statistics
+            .tambah("total_mahasiswa", "hitung_total_mahasiswa")
+            # 2. Error statistics
+            .tambah("total_submisi", "hitung_total_submisi")
+            # 3. Growth (last 30 days)
+            .tambah("pertumbuhan", "pertumbuhan_mahasiswa", days=30)
+            # 4. Top errors
+            .tambah("top_errors", "top_errors_global", limit=10)
+            # 5. Global patterns
+            .tambah("pola_global", "ambil_pola_global", limit=10)
+            # 6. Mahasiswa dengan kesulitan terbanyak
+            .tambah("mahasiswa_kesulitan", "mahasiswa_dengan_kesulitan_terbanyak", limit=5)
+            # 7. Topik paling sulit
+            .tambah("topik_sulit", "topik_paling_sulit", limit=10)
+            # 8. AI metrics (last 7 days) & kuota harian
+            .tambah("ai_stats", "ambil_statistik_ai", start_date=start_date)
+            .tambah("kuota_harian", status_kuota, queries)
+            # 9. API metrics (last 7 days)
+            .tambah("api_stats", "ambil_statistik_api", start_date=start_date)
+            .jalankan()
+        )
+        ai_stats = hasil["ai_stats"]
+        ai_stats["kuota_harian"] = hasil["kuota_harian"]
         
         return {
-            "total_mahasiswa": total_mahasiswa,
-            "total_submisi": total_submisi,
-            "pertumbuhan_mahasiswa": pertumbuhan,
-            "top_errors": top_errors,
-            "pola_global": pola_global,
-            "mahasiswa_perlu_bantuan": mahasiswa_kesulitan,
-            "topik_sulit": topik_sulit,
+            "total_mahasiswa": hasil["total_mahasiswa"],
+            "total_submisi": hasil["total_submisi"],
+            "pertumbuhan_mahasiswa": hasil["pertumbuhan"],
+            "top_errors": hasil["top_errors"],
+            "pola_global": hasil["pola_global"],
+            "mahasiswa_perlu_bantuan": hasil["mahasiswa_kesulitan"],
+            "topik_sulit": hasil["topik_sulit"],
             "ai_metrics": ai_stats,
-            "api_metrics": api_stats,
+            "api_metrics": hasil["api_stats"],
             "timestamp": datetime.now()
         }
         
@@ -193,6 +216,137 @@ def ambil_dashboard_statistik(queries: DatabaseQueries) -> Dict[str, Any]:
         return {}
 
 
+class CacheDashboard:
+    """
+    Statistik dashboard admin yang dibagi semua session admin di semua proses worker
+
+    Entri {data, dibuat} disimpan di backend bersama; hanya satu worker yang menghitung ulang
+    (lock ber-TTL), worker lain memakai entri lama selama perhitungan. Setiap worker menjalankan
+    watcher sendiri, jadi waktu perubahan users / submisi_error terakhir dicatat lokal dari bus.
+    Dihitung ulang jika ada perubahan setelah entri dibuat dan sudah lewat jeda minimal, atau
+    umurnya melewati batas: settings.DASHBOARD_CACHE_MAKS_UMUR_DETIK saat watcher aktif,
+    settings.DASHBOARD_CACHE_TTL_DETIK jika tidak.
+    """
+
+    KOLEKSI = ("users", "submisi_error")
+    KUNCI_DATA = "dashboard:statistik"
+    KUNCI_LOCK = "dashboard:lock"
+    TTL_LOCK_DETIK = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Salinan entri terakhir, dipakai jika backend bersama tidak bisa dihubungi
+        self._lokal: Dict[str, Any] = {}
+        self._berubah_pada = 0.0
+
+    def tandai_berubah(self, event: Optional[EventPerubahan] = None) -> None:
+        self._berubah_pada = time.time()
+
+    def _masih_fresh(self, entri: Dict[str, Any]) -> bool:
+        if not entri.get("data"):
+            return False
+        umur = time.time() - entri["dibuat"]
+        if not bus_perubahan.aktif:
+            return umur < settings.DASHBOARD_CACHE_TTL_DETIK
+        if self._berubah_pada > entri["dibuat"] and umur >= settings.DASHBOARD_CACHE_JEDA_MIN_DETIK:
+            return False
+        return umur < settings.DASHBOARD_CACHE_MAKS_UMUR_DETIK
+
+    def _baca(self) -> Dict[str, Any]:
+        try:
+            entri = dapatkan_backend().ambil_objek(self.KUNCI_DATA)
+        except BackendBersamaError as e:
+            logger.warning(f"Cache dashboard bersama tidak bisa dibaca: {str(e)}")
+            return self._lokal
+        if entri:
+            self._lokal = entri
+        return entri or {}
+
+    def ambil(self, queries: DatabaseQueries, paksa: bool = False) -> Dict[str, Any]:
+        """Statistik dari cache, atau dihitung ulang jika kedaluwarsa / paksa"""
+        entri = self._baca()
+        if not paksa and self._masih_fresh(entri):
+            return entri["data"]
+        with self._lock:
+            entri = self._baca()
+            if not paksa and self._masih_fresh(entri):
+                return entri["data"]
+
+            backend = dapatkan_backend()
+            pemilik = uuid.uuid4().hex
+            try:
+                dapat_lock = backend.simpan(self.KUNCI_LOCK, pemilik, ttl=self.TTL_LOCK_DETIK, hanya_baru=True)
+            except BackendBersamaError:
+                dapat_lock = True
+            if not dapat_lock and entri.get("data"):
+                # Worker lain sedang menghitung ulang
+                return entri["data"]
+
+            data: Dict[str, Any] = {}
+            try:
+                dibuat = time.time()
+                data = ambil_dashboard_statistik(queries)
+                if data:
+                    entri = {"data": data, "dibuat": dibuat}
+                    self._lokal = entri
+                    backend.simpan_objek(
+                        self.KUNCI_DATA, entri,
+                        ttl=max(settings.DASHBOARD_CACHE_MAKS_UMUR_DETIK, settings.DASHBOARD_CACHE_TTL_DETIK)
+                    )
+            except BackendBersamaError as e:
+                logger.warning(f"Cache dashboard bersama tidak bisa ditulis: {str(e)}")
+            finally:
+                try:
+                    backend.lepas_kunci(self.KUNCI_LOCK, pemilik)
+                except BackendBersamaError:
+                    pass
+            return data or entri.get("data", {})
+
+
+dashboard_cache = CacheDashboard()
+bus_perubahan.langganan(CacheDashboard.KOLEKSI, dashboard_cache.tandai_berubah)
+
+
+def ambil_dashboard_statistik_cache(queries: DatabaseQueries, paksa: bool = False) -> Dict[str, Any]:
+    """Statistik dashboard admin (cache bersama antar worker, lihat CacheDashboard)"""
+    return dashboard_cache.ambil(queries, paksa)
+
+
+def ambil_feed_perubahan(sejak: int = 0, limit: int = 20) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Submisi & registrasi terbaru dari bus event (tanpa query database) untuk live feed
+
+    Event update (mis. minhash, pengulangan) tidak ditampilkan. Cosmos DB tidak membedakan
+    insert/update: event tanpa operasi dianggap baru jika dokumennya dibuat < 5 menit sebelumnya.
+
+    Args:
+        sejak: Nomor urut event terakhir yang sudah ditampilkan (0 = semua di ring buffer)
+        limit: Jumlah item terbaru
+
+    Returns:
+        Tuple (nomor urut event terakhir, list item terbaru dulu)
+    """
+    terlihat = set()
+    item = []
+    for event in bus_perubahan.event_sejak(sejak, CacheDashboard.KOLEKSI):
+        if event.operasi not in ("insert", OPERASI_TIDAK_DIKETAHUI) or event.id_dokumen in terlihat:
+            continue
+        terlihat.add(event.id_dokumen)
+        dokumen = event.dokumen or {}
+        dibuat = dokumen.get("created_at")
+        if event.operasi == OPERASI_TIDAK_DIKETAHUI and (not dibuat or event.waktu - dibuat > timedelta(minutes=5)):
+            continue
+        if event.koleksi == "users" and dokumen.get("role") == "admin":
+            continue
+        item.append({
+            "jenis": "submisi" if event.koleksi == "submisi_error" else "registrasi",
+            "id": str(event.id_dokumen),
+            "waktu": dibuat or event.waktu,
+            **{kunci: nilai for kunci, nilai in dokumen.items() if kunci != "created_at"}
+        })
+    return bus_perubahan.urutan_terakhir, list(reversed(item))[:limit]
+
+
 def ambil_analitik_global(
     queries: DatabaseQueries,
     periode: str = "7d"
@@ -351,6 +505,7 @@ def kelola_sumber_daya(
             )
             
             id_baru = queries.buat_sumber_daya(sumber.to_dict())
+            invalidasi_katalog(queries)
             logger.info(f"Sumber daya baru: {id_baru}")
             
             return True, f"Sumber daya berhasil dibuat! (ID: {id_baru})"
@@ -362,6 +517,7 @@ def kelola_sumber_daya(
             success = queries.update_sumber_daya(id_sumber, data)
             
             if success:
+                invalidasi_katalog(queries)
                 logger.info(f"Sumber daya updated: {id_sumber}")
                 return True, "Sumber daya berhasil diperbarui!"
             else:
@@ -374,6 +530,7 @@ def kelola_sumber_daya(
             success = queries.hapus_sumber_daya(id_sumber)
             
             if success:
+                invalidasi_katalog(queries)
                 logger.info(f"Sumber daya deleted: {id_sumber}")
                 return True, "Sumber daya berhasil dihapus!"
             else:
@@ -424,6 +581,7 @@ def kelola_topik(
             )
             
             id_baru = queries.buat_topik(topik.to_dict())
+            invalidasi_katalog(queries)
             logger.info(f"Topik baru: {id_baru}")
             
             return True, f"Topik berhasil dibuat! (ID: {id_baru})"
@@ -435,6 +593,7 @@ def kelola_topik(
             success = queries.update_topik(id_topik, data)
             
             if success:
+                invalidasi_katalog(queries)
                 logger.info(f"Topik updated: {id_topik}")
                 return True, "Topik berhasil diperbarui!"
             else:
@@ -447,6 +606,7 @@ def kelola_topik(
             success = queries.hapus_topik(id_topik)
             
             if success:
+                invalidasi_katalog(queries)
                 logger.info(f"Topik deleted: {id_topik}")
                 return True, "Topik berhasil dihapus!"
             else:
@@ -504,6 +664,7 @@ def kelola_exercise(
             )
             
             id_baru = queries.buat_exercise(exercise.to_dict())
+            invalidasi_katalog(queries)
             logger.info(f"Exercise baru: {id_baru}")
             
             return True, f"Exercise berhasil dibuat! (ID: {id_baru})"
@@ -515,6 +676,7 @@ def kelola_exercise(
             success = queries.update_exercise(id_exercise, data)
             
             if success:
+                invalidasi_katalog(queries)
                 logger.info(f"Exercise updated: {id_exercise}")
                 return True, "Exercise berhasil diperbarui!"
             else:
@@ -527,6 +689,7 @@ def kelola_exercise(
             success = queries.hapus_exercise(id_exercise)
             
             if success:
+                invalidasi_katalog(queries)
                 logger.info(f"Exercise deleted: {id_exercise}")
                 return True, "Exercise berhasil dihapus!"
             else:
@@ -596,6 +759,8 @@ def ambil_system_health(queries: DatabaseQueries) -> Dict[str, Any]:
                 "status": api_health,
                 "metrics": api_stats
             },
+            "watcher": status_watcher(),
+            "backend_bersama": dapatkan_backend().status(),
             "checked_at": datetime.now()
         }
         
@@ -611,13 +776,13 @@ def ambil_system_health(queries: DatabaseQueries) -> Dict[str, Any]:
 
 def ambil_semua_sumber_daya(queries: DatabaseQueries) -> List[Dict[str, Any]]:
     """
-    Ambil semua sumber daya pembelajaran
+    Ambil semua sumber daya pembelajaran (dari cache katalog)
     
     Returns:
         List of sumber daya documents
     """
     try:
-        return queries.ambil_semua_sumber_daya()
+        return ambil_sumber_daya_katalog(queries)
     except Exception as e:
         logger.error(f"Error ambil semua sumber daya: {str(e)}")
         return []
@@ -636,7 +801,10 @@ def tambah_sumber_daya(queries: DatabaseQueries, data: Dict[str, Any]) -> Option
     """
     try:
         result = queries.tambah_sumber_daya(data)
-        return str(result) if result else None
+        if not result:
+            return None
+        invalidasi_katalog(queries)
+        return str(result)
     except Exception as e:
         logger.error(f"Error tambah sumber daya: {str(e)}")
         return None
@@ -655,7 +823,10 @@ def update_sumber_daya(queries: DatabaseQueries, id_sumber: str, data: Dict[str,
         True if success, False otherwise
     """
     try:
-        return queries.update_sumber_daya(id_sumber, data)
+        success = queries.update_sumber_daya(id_sumber, data)
+        if success:
+            invalidasi_katalog(queries)
+        return success
     except Exception as e:
         logger.error(f"Error update sumber daya: {str(e)}")
         return False
@@ -673,7 +844,10 @@ def hapus_sumber_daya(queries: DatabaseQueries, id_sumber: str) -> bool:
         True if success, False otherwise
     """
     try:
-        return queries.hapus_sumber_daya(id_sumber)
+        success = queries.hapus_sumber_daya(id_sumber)
+        if success:
+            invalidasi_katalog(queries)
+        return success
     except Exception as e:
         logger.error(f"Error hapus sumber daya: {str(e)}")
         return False
@@ -681,13 +855,13 @@ def hapus_sumber_daya(queries: DatabaseQueries, id_sumber: str) -> bool:
 
 def ambil_semua_topik(queries: DatabaseQueries) -> List[Dict[str, Any]]:
     """
-    Ambil semua topik pembelajaran
+    Ambil semua topik pembelajaran (dari cache katalog)
     
     Returns:
         List of topik documents
     """
     try:
-        return queries.ambil_semua_topik()
+        return ambil_topik_katalog(queries)
     except Exception as e:
         logger.error(f"Error ambil semua topik: {str(e)}")
         return []
@@ -706,7 +880,10 @@ def tambah_topik(queries: DatabaseQueries, data: Dict[str, Any]) -> Optional[str
     """
     try:
         result = queries.tambah_topik(data)
-        return str(result) if result else None
+        if not result:
+            return None
+        invalidasi_katalog(queries)
+        return str(result)
     except Exception as e:
         logger.error(f"Error tambah topik: {str(e)}")
         return None
@@ -725,7 +902,10 @@ def update_topik(queries: DatabaseQueries, id_topik: str, data: Dict[str, Any])
         True if success, False otherwise
     """
     try:
-        return queries.update_topik(id_topik, data)
+        success = queries.update_topik(id_topik, data)
+        if success:
+            invalidasi_katalog(queries)
+        return success
     except Exception as e:
         logger.error(f"Error update topik: {str(e)}")
         return False
@@ -743,7 +923,10 @@ def hapus_topik(queries: DatabaseQueries, id_topik: str) -> bool:
         True if success, False otherwise
     """
     try:
-        return queries.hapus_topik(id_topik)
+        success = queries.hapus_topik(id_topik)
+        if success:
+            invalidasi_katalog(queries)
+        return success
     except Exception as e:
         logger.error(f"Error hapus topik: {str(e)}")
         return False
@@ -751,13 +934,13 @@ def hapus_topik(queries: DatabaseQueries, id_topik: str) -> bool:
 
 def ambil_semua_exercises(queries: DatabaseQueries) -> List[Dict[str, Any]]:
     """
-    Ambil semua exercises
+    Ambil semua exercises (dari cache katalog)
     
     Returns:
         List of exercise documents
     """
     try:
-        return queries.ambil_semua_exercises()
+        return ambil_exercises_katalog(queries)
     except Exception as e:
         logger.error(f"Error ambil semua exercises: {str(e)}")
         return []
@@ -776,7 +959,10 @@ def tambah_exercise(queries: DatabaseQueries, data: Dict[str, Any]) -> Optional[
     """
     try:
         result = queries.tambah_exercise(data)
-        return str(result) if result else None
+        if not result:
+            return None
+        invalidasi_katalog(queries)
+        return str(result)
     except Exception as e:
         logger.error(f"Error tambah exercise: {str(e)}")
         return None
@@ -795,7 +981,10 @@ def update_exercise(queries: DatabaseQueries, id_exercise: str, data: Dict[str,
         True if success, False otherwise
     """
     try:
-        return queries.update_exercise(id_exercise, data)
+        success = queries.update_exercise(id_exercise, data)
+        if success:
+            invalidasi_katalog(queries)
+        return success
     except Exception as e:
         logger.error(f"Error update exercise: {str(e)}")
         return False
@@ -813,7 +1002,10 @@ def hapus_exercise(queries: DatabaseQueries, id_exercise: str) -> bool:
         True if success, False otherwise
     """
     try:
-        return queries.hapus_exercise(id_exercise)
+        success = queries.hapus_exercise(id_exercise)
+        if success:
+            invalidasi_katalog(queries)
+        return success
     except Exception as e:
         logger.error(f"Error hapus exercise: {str(e)}")
         return False
@@ -836,32 +1028,26 @@ def ambil_detail_mahasiswa(queries: DatabaseQueries, id_mahasiswa: str) -> Optio
         if not mahasiswa:
             return None
         
-        # Ambil statistik submission
-        riwayat = queries.ambil_riwayat_submisi(id_mahasiswa, limit=1000)
-        pola = queries.ambil_pola_mahasiswa(id_mahasiswa)
+        # Total & breakdown per tipe error dihitung di database (semua submisi,
+        # bukan 1000 terakhir); hanya 10 riwayat terbaru yang di-load
+        ringkasan_submisi = queries.ringkasan_submisi_periode(id_mahasiswa)
+        riwayat = queries.ambil_riwayat_submisi(id_mahasiswa, limit=10, tampilan="ringkasan")
+        pola = queries.ambil_pola_mahasiswa(id_mahasiswa, tampilan="ringkasan")
         progress = queries.ambil_progress_mahasiswa(id_mahasiswa)
         
-        # Hitung stats
-        total_submisi = len(riwayat)
-        total_pola = len(pola)
-        avg_penguasaan = sum(p.get("tingkat_penguasaan", 0) for p in progress) / len(progress) if progress else 0
-        
-        # Error breakdown
-        error_counts: Dict[str, int] = {}
-        for r in riwayat:
-            tipe = r.get("tipe_error", "Unknown")
-            error_counts[tipe] = error_counts.get(tipe, 0) + 1
+        # Statistik progress (vectorized)
+        ringkasan = ringkasan_progress(frame_progress(progress))
         
         return {
             "profile": mahasiswa,
             "statistik": {
-                "total_submisi": total_submisi,
-                "total_pola": total_pola,
-                "avg_penguasaan": avg_penguasaan,
-                "topik_dipelajari": len(progress),
-                "error_breakdown": error_counts
+                "total_submisi": ringkasan_submisi["total"],
+                "total_pola": len(pola),
+                "avg_penguasaan": ringkasan["avg_penguasaan"],
+                "topik_dipelajari": ringkasan["total_topik"],
+                "error_breakdown": dict(ringkasan_submisi["per_tipe"])
             },
-            "riwayat_terbaru": riwayat[:10],
+            "riwayat_terbaru": riwayat,
             "pola_terbanyak": pola[:5],
             "progress": progress
         }
@@ -5,18 +5,31 @@ CATATAN:
 - Menggunakan GitHub Models untuk cost-efficiency (FREE tier)
 - LangChain untuk prompt management & structured outputs
 - Fallback ke Azure OpenAI jika perlu
+- Input prompt (kode, traceback, riwayat) dipangkas ke anggaran token per request
+  (utils/anggaran_prompt.py); format instructions memakai versi ringkas dari schema
+- Token per panggilan dari usage respons provider (callback LangChain), fallback tokenizer
+  offline (utils/tokenizer.py); keduanya dicatat di metrik_ai
 """
 
+import json
 import os
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple, TYPE_CHECKING
 import logging
-from langchain_openai import AzureChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from datetime import datetime
 
 from config import settings
+from utils.anggaran_prompt import InputPrompt, susun_input_prompt
+from utils.tokenizer import hitung_token, hitung_token_pesan
+
+if TYPE_CHECKING:
+    # langchain berat untuk di-import (~detik saat cold start), jadi di-import
+    # di dalam fungsi yang memakainya saja
+    from langchain_openai import AzureChatOpenAI
+    from langchain.prompts import ChatPromptTemplate
+    from utils.llm_palsu import LLMPalsu
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +50,7 @@ class HasilAnalisis(BaseModel):
 
 # ==================== LLM INITIALIZATION ====================
 
-def dapatkan_llm_github_models() -> AzureChatOpenAI:
+def dapatkan_llm_github_models() -> "AzureChatOpenAI":
     """
     Initialize LLM dengan GitHub Models (FREE!)
     
@@ -50,6 +63,8 @@ def dapatkan_llm_github_models() -> AzureChatOpenAI:
     - gpt-4o (most capable)
     - phi-3-mini (Microsoft's model)
     """
+    from langchain_openai import AzureChatOpenAI
+    
     try:
         llm = AzureChatOpenAI(
             model="gpt-4o-mini",  # atau "gpt-4o" untuk quality lebih tinggi
@@ -67,11 +82,13 @@ def dapatkan_llm_github_models() -> AzureChatOpenAI:
         raise
 
 
-def dapatkan_llm_azure_openai() -> AzureChatOpenAI:
+def dapatkan_llm_azure_openai() -> "AzureChatOpenAI":
     """
     Fallback: Initialize LLM dengan Azure OpenAI
     (Gunakan jika GitHub Models tidak tersedia)
     """
+    from langchain_openai import AzureChatOpenAI
+    
     try:
         llm = AzureChatOpenAI(
             model="gpt-4o-mini",
@@ -89,8 +106,34 @@ def dapatkan_llm_azure_openai() -> AzureChatOpenAI:
         raise
 
 
-def dapatkan_llm() -> AzureChatOpenAI:
-    """Auto-select LLM based on settings"""
+def dapatkan_llm_palsu() -> "LLMPalsu":
+    """
+    LLM palsu untuk load test (settings.USE_FAKE_LLM): latensi, kegagalan & jawaban
+    kalengan bisa diatur, tanpa network dan tanpa memakai kuota
+    """
+    from utils.llm_palsu import LLMPalsu
+    
+    logger.warning("USE_FAKE_LLM aktif: analisis memakai LLM palsu")
+    return LLMPalsu(
+        latensi_ms=settings.FAKE_LLM_LATENSI_MS,
+        distribusi=settings.FAKE_LLM_DISTRIBUSI,
+        sebaran=settings.FAKE_LLM_SEBARAN,
+        tingkat_gagal=settings.FAKE_LLM_TINGKAT_GAGAL,
+        tingkat_rusak=settings.FAKE_LLM_TINGKAT_RUSAK,
+        seed=settings.FAKE_LLM_SEED
+    )
+
+
+@lru_cache(maxsize=1)
+def dapatkan_llm() -> "AzureChatOpenAI":
+    """
+    Auto-select LLM based on settings
+    
+    Client di-cache per proses (settings tidak berubah saat runtime), sehingga
+    HTTP client & konfigurasi hanya dibuat sekali (saat warm-up).
+    """
+    if settings.USE_FAKE_LLM:
+        return dapatkan_llm_palsu()  # type: ignore[return-value]
     if settings.USE_GITHUB_MODELS:
         return dapatkan_llm_github_models()
     else:
@@ -153,9 +196,9 @@ Berikan analisis mendalam yang berfokus pada:
 PENTING: Penjelasan dalam Bahasa Indonesia yang mudah dipahami!"""
 
 
-def buat_prompt_analisis_semantik() -> ChatPromptTemplate:
+def buat_prompt_analisis_semantik() -> "ChatPromptTemplate":
     """Buat prompt template untuk semantic error analysis"""
-    parser = PydanticOutputParser(pydantic_object=HasilAnalisis)  # type: ignore
+    from langchain.prompts import ChatPromptTemplate
     
     prompt = ChatPromptTemplate.from_messages([
         ("system", SYSTEM_PROMPT_SEMANTIC_ANALYSIS),
@@ -167,13 +210,90 @@ def buat_prompt_analisis_semantik() -> ChatPromptTemplate:
 
 # ==================== SEMANTIC ANALYSIS FUNCTION ====================
 
-def analisis_error_semantik(
+def _format_instruksi_ringkas() -> str:
+    """Format instructions ringkas dari schema HasilAnalisis (pengganti JSON schema lengkap parser)"""
+    field = "\n".join(
+        f'- "{nama}" ({"list string" if info.annotation == list[str] else "string"}): {info.description}'
+        for nama, info in HasilAnalisis.model_fields.items()
+    )
+    return (
+        "Jawab HANYA dengan satu JSON object (tanpa teks lain) berisi key berikut:\n"
+        f"{field}"
+    )
+
+
+FORMAT_INSTRUKSI_RINGKAS = _format_instruksi_ringkas()
+
+
+@lru_cache(maxsize=1)
+def _token_bagian_tetap() -> Tuple[int, int]:
+    """Token template prompt (system + user) dengan format instructions lengkap vs ringkas"""
+    template = SYSTEM_PROMPT_SEMANTIC_ANALYSIS + USER_PROMPT_TEMPLATE
+    schema_lengkap = json.dumps(HasilAnalisis.model_json_schema())
+    return (
+        hitung_token_estimasi(template.replace("{format_instructions}", schema_lengkap)),
+        hitung_token_estimasi(template.replace("{format_instructions}", FORMAT_INSTRUKSI_RINGKAS)),
+    )
+
+
+def siapkan_input_prompt(kode: str, pesan_error: str, riwayat_error: list[Dict[str, Any]]) -> InputPrompt:
+    """
+    Pangkas kode, traceback, dan riwayat ke anggaran token per request (settings.PROMPT_ANGGARAN_TOKEN)
+    
+    Returns:
+        InputPrompt dengan token_asli (prompt tanpa pemangkasan) & token_akhir (yang dikirim)
+    """
+    token_tetap_asli, token_tetap_akhir = _token_bagian_tetap()
+    return susun_input_prompt(
+        kode=kode,
+        pesan_error=pesan_error,
+        riwayat_error=riwayat_error,
+        anggaran=max(settings.PROMPT_ANGGARAN_TOKEN - token_tetap_akhir, 200),
+        hitung=hitung_token_estimasi,
+        radius=settings.PROMPT_RADIUS_BARIS,
+        token_tetap_asli=token_tetap_asli,
+        token_tetap_akhir=token_tetap_akhir
+    )
+
+
+@dataclass
+class PemakaianToken:
+    """Token satu panggilan LLM: dari usage provider jika ada, selain itu tokenizer offline"""
+    token_input: int = 0
+    token_output: int = 0
+    sumber_token: str = "tokenizer"  # provider / tokenizer
+    token_input_lokal: int = 0  # Hitungan tokenizer offline (selalu dicatat, untuk kalibrasi)
+    token_output_lokal: int = 0
+
+    @property
+    def total_token(self) -> int:
+        return self.token_input + self.token_output
+
+
+def _hitung_pemakaian(callback: Any, isi_pesan: list[str], teks_output: str) -> PemakaianToken:
+    """Gabungkan usage provider (callback LangChain) dengan hitungan tokenizer offline"""
+    pemakaian = PemakaianToken(
+        token_input_lokal=hitung_token_pesan(isi_pesan),
+        token_output_lokal=hitung_token_estimasi(teks_output)
+    )
+    if callback is not None and callback.prompt_tokens > 0:
+        pemakaian.token_input = callback.prompt_tokens
+        pemakaian.token_output = callback.completion_tokens
+        pemakaian.sumber_token = "provider"
+    else:
+        pemakaian.token_input = pemakaian.token_input_lokal
+        pemakaian.token_output = pemakaian.token_output_lokal
+    return pemakaian
+
+
+def analisis_error_semantik_dengan_pemakaian(
     kode: str,
     pesan_error: str,
     bahasa: str,
     tingkat_kemahiran: str,
-    riwayat_error: list[Dict[str, Any]]
-) -> Optional[HasilAnalisis]:
+    riwayat_error: list[Dict[str, Any]],
+    input_prompt: Optional[InputPrompt] = None
+) -> Tuple[Optional[HasilAnalisis], PemakaianToken]:
     """
     Analisis error secara semantik menggunakan LangChain + GitHub Models
     
@@ -185,10 +305,16 @@ def analisis_error_semantik(
         bahasa: Programming language (python, javascript, java, cpp)
         tingkat_kemahiran: Level mahasiswa (pemula, menengah, mahir)
         riwayat_error: Recent error history untuk konteks
+        input_prompt: Hasil siapkan_input_prompt (dibuat di sini jika None)
     
     Returns:
-        HasilAnalisis object dengan structured analysis
+        Tuple (HasilAnalisis atau None jika gagal, PemakaianToken panggilan ini).
+        Pemakaian tetap diisi jika LLM menjawab tapi output gagal di-parse.
     """
+    from langchain.output_parsers import PydanticOutputParser
+    from langchain_community.callbacks import get_openai_callback
+    
+    pemakaian = PemakaianToken()
     try:
         start_time = datetime.now()
         
@@ -201,24 +327,26 @@ def analisis_error_semantik(
         # 3. Create prompt
         prompt = buat_prompt_analisis_semantik()
         
-        # 4. Format riwayat error untuk context
-        riwayat_context = "\n".join([
-            f"- {err.get('tipe_error', 'Unknown')}: {err.get('kesenjangan_konsep', 'N/A')}"
-            for err in riwayat_error[:5]  # Ambil 5 terakhir saja
-        ]) if riwayat_error else "Belum ada riwayat error"
+        # 4. Pangkas kode, traceback & riwayat ke anggaran token
+        if input_prompt is None:
+            input_prompt = siapkan_input_prompt(kode, pesan_error, riwayat_error)
         
-        # 5. Create chain
-        chain = prompt | llm | parser
+        pesan = prompt.format_messages(
+            kode=input_prompt.kode,
+            pesan_error=input_prompt.pesan_error,
+            bahasa=bahasa,
+            tingkat_kemahiran=tingkat_kemahiran,
+            riwayat_error=input_prompt.riwayat_error,
+            format_instructions=FORMAT_INSTRUKSI_RINGKAS
+        )
+        
+        # 5. Invoke LLM (synchronous untuk Streamlit compatibility), usage dari callback
+        with get_openai_callback() as callback:
+            respons = llm.invoke(pesan)
+        pemakaian = _hitung_pemakaian(callback, [str(item.content) for item in pesan], str(respons.content))
         
-        # 6. Invoke chain (synchronous untuk Streamlit compatibility)
-        result: HasilAnalisis = chain.invoke({
-            "kode": kode,
-            "pesan_error": pesan_error,
-            "bahasa": bahasa,
-            "tingkat_kemahiran": tingkat_kemahiran,
-            "riwayat_error": riwayat_context,
-            "format_instructions": parser.get_format_instructions()
-        })
+        # 6. Parse structured output
+        result: HasilAnalisis = parser.parse(str(respons.content))
         
         # 7. Calculate metrics
         end_time = datetime.now()
@@ -227,39 +355,70 @@ def analisis_error_semantik(
         logger.info(f"Semantic analysis completed in {waktu_respons:.2f}s")
         logger.info(f"Error type detected: {result.tipe_error}")
         logger.info(f"Bloom level: {result.level_bloom}")
+        logger.info(
+            f"Token: {pemakaian.token_input} in / {pemakaian.token_output} out ({pemakaian.sumber_token}), "
+            f"hemat {input_prompt.token_dihemat}"
+        )
         
-        return result
+        return result, pemakaian
         
     except Exception as e:
         logger.error(f"Error dalam analisis semantik: {str(e)}", exc_info=True)
-        return None
+        return None, pemakaian
+
+
+def analisis_error_semantik(
+    kode: str,
+    pesan_error: str,
+    bahasa: str,
+    tingkat_kemahiran: str,
+    riwayat_error: list[Dict[str, Any]],
+    input_prompt: Optional[InputPrompt] = None
+) -> Optional[HasilAnalisis]:
+    """
+    Analisis error secara semantik (tanpa info pemakaian token)
+    
+    Returns:
+        HasilAnalisis object dengan structured analysis
+    """
+    hasil, _ = analisis_error_semantik_dengan_pemakaian(
+        kode, pesan_error, bahasa, tingkat_kemahiran, riwayat_error, input_prompt
+    )
+    return hasil
 
 
 # ==================== TOKEN COUNTING (untuk metrik) ====================
 
 def hitung_token_estimasi(text: str) -> int:
     """
-    Estimasi jumlah token (rough estimation)
-    1 token ≈ 4 characters untuk English
-    1 token ≈ 2-3 characters untuk Indonesian (lebih efisien)
+    Jumlah token teks (tiktoken jika terpasang, selain itu tokenizer offline)
+    
+    Dipakai untuk anggaran prompt & cek kuota sebelum request; metrik_ai memakai
+    usage dari provider jika tersedia (lihat PemakaianToken).
     """
-    return len(text) // 3
+    return hitung_token(text)
+
+
+# Harga per 1K token (input, output) Azure OpenAI
+HARGA_PER_1K_TOKEN = {
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+}
 
 
 def hitung_biaya_estimasi(token_input: int, token_output: int, model: str = "gpt-4o-mini") -> float:
     """
-    Hitung estimasi biaya AI call
+    Hitung biaya AI call dari jumlah token (usage provider / tokenizer)
     
     GitHub Models: FREE (no cost!)
-    Azure OpenAI GPT-4o-mini:
-    - Input: $0.00015/1K tokens
-    - Output: $0.0006/1K tokens
+    Azure OpenAI: lihat HARGA_PER_1K_TOKEN
     """
     if settings.USE_GITHUB_MODELS:
         return 0.0  # FREE!
     
     # Azure OpenAI pricing
-    biaya_input = (token_input / 1000) * 0.00015
-    biaya_output = (token_output / 1000) * 0.0006
+    harga_input, harga_output = HARGA_PER_1K_TOKEN.get(model, HARGA_PER_1K_TOKEN["gpt-4o-mini"])
+    biaya_input = (token_input / 1000) * harga_input
+    biaya_output = (token_output / 1000) * harga_output
     
     return biaya_input + biaya_output
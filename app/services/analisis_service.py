@@ -7,6 +7,11 @@ CATATAN:
 - Pattern detection (≥3 errors of same type)
 - Progress tracking otomatis
 - Metrics logging untuk admin monitoring
+- Submisi hampir identik (MinHash/LSH, services/duplikat_service.py) memakai ulang
+  analisis sebelumnya tanpa LLM call; kiriman ulang mahasiswa sendiri hanya menaikkan
+  jumlah_pengulangan di submisi asal
+- Error "buku teks" diklasifikasi lokal (services/klasifikasi_service.py) jika keyakinan
+  ≥ settings.KLASIFIKASI_LOKAL_AMBANG; analisis tanpa LLM dicatat di metrik_ai (sumber lokal/duplikat)
 """
 
 import logging
@@ -15,16 +20,29 @@ from datetime import datetime
 from bson import ObjectId
 
 from services.ai_service import (
-    analisis_error_semantik,
+    analisis_error_semantik_dengan_pemakaian,
     HasilAnalisis,
-    hitung_token_estimasi,
-    hitung_biaya_estimasi
+    PemakaianToken,
+    hitung_biaya_estimasi,
+    siapkan_input_prompt
 )
+from services.duplikat_service import cari_submisi_mirip, daftarkan_submisi
+from services.katalog_service import cari_sumber_daya_by_topik
+from services.klasifikasi_service import klasifikasi_lokal, parse_traceback
+from services.kuota_service import KuotaHabisError, catat_pemakaian, pastikan_kuota
+from services.penguasaan_service import catat_error_topik
+from services.snapshot_service import rata_rata_delta, snapshot_progress_batch
+from config import settings
+from database.kumpulan_query import KumpulanQuery
 from database.queries import DatabaseQueries
 from database.models import SubmisiError, MetrikAI
+from utils.minhash import diff_kode, ke_bytes, signature
 
 logger = logging.getLogger(__name__)
 
+# Tipe untuk sumber daya katalog tanpa field `tipe` (default model SumberDaya)
+TIPE_SUMBER_DAYA_DEFAULT = "artikel"
+
 
 # ==================== MAIN ANALYSIS FUNCTION ====================
 
@@ -65,22 +83,83 @@ def proses_analisis_error(
         
         tingkat_kemahiran = mahasiswa.get("tingkat_kemahiran", "pemula")
         
-        # 2. Get recent error history untuk konteks AI
-        riwayat_error = queries.ambil_submisi_terakhir(id_mahasiswa, jumlah=5)
-        
-        # 3. Call AI untuk semantic analysis (synchronous)
-        logger.info(f"Starting semantic analysis untuk mahasiswa: {id_mahasiswa}")
-        
-        hasil_ai: Optional[HasilAnalisis] = analisis_error_semantik(
-            kode=kode,
-            pesan_error=pesan_error,
-            bahasa=bahasa,
-            tingkat_kemahiran=tingkat_kemahiran,
-            riwayat_error=riwayat_error
-        )
+        # 2. Cek submisi hampir identik (MinHash/LSH) - analisis sebelumnya dipakai ulang
+        sig = signature(kode, pesan_error, bahasa)
+        mirip = None
+        try:
+            mirip = cari_submisi_mirip(queries, id_mahasiswa, sig, pesan_error, parse_traceback(pesan_error)[0])
+        except Exception as e:
+            logger.warning(f"Lookup submisi mirip gagal: {str(e)}")
+        submisi_asal = queries.ambil_submisi_by_id(mirip.id_submisi) if mirip else None
+        
+        if submisi_asal and mirip.milik_sendiri:
+            # Kiriman ulang mahasiswa sendiri: tidak ada LLM call & dokumen baru
+            queries.catat_pengulangan_submisi(submisi_asal["_id"], start_time)
+            logger.info(f"Submisi ulang terdeteksi ({mirip.kemiripan:.2f}), pakai analisis {submisi_asal['_id']}")
+            submisi = SubmisiError(
+                **_analisis_dari_submisi(submisi_asal).model_dump(),
+                id_mahasiswa=ObjectId(id_mahasiswa),
+                kode=kode,
+                pesan_error=pesan_error,
+                bahasa=bahasa,
+                duplikat_dari=submisi_asal["_id"],
+                kemiripan=mirip.kemiripan,
+                diff_kode=diff_kode(submisi_asal.get("kode", ""), kode),
+                created_at=submisi_asal.get("created_at", start_time),
+                _id=submisi_asal["_id"]
+            )
+            _catat_metrik_offload(queries, submisi_asal["_id"], "duplikat", "minhash", start_time,
+                                  token_dihemat=_token_prompt_dihindari(kode, pesan_error))
+            return submisi, None
+        
+        # 3. Pre-classifier lokal (aturan + ast) untuk error "buku teks"
+        kandidat_lokal = None if submisi_asal else klasifikasi_lokal(kode, pesan_error, bahasa, tingkat_kemahiran)
+        lokal = kandidat_lokal
+        if lokal and lokal.keyakinan < settings.KLASIFIKASI_LOKAL_AMBANG:
+            logger.info(f"Klasifikasi lokal '{lokal.aturan}' kurang yakin ({lokal.keyakinan:.2f}), lanjut ke LLM")
+            lokal = None
+        
+        riwayat_error: list = []
+        input_prompt = None
+        pemakaian: Optional[PemakaianToken] = None
+        if not submisi_asal and not lokal:
+            # Kode, traceback & riwayat dipangkas ke anggaran token, lalu cek kuota token harian
+            riwayat_error = queries.ambil_submisi_terakhir(id_mahasiswa, jumlah=5)
+            input_prompt = siapkan_input_prompt(kode, pesan_error, riwayat_error)
+            try:
+                pastikan_kuota(queries, input_prompt.token_akhir)
+            except KuotaHabisError:
+                if kandidat_lokal is None:
+                    raise
+                # Hasil lokal yang kurang yakin lebih baik daripada tidak ada analisis sama sekali
+                logger.warning(f"Kuota habis, pakai klasifikasi lokal '{kandidat_lokal.aturan}'")
+                lokal = kandidat_lokal
+        
+        if submisi_asal:
+            # Submisi identik milik mahasiswa lain (ambang ketat): analisis dipakai, submisi tetap dicatat
+            logger.info(f"Submisi identik global ({mirip.kemiripan:.2f}), pakai analisis {submisi_asal['_id']}")
+            hasil_ai: Optional[HasilAnalisis] = _analisis_dari_submisi(submisi_asal)
+        elif lokal:
+            logger.info(f"Klasifikasi lokal '{lokal.aturan}' (keyakinan {lokal.keyakinan:.2f}), LLM dilewati")
+            hasil_ai = lokal.hasil
+        else:
+            # Semantic analysis (synchronous) dengan riwayat error sebagai konteks
+            logger.info(f"Starting semantic analysis untuk mahasiswa: {id_mahasiswa}")
+            hasil_ai, pemakaian = analisis_error_semantik_dengan_pemakaian(
+                kode=kode,
+                pesan_error=pesan_error,
+                bahasa=bahasa,
+                tingkat_kemahiran=tingkat_kemahiran,
+                riwayat_error=riwayat_error,
+                input_prompt=input_prompt
+            )
+            catat_pemakaian(pemakaian.total_token)
         
         if not hasil_ai:
             logger.error("AI analysis gagal")
+            if pemakaian and pemakaian.total_token:
+                # Token tetap terpakai walau output gagal di-parse
+                _catat_metrik_llm(queries, None, pemakaian, start_time, gagal="Output LLM tidak valid")
             return None, None
         
         # 4. Create SubmisiError object
@@ -97,14 +176,19 @@ def proses_analisis_error(
             saran_perbaikan=hasil_ai.saran_perbaikan,
             topik_terkait=hasil_ai.topik_terkait,
             saran_latihan=hasil_ai.saran_latihan,
+            minhash=ke_bytes(sig) if sig is not None else None,
+            duplikat_dari=submisi_asal["_id"] if submisi_asal else None,
+            kemiripan=mirip.kemiripan if submisi_asal else None,
+            diff_kode=diff_kode(submisi_asal.get("kode", ""), kode) if submisi_asal else None,
             created_at=datetime.now()
         )
         
         # 5. Save ke database
-        id_submisi = queries.simpan_submisi_error(submisi.to_dict())
+        id_submisi = queries.simpan_submisi_error(submisi.to_dict(settings.KOMPRESI_TEKS_AMBANG_BYTE))
         submisi._id = id_submisi
         
         logger.info(f"Submisi error saved: {id_submisi}")
+        daftarkan_submisi(id_submisi, sig, id_mahasiswa, submisi.tipe_error, submisi.created_at)
         
         # 6. Check for pattern (≥3 errors of same type)
         pattern_alert: Optional[str] = None
@@ -129,47 +213,40 @@ def proses_analisis_error(
                 f"Lihat halaman **Pola Error** untuk detail lengkap."
             )
         
-        # 7. Update progress tracking untuk topik terkait
-        for topik in hasil_ai.topik_terkait:
-            queries.buat_atau_update_progress(
-                id_mahasiswa=id_mahasiswa,
-                topik=topik
-            )
-            
-            # Increment error count di topik pembelajaran
-            queries.increment_error_count_topik(topik)
-        
-        # 8. Log AI metrics untuk admin monitoring
-        end_time = datetime.now()
-        waktu_respons = (end_time - start_time).total_seconds()
-        
-        # Estimate tokens (rough estimation)
-        token_input = hitung_token_estimasi(kode + pesan_error)
-        token_output = hitung_token_estimasi(hasil_ai.penjelasan + hasil_ai.saran_perbaikan)
-        total_token = token_input + token_output
-        biaya = hitung_biaya_estimasi(token_input, token_output)
-        
-        metrik = MetrikAI(
-            id_submisi=id_submisi,
-            model="gpt-4o-mini",  # atau model yang dipakai
-            token_input=token_input,
-            token_output=token_output,
-            total_token=total_token,
-            biaya=biaya,
-            waktu_respons=waktu_respons,
-            status_berhasil=True,
-            created_at=datetime.now()
-        )
-        
-        queries.simpan_metrik_ai(metrik.to_dict())
+        # 7. Update penguasaan topik terkait (satu bulk write) + titik snapshot untuk delta & tren
+        progress_baru = catat_error_topik(queries, id_mahasiswa, hasil_ai.topik_terkait)
+        try:
+            snapshot_progress_batch(queries, progress_baru)
+        except Exception as e:
+            logger.warning(f"Snapshot penguasaan gagal: {str(e)}")
+        
+        # Increment error count di topik pembelajaran
+        if hasil_ai.topik_terkait:
+            queries.increment_error_count_topik_bulk(hasil_ai.topik_terkait)
+        
+        if submisi_asal or lokal:
+            # Tanpa LLM call: dicatat sebagai offload (token & biaya nol)
+            if submisi_asal:
+                _catat_metrik_offload(queries, id_submisi, "duplikat", "minhash", start_time,
+                                      token_dihemat=_token_prompt_dihindari(kode, pesan_error))
+            else:
+                _catat_metrik_offload(queries, id_submisi, "lokal", f"aturan:{lokal.aturan}", start_time)
+            return submisi, pattern_alert
+        
+        # 8. Log AI metrics untuk admin monitoring (token dari usage provider / tokenizer)
+        metrik = _catat_metrik_llm(queries, id_submisi, pemakaian, start_time,
+                                   token_dihemat=input_prompt.token_dihemat)
         
         logger.info(
-            f"Analysis completed: {waktu_respons:.2f}s, "
-            f"{total_token} tokens, ${biaya:.4f}"
+            f"Analysis completed: {metrik.waktu_respons:.2f}s, "
+            f"{metrik.total_token} tokens ({metrik.sumber_token}, hemat {metrik.token_dihemat}), ${metrik.biaya:.4f}"
         )
         
         return submisi, pattern_alert
         
+    except KuotaHabisError:
+        # Diteruskan ke UI supaya mahasiswa tahu alasannya (bukan "analisis gagal")
+        raise
     except Exception as e:
         logger.error(f"Error dalam proses analisis: {str(e)}", exc_info=True)
         
@@ -195,6 +272,85 @@ def proses_analisis_error(
 
 # ==================== HELPER FUNCTIONS ====================
 
+def _catat_metrik_llm(
+    queries: DatabaseQueries,
+    id_submisi: Optional[ObjectId],
+    pemakaian: PemakaianToken,
+    start_time: datetime,
+    token_dihemat: int = 0,
+    gagal: Optional[str] = None
+) -> MetrikAI:
+    """Catat satu panggilan LLM di metrik_ai (token provider + hitungan tokenizer offline)"""
+    metrik = MetrikAI(
+        id_submisi=id_submisi,
+        model="gpt-4o-mini",  # atau model yang dipakai
+        token_input=pemakaian.token_input,
+        token_output=pemakaian.token_output,
+        total_token=pemakaian.total_token,
+        biaya=hitung_biaya_estimasi(pemakaian.token_input, pemakaian.token_output),
+        waktu_respons=(datetime.now() - start_time).total_seconds(),
+        status_berhasil=gagal is None,
+        error_message=gagal,
+        token_dihemat=token_dihemat,
+        sumber_token=pemakaian.sumber_token,
+        token_input_lokal=pemakaian.token_input_lokal,
+        token_output_lokal=pemakaian.token_output_lokal,
+        created_at=datetime.now()
+    )
+    try:
+        queries.simpan_metrik_ai(metrik.to_dict())
+    except Exception as e:
+        logger.warning(f"Gagal catat metrik LLM: {str(e)}")
+    return metrik
+
+
+def _catat_metrik_offload(
+    queries: DatabaseQueries,
+    id_submisi: Optional[ObjectId],
+    sumber: str,
+    model: str,
+    start_time: datetime,
+    token_dihemat: int = 0
+) -> None:
+    """Catat analisis tanpa LLM call (lokal / duplikat) di metrik_ai untuk offload rate"""
+    try:
+        metrik = MetrikAI(
+            id_submisi=id_submisi,
+            model=model,
+            waktu_respons=(datetime.now() - start_time).total_seconds(),
+            status_berhasil=True,
+            sumber=sumber,
+            token_dihemat=token_dihemat,
+            created_at=datetime.now()
+        )
+        queries.simpan_metrik_ai(metrik.to_dict())
+    except Exception as e:
+        logger.warning(f"Gagal catat metrik offload: {str(e)}")
+
+
+def _token_prompt_dihindari(kode: str, pesan_error: str) -> int:
+    """Estimasi token prompt (sebelum dipangkas, tanpa riwayat) yang tidak dikirim karena analisis dipakai ulang"""
+    try:
+        return siapkan_input_prompt(kode, pesan_error, []).token_asli
+    except Exception as e:
+        logger.warning(f"Gagal estimasi token prompt: {str(e)}")
+        return 0
+
+
+def _analisis_dari_submisi(dokumen: Dict[str, Any]) -> HasilAnalisis:
+    """Bangun HasilAnalisis dari dokumen submisi yang sudah dianalisis (untuk dipakai ulang)"""
+    return HasilAnalisis(
+        tipe_error=dokumen.get("tipe_error") or "Unknown",
+        penyebab_utama=dokumen.get("penyebab_utama") or "",
+        kesenjangan_konsep=dokumen.get("kesenjangan_konsep") or "",
+        level_bloom=dokumen.get("level_bloom") or "Understand",
+        penjelasan=dokumen.get("penjelasan") or "",
+        saran_perbaikan=dokumen.get("saran_perbaikan") or "",
+        topik_terkait=dokumen.get("topik_terkait") or [],
+        saran_latihan=dokumen.get("saran_latihan") or ""
+    )
+
+
 def format_hasil_analisis(submisi: SubmisiError, pattern_alert: Optional[str] = None) -> Dict[str, Any]:
     """
     Format hasil analisis untuk ditampilkan di UI
@@ -229,12 +385,6 @@ def ambil_rekomendasi_belajar(
         Dictionary dengan videos, articles, exercises, quizzes
     """
     try:
-        # Get all resources for topik
-        semua_resources = queries.ambil_sumber_daya_by_topik(
-            topik=topik,
-            tingkat=tingkat_kesulitan
-        )
-        
         # Group by type
         rekomendasi = {
             "video": [],
@@ -244,8 +394,10 @@ def ambil_rekomendasi_belajar(
             "quiz": []
         }
         
-        for resource in semua_resources:
-            tipe = resource.get("tipe", "artikel")
+        # Satu lookup semua bucket tipe; dokumen katalog lama tanpa `tipe` masuk ke
+        # default model SumberDaya ("artikel"), bukan dibuang
+        for resource in cari_sumber_daya_by_topik(queries, topik, tingkat_kesulitan):
+            tipe = resource.get("tipe") or TIPE_SUMBER_DAYA_DEFAULT
             if tipe in rekomendasi:
                 rekomendasi[tipe].append({
                     "id": str(resource["_id"]),
@@ -274,26 +426,38 @@ def hitung_statistik_mahasiswa(
         Always returns complete structure dengan defaults untuk avoid None errors
     """
     try:
+        # Query dashboard saling independen: dijalankan paralel (database/kumpulan_query.py)
+        hasil = (
+            KumpulanQuery(queries)
+            .tambah("total_submisi", "hitung_total_submisi", id_mahasiswa)
+            .tambah("riwayat_semua", "ambil_riwayat_submisi", id_mahasiswa, limit=1000, tampilan="konteks")
+            .tambah("pola_errors", "ambil_pola_mahasiswa", id_mahasiswa, tampilan="ringkasan")
+            .tambah("progress_data", "ambil_progress_mahasiswa", id_mahasiswa)
+            .tambah("rata_rata_penguasaan", "hitung_rata_rata_penguasaan", id_mahasiswa)
+            .tambah("recent_activity", "ambil_riwayat_submisi", id_mahasiswa, limit=10, tampilan="ringkasan")
+            .jalankan()
+        )
+        
         # Total submisi
-        total_submisi = queries.hitung_total_submisi(id_mahasiswa) or 0
+        total_submisi = hasil["total_submisi"] or 0
         
         # Submisi minggu ini (last 7 days)
         from datetime import timedelta
         seminggu_lalu = datetime.now() - timedelta(days=7)
-        riwayat_semua = queries.ambil_riwayat_submisi(id_mahasiswa, limit=1000)
+        riwayat_semua = hasil["riwayat_semua"]
         submisi_minggu_ini = len([r for r in riwayat_semua if r.get("created_at", datetime.min) >= seminggu_lalu]) or 0
         
         # Ambil pola error (top 5)
-        pola_errors = queries.ambil_pola_mahasiswa(id_mahasiswa)[:5] or []
+        pola_errors = hasil["pola_errors"][:5] or []
         
         # Progress learning
-        progress_data = queries.ambil_progress_mahasiswa(id_mahasiswa) or []
+        progress_data = hasil["progress_data"] or []
         
         # Rata-rata penguasaan
-        rata_rata_penguasaan = queries.hitung_rata_rata_penguasaan(id_mahasiswa) or 0.0
+        rata_rata_penguasaan = hasil["rata_rata_penguasaan"] or 0.0
         
         # Recent activity (10 terakhir untuk dashboard)
-        recent_activity = queries.ambil_riwayat_submisi(id_mahasiswa, limit=10) or []
+        recent_activity = hasil["recent_activity"] or []
         
         # Top pola untuk display
         top_pola = [
@@ -310,7 +474,9 @@ def hitung_statistik_mahasiswa(
             {
                 "topik": prog.get("topik", "Unknown"),
                 "tingkat_penguasaan": prog.get("tingkat_penguasaan", 0),
-                "jumlah_error_di_topik": prog.get("jumlah_error_di_topik", 0)
+                "jumlah_error_di_topik": prog.get("jumlah_error_di_topik", 0),
+                "tren_perbaikan": prog.get("tren_perbaikan") or "stagnan",
+                "penguasaan_delta": prog.get("penguasaan_delta", 0.0)
             }
             for prog in progress_data
         ]
@@ -353,8 +519,9 @@ def hitung_statistik_mahasiswa(
                 f"Perhatian: Anda sering mengalami error '{top_pola[0]['jenis_kesalahan']}'. Lihat halaman Pola Error."
             )
         
-        # Penguasaan delta (improvement) - simplified as 0 for now
-        penguasaan_delta = 0.0  # TODO: Calculate based on historical data
+        # Penguasaan delta: rata-rata delta per topik yang disimpan snapshot service
+        # (dihitung dari titik snapshot terakhir, bukan scan riwayat submisi)
+        penguasaan_delta = rata_rata_delta(progress_data)
         
         return {
             # Key metrics
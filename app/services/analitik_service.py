@@ -0,0 +1,233 @@
+"""
+Analitik Service - Statistik progress, pola, dan submisi secara vectorized
+
+CATATAN:
+- Dokumen MongoDB dimuat SEKALI ke struktur kolumnar (pandas DataFrame / NumPy array),
+  lalu jumlah, rata-rata, distribusi, persentil, group-by, dan ranking dihitung vectorized
+- Dipakai halaman Progress, Pola, Export, Analitik Global, dan admin_service
+  (menggantikan loop per-dict & sorted(...) berulang di masing-masing halaman)
+- Frame memakai RangeIndex = posisi dokumen di list asal, jadi hasil filter/urut bisa
+  dipetakan balik ke dokumen aslinya (lihat dokumen_urut)
+- Semua fungsi aman untuk input kosong (mengembalikan nilai nol / frame kosong)
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Batas penguasaan untuk topik "lemah" (dipakai Progress page & rekomendasi)
+BATAS_TOPIK_LEMAH = 60.0
+# Frekuensi pola dianggap tinggi / sedang
+FREKUENSI_TINGGI = 5
+FREKUENSI_SEDANG = 3
+
+KOLOM_PROGRESS = ["id_mahasiswa", "topik", "tingkat_penguasaan", "jumlah_error_di_topik", "tren_perbaikan"]
+KOLOM_POLA = ["jenis_kesalahan", "frekuensi", "kejadian_pertama", "kejadian_terakhir"]
+KOLOM_SUBMISI = ["id_mahasiswa", "tipe_error", "created_at"]
+
+# sort_by di halaman Progress → (kolom, ascending)
+URUTAN_PROGRESS = {
+    "penguasaan_asc": ("tingkat_penguasaan", True),
+    "penguasaan_desc": ("tingkat_penguasaan", False),
+    "error_count_asc": ("jumlah_error_di_topik", True),
+    "error_count_desc": ("jumlah_error_di_topik", False),
+}
+
+
+# ==================== LOADING KOLUMNAR ====================
+
+def _frame(dokumen: Iterable[Dict[str, Any]], kolom: Sequence[str]) -> pd.DataFrame:
+    """Bangun DataFrame hanya dari kolom yang dibutuhkan (field lain tidak disalin)"""
+    return pd.DataFrame.from_records(list(dokumen), columns=list(kolom))
+
+
+def frame_progress(progress_list: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """Progress belajar → DataFrame (penguasaan float, jumlah error int, tren default 'stagnan')"""
+    df = _frame(progress_list, KOLOM_PROGRESS)
+    df["tingkat_penguasaan"] = pd.to_numeric(df["tingkat_penguasaan"], errors="coerce").fillna(0.0).astype(float)
+    df["jumlah_error_di_topik"] = pd.to_numeric(df["jumlah_error_di_topik"], errors="coerce").fillna(0).astype(np.int64)
+    df["tren_perbaikan"] = df["tren_perbaikan"].fillna("stagnan")
+    df["topik"] = df["topik"].fillna("N/A")
+    df["id_mahasiswa"] = df["id_mahasiswa"].astype(str)
+    return df
+
+
+def frame_pola(pola_list: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """Pola error → DataFrame (frekuensi int)"""
+    df = _frame(pola_list, KOLOM_POLA)
+    df["frekuensi"] = pd.to_numeric(df["frekuensi"], errors="coerce").fillna(0).astype(np.int64)
+    df["jenis_kesalahan"] = df["jenis_kesalahan"].fillna("Unknown")
+    return df
+
+
+def frame_submisi(submisi_list: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """Submisi error → DataFrame (tipe_error kategori, id_mahasiswa string)"""
+    df = _frame(submisi_list, KOLOM_SUBMISI)
+    df["tipe_error"] = df["tipe_error"].fillna("Unknown").astype("category")
+    df["id_mahasiswa"] = df["id_mahasiswa"].astype(str)
+    return df
+
+
+def dokumen_urut(dokumen: Sequence[Dict[str, Any]], df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Petakan hasil filter/urut frame kembali ke dokumen asli (urutan mengikuti frame)"""
+    return [dokumen[posisi] for posisi in df.index.to_numpy()]
+
+
+# ==================== DISTRIBUSI ====================
+
+def distribusi(nilai: Any) -> Dict[str, float]:
+    """
+    Statistik distribusi vectorized (NaN diabaikan)
+
+    Returns:
+        Dict dengan jumlah, rata, median, min, max, std, p25, p75, p90
+    """
+    array = np.asarray(nilai, dtype=float)
+    array = array[~np.isnan(array)]
+    if array.size == 0:
+        return {"jumlah": 0, "rata": 0.0, "median": 0.0, "min": 0.0, "max": 0.0,
+                "std": 0.0, "p25": 0.0, "p75": 0.0, "p90": 0.0}
+
+    p25, median, p75, p90 = np.percentile(array, [25, 50, 75, 90])
+    return {
+        "jumlah": int(array.size),
+        "rata": float(array.mean()),
+        "median": float(median),
+        "min": float(array.min()),
+        "max": float(array.max()),
+        "std": float(array.std()),
+        "p25": float(p25),
+        "p75": float(p75),
+        "p90": float(p90),
+    }
+
+
+def rata_rata(nilai: Any) -> float:
+    """Rata-rata vectorized, 0.0 untuk input kosong"""
+    array = np.asarray(nilai, dtype=float)
+    return float(np.nanmean(array)) if array.size else 0.0
+
+
+# ==================== PROGRESS ====================
+
+def ringkasan_progress(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Ringkasan progress belajar satu mahasiswa
+
+    Returns:
+        Dict dengan total_topik, avg_penguasaan, total_error, jumlah_per_tren,
+        jumlah_membaik, topik_lemah (urut penguasaan naik), topik_membaik, distribusi
+    """
+    if df.empty:
+        return {"total_topik": 0, "avg_penguasaan": 0.0, "total_error": 0, "jumlah_per_tren": {},
+                "jumlah_membaik": 0, "topik_lemah": [], "topik_membaik": [], "distribusi": distribusi([])}
+
+    penguasaan = df["tingkat_penguasaan"].to_numpy()
+    per_tren = df["tren_perbaikan"].value_counts()
+    lemah = df.loc[penguasaan < BATAS_TOPIK_LEMAH].sort_values("tingkat_penguasaan", kind="stable")
+
+    return {
+        "total_topik": int(len(df)),
+        "avg_penguasaan": float(penguasaan.mean()),
+        "total_error": int(df["jumlah_error_di_topik"].to_numpy().sum()),
+        "jumlah_per_tren": {str(tren): int(jumlah) for tren, jumlah in per_tren.items()},
+        "jumlah_membaik": int(per_tren.get("membaik", 0)),
+        "topik_lemah": lemah["topik"].tolist(),
+        "topik_membaik": df.loc[df["tren_perbaikan"] == "membaik", "topik"].tolist(),
+        "distribusi": distribusi(penguasaan),
+    }
+
+
+def filter_urut_progress(df: pd.DataFrame, filter_tren: Optional[str] = None, sort_by: str = "penguasaan_asc") -> pd.DataFrame:
+    """Filter tren (None / "Semua" = semua) lalu urutkan sesuai opsi halaman Progress"""
+    if filter_tren and filter_tren != "Semua":
+        df = df.loc[df["tren_perbaikan"] == filter_tren]
+    kolom, naik = URUTAN_PROGRESS.get(sort_by, URUTAN_PROGRESS["penguasaan_asc"])
+    return df.sort_values(kolom, ascending=naik, kind="stable")
+
+
+# ==================== POLA ====================
+
+def ringkasan_pola(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Ringkasan pola error satu mahasiswa
+
+    Returns:
+        Dict dengan total_pola, total_frekuensi, avg_frekuensi, jumlah_per_severity,
+        pola_frekuensi_tinggi (urut frekuensi turun)
+    """
+    if df.empty:
+        return {"total_pola": 0, "total_frekuensi": 0, "avg_frekuensi": 0.0,
+                "jumlah_per_severity": {"tinggi": 0, "sedang": 0, "rendah": 0}, "pola_frekuensi_tinggi": []}
+
+    frekuensi = df["frekuensi"].to_numpy()
+    severity = np.where(frekuensi >= FREKUENSI_TINGGI, 2, np.where(frekuensi >= FREKUENSI_SEDANG, 1, 0))
+    jumlah_severity = np.bincount(severity, minlength=3)
+    tinggi = df.loc[frekuensi >= FREKUENSI_TINGGI].sort_values("frekuensi", ascending=False, kind="stable")
+
+    return {
+        "total_pola": int(len(df)),
+        "total_frekuensi": int(frekuensi.sum()),
+        "avg_frekuensi": float(frekuensi.mean()),
+        "jumlah_per_severity": {
+            "tinggi": int(jumlah_severity[2]),
+            "sedang": int(jumlah_severity[1]),
+            "rendah": int(jumlah_severity[0]),
+        },
+        "pola_frekuensi_tinggi": tinggi["jenis_kesalahan"].tolist(),
+    }
+
+
+def urut_pola(df: pd.DataFrame) -> pd.DataFrame:
+    """Pola urut frekuensi turun (stabil: urutan asli dipertahankan untuk frekuensi sama)"""
+    return df.sort_values("frekuensi", ascending=False, kind="stable")
+
+
+# ==================== SUBMISI & KOHORT ====================
+
+def hitung_per_tipe_error(df: pd.DataFrame, limit: Optional[int] = None) -> Dict[str, int]:
+    """Group-by tipe_error → jumlah, urut jumlah turun"""
+    if df.empty:
+        return {}
+    jumlah = df["tipe_error"].value_counts(sort=True)
+    jumlah = jumlah[jumlah > 0]
+    if limit:
+        jumlah = jumlah.head(limit)
+    return {str(tipe): int(nilai) for tipe, nilai in jumlah.items()}
+
+
+def statistik_kohort(df_submisi: pd.DataFrame, df_progress_kohort: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """
+    Statistik satu kohort dari frame submisi (+ opsional frame progress dengan kolom id_mahasiswa)
+
+    Returns:
+        Dict dengan total_submisi, jumlah_mahasiswa, per_tipe_error, distribusi_submisi_per_mahasiswa,
+        ranking_mahasiswa (id → jumlah submisi, urut turun), distribusi_penguasaan (rata-rata per mahasiswa)
+    """
+    hasil: Dict[str, Any] = {
+        "total_submisi": int(len(df_submisi)),
+        "jumlah_mahasiswa": 0,
+        "per_tipe_error": hitung_per_tipe_error(df_submisi),
+        "distribusi_submisi_per_mahasiswa": distribusi([]),
+        "ranking_mahasiswa": {},
+        "distribusi_penguasaan": distribusi([]),
+    }
+
+    if not df_submisi.empty:
+        # factorize + bincount: group-by count tanpa hashing per baris di Python
+        kode, id_unik = pd.factorize(df_submisi["id_mahasiswa"])
+        per_mahasiswa = np.bincount(kode, minlength=len(id_unik))
+        urutan = np.argsort(-per_mahasiswa, kind="stable")
+        hasil["jumlah_mahasiswa"] = int(len(id_unik))
+        hasil["distribusi_submisi_per_mahasiswa"] = distribusi(per_mahasiswa)
+        hasil["ranking_mahasiswa"] = {str(id_unik[i]): int(per_mahasiswa[i]) for i in urutan}
+
+    if df_progress_kohort is not None and not df_progress_kohort.empty:
+        rata_per_mahasiswa = df_progress_kohort.groupby("id_mahasiswa", sort=False)["tingkat_penguasaan"].mean()
+        hasil["distribusi_penguasaan"] = distribusi(rata_per_mahasiswa.to_numpy())
+
+    return hasil
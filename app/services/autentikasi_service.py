@@ -5,6 +5,8 @@ CATATAN:
 - Menggunakan st.session_state untuk session management
 - bcrypt untuk password hashing
 - Role-based access control (mahasiswa, admin)
+- Rate limit login gagal disimpan di backend bersama (utils/backend_bersama.py),
+  jadi berlaku di semua proses worker
 """
 
 import logging
@@ -12,8 +14,11 @@ import bcrypt
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
 
+from config import settings
 from database.queries import DatabaseQueries
 from database.models import Pengguna
+from utils.backend_bersama import BackendBersamaError, dapatkan_backend
+from utils.pencarian import buat_kata_cari
 
 logger = logging.getLogger(__name__)
 
@@ -118,6 +123,52 @@ def registrasi_pengguna(
         return False, f"Error registrasi: {str(e)}"
 
 
+# ==================== RATE LIMIT LOGIN ====================
+
+def _kunci_login_gagal(email: str) -> str:
+    return f"login_gagal:{email.strip().lower()}"
+
+
+def login_terkunci(email: str) -> bool:
+    """Cek apakah email sedang dikunci karena terlalu banyak login gagal"""
+    try:
+        gagal = dapatkan_backend().ambil(_kunci_login_gagal(email))
+    except BackendBersamaError as e:
+        logger.warning(f"Rate limit login tidak bisa dicek: {str(e)}")
+        return False
+    return int(gagal or 0) >= settings.LOGIN_MAKS_GAGAL
+
+
+def _catat_login_gagal(email: str) -> None:
+    try:
+        dapatkan_backend().tambah(_kunci_login_gagal(email), ttl=settings.LOGIN_JENDELA_DETIK)
+    except BackendBersamaError as e:
+        logger.warning(f"Login gagal tidak tercatat di rate limit: {str(e)}")
+
+
+def _reset_login_gagal(email: str) -> None:
+    try:
+        dapatkan_backend().hapus(_kunci_login_gagal(email))
+    except BackendBersamaError as e:
+        logger.warning(f"Rate limit login tidak bisa di-reset: {str(e)}")
+
+
+# ==================== LOGIN & SESI ====================
+
+def _data_sesi(pengguna: Dict[str, Any]) -> Dict[str, Any]:
+    """Data pengguna untuk st.session_state (tanpa password hash)"""
+    return {
+        "_id": pengguna["_id"],
+        "email": pengguna["email"],
+        "nama": pengguna.get("nama"),
+        "role": pengguna.get("role", "mahasiswa"),
+        "status": pengguna.get("status", "aktif"),
+        "tingkat_kemahiran": pengguna.get("tingkat_kemahiran", "pemula"),
+        "created_at": pengguna.get("created_at"),
+        "last_login": datetime.now()
+    }
+
+
 def login_pengguna(
     queries: DatabaseQueries,
     email: str,
@@ -139,14 +190,23 @@ def login_pengguna(
         if not email or not password:
             return False, None, "Email dan password harus diisi!"
         
-        # 2. Find user by email
+        # 2. Rate limit percobaan gagal (berlaku di semua worker)
+        if login_terkunci(email):
+            logger.warning(f"Login blocked - too many failed attempts: {email}")
+            return False, None, (
+                f"Terlalu banyak percobaan login gagal. "
+                f"Coba lagi dalam {settings.LOGIN_JENDELA_DETIK // 60} menit."
+            )
+        
+        # 3. Find user by email
         pengguna = queries.cari_pengguna_by_email(email)
         
         if not pengguna:
             logger.warning(f"Login failed - user not found: {email}")
+            _catat_login_gagal(email)
             return False, None, "Email atau password salah!"
         
-        # 3. Check user status
+        # 4. Check user status
         if pengguna.get("status") == "suspended":
             logger.warning(f"Login blocked - suspended user: {email}")
             return False, None, "Akun Anda telah ditangguhkan. Hubungi admin."
@@ -155,27 +215,20 @@ def login_pengguna(
             logger.warning(f"Login blocked - inactive user: {email}")
             return False, None, "Akun Anda tidak aktif."
         
-        # 4. Verify password
+        # 5. Verify password
         password_hash = pengguna.get("password_hash", "")
         
         if not verify_password(password, password_hash):
             logger.warning(f"Login failed - wrong password for: {email}")
+            _catat_login_gagal(email)
             return False, None, "Email atau password salah!"
         
-        # 5. Update last login
+        # 6. Update last login & reset counter gagal
         queries.update_last_login(str(pengguna["_id"]))
+        _reset_login_gagal(email)
         
-        # 6. Remove password hash dari return data (security)
-        user_data = {
-            "_id": pengguna["_id"],
-            "email": pengguna["email"],
-            "nama": pengguna.get("nama"),
-            "role": pengguna.get("role", "mahasiswa"),
-            "status": pengguna.get("status", "aktif"),
-            "tingkat_kemahiran": pengguna.get("tingkat_kemahiran", "pemula"),
-            "created_at": pengguna.get("created_at"),
-            "last_login": datetime.now()
-        }
+        # 7. Remove password hash dari return data (security)
+        user_data = _data_sesi(pengguna)
         
         logger.info(f"Login successful: {email} (Role: {user_data['role']})")
         
@@ -296,6 +349,7 @@ def update_profil_mahasiswa(
         update_data: Dict[str, Any] = {}
         if nama:
             update_data["nama"] = nama
+            update_data["kata_cari"] = buat_kata_cari(nama, mahasiswa.get("email"))
         if tingkat_kemahiran:
             update_data["tingkat_kemahiran"] = tingkat_kemahiran
         
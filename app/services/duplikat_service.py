@@ -0,0 +1,240 @@
+"""
+Duplikat Service - Deteksi submisi hampir identik (MinHash/LSH) & klaster kesalahan identik
+
+CATATAN:
+- Mahasiswa sering mengirim ulang kode yang hampir sama dengan error yang sama; tanpa deteksi,
+  setiap kiriman ulang = satu panggilan LLM + satu dokumen submisi_error baru
+- Index LSH process-wide (utils/minhash.py) berisi signature submisi beberapa hari terakhir
+  (settings.DUPLIKAT_JENDELA_HARI); submisi baru dari proses lain disinkron incremental
+  berdasarkan created_at (throttle settings.DUPLIKAT_INTERVAL_SINKRON)
+- Lookup per mahasiswa (ambang DUPLIKAT_AMBANG_MAHASISWA) dan global (DUPLIKAT_AMBANG_GLOBAL,
+  lebih ketat karena analisis dibuat untuk konteks mahasiswa lain)
+- Signature menggabungkan kode + pesan error, jadi di kode panjang kode mendominasi skor. Kandidat
+  hanya dipakai jika tipe exception sama dengan tipe_error kandidat (metadata index) dan pesan
+  error-nya sendiri mirip (DUPLIKAT_AMBANG_PESAN): kode sama dengan error berbeda = analisis baru
+- Klaster kesalahan identik untuk admin: union-find di atas bucket LSH, tanpa pairwise
+- Submisi lama tanpa signature diisi lewat scripts/backfill_minhash.py
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from database.queries import DatabaseQueries
+from utils.minhash import IndeksLSH, dari_bytes, ke_bytes, kemiripan_pesan_error, signature
+
+logger = logging.getLogger(__name__)
+
+# Batas anggota klaster yang contohnya diambil dari database
+MAKS_CONTOH_KLASTER = 3
+# Kandidat LSH teratas yang pesan error-nya dicek (satu query $in)
+MAKS_KANDIDAT = 5
+
+
+@dataclass
+class SubmisiMirip:
+    """Hasil lookup near-duplicate"""
+    id_submisi: str
+    kemiripan: float
+    milik_sendiri: bool
+
+
+# ==================== INDEX PROCESS-WIDE ====================
+
+class _IndeksSubmisi:
+    """Index LSH submisi + watermark sinkron (created_at terakhir yang sudah dimuat)"""
+
+    def __init__(self):
+        self.lsh = IndeksLSH()
+        self._lock = threading.Lock()
+        self._watermark: Optional[datetime] = None
+        self._terakhir_sinkron = 0.0
+
+    def tambah(self, id_submisi: Any, sig: np.ndarray, id_mahasiswa: Any,
+               tipe_error: Optional[str], created_at: datetime) -> None:
+        self.lsh.tambah(id_submisi, sig, {
+            "id_mahasiswa": str(id_mahasiswa),
+            "tipe_error": tipe_error,
+            "created_at": created_at,
+        })
+
+    def sinkron(self, queries: DatabaseQueries, paksa: bool = False) -> None:
+        """Muat submisi baru sejak watermark (satu thread saja, lainnya memakai index apa adanya)"""
+        if not paksa and time.monotonic() - self._terakhir_sinkron < settings.DUPLIKAT_INTERVAL_SINKRON:
+            return
+        if not self._lock.acquire(blocking=self._watermark is None):
+            return
+        try:
+            batas_jendela = datetime.now() - timedelta(days=settings.DUPLIKAT_JENDELA_HARI)
+            sejak = self._watermark or batas_jendela
+            jumlah = 0
+            for dokumen in queries.iterasi_signature_submisi(sejak):
+                sig = dari_bytes(dokumen.get("minhash"))
+                if sig is not None:
+                    self.tambah(dokumen["_id"], sig, dokumen["id_mahasiswa"],
+                                dokumen.get("tipe_error"), dokumen["created_at"])
+                    jumlah += 1
+                sejak = max(sejak, dokumen["created_at"])
+            self._watermark = sejak
+            self._buang_kedaluwarsa(batas_jendela)
+            if jumlah:
+                logger.info(f"Index duplikat: {jumlah} submisi dimuat, total {len(self.lsh)}")
+        except Exception as e:
+            logger.warning(f"Sinkron index duplikat gagal: {str(e)}")
+        finally:
+            self._terakhir_sinkron = time.monotonic()
+            self._lock.release()
+
+    def _buang_kedaluwarsa(self, batas: datetime) -> None:
+        kedaluwarsa = [
+            kunci for kunci in self.lsh.semua_kunci()
+            if (self.lsh.meta(kunci).get("created_at") or batas) < batas
+        ]
+        for kunci in kedaluwarsa:
+            self.lsh.hapus(kunci)
+
+
+_indeks = _IndeksSubmisi()
+
+
+def ambil_indeks(queries: DatabaseQueries) -> IndeksLSH:
+    """Index LSH submisi yang sudah disinkron"""
+    _indeks.sinkron(queries)
+    return _indeks.lsh
+
+
+# ==================== LOOKUP ====================
+
+def _pilih_pesan_mirip(
+    queries: DatabaseQueries,
+    kandidat: List[Tuple[str, float]],
+    pesan_error: str
+) -> Optional[Tuple[str, float]]:
+    """Kandidat teratas yang pesan error-nya juga mirip (≥ DUPLIKAT_AMBANG_PESAN)"""
+    if not kandidat:
+        return None
+    pesan = {
+        str(dokumen["_id"]): dokumen.get("pesan_error") or ""
+        for dokumen in queries.ambil_submisi_by_ids([kunci for kunci, _ in kandidat], {"pesan_error": 1})
+    }
+    for kunci, skor in kandidat:
+        if kunci in pesan and kemiripan_pesan_error(pesan[kunci], pesan_error) >= settings.DUPLIKAT_AMBANG_PESAN:
+            return kunci, skor
+    return None
+
+
+def cari_submisi_mirip(
+    queries: DatabaseQueries,
+    id_mahasiswa: str,
+    sig: Optional[np.ndarray],
+    pesan_error: str = "",
+    tipe_error: Optional[str] = None
+) -> Optional[SubmisiMirip]:
+    """
+    Cari submisi hampir identik: milik mahasiswa sendiri dulu, lalu global (ambang lebih ketat)
+
+    Args:
+        pesan_error: Pesan error submisi baru, harus mirip dengan pesan kandidat
+        tipe_error: Tipe exception hasil parse traceback; jika ada, harus sama dengan
+            tipe_error kandidat
+
+    Returns:
+        SubmisiMirip terbaik atau None
+    """
+    if sig is None:
+        return None
+    lsh = ambil_indeks(queries)
+    filter_tipe = {"tipe_error": tipe_error} if tipe_error else {}
+
+    sendiri = lsh.cari(sig, settings.DUPLIKAT_AMBANG_MAHASISWA,
+                       filter_meta={"id_mahasiswa": str(id_mahasiswa), **filter_tipe}, limit=MAKS_KANDIDAT)
+    terpilih = _pilih_pesan_mirip(queries, sendiri, pesan_error)
+    if terpilih:
+        return SubmisiMirip(terpilih[0], terpilih[1], milik_sendiri=True)
+
+    lain = lsh.cari(sig, settings.DUPLIKAT_AMBANG_GLOBAL, filter_meta=filter_tipe or None,
+                    kecuali={"id_mahasiswa": str(id_mahasiswa)}, limit=MAKS_KANDIDAT)
+    terpilih = _pilih_pesan_mirip(queries, lain, pesan_error)
+    if terpilih:
+        return SubmisiMirip(terpilih[0], terpilih[1], milik_sendiri=False)
+    return None
+
+
+def daftarkan_submisi(
+    id_submisi: Any,
+    sig: Optional[np.ndarray],
+    id_mahasiswa: Any,
+    tipe_error: Optional[str],
+    created_at: datetime
+) -> None:
+    """Tambahkan submisi yang baru disimpan ke index proses ini"""
+    if sig is not None:
+        _indeks.tambah(id_submisi, sig, id_mahasiswa, tipe_error, created_at)
+
+
+# ==================== KLASTER (ADMIN) ====================
+
+def kelompokkan_kesalahan_identik(
+    queries: DatabaseQueries,
+    ambang: float = 0.8,
+    hari: int = 7,
+    minimal_anggota: int = 3,
+    limit: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Klaster submisi hampir identik dalam N hari terakhir (lintas mahasiswa)
+
+    Returns:
+        List dict {jumlah_submisi, jumlah_mahasiswa, tipe_error, contoh}, urut ukuran turun
+    """
+    try:
+        lsh = ambil_indeks(queries)
+        batas = datetime.now() - timedelta(days=hari)
+        terpilih = [
+            kunci for kunci in lsh.semua_kunci()
+            if (lsh.meta(kunci).get("created_at") or batas) >= batas
+        ]
+        klaster = [item for item in lsh.kelompokkan(ambang, terpilih) if len(item) >= minimal_anggota][:limit]
+
+        contoh_ids = [kunci for item in klaster for kunci in item[:MAKS_CONTOH_KLASTER]]
+        contoh = {
+            str(dokumen["_id"]): dokumen
+            for dokumen in queries.ambil_submisi_by_ids(contoh_ids, {"kode": 1, "pesan_error": 1, "tipe_error": 1})
+        }
+
+        hasil = []
+        for item in klaster:
+            meta = [lsh.meta(kunci) for kunci in item]
+            tipe = [m.get("tipe_error") or "Unknown" for m in meta]
+            hasil.append({
+                "jumlah_submisi": len(item),
+                "jumlah_mahasiswa": len({m.get("id_mahasiswa") for m in meta}),
+                "tipe_error": max(set(tipe), key=tipe.count),
+                "contoh": [contoh[kunci] for kunci in item[:MAKS_CONTOH_KLASTER] if kunci in contoh],
+            })
+        return hasil
+    except Exception as e:
+        logger.error(f"Error kelompokkan kesalahan identik: {str(e)}")
+        return []
+
+
+# ==================== BACKFILL ====================
+
+def backfill_signature(queries: DatabaseQueries, batch_size: int = 500) -> int:
+    """Hitung & simpan signature untuk submisi lama yang belum punya (scripts/backfill_minhash.py)"""
+    total = 0
+    for batch in queries.iterasi_submisi_tanpa_minhash(batch_size):
+        entri = []
+        for dokumen in batch:
+            sig = signature(dokumen.get("kode", ""), dokumen.get("pesan_error", ""), dokumen.get("bahasa", "python"))
+            if sig is not None:
+                entri.append((dokumen["_id"], ke_bytes(sig)))
+        total += queries.simpan_minhash_bulk(entri)
+        logger.info(f"Backfill minhash: {total} submisi")
+    return total
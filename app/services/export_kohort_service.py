@@ -0,0 +1,582 @@
+"""
+Export Kohort Service - Background bulk export untuk admin
+
+CATATAN:
+- Mengekspor submisi_error, pola_error, dan progress_belajar untuk seluruh kohort
+  (opsional filter tingkat/status mahasiswa) dan rentang tanggal
+- Output kolumnar terkompresi: Parquet (zstd/snappy) jika pyarrow terpasang,
+  fallback CSV gzip yang dipecah per chunk baris; semua file dibundel ke satu .zip
+- Memori terbatas: dokumen dibaca per batch cursor, ditulis, lalu dibuang
+- Tidak mengganggu app live:
+  * satu job berjalan di seluruh deployment: satu worker thread per proses, dan antar proses
+    worker Streamlit job menunggu lock di backend bersama (status tetap "antri")
+  * throttle dokumen/detik (settings.EXPORT_KOHORT_MAKS_DOKUMEN_PER_DETIK)
+  * baca dengan read preference secondaryPreferred
+- Status job (progress, throughput, path hasil) disimpan di backend bersama
+  (utils/backend_bersama.py), jadi admin melihat & bisa membatalkan job dari worker mana pun.
+  Job dijalankan oleh proses yang menerimanya; file hasil ditulis ke EXPORT_DIR yang sama
+- Job antri / berjalan yang tidak diperbarui selama BATAS_DETAK_JOB_DETIK dianggap gagal
+  (proses pemiliknya berhenti)
+"""
+
+import csv
+import gzip
+import json
+import logging
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId, json_util
+
+from config import settings
+from database.queries import DatabaseQueries
+from services.export_service import direktori_export
+from utils.backend_bersama import BackendBersamaError, dapatkan_backend
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== SKEMA EXPORT ====================
+
+# Kolom per collection: nama_kolom → tipe ("str", "int", "float", "datetime")
+SKEMA_KOLEKSI: Dict[str, Dict[str, str]] = {
+    "submisi_error": {
+        "_id": "str",
+        "id_mahasiswa": "str",
+        "bahasa": "str",
+        "tipe_error": "str",
+        "pesan_error": "str",
+        "penyebab_utama": "str",
+        "kesenjangan_konsep": "str",
+        "level_bloom": "str",
+        "topik_terkait": "str",
+        "created_at": "datetime",
+    },
+    "pola_error": {
+        "_id": "str",
+        "id_mahasiswa": "str",
+        "jenis_kesalahan": "str",
+        "frekuensi": "int",
+        "kejadian_pertama": "datetime",
+        "kejadian_terakhir": "datetime",
+        "deskripsi_miskonsepsi": "str",
+    },
+    "progress_belajar": {
+        "_id": "str",
+        "id_mahasiswa": "str",
+        "topik": "str",
+        "tingkat_penguasaan": "float",
+        "jumlah_error_di_topik": "int",
+        "tanggal_error_terakhir": "datetime",
+        "tren_perbaikan": "str",
+        "updated_at": "datetime",
+    },
+}
+
+# Field tanggal yang dipakai filter periode per collection
+FIELD_PERIODE: Dict[str, str] = {
+    "submisi_error": "created_at",
+    "pola_error": "kejadian_terakhir",
+    "progress_belajar": "updated_at",
+}
+
+MAKS_RIWAYAT_JOB = 20
+
+# Key backend bersama: registry status job, lock job berjalan, flag pembatalan per job
+KUNCI_REGISTRY_JOB = "export_kohort:job"
+KUNCI_LOCK_JOB = "export_kohort:lock"
+KUNCI_BATAL_JOB = "export_kohort:batal:"
+TTL_LOCK_JOB_DETIK = 120  # Diperpanjang setiap batch; lepas sendiri jika proses pemilik mati
+INTERVAL_TUNGGU_LOCK_DETIK = 2.0
+BATAS_DETAK_JOB_DETIK = 300
+
+
+def _nilai_kolom(nilai: Any, tipe: str) -> Any:
+    """Konversi nilai BSON ke nilai kolom yang konsisten per tipe"""
+    if nilai is None:
+        return None
+    if tipe == "datetime":
+        return nilai if isinstance(nilai, datetime) else None
+    if tipe == "int":
+        try:
+            return int(nilai)
+        except (TypeError, ValueError):
+            return None
+    if tipe == "float":
+        try:
+            return float(nilai)
+        except (TypeError, ValueError):
+            return None
+    if isinstance(nilai, ObjectId):
+        return str(nilai)
+    if isinstance(nilai, list):
+        return "; ".join(str(item) for item in nilai)
+    if isinstance(nilai, dict):
+        return json.dumps(nilai, default=str, ensure_ascii=False)
+    return str(nilai)
+
+
+def _ratakan(dokumen: Dict[str, Any], skema: Dict[str, str]) -> Dict[str, Any]:
+    return {kolom: _nilai_kolom(dokumen.get(kolom), tipe) for kolom, tipe in skema.items()}
+
+
+# ==================== STATUS JOB ====================
+
+@dataclass
+class JobExportKohort:
+    """Status satu job export kohort"""
+    id_job: str
+    koleksi: List[str]
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    filter_tingkat: Optional[str] = None
+    filter_status: Optional[str] = None
+    dibuat_oleh: Optional[str] = None
+    format: str = ""  # "parquet" atau "csv.gz"
+    status: str = "antri"  # antri, berjalan, selesai, gagal, dibatalkan
+    koleksi_aktif: Optional[str] = None
+    total_dokumen: int = 0
+    dokumen_diproses: int = 0
+    byte_ditulis: int = 0
+    dokumen_per_detik: float = 0.0
+    path_hasil: Optional[str] = None
+    error: Optional[str] = None
+    dibuat_pada: datetime = field(default_factory=datetime.now)
+    mulai_pada: Optional[datetime] = None
+    selesai_pada: Optional[datetime] = None
+    diperbarui_pada: Optional[datetime] = None
+    dibatalkan: bool = False
+
+    @property
+    def persentase(self) -> float:
+        if self.status == "selesai":
+            return 100.0
+        if not self.total_dokumen:
+            return 0.0
+        return min(100.0, self.dokumen_diproses / self.total_dokumen * 100)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["persentase"] = self.persentase
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobExportKohort":
+        return cls(**{nama: nilai for nama, nilai in data.items() if nama in cls.__dataclass_fields__})
+
+
+# Job yang dijalankan proses ini (objek hidup, paling baru); job proses lain dibaca dari registry
+_lock_job = threading.Lock()
+_jobs: Dict[str, JobExportKohort] = {}
+# Satu worker: job export berjalan berurutan, tidak pernah paralel
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pahamkode-export-kohort")
+
+
+def _simpan_job(job: JobExportKohort) -> None:
+    """Tulis status job ke registry bersama (kegagalan backend hanya dicatat)"""
+    job.diperbarui_pada = datetime.now()
+    try:
+        dapatkan_backend().hash_simpan(KUNCI_REGISTRY_JOB, job.id_job, json_util.dumps(asdict(job)))
+    except BackendBersamaError as e:
+        logger.warning(f"Status job export {job.id_job} tidak tersimpan di backend bersama: {str(e)}")
+
+
+def _registry_job() -> Dict[str, JobExportKohort]:
+    """Semua job di registry bersama, ditimpa objek job milik proses ini"""
+    try:
+        data = dapatkan_backend().hash_semua(KUNCI_REGISTRY_JOB)
+    except BackendBersamaError as e:
+        logger.warning(f"Registry job export tidak bisa dibaca: {str(e)}")
+        data = {}
+    jobs = {id_job: JobExportKohort.from_dict(json_util.loads(isi)) for id_job, isi in data.items()}
+    batas = datetime.now().timestamp() - BATAS_DETAK_JOB_DETIK
+    for job in jobs.values():
+        if job.status in ("antri", "berjalan") and job.diperbarui_pada and job.diperbarui_pada.timestamp() < batas:
+            job.status = "gagal"
+            job.error = "Proses worker yang menjalankan job berhenti"
+    with _lock_job:
+        jobs.update(_jobs)
+    return jobs
+
+
+def _job_dibatalkan(job: JobExportKohort) -> bool:
+    """Flag batal lokal atau dari worker lain (lewat backend bersama)"""
+    if job.dibatalkan:
+        return True
+    try:
+        job.dibatalkan = dapatkan_backend().ambil(KUNCI_BATAL_JOB + job.id_job) is not None
+    except BackendBersamaError:
+        pass
+    return job.dibatalkan
+
+
+def _tunggu_lock_job(job: JobExportKohort) -> bool:
+    """
+    Tunggu giliran job (satu job berjalan di semua worker)
+
+    Returns:
+        False jika job dibatalkan selama menunggu
+    """
+    backend = dapatkan_backend()
+    while not _job_dibatalkan(job):
+        try:
+            if backend.simpan(KUNCI_LOCK_JOB, job.id_job, ttl=TTL_LOCK_JOB_DETIK, hanya_baru=True):
+                return True
+        except BackendBersamaError as e:
+            # Backend mati: jalan tanpa koordinasi antar worker (tetap satu job per proses)
+            logger.warning(f"Lock job export tidak tersedia, job {job.id_job} jalan tanpa lock: {str(e)}")
+            return True
+        _simpan_job(job)
+        time.sleep(INTERVAL_TUNGGU_LOCK_DETIK)
+    return False
+
+
+def _lepas_lock_job(job: JobExportKohort) -> None:
+    try:
+        dapatkan_backend().lepas_kunci(KUNCI_LOCK_JOB, job.id_job)
+    except BackendBersamaError as e:
+        logger.warning(f"Lock job export {job.id_job} tidak bisa dilepas (kedaluwarsa sendiri): {str(e)}")
+
+
+def _format_tersedia() -> str:
+    """Parquet jika pyarrow terpasang, selain itu CSV gzip"""
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+        return "parquet"
+    except ImportError:
+        return "csv.gz"
+
+
+# ==================== PENULIS FILE ====================
+
+class _Throttle:
+    """Batasi laju dokumen/detik (sleep jika lebih cepat dari batas)"""
+
+    def __init__(self, maks_per_detik: int):
+        self.maks_per_detik = maks_per_detik
+        self.mulai = time.monotonic()
+        self.jumlah = 0
+
+    def tunggu(self, jumlah_baru: int) -> None:
+        self.jumlah += jumlah_baru
+        if self.maks_per_detik <= 0:
+            return
+        seharusnya = self.jumlah / self.maks_per_detik
+        lewat = time.monotonic() - self.mulai
+        if seharusnya > lewat:
+            time.sleep(seharusnya - lewat)
+
+
+class _PenulisParquet:
+    """Tulis batch ke satu file Parquet (satu row group per batch)"""
+
+    def __init__(self, folder: Path, nama_koleksi: str, skema: Dict[str, str]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        tipe_arrow = {
+            "str": pa.string(),
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "datetime": pa.timestamp("ms"),
+        }
+        self._pa = pa
+        self.skema = pa.schema([(kolom, tipe_arrow[tipe]) for kolom, tipe in skema.items()])
+        self.path = folder / f"{nama_koleksi}.parquet"
+        kompresi = "zstd" if pa.Codec.is_available("zstd") else "snappy"
+        self._writer = pq.ParquetWriter(str(self.path), self.skema, compression=kompresi)
+        self.files = [self.path]
+
+    def tulis(self, baris: List[Dict[str, Any]]) -> None:
+        self._writer.write_table(self._pa.Table.from_pylist(baris, schema=self.skema))
+
+    def tutup(self) -> None:
+        self._writer.close()
+
+
+class _PenulisCsvGzip:
+    """Tulis batch ke file .csv.gz, pindah ke file baru setiap N baris"""
+
+    def __init__(self, folder: Path, nama_koleksi: str, skema: Dict[str, str], baris_per_chunk: int):
+        self.folder = folder
+        self.nama_koleksi = nama_koleksi
+        self.kolom = list(skema)
+        self.baris_per_chunk = max(1, baris_per_chunk)
+        self.files: List[Path] = []
+        self._file: Any = None
+        self._writer: Any = None
+        self._baris_chunk = 0
+
+    def _buka_chunk(self) -> None:
+        self.tutup()
+        path = self.folder / f"{self.nama_koleksi}.part{len(self.files) + 1:04d}.csv.gz"
+        self._file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.kolom)
+        self._writer.writeheader()
+        self._baris_chunk = 0
+        self.files.append(path)
+
+    def tulis(self, baris: List[Dict[str, Any]]) -> None:
+        for item in baris:
+            if self._writer is None or self._baris_chunk >= self.baris_per_chunk:
+                self._buka_chunk()
+            self._writer.writerow({
+                kolom: nilai.isoformat() if isinstance(nilai, datetime) else nilai
+                for kolom, nilai in item.items()
+            })
+            self._baris_chunk += 1
+
+    def tutup(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+
+# ==================== EKSEKUSI JOB ====================
+
+def _query_koleksi(job: JobExportKohort, nama_koleksi: str, id_kohort: Optional[List[ObjectId]]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {}
+    if id_kohort is not None:
+        query["id_mahasiswa"] = {"$in": id_kohort}
+    rentang: Dict[str, datetime] = {}
+    if job.date_from:
+        rentang["$gte"] = job.date_from
+    if job.date_to:
+        rentang["$lte"] = job.date_to
+    if rentang:
+        query[FIELD_PERIODE[nama_koleksi]] = rentang
+    return query
+
+
+def _perbarui_progres(job: JobExportKohort) -> None:
+    """Progress ke registry bersama & perpanjang lock (dipanggil per batch)"""
+    _simpan_job(job)
+    # Job lain yang antri di executor proses ini ikut diperbarui supaya tidak dianggap yatim
+    with _lock_job:
+        antri = [j for j in _jobs.values() if j.status == "antri"]
+    for item in antri:
+        _simpan_job(item)
+    try:
+        dapatkan_backend().kedaluwarsa(KUNCI_LOCK_JOB, TTL_LOCK_JOB_DETIK)
+    except BackendBersamaError:
+        pass
+
+
+def _cek_dibatalkan(job: JobExportKohort) -> None:
+    """Lempar InterruptedError jika flag batal job sudah dipasang"""
+    if _job_dibatalkan(job):
+        raise InterruptedError("Job dibatalkan oleh admin")
+
+
+def _jalankan_job(queries: DatabaseQueries, job: JobExportKohort) -> None:
+    """Worker: tunggu giliran, ekspor semua collection job ke folder, lalu bundel jadi zip"""
+    if not _tunggu_lock_job(job):
+        job.status = "dibatalkan"
+        job.error = "Job dibatalkan oleh admin"
+        job.selesai_pada = datetime.now()
+        _simpan_job(job)
+        logger.info(f"Export kohort {job.id_job} dibatalkan sebelum berjalan")
+        return
+
+    folder = direktori_export() / f"kohort_{job.id_job}"
+    folder.mkdir(parents=True, exist_ok=True)
+    semua_file: List[Path] = []
+
+    job.status = "berjalan"
+    job.mulai_pada = datetime.now()
+    _simpan_job(job)
+    mulai = time.monotonic()
+    throttle = _Throttle(settings.EXPORT_KOHORT_MAKS_DOKUMEN_PER_DETIK)
+
+    try:
+        id_kohort: Optional[List[ObjectId]] = None
+        if job.filter_tingkat or job.filter_status:
+            id_kohort = queries.ambil_id_mahasiswa_kohort(job.filter_tingkat, job.filter_status)
+
+        query_per_koleksi = {nama: _query_koleksi(job, nama, id_kohort) for nama in job.koleksi}
+        job.total_dokumen = sum(
+            queries.hitung_dokumen_export(nama, query) for nama, query in query_per_koleksi.items()
+        )
+
+        for nama_koleksi, query in query_per_koleksi.items():
+            # Dicek juga di luar loop batch: koleksi kosong / batal sebelum batch pertama
+            _cek_dibatalkan(job)
+            job.koleksi_aktif = nama_koleksi
+            skema = SKEMA_KOLEKSI[nama_koleksi]
+            penulis: Any = (
+                _PenulisParquet(folder, nama_koleksi, skema) if job.format == "parquet"
+                else _PenulisCsvGzip(folder, nama_koleksi, skema, settings.EXPORT_KOHORT_BARIS_PER_CHUNK)
+            )
+            try:
+                proyeksi = {kolom: 1 for kolom in skema}
+                for batch in queries.iterasi_batch_export(
+                    nama_koleksi, query, proyeksi, settings.EXPORT_KOHORT_BATCH
+                ):
+                    _cek_dibatalkan(job)
+                    penulis.tulis([_ratakan(dokumen, skema) for dokumen in batch])
+                    job.dokumen_diproses += len(batch)
+                    job.dokumen_per_detik = job.dokumen_diproses / max(time.monotonic() - mulai, 1e-6)
+                    _perbarui_progres(job)
+                    throttle.tunggu(len(batch))
+            finally:
+                penulis.tutup()
+                semua_file.extend(penulis.files)
+                job.byte_ditulis = sum(path.stat().st_size for path in semua_file if path.exists())
+
+        _cek_dibatalkan(job)
+
+        # File sudah terkompresi: zip tanpa kompresi ulang (ZIP_STORED)
+        path_zip = direktori_export() / f"pahamkode_kohort_{job.id_job}.zip"
+        with zipfile.ZipFile(path_zip, "w", compression=zipfile.ZIP_STORED) as arsip:
+            for path in semua_file:
+                arsip.write(path, arcname=path.name)
+            arsip.writestr("manifest.json", json.dumps({
+                "id_job": job.id_job,
+                "format": job.format,
+                "koleksi": job.koleksi,
+                "periode": [
+                    job.date_from.isoformat() if job.date_from else None,
+                    job.date_to.isoformat() if job.date_to else None,
+                ],
+                "filter_tingkat": job.filter_tingkat,
+                "filter_status": job.filter_status,
+                "total_dokumen": job.dokumen_diproses,
+                "skema": {nama: SKEMA_KOLEKSI[nama] for nama in job.koleksi},
+                "dibuat_pada": datetime.now().isoformat(),
+            }, indent=2))
+
+        job.path_hasil = str(path_zip)
+        job.byte_ditulis = path_zip.stat().st_size
+        job.status = "selesai"
+        logger.info(
+            f"Export kohort {job.id_job} selesai: {job.dokumen_diproses} dokumen, "
+            f"{job.byte_ditulis / 1024 / 1024:.1f} MB, {job.dokumen_per_detik:.0f} dok/detik"
+        )
+
+    except InterruptedError as e:
+        job.status = "dibatalkan"
+        job.error = str(e)
+        logger.info(f"Export kohort {job.id_job} dibatalkan")
+    except Exception as e:
+        job.status = "gagal"
+        job.error = str(e)
+        logger.error(f"Export kohort {job.id_job} gagal: {str(e)}")
+    finally:
+        job.koleksi_aktif = None
+        job.selesai_pada = datetime.now()
+        _simpan_job(job)
+        _lepas_lock_job(job)
+        for path in semua_file:
+            path.unlink(missing_ok=True)
+        try:
+            folder.rmdir()
+        except OSError:
+            pass
+
+
+def _pangkas_registry() -> None:
+    """Buang riwayat job lama (yang sudah tidak berjalan) dari registry bersama"""
+    jobs = _registry_job()
+    selesai = sorted(
+        (j for j in jobs.values() if j.status not in ("antri", "berjalan")),
+        key=lambda j: j.dibuat_pada
+    )
+    lebih = len(jobs) - MAKS_RIWAYAT_JOB
+    if lebih <= 0 or not selesai:
+        return
+    try:
+        dapatkan_backend().hash_hapus(KUNCI_REGISTRY_JOB, *(j.id_job for j in selesai[:lebih]))
+    except BackendBersamaError as e:
+        logger.warning(f"Riwayat job export tidak bisa dipangkas: {str(e)}")
+
+
+# ==================== PUBLIC API ====================
+
+def mulai_export_kohort(
+    queries: DatabaseQueries,
+    koleksi: List[str],
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    filter_tingkat: Optional[str] = None,
+    filter_status: Optional[str] = None,
+    id_admin: Optional[str] = None
+) -> JobExportKohort:
+    """
+    Antrikan job export kohort (dijalankan di background worker)
+
+    Args:
+        queries: DatabaseQueries instance
+        koleksi: Subset dari submisi_error, pola_error, progress_belajar
+        date_from / date_to: Rentang tanggal (opsional)
+        filter_tingkat / filter_status: Filter kohort mahasiswa (opsional)
+        id_admin: Admin yang memulai (audit)
+
+    Returns:
+        JobExportKohort yang baru dibuat (status "antri")
+    """
+    tidak_dikenal = [nama for nama in koleksi if nama not in SKEMA_KOLEKSI]
+    if tidak_dikenal or not koleksi:
+        raise ValueError(f"Collection tidak valid untuk export: {tidak_dikenal or koleksi}")
+
+    job = JobExportKohort(
+        id_job=uuid.uuid4().hex[:12],
+        koleksi=list(koleksi),
+        date_from=date_from,
+        date_to=date_to,
+        filter_tingkat=filter_tingkat,
+        filter_status=filter_status,
+        dibuat_oleh=id_admin,
+        format=_format_tersedia()
+    )
+
+    with _lock_job:
+        _jobs[job.id_job] = job
+        # Buang objek job lokal yang sudah tidak berjalan (status akhir ada di registry)
+        for id_lama in [j.id_job for j in _jobs.values() if j.status not in ("antri", "berjalan")]:
+            _jobs.pop(id_lama, None)
+    _simpan_job(job)
+    _pangkas_registry()
+
+    _executor.submit(_jalankan_job, queries, job)
+    logger.info(f"Export kohort {job.id_job} diantrikan ({job.format}): {', '.join(koleksi)}")
+    return job
+
+
+def daftar_job_export() -> List[JobExportKohort]:
+    """Semua job export di semua worker (terbaru dulu)"""
+    return sorted(_registry_job().values(), key=lambda j: j.dibuat_pada, reverse=True)
+
+
+def ambil_job_export(id_job: str) -> Optional[JobExportKohort]:
+    """Ambil status satu job"""
+    with _lock_job:
+        if id_job in _jobs:
+            return _jobs[id_job]
+    try:
+        isi = dapatkan_backend().hash_ambil(KUNCI_REGISTRY_JOB, id_job)
+    except BackendBersamaError as e:
+        logger.warning(f"Registry job export tidak bisa dibaca: {str(e)}")
+        return None
+    return JobExportKohort.from_dict(json_util.loads(isi)) if isi else None
+
+
+def batalkan_job_export(id_job: str) -> bool:
+    """Minta job berhenti di batas batch berikutnya (job bisa dijalankan worker lain)"""
+    job = ambil_job_export(id_job)
+    if job is None or job.status not in ("antri", "berjalan"):
+        return False
+    job.dibatalkan = True
+    try:
+        dapatkan_backend().simpan(KUNCI_BATAL_JOB + id_job, "1", ttl=BATAS_DETAK_JOB_DETIK * 12)
+    except BackendBersamaError as e:
+        logger.warning(f"Flag batal job export {id_job} tidak tersimpan: {str(e)}")
+    return True
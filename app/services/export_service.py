@@ -0,0 +1,275 @@
+"""
+Export Service - Streaming export laporan mahasiswa (CSV & XLSX)
+
+CATATAN:
+- Rentang tanggal di-push ke query MongoDB (bukan filter di Python setelah limit=1000),
+  jadi riwayat panjang terekspor lengkap
+- Submisi di-stream per batch cursor langsung ke file: csv.writer untuk CSV,
+  xlsxwriter mode constant_memory untuk XLSX (baris di-flush per row ke disk)
+- Statistik preview (total & top errors) dihitung dengan aggregation di database
+- Hasil export berupa file di disk (settings.EXPORT_DIR) yang diserahkan ke
+  st.download_button; file lama dibersihkan otomatis
+"""
+
+import csv
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import settings
+from database.queries import DatabaseQueries
+from services.analitik_service import frame_progress
+from utils.helpers import format_datetime
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== KONFIGURASI KOLOM ====================
+
+def _gabung_list(nilai: Any) -> str:
+    return ", ".join(str(item) for item in nilai) if isinstance(nilai, list) else (nilai or "")
+
+
+# (header, field, formatter) untuk baris riwayat submisi
+KOLOM_SUBMISI: List[Tuple[str, str, Callable[[Any], Any]]] = [
+    ("Tanggal", "created_at", lambda nilai: nilai),
+    ("Bahasa", "bahasa", lambda nilai: nilai or ""),
+    ("Tipe Error", "tipe_error", lambda nilai: nilai or "Unknown"),
+    ("Pesan Error", "pesan_error", lambda nilai: nilai or ""),
+    ("Penyebab Utama", "penyebab_utama", lambda nilai: nilai or ""),
+    ("Kesenjangan Konsep", "kesenjangan_konsep", lambda nilai: nilai or ""),
+    ("Level Bloom", "level_bloom", lambda nilai: nilai or ""),
+    ("Topik Terkait", "topik_terkait", _gabung_list),
+    ("Saran Perbaikan", "saran_perbaikan", lambda nilai: nilai or ""),
+]
+
+# Hanya field yang diekspor yang diambil dari database (kode & penjelasan panjang tidak ikut)
+PROYEKSI_SUBMISI: Dict[str, int] = {field: 1 for _, field, _ in KOLOM_SUBMISI}
+
+FORMAT_TANGGAL_CSV = "%Y-%m-%d %H:%M:%S"
+BATCH_CURSOR = 500
+BATAS_SEL_XLSX = 32767
+
+
+# ==================== FILE EXPORT ====================
+
+def direktori_export() -> Path:
+    """Folder tujuan file export (dibuat jika belum ada)"""
+    folder = Path(settings.EXPORT_DIR) if settings.EXPORT_DIR else Path(tempfile.gettempdir()) / "pahamkode-export"
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder
+
+
+def bersihkan_export_lama(maks_umur_jam: Optional[int] = None) -> int:
+    """
+    Hapus file export yang lebih tua dari batas umur
+
+    Returns:
+        Jumlah file yang dihapus
+    """
+    batas = time.time() - (maks_umur_jam or settings.EXPORT_MAKS_UMUR_JAM) * 3600
+    dihapus = 0
+    for file in direktori_export().glob("pahamkode_*"):
+        try:
+            if file.is_file() and file.stat().st_mtime < batas:
+                file.unlink()
+                dihapus += 1
+        except OSError as e:
+            logger.warning(f"Gagal hapus export lama {file.name}: {str(e)}")
+    return dihapus
+
+
+def _path_export(id_mahasiswa: str, ekstensi: str) -> Path:
+    bersihkan_export_lama()
+    nama_file = f"pahamkode_{id_mahasiswa}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.{ekstensi}"
+    return direktori_export() / nama_file
+
+
+# ==================== DATA LAPORAN ====================
+
+def siapkan_data_laporan(
+    queries: DatabaseQueries,
+    id_mahasiswa: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Kumpulkan data ringkas untuk preview & lembar summary export
+
+    Submisi tidak di-load: total dan top errors datang dari aggregation.
+
+    Returns:
+        Dictionary dengan total_submisi, top_errors, pola, progress, avg_penguasaan
+    """
+    ringkasan = queries.ringkasan_submisi_periode(id_mahasiswa, date_from, date_to)
+    pola = queries.ambil_pola_mahasiswa(id_mahasiswa)
+    progress = queries.ambil_progress_mahasiswa(id_mahasiswa)
+    df_progress = frame_progress(progress)
+    avg_penguasaan = float(df_progress["tingkat_penguasaan"].mean()) if len(df_progress) else 0.0
+
+    return {
+        "total_submisi": ringkasan["total"],
+        "top_errors": ringkasan["per_tipe"][:10],
+        "pola": pola,
+        "progress": progress,
+        "avg_penguasaan": avg_penguasaan
+    }
+
+
+def _teks_periode(date_from: Optional[datetime], date_to: Optional[datetime]) -> str:
+    return f"{format_datetime(date_from) if date_from else 'Semua'} - {format_datetime(date_to) if date_to else 'Sekarang'}"
+
+
+def _baris_submisi(dokumen: Dict[str, Any]) -> List[Any]:
+    return [formatter(dokumen.get(field)) for _, field, formatter in KOLOM_SUBMISI]
+
+
+# ==================== CSV ====================
+
+def export_csv_submisi(
+    queries: DatabaseQueries,
+    id_mahasiswa: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Tuple[Path, int]:
+    """
+    Stream seluruh riwayat submisi dalam periode ke file CSV
+
+    Returns:
+        Tuple (path file CSV, jumlah baris submisi)
+    """
+    path = _path_export(id_mahasiswa, "csv")
+    jumlah = 0
+    mulai = time.perf_counter()
+
+    try:
+        # utf-8-sig supaya Excel membaca karakter non-ASCII dengan benar
+        with open(path, "w", newline="", encoding="utf-8-sig") as file:
+            writer = csv.writer(file)
+            writer.writerow([header for header, _, _ in KOLOM_SUBMISI])
+            for dokumen in queries.iterasi_submisi_periode(
+                id_mahasiswa, date_from, date_to, PROYEKSI_SUBMISI, BATCH_CURSOR
+            ):
+                baris = _baris_submisi(dokumen)
+                if isinstance(baris[0], datetime):
+                    baris[0] = baris[0].strftime(FORMAT_TANGGAL_CSV)
+                writer.writerow(baris)
+                jumlah += 1
+    except Exception:
+        path.unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Export CSV {id_mahasiswa}: {jumlah} baris dalam {time.perf_counter() - mulai:.2f}s")
+    return path, jumlah
+
+
+# ==================== XLSX ====================
+
+def export_xlsx_laporan(
+    queries: DatabaseQueries,
+    pengguna: Dict[str, Any],
+    data_laporan: Dict[str, Any],
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Tuple[Path, int]:
+    """
+    Tulis laporan lengkap ke XLSX dengan xlsxwriter mode constant_memory
+
+    Sheet: Info, Summary, Progress, Top Errors, Pola Kesalahan, Riwayat Submisi.
+    Constant memory mewajibkan baris ditulis berurutan per sheet, jadi setiap
+    sheet diselesaikan sebelum sheet berikutnya dibuat.
+
+    Returns:
+        Tuple (path file XLSX, jumlah baris submisi)
+    """
+    import xlsxwriter
+
+    id_mahasiswa = str(pengguna["_id"])
+    path = _path_export(id_mahasiswa, "xlsx")
+    mulai = time.perf_counter()
+    jumlah = 0
+
+    workbook = xlsxwriter.Workbook(str(path), {"constant_memory": True, "remove_timezone": True})
+    try:
+        tebal = workbook.add_format({"bold": True})
+        format_tanggal = workbook.add_format({"num_format": "yyyy-mm-dd hh:mm"})
+
+        def tulis_tabel(nama_sheet: str, header: List[str], baris_baris: List[List[Any]]) -> None:
+            sheet = workbook.add_worksheet(nama_sheet)
+            sheet.write_row(0, 0, header, tebal)
+            for nomor, baris in enumerate(baris_baris, start=1):
+                sheet.write_row(nomor, 0, baris)
+
+        tulis_tabel("Info", ["Field", "Value"], [
+            ["Nama", pengguna.get("nama", "N/A")],
+            ["Email", pengguna.get("email", "N/A")],
+            ["Tingkat Kemahiran", pengguna.get("tingkat_kemahiran", "N/A")],
+            ["Report Generated", format_datetime(datetime.now())],
+            ["Periode", _teks_periode(date_from, date_to)],
+        ])
+
+        tulis_tabel("Summary", ["Field", "Value"], [
+            ["Total Submisi", data_laporan["total_submisi"]],
+            ["Total Pola", len(data_laporan["pola"])],
+            ["Rata-rata Penguasaan", f"{data_laporan['avg_penguasaan']:.1f}%"],
+            ["Topik Dipelajari", len(data_laporan["progress"])],
+        ])
+
+        if data_laporan["progress"]:
+            tulis_tabel("Progress", ["Topik", "Penguasaan (%)", "Jumlah Error", "Tren"], [
+                [
+                    p.get("topik", "N/A"),
+                    p.get("tingkat_penguasaan", 0),
+                    p.get("jumlah_error_di_topik", 0),
+                    p.get("tren_perbaikan", "N/A"),
+                ]
+                for p in data_laporan["progress"]
+            ])
+
+        if data_laporan["top_errors"]:
+            tulis_tabel("Top Errors", ["Tipe Error", "Jumlah"], [
+                [tipe, jumlah_tipe] for tipe, jumlah_tipe in data_laporan["top_errors"]
+            ])
+
+        if data_laporan["pola"]:
+            tulis_tabel("Pola Kesalahan", ["Jenis Kesalahan", "Frekuensi", "Kejadian Terakhir", "Misconception"], [
+                [
+                    p.get("jenis_kesalahan", "N/A"),
+                    p.get("frekuensi", 0),
+                    format_datetime(p.get("kejadian_terakhir")),
+                    p.get("deskripsi_miskonsepsi") or "N/A",
+                ]
+                for p in data_laporan["pola"]
+            ])
+
+        # Riwayat submisi: stream dari cursor, satu baris per dokumen
+        sheet = workbook.add_worksheet("Riwayat Submisi")
+        sheet.set_column(0, 0, 18)
+        sheet.set_column(3, len(KOLOM_SUBMISI) - 1, 40)
+        sheet.write_row(0, 0, [header for header, _, _ in KOLOM_SUBMISI], tebal)
+        for dokumen in queries.iterasi_submisi_periode(
+            id_mahasiswa, date_from, date_to, PROYEKSI_SUBMISI, BATCH_CURSOR
+        ):
+            jumlah += 1
+            # Batas panjang string per sel Excel
+            baris = [nilai[:BATAS_SEL_XLSX] if isinstance(nilai, str) else nilai for nilai in _baris_submisi(dokumen)]
+            if isinstance(baris[0], datetime):
+                sheet.write_datetime(jumlah, 0, baris[0], format_tanggal)
+            else:
+                sheet.write(jumlah, 0, baris[0])
+            sheet.write_row(jumlah, 1, baris[1:])
+
+        workbook.close()
+    except Exception:
+        try:
+            workbook.close()
+        finally:
+            path.unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Export XLSX {id_mahasiswa}: {jumlah} baris dalam {time.perf_counter() - mulai:.2f}s")
+    return path, jumlah
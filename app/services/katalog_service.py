@@ -0,0 +1,267 @@
+"""
+Katalog Service - Shared in-memory catalogue cache (topik, sumber daya, exercises)
+
+CATATAN:
+- Konten katalog jarang berubah dan hanya lewat admin_service CRUD, tapi sebelumnya
+  dibaca full-collection di setiap render halaman Sumber Belajar, Latihan, Analisis
+  dan Kelola Konten untuk setiap mahasiswa
+- Snapshot dimuat sekali per proses (dibagi semua session Streamlit) dan disajikan dari memori
+- Versi katalog disimpan di collection meta_aplikasi; admin CRUD menaikkan versi
+  (lihat invalidasi_katalog), proses lain me-reload snapshot saat versi berubah
+- Pengecekan versi di-throttle (settings.KATALOG_INTERVAL_CEK_VERSI), jadi page load
+  mahasiswa tidak melakukan query katalog sama sekali
+- Cache berlangganan bus event (services/watcher_service.py): perubahan katalog dari mana pun
+  (termasuk script seperti init_database.py) langsung menandai snapshot kedaluwarsa. Selama
+  watcher aktif, cek versi hanya cadangan (settings.KATALOG_INTERVAL_CEK_VERSI_WATCHER)
+- Counter total_error di topik_pembelajaran (di-$inc setiap analisis) tidak ikut
+  menginvalidasi: watcher menyaring update yang hanya menyentuh FIELD_COUNTER
+- Snapshot bersifat read-only: caller yang perlu memodifikasi item harus copy dulu
+- Rekomendasi per topik memakai inverted index (utils/indeks_topik.py) dan pencarian
+  teks memakai index BM25 (utils/pencarian.py); keduanya diperbarui incremental
+  dari selisih antar versi katalog, bukan dibangun ulang
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from config import settings
+from database.queries import DatabaseQueries
+from utils.bus_event import BusEvent, EventPerubahan, bus_perubahan
+from utils.indeks_topik import IndeksTopik
+from utils.pencarian import IndeksBM25
+
+logger = logging.getLogger(__name__)
+
+# Bobot field untuk ranking BM25 per jenis katalog (judul/nama paling relevan)
+BOBOT_PENCARIAN: Dict[str, Dict[str, float]] = {
+    "topik": {"nama": 3.0, "kategori": 1.5, "deskripsi": 1.0},
+    "sumber_daya": {"judul": 3.0, "topik_terkait": 2.0, "deskripsi": 1.0},
+    "exercises": {"judul": 3.0, "topik": 2.0, "topik_terkait": 2.0, "deskripsi": 1.0},
+}
+
+# Collection sumber katalog (perubahan di sini membuat snapshot kedaluwarsa)
+KOLEKSI_KATALOG = ("topik_pembelajaran", "sumber_daya", "exercises")
+
+# ==================== SNAPSHOT ====================
+
+@dataclass
+class SnapshotKatalog:
+    """Satu versi katalog yang sudah dimuat ke memori"""
+    versi: int
+    topik: List[Dict[str, Any]] = field(default_factory=list)
+    sumber_daya: List[Dict[str, Any]] = field(default_factory=list)
+    exercises: List[Dict[str, Any]] = field(default_factory=list)
+    indeks_sumber_daya: IndeksTopik = field(default_factory=IndeksTopik)
+    indeks_exercises: IndeksTopik = field(default_factory=IndeksTopik)
+    pencarian: Dict[str, IndeksBM25] = field(default_factory=dict)
+    dimuat_pada: datetime = field(default_factory=datetime.now)
+
+
+class CacheKatalog:
+    """
+    Cache katalog process-wide dengan invalidasi berbasis versi
+
+    Reader tidak pernah menunggu lock selama snapshot masih fresh; reload hanya
+    dilakukan satu thread (double-checked locking), thread lain tetap memakai
+    snapshot lama sampai snapshot baru siap.
+    """
+
+    def __init__(self, interval_cek_versi: Optional[float] = None):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[SnapshotKatalog] = None
+        self._terakhir_cek = 0.0
+        self._paksa_reload = False
+        self._interval_cek_versi = interval_cek_versi
+        self._bus: Optional[BusEvent] = None
+        # Index dipakai bersama antar snapshot dan di-update incremental saat reload
+        self._indeks_sumber_daya = IndeksTopik()
+        self._indeks_exercises = IndeksTopik()
+        self._pencarian = {jenis: IndeksBM25(bobot) for jenis, bobot in BOBOT_PENCARIAN.items()}
+
+    @property
+    def interval_cek_versi(self) -> float:
+        if self._interval_cek_versi is not None:
+            return self._interval_cek_versi
+        if self._bus is not None and self._bus.aktif:
+            return float(settings.KATALOG_INTERVAL_CEK_VERSI_WATCHER)
+        return float(settings.KATALOG_INTERVAL_CEK_VERSI)
+
+    def _masih_fresh(self) -> bool:
+        return (
+            self._snapshot is not None
+            and not self._paksa_reload
+            and time.monotonic() - self._terakhir_cek < self.interval_cek_versi
+        )
+
+    def _muat(self, queries: DatabaseQueries, versi: int) -> SnapshotKatalog:
+        """Muat ulang seluruh katalog dari database dan terapkan selisihnya ke index"""
+        mulai = time.perf_counter()
+        lama = self._snapshot
+        snapshot = SnapshotKatalog(
+            versi=versi,
+            topik=queries.ambil_semua_topik(),
+            sumber_daya=queries.ambil_semua_sumber_daya(),
+            exercises=queries.ambil_semua_exercises(),
+            indeks_sumber_daya=self._indeks_sumber_daya,
+            indeks_exercises=self._indeks_exercises,
+            pencarian=self._pencarian
+        )
+        delta_sumber_daya = self._indeks_sumber_daya.perbarui(
+            lama.sumber_daya if lama else [], snapshot.sumber_daya
+        )
+        delta_exercises = self._indeks_exercises.perbarui(
+            lama.exercises if lama else [], snapshot.exercises
+        )
+        for jenis, indeks in self._pencarian.items():
+            indeks.perbarui(getattr(lama, jenis) if lama else [], getattr(snapshot, jenis))
+        logger.info(
+            f"Katalog v{versi} dimuat dalam {(time.perf_counter() - mulai) * 1000:.0f}ms "
+            f"({len(snapshot.topik)} topik, {len(snapshot.sumber_daya)} sumber daya, "
+            f"{len(snapshot.exercises)} exercises) - delta index sumber daya: "
+            f"{delta_sumber_daya}, exercises: {delta_exercises}"
+        )
+        return snapshot
+
+    def ambil_snapshot(self, queries: DatabaseQueries) -> SnapshotKatalog:
+        """
+        Ambil snapshot katalog terkini
+
+        Args:
+            queries: DatabaseQueries instance (hanya dipakai saat cek versi / reload)
+
+        Returns:
+            SnapshotKatalog (bisa kosong jika database belum pernah terbaca)
+        """
+        if self._masih_fresh():
+            return self._snapshot  # type: ignore[return-value]
+
+        with self._lock:
+            if self._masih_fresh():
+                return self._snapshot  # type: ignore[return-value]
+
+            versi_db = queries.ambil_versi_katalog()
+            self._terakhir_cek = time.monotonic()
+
+            if versi_db is None:
+                # Database tidak bisa dibaca: pakai snapshot lama bila ada
+                if self._snapshot is not None:
+                    return self._snapshot
+                versi_db = 0
+
+            if self._snapshot is None or self._paksa_reload or self._snapshot.versi != versi_db:
+                self._snapshot = self._muat(queries, versi_db)
+                self._paksa_reload = False
+
+            return self._snapshot
+
+    def tandai_kedaluwarsa(self) -> None:
+        """
+        Paksa reload di pembacaan berikutnya. Snapshot lama tetap disajikan
+        sampai reload selesai dan dipakai sebagai basis delta index.
+        """
+        with self._lock:
+            self._paksa_reload = True
+
+    def hubungkan_bus(self, bus: BusEvent) -> None:
+        """Berlangganan perubahan katalog & versi katalog dari bus event"""
+        self._bus = bus
+        bus.langganan(KOLEKSI_KATALOG + ("meta_aplikasi",), self._saat_perubahan)
+
+    def _saat_perubahan(self, event: EventPerubahan) -> None:
+        if event.koleksi == "meta_aplikasi" and event.id_dokumen != "versi_katalog":
+            return
+        self.tandai_kedaluwarsa()
+
+
+katalog_cache = CacheKatalog()
+katalog_cache.hubungkan_bus(bus_perubahan)
+
+
+# ==================== PUBLIC API ====================
+
+def ambil_topik_katalog(queries: DatabaseQueries) -> List[Dict[str, Any]]:
+    """Ambil semua topik pembelajaran dari cache (urut kategori)"""
+    return list(katalog_cache.ambil_snapshot(queries).topik)
+
+
+def ambil_sumber_daya_katalog(queries: DatabaseQueries) -> List[Dict[str, Any]]:
+    """Ambil semua learning resources dari cache (terbaru dulu)"""
+    return list(katalog_cache.ambil_snapshot(queries).sumber_daya)
+
+
+def ambil_exercises_katalog(queries: DatabaseQueries) -> List[Dict[str, Any]]:
+    """Ambil semua exercises dari cache (terbaru dulu)"""
+    return list(katalog_cache.ambil_snapshot(queries).exercises)
+
+
+def cari_sumber_daya_by_topik(
+    queries: DatabaseQueries,
+    topik: Union[str, Iterable[str]],
+    tingkat_kesulitan: Optional[str] = None,
+    tipe: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Ambil learning resources untuk satu/beberapa topik via inverted index
+
+    Returns:
+        List sumber daya unik (terbaru dulu)
+    """
+    snapshot = katalog_cache.ambil_snapshot(queries)
+    return snapshot.indeks_sumber_daya.cari(topik, tingkat_kesulitan, tipe, limit)
+
+
+def cari_exercises_by_topik(
+    queries: DatabaseQueries,
+    topik: Union[str, Iterable[str]],
+    tingkat_kesulitan: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Ambil exercises untuk satu/beberapa topik via inverted index
+
+    Returns:
+        List exercises unik (terbaru dulu)
+    """
+    snapshot = katalog_cache.ambil_snapshot(queries)
+    return snapshot.indeks_exercises.cari(topik, tingkat_kesulitan, limit=limit)
+
+
+def cari_katalog(
+    queries: DatabaseQueries,
+    teks: str,
+    jenis: str = "sumber_daya",
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Full-text search (BM25) atas katalog
+
+    Args:
+        queries: DatabaseQueries instance
+        teks: Query bebas (token terakhir diperlakukan sebagai prefix)
+        jenis: "sumber_daya", "exercises", atau "topik"
+        limit: Batas jumlah hasil
+
+    Returns:
+        List dokumen urut relevansi
+    """
+    if jenis not in BOBOT_PENCARIAN:
+        raise ValueError(f"Jenis katalog tidak dikenal: {jenis}")
+    snapshot = katalog_cache.ambil_snapshot(queries)
+    return snapshot.pencarian[jenis].cari(teks, limit)
+
+
+def invalidasi_katalog(queries: DatabaseQueries) -> None:
+    """
+    Tandai katalog berubah - dipanggil admin_service setelah CRUD berhasil
+
+    Versi di database dinaikkan supaya semua proses (worker lain) reload,
+    dan proses ini dipaksa reload supaya admin langsung melihat perubahannya.
+    """
+    versi_baru = queries.naikkan_versi_katalog()
+    katalog_cache.tandai_kedaluwarsa()
+    logger.info(f"Katalog diinvalidasi (versi baru: {versi_baru})")
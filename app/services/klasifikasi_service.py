@@ -0,0 +1,385 @@
+"""
+Klasifikasi Service - Pre-classifier lokal berbasis aturan sebelum analisis LLM
+
+CATATAN:
+- Banyak submisi adalah kasus "buku teks" (SyntaxError, IndentationError, NameError,
+  ZeroDivisionError) yang sudah dikenali utils/prompts.estimasi_tingkat_kesulitan sebagai "mudah"
+- Traceback di-parse (tipe, detail, nomor baris) dan kode Python di-parse dengan `ast`
+  untuk mengonfirmasi penyebab (mis. titik dua hilang, salah ketik nama variabel)
+- Pola yang dikenali dipetakan ke HasilAnalisis dari template, dengan skor keyakinan 0-1;
+  hanya hasil dengan keyakinan ≥ settings.KLASIFIKASI_LOKAL_AMBANG yang dipakai,
+  sisanya (kasus ambigu) tetap dikirim ke LLM
+- Hanya Python; bahasa lain selalu ke LLM
+- Analisis lokal dicatat di metrik_ai dengan sumber "lokal" (offload rate di dashboard admin)
+"""
+
+import ast
+import builtins
+import difflib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Set, Tuple
+
+from config import settings
+from services.ai_service import HasilAnalisis
+from utils.prompts import estimasi_tingkat_kesulitan
+
+logger = logging.getLogger(__name__)
+
+_POLA_TIPE_ERROR = re.compile(r"^\s*([A-Za-z_][\w.]*(?:Error|Exception))\s*(?::\s*(.*?))?\s*$", re.MULTILINE)
+_POLA_BARIS = re.compile(r"line (\d+)")
+_POLA_NAMA_TIDAK_ADA = re.compile(r"name '(\w+)' is not defined")
+
+# Level Bloom penjelasan template per tingkat kemahiran
+BLOOM_PER_KEMAHIRAN = {"pemula": "Remember", "menengah": "Understand", "mahir": "Apply"}
+
+# Keyword pembuka blok → topik katalog
+TOPIK_PER_BLOK = {
+    "if": "Control Flow (If/Else)",
+    "elif": "Control Flow (If/Else)",
+    "else": "Control Flow (If/Else)",
+    "for": "Loops (For/While)",
+    "while": "Loops (For/While)",
+    "def": "Functions",
+}
+TOPIK_DEFAULT = "Variables & Data Types"
+
+_BUILTIN = set(dir(builtins))
+
+
+@dataclass
+class KonteksError:
+    """Hasil parsing traceback + kode"""
+    kode: str
+    tipe: Optional[str]
+    detail: str
+    baris: Optional[int]
+    error_ast: Optional[SyntaxError]
+
+    def teks_baris(self, nomor: Optional[int]) -> str:
+        baris = self.kode.splitlines()
+        if nomor and 0 < nomor <= len(baris):
+            return baris[nomor - 1].strip()
+        return ""
+
+
+@dataclass
+class HasilKlasifikasi:
+    """Klasifikasi lokal: analisis template + keyakinan + nama aturan yang cocok"""
+    hasil: HasilAnalisis
+    keyakinan: float
+    aturan: str
+
+
+# ==================== PARSING ====================
+
+def parse_traceback(pesan_error: str) -> Tuple[Optional[str], str, Optional[int]]:
+    """
+    Ambil tipe exception, detail, dan nomor baris terakhir dari traceback
+
+    Returns:
+        Tuple (tipe, detail, baris); tipe None jika tidak dikenali
+    """
+    cocok = _POLA_TIPE_ERROR.findall(pesan_error or "")
+    tipe, detail = cocok[-1] if cocok else (None, "")
+    baris = _POLA_BARIS.findall(pesan_error or "")
+    return (tipe.rsplit(".", 1)[-1] if tipe else None), detail, (int(baris[-1]) if baris else None)
+
+
+def _cek_sintaks(kode: str) -> Optional[SyntaxError]:
+    try:
+        ast.parse(kode)
+        return None
+    except SyntaxError as e:
+        return e
+    except ValueError:
+        return None
+
+
+def _nama_terdefinisi(kode: str) -> Set[str]:
+    """Nama yang di-assign / didefinisikan di kode (variabel, fungsi, kelas, parameter, import)"""
+    try:
+        pohon = ast.parse(kode)
+    except (SyntaxError, ValueError):
+        return set()
+    nama: Set[str] = set()
+    for node in ast.walk(pohon):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            nama.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            nama.add(node.name)
+        elif isinstance(node, ast.arg):
+            nama.add(node.arg)
+        elif isinstance(node, ast.alias):
+            nama.add((node.asname or node.name).split(".")[0])
+    return nama
+
+
+def _keyword_blok(teks_baris: str) -> Optional[str]:
+    kata = re.match(r"\s*(\w+)", teks_baris)
+    return kata.group(1) if kata and kata.group(1) in TOPIK_PER_BLOK else None
+
+
+# ==================== TEMPLATE ====================
+
+def _hasil(
+    tipe_error: str,
+    penyebab_utama: str,
+    kesenjangan_konsep: str,
+    penjelasan: str,
+    saran_perbaikan: str,
+    topik_terkait: List[str],
+    saran_latihan: str,
+    tingkat_kemahiran: str
+) -> HasilAnalisis:
+    return HasilAnalisis(
+        tipe_error=tipe_error,
+        penyebab_utama=penyebab_utama,
+        kesenjangan_konsep=kesenjangan_konsep,
+        level_bloom=BLOOM_PER_KEMAHIRAN.get(tingkat_kemahiran, "Understand"),
+        penjelasan=penjelasan,
+        saran_perbaikan=saran_perbaikan,
+        topik_terkait=list(dict.fromkeys(topik_terkait)),
+        saran_latihan=saran_latihan,
+    )
+
+
+# ==================== ATURAN ====================
+
+def _aturan_indentasi(konteks: KonteksError, tingkat: str) -> Optional[HasilKlasifikasi]:
+    terkonfirmasi = isinstance(konteks.error_ast, IndentationError)
+    if konteks.tipe not in ("IndentationError", "TabError", "SyntaxError"):
+        # Traceback menyebut exception lain: kode hanya potongan, bukan sumber error-nya
+        return None
+    if konteks.tipe == "SyntaxError" and not terkonfirmasi:
+        return None
+    pesan = (konteks.error_ast.msg if terkonfirmasi else konteks.detail).lower()
+    nomor = konteks.error_ast.lineno if terkonfirmasi else konteks.baris
+    teks = konteks.teks_baris(nomor)
+    teks_sebelum = konteks.teks_baris((nomor or 1) - 1)
+    blok = _keyword_blok(teks_sebelum) or _keyword_blok(teks)
+    topik = [TOPIK_PER_BLOK.get(blok, "Control Flow (If/Else)")]
+
+    if "expected an indented block" in pesan:
+        aturan, penyebab = "blok_tanpa_indentasi", (
+            f"Baris {nomor} seharusnya menjadi isi blok dari baris sebelumnya, tetapi tidak menjorok ke dalam."
+        )
+        saran = "Tambahkan indentasi (4 spasi) pada baris isi blok, atau isi blok dengan `pass` jika memang kosong."
+    elif "unexpected indent" in pesan:
+        aturan, penyebab = "indentasi_berlebih", (
+            f"Baris {nomor} menjorok ke dalam padahal tidak berada di dalam blok apa pun."
+        )
+        saran = "Samakan indentasi baris tersebut dengan baris sebelumnya yang setingkat."
+    elif "unindent does not match" in pesan or "inconsistent use of tabs" in pesan:
+        aturan, penyebab = "indentasi_tidak_konsisten", (
+            f"Indentasi baris {nomor} tidak cocok dengan tingkat indentasi blok mana pun "
+            f"(sering karena campuran tab dan spasi)."
+        )
+        saran = "Gunakan 4 spasi secara konsisten (jangan campur tab & spasi), lalu rapikan indentasi blok."
+    else:
+        return None
+
+    return HasilKlasifikasi(
+        hasil=_hasil(
+            tipe_error="IndentationError",
+            penyebab_utama=penyebab,
+            kesenjangan_konsep="Di Python, indentasi adalah bagian dari sintaks: indentasi menentukan baris mana yang termasuk dalam sebuah blok.",
+            penjelasan=(
+                "Python tidak memakai kurung kurawal untuk menandai blok. Setelah baris yang diakhiri titik dua "
+                "(`if`, `for`, `while`, `def`, ...), baris-baris isi blok harus menjorok ke dalam dengan jumlah spasi "
+                "yang sama. Saat indentasi tidak sesuai, interpreter tidak bisa menentukan struktur program."
+            ),
+            saran_perbaikan=f"{saran}\n\nBaris bermasalah: {teks or '(tidak terbaca)'}",
+            topik_terkait=topik,
+            saran_latihan="Tulis ulang program kecil dengan if di dalam for, lalu periksa tingkat indentasi setiap baris.",
+            tingkat_kemahiran=tingkat,
+        ),
+        keyakinan=0.95 if terkonfirmasi else 0.8,
+        aturan=aturan,
+    )
+
+
+def _aturan_sintaks(konteks: KonteksError, tingkat: str) -> Optional[HasilKlasifikasi]:
+    error_ast = konteks.error_ast
+    if isinstance(error_ast, IndentationError):
+        return None
+    if konteks.tipe != "SyntaxError":
+        # Traceback menyebut exception lain: kode hanya potongan, bukan sumber error-nya
+        return None
+    pesan = (error_ast.msg if error_ast else konteks.detail).lower()
+    nomor = error_ast.lineno if error_ast else konteks.baris
+    teks = konteks.teks_baris(nomor)
+    blok = _keyword_blok(teks)
+
+    if blok and not teks.rstrip().endswith(":") and ("expected ':'" in pesan or "invalid syntax" in pesan):
+        aturan = "titik_dua_hilang"
+        penyebab = f"Baris {nomor} membuka blok `{blok}` tetapi tidak diakhiri titik dua (`:`)."
+        kesenjangan = "Pernyataan yang membuka blok (if, for, while, def, ...) wajib diakhiri titik dua."
+        saran = f"Tambahkan `:` di akhir baris:\n{teks}:"
+        topik = [TOPIK_PER_BLOK[blok]]
+    elif "was never closed" in pesan or "unexpected eof" in pesan:
+        aturan = "kurung_tidak_ditutup"
+        penyebab = "Ada tanda kurung, kurung siku, atau kurung kurawal yang dibuka tetapi tidak pernah ditutup."
+        kesenjangan = "Setiap pembuka `(`, `[`, `{` harus punya pasangan penutupnya."
+        saran = f"Periksa pasangan kurung di sekitar baris {nomor}: {teks or '(tidak terbaca)'}"
+        topik = [TOPIK_DEFAULT]
+    elif "unterminated string" in pesan or "eol while scanning" in pesan:
+        aturan = "string_tidak_ditutup"
+        penyebab = f"String di baris {nomor} dibuka dengan tanda kutip tetapi tidak ditutup."
+        kesenjangan = "String harus diawali dan diakhiri tanda kutip yang sama."
+        saran = f"Tutup string dengan tanda kutip yang sama di baris {nomor}: {teks or '(tidak terbaca)'}"
+        topik = [TOPIK_DEFAULT]
+    elif "maybe you meant '=='" in pesan or (blok in ("if", "elif", "while")
+                                              and re.search(r"[^=!<>]=[^=]", teks)):
+        aturan = "assignment_di_kondisi"
+        penyebab = f"Kondisi di baris {nomor} memakai `=` (assignment), bukan `==` (perbandingan)."
+        kesenjangan = "`=` menyimpan nilai ke variabel, sedangkan `==` membandingkan dua nilai."
+        saran = "Ganti `=` pada kondisi menjadi `==`."
+        topik = [TOPIK_PER_BLOK.get(blok, "Control Flow (If/Else)"), TOPIK_DEFAULT]
+    else:
+        # "invalid syntax" tanpa pola yang jelas: biarkan LLM
+        return None
+
+    return HasilKlasifikasi(
+        hasil=_hasil(
+            tipe_error="SyntaxError",
+            penyebab_utama=penyebab,
+            kesenjangan_konsep=kesenjangan,
+            penjelasan=(
+                "SyntaxError berarti kode tidak sesuai aturan penulisan Python, sehingga program "
+                "gagal dibaca sebelum satu baris pun dijalankan. Pesan error menunjuk lokasi di mana "
+                "interpreter pertama kali bingung; penyebabnya bisa ada di baris itu atau tepat sebelumnya."
+            ),
+            saran_perbaikan=saran,
+            topik_terkait=topik,
+            saran_latihan="Baca pesan SyntaxError baris per baris: cari nomor baris, lalu periksa tanda baca di baris itu dan sebelumnya.",
+            tingkat_kemahiran=tingkat,
+        ),
+        keyakinan=0.9 if error_ast else 0.7,
+        aturan=aturan,
+    )
+
+
+def _aturan_nama(konteks: KonteksError, tingkat: str) -> Optional[HasilKlasifikasi]:
+    if konteks.tipe != "NameError":
+        return None
+    cocok = _POLA_NAMA_TIDAK_ADA.search(konteks.detail)
+    if not cocok:
+        return None
+    nama = cocok.group(1)
+    terdefinisi = _nama_terdefinisi(konteks.kode)
+    topik = [TOPIK_DEFAULT]
+
+    if nama.lower() in ("true", "false", "none"):
+        benar = nama.capitalize()
+        aturan, keyakinan = "kapitalisasi_konstanta", 0.95
+        penyebab = f"`{nama}` bukan nilai bawaan Python; yang benar adalah `{benar}` (huruf besar di awal)."
+        saran = f"Ganti `{nama}` menjadi `{benar}`."
+    else:
+        mirip = difflib.get_close_matches(nama, sorted((terdefinisi | _BUILTIN) - {nama}), n=1, cutoff=0.8)
+        if mirip:
+            aturan, keyakinan = "salah_ketik_nama", 0.9
+            penyebab = f"`{nama}` tidak pernah didefinisikan; kemungkinan salah ketik dari `{mirip[0]}`."
+            saran = f"Ganti `{nama}` menjadi `{mirip[0]}` (Python membedakan huruf besar/kecil)."
+        elif nama in terdefinisi:
+            # Dipakai sebelum di-assign / beda scope: butuh analisis alur, serahkan ke LLM
+            return None
+        elif konteks.error_ast is not None:
+            # Kode tidak bisa di-parse, daftar nama terdefinisi tidak lengkap
+            return None
+        else:
+            aturan, keyakinan = "nama_belum_didefinisikan", 0.85
+            penyebab = f"Nama `{nama}` dipakai tetapi tidak pernah dibuat (di-assign, di-import, atau didefinisikan)."
+            saran = (
+                f"Buat `{nama}` terlebih dahulu sebelum dipakai (mis. `{nama} = ...`), import modulnya, "
+                f"atau jika maksudnya teks, apit dengan tanda kutip: \"{nama}\"."
+            )
+
+    return HasilKlasifikasi(
+        hasil=_hasil(
+            tipe_error="NameError",
+            penyebab_utama=penyebab,
+            kesenjangan_konsep="Variabel di Python baru ada setelah diberi nilai; nama bersifat case-sensitive.",
+            penjelasan=(
+                "NameError muncul saat Python menemukan nama yang tidak dikenalnya. Python mencari nama "
+                "di scope lokal, global, lalu bawaan (built-in); jika tidak ada di semuanya, program berhenti. "
+                "Penyebab paling umum adalah salah ketik, beda huruf besar/kecil, atau lupa membuat variabel."
+            ),
+            saran_perbaikan=saran,
+            topik_terkait=topik,
+            saran_latihan="Latih membaca kode dari atas ke bawah dan tandai kapan setiap variabel pertama kali diberi nilai.",
+            tingkat_kemahiran=tingkat,
+        ),
+        keyakinan=keyakinan,
+        aturan=aturan,
+    )
+
+
+def _aturan_pembagian_nol(konteks: KonteksError, tingkat: str) -> Optional[HasilKlasifikasi]:
+    if konteks.tipe != "ZeroDivisionError":
+        return None
+    teks = konteks.teks_baris(konteks.baris)
+    return HasilKlasifikasi(
+        hasil=_hasil(
+            tipe_error="ZeroDivisionError",
+            penyebab_utama=f"Program membagi dengan nol{f' di baris {konteks.baris}' if konteks.baris else ''}.",
+            kesenjangan_konsep="Pembagi bisa bernilai nol untuk input tertentu (mis. list kosong); kondisi ini perlu dicek sebelum membagi.",
+            penjelasan=(
+                "Pembagian dengan nol tidak terdefinisi secara matematis, sehingga Python menghentikan program. "
+                "Biasanya pembagi berasal dari variabel (jumlah data, panjang list) yang ternyata nol pada kasus tertentu."
+            ),
+            saran_perbaikan=(
+                "Cek pembagi sebelum membagi, misalnya:\n"
+                "if pembagi != 0:\n    hasil = a / pembagi\nelse:\n    hasil = 0  # atau tangani sesuai kebutuhan"
+                + (f"\n\nBaris bermasalah: {teks}" if teks else "")
+            ),
+            topik_terkait=["Control Flow (If/Else)", TOPIK_DEFAULT],
+            saran_latihan="Buat fungsi rata-rata yang tetap benar saat list kosong, lalu uji dengan beberapa input tepi.",
+            tingkat_kemahiran=tingkat,
+        ),
+        keyakinan=0.85,
+        aturan="pembagian_nol",
+    )
+
+
+ATURAN: List[Callable[[KonteksError, str], Optional[HasilKlasifikasi]]] = [
+    _aturan_indentasi,
+    _aturan_sintaks,
+    _aturan_nama,
+    _aturan_pembagian_nol,
+]
+
+
+# ==================== ENTRY POINT ====================
+
+def klasifikasi_lokal(
+    kode: str,
+    pesan_error: str,
+    bahasa: str = "python",
+    tingkat_kemahiran: str = "pemula"
+) -> Optional[HasilKlasifikasi]:
+    """
+    Klasifikasi error secara lokal (tanpa LLM)
+
+    Returns:
+        HasilKlasifikasi dengan keyakinan tertinggi, atau None jika tidak ada aturan yang cocok.
+        Caller yang memutuskan apakah keyakinan cukup (settings.KLASIFIKASI_LOKAL_AMBANG).
+    """
+    if not settings.KLASIFIKASI_LOKAL_AKTIF or bahasa != "python":
+        return None
+    try:
+        tipe, detail, baris = parse_traceback(pesan_error)
+        error_ast = _cek_sintaks(kode or "")
+        if tipe is None and error_ast is not None:
+            tipe = type(error_ast).__name__
+        # Hanya error "mudah" yang dicoba lokal; sisanya butuh penalaran semantik
+        if not tipe or estimasi_tingkat_kesulitan(tipe) != "mudah":
+            return None
+
+        konteks = KonteksError(kode=kode or "", tipe=tipe, detail=detail, baris=baris, error_ast=error_ast)
+        kandidat = [hasil for aturan in ATURAN if (hasil := aturan(konteks, tingkat_kemahiran))]
+        return max(kandidat, key=lambda item: item.keyakinan) if kandidat else None
+    except Exception as e:
+        logger.warning(f"Klasifikasi lokal gagal: {str(e)}")
+        return None
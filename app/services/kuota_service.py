@@ -0,0 +1,122 @@
+"""
+Kuota Service - Pembatas pemakaian token LLM harian
+
+CATATAN:
+- GitHub Models membatasi token per hari per model; tanpa pembatas, request yang melewati
+  kuota gagal di provider setelah mahasiswa menunggu
+- Pemakaian hari ini = total_token metrik_ai (sumber llm) sejak 00:00, memakai jumlah token
+  dari usage provider (fallback tokenizer offline, lihat services/ai_service.py)
+- Counter di backend bersama (utils/backend_bersama.py, key per tanggal) supaya semua proses
+  worker melihat pemakaian yang sama: ditambah setiap panggilan, disinkron dari database berkala
+  (settings.LLM_KUOTA_INTERVAL_SINKRON) oleh satu worker saja (lock NX ber-TTL) supaya pemakaian
+  proses lain (script, worker yang restart) ikut terhitung
+- Backend tidak bisa dihubungi → pemakaian dibaca langsung dari metrik_ai
+- Sebelum panggilan LLM: estimasi input (prompt setelah dipangkas) + estimasi output harus
+  muat di sisa kuota, jika tidak → KuotaHabisError
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict
+
+from config import settings
+from database.queries import DatabaseQueries
+from utils.backend_bersama import BackendBersamaError, dapatkan_backend
+
+logger = logging.getLogger(__name__)
+
+# Counter per tanggal cukup hidup dua hari (hari ini + sisa jam kemarin untuk log)
+TTL_COUNTER_DETIK = 2 * 86400
+
+
+class KuotaHabisError(Exception):
+    """Kuota token LLM harian tidak cukup untuk request ini"""
+
+
+class _PemakaianHarian:
+    """Counter token LLM hari ini di backend bersama (dibagi semua worker)"""
+
+    @staticmethod
+    def _kunci() -> str:
+        return f"kuota_llm:{datetime.now():%Y%m%d}"
+
+    @staticmethod
+    def _dari_database(queries: DatabaseQueries) -> int:
+        awal_hari = datetime.combine(datetime.now().date(), datetime.min.time())
+        return queries.total_token_llm_sejak(awal_hari)
+
+    def terpakai(self, queries: DatabaseQueries) -> int:
+        """Token terpakai hari ini, sinkron dari metrik_ai jika sudah lewat interval"""
+        backend = dapatkan_backend()
+        kunci = self._kunci()
+        try:
+            perlu_sinkron = backend.simpan(
+                f"{kunci}:sinkron", "1", ttl=settings.LLM_KUOTA_INTERVAL_SINKRON, hanya_baru=True
+            )
+            terpakai = int(backend.ambil(kunci) or 0)
+        except BackendBersamaError as e:
+            logger.warning(f"Backend bersama tidak tersedia, pemakaian token dibaca dari database: {str(e)}")
+            try:
+                return self._dari_database(queries)
+            except Exception as e:
+                logger.error(f"Pemakaian token tidak bisa dibaca: {str(e)}")
+                return 0
+
+        if perlu_sinkron:
+            try:
+                selisih = self._dari_database(queries) - terpakai
+                if selisih > 0:
+                    terpakai = backend.tambah(kunci, selisih, ttl=TTL_COUNTER_DETIK)
+            except Exception as e:
+                logger.warning(f"Sinkron pemakaian token gagal, pakai counter bersama: {str(e)}")
+        return terpakai
+
+    def tambah(self, token: int) -> None:
+        try:
+            dapatkan_backend().tambah(self._kunci(), max(int(token), 0), ttl=TTL_COUNTER_DETIK)
+        except BackendBersamaError as e:
+            logger.warning(f"Pemakaian token tidak tercatat di backend bersama: {str(e)}")
+
+
+_pemakaian = _PemakaianHarian()
+
+
+def status_kuota(queries: DatabaseQueries) -> Dict[str, Any]:
+    """
+    Status kuota token LLM hari ini
+
+    Returns:
+        Dict dengan kuota, terpakai, sisa, persen (kuota 0 = tanpa batas)
+    """
+    kuota = settings.LLM_KUOTA_TOKEN_HARIAN
+    terpakai = _pemakaian.terpakai(queries)
+    return {
+        "kuota": kuota,
+        "terpakai": terpakai,
+        "sisa": max(kuota - terpakai, 0) if kuota > 0 else None,
+        "persen": (terpakai / kuota * 100) if kuota > 0 else 0.0,
+    }
+
+
+def pastikan_kuota(queries: DatabaseQueries, token_input: int) -> None:
+    """
+    Cek sisa kuota sebelum panggilan LLM
+
+    Raises:
+        KuotaHabisError: Jika token_input + estimasi output melebihi sisa kuota hari ini
+    """
+    kuota = settings.LLM_KUOTA_TOKEN_HARIAN
+    if kuota <= 0:
+        return
+    dibutuhkan = token_input + settings.LLM_ESTIMASI_TOKEN_OUTPUT
+    terpakai = _pemakaian.terpakai(queries)
+    if terpakai + dibutuhkan > kuota:
+        logger.warning(f"Kuota token harian habis: {terpakai}/{kuota}, butuh {dibutuhkan}")
+        raise KuotaHabisError(
+            "Kuota analisis AI hari ini sudah habis. Silakan coba lagi besok."
+        )
+
+
+def catat_pemakaian(total_token: int) -> None:
+    """Tambahkan token panggilan LLM yang baru selesai ke counter hari ini"""
+    _pemakaian.tambah(total_token)
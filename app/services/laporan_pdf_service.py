@@ -0,0 +1,272 @@
+"""
+Laporan PDF Service - Generate laporan PDF mahasiswa & kohort dengan render cache
+
+CATATAN:
+- Data diambil di proses app (query ringkas, sama dengan preview), lalu render
+  grafik & tabel dijalankan di ProcessPoolExecutor (spawn) - tidak memblok thread request
+  dan tidak terkena GIL
+- Hasil di-cache di disk dengan kunci (jenis, subjek, periode, versi data, versi template):
+  * periode dinormalisasi ke tanggal (bukan jam), jadi "7 hari terakhir" stabil dalam sehari
+  * versi data = sidik SHA-256 dari payload laporan; data tidak berubah = cache hit
+- Render yang sama dan sedang berjalan tidak diduplikasi (future dibagi antar request)
+- Worker menulis ke path sementara lalu rename atomik, jadi cache tidak pernah setengah jadi
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from config import settings
+from database.queries import DatabaseQueries
+from services.export_service import direktori_export, siapkan_data_laporan
+from utils.helpers import format_datetime
+from utils.laporan_pdf import render_laporan
+
+logger = logging.getLogger(__name__)
+
+# Naikkan jika layout/isi PDF berubah supaya cache lama tidak dipakai
+VERSI_TEMPLATE = 1
+
+
+# ==================== WORKER POOL ====================
+
+_lock_pool = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_sedang_dirender: Dict[str, Future] = {}
+
+
+def _ambil_pool_terkunci() -> ProcessPoolExecutor:
+    """ProcessPoolExecutor lazy (spawn: aman untuk proses yang punya thread & koneksi DB); panggil dengan _lock_pool"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=max(1, settings.PDF_WORKERS),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def _reset_pool() -> None:
+    """Buang pool yang rusak (worker crash), pool baru dibuat saat render berikutnya"""
+    global _pool
+    with _lock_pool:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def hentikan_pool() -> None:
+    """Matikan worker process (dipanggil saat shutdown / setelah benchmark)"""
+    _reset_pool()
+
+
+# ==================== CACHE ====================
+
+def direktori_cache_pdf() -> Path:
+    folder = direktori_export() / "pdf_cache"
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder
+
+
+def bersihkan_cache_pdf(maks_umur_jam: Optional[int] = None) -> int:
+    """
+    Hapus PDF cache yang lebih tua dari batas umur
+
+    Returns:
+        Jumlah file yang dihapus
+    """
+    batas = time.time() - (maks_umur_jam or settings.PDF_CACHE_MAKS_UMUR_JAM) * 3600
+    dihapus = 0
+    for file in direktori_cache_pdf().glob("*.pdf"):
+        try:
+            if file.stat().st_mtime < batas:
+                file.unlink()
+                dihapus += 1
+        except OSError as e:
+            logger.warning(f"Gagal hapus PDF cache {file.name}: {str(e)}")
+    return dihapus
+
+
+def _kunci_periode(date_from: Optional[datetime], date_to: Optional[datetime]) -> str:
+    """Periode dinormalisasi ke tanggal supaya rentang relatif stabil dalam satu hari"""
+    awal = date_from.strftime("%Y%m%d") if date_from else "awal"
+    akhir = date_to.strftime("%Y%m%d") if date_to else "kini"
+    return f"{awal}-{akhir}"
+
+
+def sidik_data(payload: Dict[str, Any]) -> str:
+    """Versi data laporan: hash SHA-256 dari payload (urutan key stabil)"""
+    teks = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(teks.encode("utf-8")).hexdigest()[:16]
+
+
+def _path_cache(jenis: str, subjek: str, periode: str, versi_data: str) -> Path:
+    return direktori_cache_pdf() / f"{jenis}_{subjek}_{periode}_{versi_data}_t{VERSI_TEMPLATE}.pdf"
+
+
+def _render_dengan_cache(jenis: str, subjek: str, periode: str, payload: Dict[str, Any]) -> Tuple[Path, bool]:
+    """
+    Ambil PDF dari cache, atau render di worker pool jika belum ada
+
+    Returns:
+        Tuple (path PDF, True jika cache hit)
+    """
+    path = _path_cache(jenis, subjek, periode, sidik_data(payload))
+    if path.exists():
+        os.utime(path)  # Perpanjang umur cache yang masih dipakai
+        return path, True
+
+    kunci = path.name
+    with _lock_pool:
+        future = _sedang_dirender.get(kunci)
+        pemilik = future is None
+        if pemilik:
+            payload_render = {**payload, "dibuat_pada": format_datetime(datetime.now())}
+            future = _ambil_pool_terkunci().submit(render_laporan, jenis, payload_render, str(path))
+            _sedang_dirender[kunci] = future
+    if pemilik:
+        bersihkan_cache_pdf()
+
+    mulai = time.perf_counter()
+    try:
+        future.result(timeout=settings.PDF_TIMEOUT_DETIK)
+        if pemilik:
+            logger.info(f"PDF {jenis} {subjek} dirender dalam {time.perf_counter() - mulai:.2f}s")
+    except BrokenProcessPool:
+        logger.error("Worker PDF crash, pool di-reset")
+        _reset_pool()
+        raise
+    finally:
+        if pemilik:
+            with _lock_pool:
+                _sedang_dirender.pop(kunci, None)
+
+    return path, False
+
+
+# ==================== PAYLOAD ====================
+
+def payload_laporan_mahasiswa(
+    pengguna: Dict[str, Any],
+    data_laporan: Dict[str, Any],
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Ubah data laporan (hasil siapkan_data_laporan) jadi payload tipe dasar untuk worker"""
+    return {
+        "nama": pengguna.get("nama", "N/A"),
+        "email": pengguna.get("email", "N/A"),
+        "tingkat_kemahiran": pengguna.get("tingkat_kemahiran", "N/A"),
+        # Resolusi tanggal (sama dengan _kunci_periode): jam/menit preset "N hari terakhir"
+        # tidak boleh ikut sidik_data, kalau tidak cache tidak pernah hit
+        "periode": f"{format_datetime(date_from, 'date') if date_from else 'Semua'} - "
+                   f"{format_datetime(date_to, 'date') if date_to else 'Sekarang'}",
+        "total_submisi": data_laporan["total_submisi"],
+        "avg_penguasaan": float(data_laporan["avg_penguasaan"]),
+        "top_errors": [[str(tipe), int(jumlah)] for tipe, jumlah in data_laporan["top_errors"]],
+        "progress": [
+            {
+                "topik": p.get("topik", "N/A"),
+                "tingkat_penguasaan": float(p.get("tingkat_penguasaan", 0)),
+                "jumlah_error_di_topik": int(p.get("jumlah_error_di_topik", 0)),
+                "tren_perbaikan": p.get("tren_perbaikan", "N/A"),
+            }
+            for p in data_laporan["progress"]
+        ],
+        "pola": [
+            {
+                "jenis_kesalahan": p.get("jenis_kesalahan", "N/A"),
+                "frekuensi": int(p.get("frekuensi", 0)),
+                "kejadian_terakhir": format_datetime(p.get("kejadian_terakhir")),
+                "deskripsi_miskonsepsi": p.get("deskripsi_miskonsepsi"),
+            }
+            for p in data_laporan["pola"]
+        ],
+    }
+
+
+def payload_laporan_kohort(analytics: Dict[str, Any]) -> Dict[str, Any]:
+    """Ubah hasil ambil_analitik_global jadi payload tipe dasar untuk worker"""
+    ai_usage = analytics.get("ai_usage", {})
+    return {
+        "periode": analytics.get("periode", "semua"),
+        "top_errors": [
+            {
+                "tipe_error": item.get("tipe_error", "Unknown"),
+                "jumlah": int(item.get("jumlah", 0)),
+                "jumlah_mahasiswa": int(item.get("jumlah_mahasiswa", 0)),
+            }
+            for item in analytics.get("top_errors", [])
+        ],
+        "pola_global": [
+            {
+                "jenis_kesalahan": item.get("jenis_kesalahan", "N/A"),
+                "total_frekuensi": int(item.get("total_frekuensi", 0)),
+                "jumlah_mahasiswa": int(item.get("jumlah_mahasiswa", 0)),
+                "deskripsi_sample": item.get("deskripsi_sample"),
+            }
+            for item in analytics.get("pola_global", [])
+        ],
+        "topik_ranking": [
+            {"nama": item.get("nama", "N/A"), "total_error": int(item.get("total_error", 0))}
+            for item in analytics.get("topik_ranking", [])
+        ],
+        "ai_usage": {
+            "total_request": int(ai_usage.get("total_request", 0)),
+            "total_token": int(ai_usage.get("total_token") or 0),
+            "total_biaya": float(ai_usage.get("total_biaya") or 0.0),
+            "success_rate": float(ai_usage.get("success_rate") or 0.0),
+        },
+    }
+
+
+# ==================== PUBLIC API ====================
+
+def buat_pdf_mahasiswa(
+    queries: DatabaseQueries,
+    pengguna: Dict[str, Any],
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    data_laporan: Optional[Dict[str, Any]] = None
+) -> Tuple[Path, bool]:
+    """
+    Generate (atau ambil dari cache) laporan PDF progress mahasiswa
+
+    Args:
+        queries: DatabaseQueries instance
+        pengguna: Dokumen user mahasiswa
+        date_from / date_to: Periode laporan
+        data_laporan: Hasil siapkan_data_laporan jika sudah ada (preview), supaya tidak query ulang
+
+    Returns:
+        Tuple (path PDF, True jika cache hit)
+    """
+    id_mahasiswa = str(pengguna["_id"])
+    if data_laporan is None:
+        data_laporan = siapkan_data_laporan(queries, id_mahasiswa, date_from, date_to)
+    payload = payload_laporan_mahasiswa(pengguna, data_laporan, date_from, date_to)
+    return _render_dengan_cache("mahasiswa", id_mahasiswa, _kunci_periode(date_from, date_to), payload)
+
+
+def buat_pdf_kohort(analytics: Dict[str, Any]) -> Tuple[Path, bool]:
+    """
+    Generate (atau ambil dari cache) laporan PDF analitik kohort
+
+    Args:
+        analytics: Hasil ambil_analitik_global (sudah dimuat oleh halaman admin)
+
+    Returns:
+        Tuple (path PDF, True jika cache hit)
+    """
+    payload = payload_laporan_kohort(analytics)
+    periode = str(payload["periode"])
+    return _render_dengan_cache("kohort", "global", f"{periode}-{datetime.now().strftime('%Y%m%d')}", payload)
@@ -0,0 +1,221 @@
+"""
+Penguasaan Service - Model tingkat penguasaan per topik (beban error meluruh eksponensial)
+
+CATATAN:
+- State per progress_belajar: `beban_error` (jumlah error berbobot) + `beban_diperbarui` (waktu)
+- Setiap error di topik: beban = beban_lama * 0.5^(Δt / paruh_waktu) + 1
+  Error lama makin tidak berpengaruh, jadi penguasaan pulih jika mahasiswa berhenti error
+- tingkat_penguasaan = 100 * skala / (skala + beban)  (beban 0 → 100, beban = skala → 50)
+- Update per submisi O(1) per topik: satu bulk_write update pipeline untuk semua topik.
+  Peluruhan + tambah beban dan skor dihitung server dari state dokumen saat itu (bukan
+  read-modify-write di Python), jadi submisi bersamaan dari worker lain tidak saling menimpa
+- Skor yang tersimpan diperbarui ke "sekarang" oleh snapshot harian (peluruhan tanpa error baru)
+- Mode recompute: bangun ulang skor semua mahasiswa dari riwayat submisi_error plus arsipnya
+  (submisi_error_arsip & file JSONL di ARSIP_DIR, lihat services/retensi_service.py), dibagi
+  chunk mahasiswa yang diproses paralel (ThreadPoolExecutor, I/O bound ke database). Replay
+  tidak bergantung urutan, jadi sumber cukup dirangkai tanpa merge
+"""
+
+import itertools
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import settings
+from database.queries import DatabaseQueries
+from services.retensi_service import baca_arsip_file
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== MODEL ====================
+
+def luruhkan_beban(beban: float, dari: Optional[datetime], ke: datetime) -> float:
+    """Peluruhan eksponensial beban error dari waktu `dari` ke waktu `ke`"""
+    if not beban or dari is None or ke <= dari:
+        return float(beban or 0.0)
+    hari = (ke - dari).total_seconds() / 86400
+    return beban * math.pow(0.5, hari / settings.PENGUASAAN_PARUH_WAKTU_HARI)
+
+
+def skor_penguasaan(beban: float) -> int:
+    """Beban error → tingkat penguasaan 0-100"""
+    skala = settings.PENGUASAAN_SKALA
+    return int(round(100 * skala / (skala + max(beban, 0.0))))
+
+
+def tambah_error(beban_lama: float, waktu_lama: Optional[datetime], waktu: datetime, jumlah: int = 1) -> float:
+    """Beban baru setelah `jumlah` error pada `waktu`"""
+    return luruhkan_beban(beban_lama, waktu_lama, waktu) + jumlah
+
+
+def penguasaan_saat(progress: Dict[str, Any], waktu: Optional[datetime] = None) -> int:
+    """
+    Tingkat penguasaan progress pada waktu tertentu (beban diluruhkan sampai `waktu`)
+
+    Progress lama tanpa state beban memakai tingkat_penguasaan yang tersimpan.
+    """
+    if "beban_error" not in progress:
+        return int(progress.get("tingkat_penguasaan") or 0)
+    beban = luruhkan_beban(float(progress.get("beban_error") or 0.0), progress.get("beban_diperbarui"),
+                           waktu or datetime.now())
+    return skor_penguasaan(beban)
+
+
+# ==================== UPDATE PER SUBMISI ====================
+
+def pipeline_tambah_error(waktu: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Update pipeline satu error di satu topik (rumus sama dengan tambah_error & skor_penguasaan)
+
+    `waktu` None = jam server ($$NOW). Selang negatif (jam worker tidak sinkron) dianggap nol.
+    """
+    acuan: Any = waktu if waktu is not None else "$$NOW"
+    skala = settings.PENGUASAAN_SKALA
+    paruh_waktu_ms = settings.PENGUASAAN_PARUH_WAKTU_HARI * 86400 * 1000
+    selang_ms = {"$max": [0, {"$subtract": [acuan, {"$ifNull": ["$beban_diperbarui", acuan]}]}]}
+    return [
+        {"$set": {
+            "beban_error": {"$add": [
+                {"$multiply": [
+                    {"$ifNull": ["$beban_error", 0]},
+                    {"$pow": [0.5, {"$divide": [selang_ms, paruh_waktu_ms]}]}
+                ]},
+                1
+            ]},
+            "jumlah_error_di_topik": {"$add": [{"$ifNull": ["$jumlah_error_di_topik", 0]}, 1]},
+            "beban_diperbarui": acuan,
+            "tanggal_error_terakhir": acuan,
+            "updated_at": acuan,
+            "created_at": {"$ifNull": ["$created_at", acuan]},
+        }},
+        {"$set": {
+            "tingkat_penguasaan": {"$toInt": {"$round": [
+                {"$divide": [100 * skala, {"$add": [skala, {"$max": ["$beban_error", 0]}]}]}, 0
+            ]}}
+        }},
+    ]
+
+
+def catat_error_topik(
+    queries: DatabaseQueries,
+    id_mahasiswa: str,
+    topik_list: Iterable[str],
+    waktu: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Update penguasaan semua topik terkait satu submisi error
+
+    Satu bulk_write update pipeline (atomik per dokumen) lalu satu read ($in topik) untuk
+    state setelah update.
+
+    Returns:
+        Dokumen progress (bentuk ringkas) setelah update, untuk snapshot
+    """
+    topik_unik = list(dict.fromkeys(topik for topik in topik_list if topik))
+    if not topik_unik:
+        return []
+
+    queries.catat_error_progress_bulk(id_mahasiswa, topik_unik, pipeline_tambah_error(waktu))
+    progress_baru = queries.ambil_progress_topik(id_mahasiswa, topik_unik)
+    return [
+        {**progress_baru[topik], "id_mahasiswa": id_mahasiswa}
+        for topik in topik_unik
+        if topik in progress_baru
+    ]
+
+
+# ==================== RECOMPUTE DARI RIWAYAT ====================
+
+def hitung_dari_riwayat(
+    submisi: Iterable[Dict[str, Any]],
+    waktu_akhir: Optional[datetime] = None
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Replay riwayat submisi menjadi state penguasaan per (mahasiswa, topik)
+
+    Urutan bebas: error yang lebih lama dari state saat ini ditambahkan dengan bobot yang sudah
+    diluruhkan ke waktu state, hasilnya sama dengan replay urut created_at.
+
+    Returns:
+        Dict (id_mahasiswa, topik) → {beban_error, beban_diperbarui, tingkat_penguasaan,
+        jumlah_error_di_topik, tanggal_error_terakhir}; skor diluruhkan sampai waktu_akhir
+    """
+    waktu_akhir = waktu_akhir or datetime.now()
+    state: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for item in submisi:
+        waktu = item.get("created_at") or waktu_akhir
+        for topik in dict.fromkeys(item.get("topik_terkait") or []):
+            kunci = (str(item["id_mahasiswa"]), topik)
+            lama = state.get(kunci)
+            if lama is None:
+                state[kunci] = {"beban_error": 1.0, "beban_diperbarui": waktu, "jumlah_error_di_topik": 1}
+            elif waktu >= lama["beban_diperbarui"]:
+                lama["beban_error"] = tambah_error(lama["beban_error"], lama["beban_diperbarui"], waktu)
+                lama["beban_diperbarui"] = waktu
+                lama["jumlah_error_di_topik"] += 1
+            else:
+                lama["beban_error"] += luruhkan_beban(1.0, waktu, lama["beban_diperbarui"])
+                lama["jumlah_error_di_topik"] += 1
+
+    for nilai in state.values():
+        nilai["tanggal_error_terakhir"] = nilai["beban_diperbarui"]
+        nilai["tingkat_penguasaan"] = skor_penguasaan(
+            luruhkan_beban(nilai["beban_error"], nilai["beban_diperbarui"], waktu_akhir)
+        )
+    return state
+
+
+def _recompute_chunk(
+    queries: DatabaseQueries,
+    id_mahasiswa_chunk: List[Any],
+    waktu_akhir: datetime,
+    dry_run: bool
+) -> int:
+    # Submisi yang sudah diarsipkan ikut di-replay; tanpa itu jumlah_error_di_topik & penguasaan
+    # ditimpa dengan nilai dari submisi "panas" saja
+    riwayat = itertools.chain(
+        queries.iterasi_submisi_mahasiswa_kohort(id_mahasiswa_chunk, termasuk_arsip=True),
+        *(baca_arsip_file(settings.ARSIP_DIR, str(id_mahasiswa)) for id_mahasiswa in id_mahasiswa_chunk)
+    )
+    state = hitung_dari_riwayat(riwayat, waktu_akhir)
+    if not dry_run:
+        queries.simpan_penguasaan_bulk(state)
+    return len(state)
+
+
+def recompute_semua_penguasaan(
+    queries: DatabaseQueries,
+    ukuran_chunk: int = 200,
+    workers: int = 4,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Bangun ulang tingkat penguasaan semua mahasiswa dari riwayat submisi_error (termasuk arsip)
+
+    Mahasiswa dibagi chunk; tiap chunk: cursor submisi + arsip ($in mahasiswa) dan file arsip
+    per mahasiswa, replay model di memori, satu bulk_write progress. Chunk diproses paralel.
+
+    Returns:
+        Dict dengan jumlah mahasiswa, chunk, progress ditulis, chunk gagal, durasi
+    """
+    mulai = datetime.now()
+    id_mahasiswa = queries.ambil_id_mahasiswa_kohort()
+    chunks = [id_mahasiswa[i:i + ukuran_chunk] for i in range(0, len(id_mahasiswa), ukuran_chunk)]
+    hasil = {"mahasiswa": len(id_mahasiswa), "chunk": len(chunks), "progress": 0, "chunk_gagal": 0}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="pahamkode-recompute") as executor:
+        futures = {executor.submit(_recompute_chunk, queries, chunk, mulai, dry_run): nomor
+                   for nomor, chunk in enumerate(chunks)}
+        for future in as_completed(futures):
+            try:
+                hasil["progress"] += future.result()
+            except Exception as e:
+                hasil["chunk_gagal"] += 1
+                logger.error(f"Recompute penguasaan chunk {futures[future]} gagal: {str(e)}")
+
+    hasil["durasi_detik"] = (datetime.now() - mulai).total_seconds()
+    logger.info(f"Recompute penguasaan selesai: {hasil}")
+    return hasil
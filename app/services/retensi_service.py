@@ -0,0 +1,275 @@
+"""
+Retensi Service - Rollup & TTL metrik mentah, arsip submisi lama
+
+CATATAN:
+- metrik_ai & metrik_api: rollup harian per sumber / endpoint ke `metrik_harian` (idempotent,
+  satu dokumen per hari & dimensi), lalu data mentah lebih tua dari settings.RETENSI_METRIK_HARI
+  dihapus. TTL index dipasang setelah rollup ada, sebagai pengaman jika job berhenti jalan
+  (retensi + TENGGANG_TTL_HARI)
+- Statistik admin (ambil_statistik_ai / ambil_statistik_api) menggabungkan rollup untuk hari
+  sebelum batas_mentah dengan data mentah sesudahnya, jadi angka tidak berubah setelah retensi
+- submisi_error lebih tua dari N semester dipindah ke `submisi_error_arsip` atau file JSONL gzip
+  per mahasiswa; total & jumlah per tipe error masuk `ringkasan_arsip_mahasiswa` sehingga total
+  submisi, frekuensi pola, dan ringkasan export tetap utuh
+- pola_error, progress_belajar, dan snapshot_penguasaan tidak disentuh (sudah berupa ringkasan)
+- Riwayat, detail, export per periode, dan analitik admin (top error, kesulitan) hanya membaca
+  submisi yang belum diarsipkan
+- Dijalankan harian oleh deployment/pahamkode-retensi.timer (scripts/retensi_data.py)
+"""
+
+import gzip
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from bson import json_util
+
+from config import settings
+from database.queries import DatabaseQueries
+
+logger = logging.getLogger(__name__)
+
+# Bulan mulai semester: Genap (Februari) dan Ganjil (Agustus)
+BULAN_AWAL_SEMESTER = (2, 8)
+
+# TTL = retensi + tenggang, supaya TTL tidak mendahului rollup jika job sempat tidak jalan
+TENGGANG_TTL_HARI = 7
+
+# Rentang hari per aggregation rollup (backfill pertama bisa mencakup berbulan-bulan)
+HARI_PER_ROLLUP = 7
+
+TUJUAN_KOLEKSI = "koleksi"
+TUJUAN_FILE = "file"
+
+
+# ==================== SEMESTER ====================
+
+def awal_hari(waktu: datetime) -> datetime:
+    """Awal hari (00:00)"""
+    return waktu.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def awal_semester(waktu: datetime) -> datetime:
+    """Tanggal mulai semester yang memuat `waktu`"""
+    bulan = [item for item in BULAN_AWAL_SEMESTER if item <= waktu.month]
+    if bulan:
+        return datetime(waktu.year, max(bulan), 1)
+    return datetime(waktu.year - 1, max(BULAN_AWAL_SEMESTER), 1)
+
+
+def batas_arsip_submisi(jumlah_semester: int, sekarang: Optional[datetime] = None) -> datetime:
+    """
+    Awal semester tertua yang dipertahankan (semester berjalan dihitung satu)
+
+    Submisi dengan created_at sebelum tanggal ini diarsipkan.
+    """
+    if jumlah_semester < 1:
+        raise ValueError("Jumlah semester yang dipertahankan minimal 1")
+    batas = awal_semester(sekarang or datetime.now())
+    for _ in range(jumlah_semester - 1):
+        batas = awal_semester(batas - timedelta(days=1))
+    return batas
+
+
+# ==================== METRIK ====================
+
+def rollup_metrik(queries: DatabaseQueries, jenis: str, sampai: datetime, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Rollup harian metrik mentah dari hari terakhir yang belum di-rollup sampai `sampai` (eksklusif)
+
+    Returns:
+        Statistik {"hari", "entri"}
+    """
+    mulai = queries.ambil_meta_retensi(jenis).get("rollup_sampai")
+    if mulai is None:
+        tertua = queries.waktu_metrik_tertua(jenis)
+        if tertua is None:
+            return {"hari": 0, "entri": 0}
+        mulai = awal_hari(tertua)
+
+    statistik = {"hari": max((sampai - mulai).days, 0), "entri": 0}
+    while mulai < sampai:
+        akhir = min(mulai + timedelta(days=HARI_PER_ROLLUP), sampai)
+        entri = queries.agregasi_metrik_harian(jenis, mulai, akhir)
+        if not dry_run:
+            queries.simpan_metrik_harian_bulk(entri)
+            queries.simpan_meta_retensi(jenis, {"rollup_sampai": akhir})
+        statistik["entri"] += len(entri)
+        mulai = akhir
+    return statistik
+
+
+def terapkan_retensi_metrik(
+    queries: DatabaseQueries,
+    jenis: str,
+    retensi_hari: int,
+    sekarang: Optional[datetime] = None,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Rollup sampai kemarin, lalu hapus metrik mentah lebih tua dari retensi & pasang TTL
+
+    batas_mentah dicatat sebelum data dihapus dan tidak pernah mundur (data di bawahnya
+    sudah tidak ada), supaya statistik selalu tahu bagian mana yang dibaca dari rollup.
+
+    Returns:
+        Statistik {"hari", "entri", "dihapus", "ttl"}
+    """
+    hari_ini = awal_hari(sekarang or datetime.now())
+    statistik = rollup_metrik(queries, jenis, hari_ini, dry_run)
+    statistik.update({"dihapus": 0, "ttl": ""})
+
+    meta = queries.ambil_meta_retensi(jenis)
+    if dry_run or meta.get("rollup_sampai") is None:
+        return statistik
+
+    batas = min(hari_ini - timedelta(days=retensi_hari), meta["rollup_sampai"])
+    if meta.get("batas_mentah"):
+        batas = max(batas, meta["batas_mentah"])
+    queries.simpan_meta_retensi(jenis, {"batas_mentah": batas})
+    statistik["dihapus"] = queries.hapus_metrik_sebelum(jenis, batas)
+    statistik["ttl"] = queries.pasang_ttl_metrik(jenis, (retensi_hari + TENGGANG_TTL_HARI) * 86400)
+    return statistik
+
+
+# ==================== ARSIP SUBMISI ====================
+
+def tulis_arsip_file(folder: str, id_mahasiswa: str, dokumen: List[Dict[str, Any]]) -> Path:
+    """
+    Tulis satu batch submisi ke JSONL gzip (Extended JSON canonical, tipe BSON terjaga)
+
+    Nama file dari submisi pertama batch: batch yang diulang setelah gagal menimpa file yang sama.
+    """
+    pertama = dokumen[0]
+    path = Path(folder) / "submisi_error" / id_mahasiswa / f"{pertama['created_at']:%Y%m%d}_{pertama['_id']}.jsonl.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sementara = path.with_name(path.name + ".tmp")
+    with gzip.open(sementara, "wt", encoding="utf-8") as berkas:
+        for item in dokumen:
+            berkas.write(json_util.dumps(item, json_options=json_util.CANONICAL_JSON_OPTIONS) + "\n")
+    os.replace(sementara, path)
+    return path
+
+
+def baca_arsip_file(folder: str, id_mahasiswa: str) -> Iterator[Dict[str, Any]]:
+    """Stream submisi satu mahasiswa dari arsip JSONL gzip (kosong jika belum pernah diarsipkan)"""
+    for path in sorted((Path(folder) / "submisi_error" / id_mahasiswa).glob("*.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as berkas:
+            for baris in berkas:
+                if baris.strip():
+                    yield json_util.loads(baris)
+
+
+def arsipkan_submisi_mahasiswa(
+    queries: DatabaseQueries,
+    id_mahasiswa: str,
+    batas: datetime,
+    tujuan: str,
+    folder: str,
+    batch_size: int = 500
+) -> int:
+    """
+    Pindahkan submisi satu mahasiswa yang lebih tua dari batas ke arsip, per batch
+
+    Urutan per batch: salin ke arsip → tambah ringkasan → hapus dari submisi_error. Kursor di
+    ringkasan mencegah batch yang diulang (gagal sebelum hapus) terhitung dua kali.
+
+    Returns:
+        Jumlah submisi yang dipindahkan
+    """
+    kursor = (queries.ambil_ringkasan_arsip(id_mahasiswa) or {}).get("kursor")
+    posisi = (kursor["created_at"], kursor["_id"]) if kursor else None
+    total = 0
+    while True:
+        batch = queries.ambil_submisi_sebelum(id_mahasiswa, batas, batch_size)
+        if not batch:
+            return total
+        if tujuan == TUJUAN_FILE:
+            tulis_arsip_file(folder, id_mahasiswa, batch)
+        else:
+            queries.simpan_arsip_submisi_bulk(batch)
+
+        baru = [item for item in batch if posisi is None or (item["created_at"], item["_id"]) > posisi]
+        posisi = (batch[-1]["created_at"], batch[-1]["_id"])
+        queries.tambah_ringkasan_arsip(id_mahasiswa, baru, {"created_at": posisi[0], "_id": posisi[1]})
+
+        dihapus = queries.hapus_submisi_by_ids([item["_id"] for item in batch])
+        total += dihapus
+        if dihapus == 0:
+            return total
+
+
+def arsipkan_submisi(
+    queries: DatabaseQueries,
+    batas: datetime,
+    tujuan: str = TUJUAN_KOLEKSI,
+    folder: str = "arsip",
+    batch_size: int = 500,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Arsipkan submisi_error dengan created_at < batas untuk semua mahasiswa
+
+    Returns:
+        Statistik {"mahasiswa", "kandidat", "diarsipkan", "gagal"}
+    """
+    if tujuan not in (TUJUAN_KOLEKSI, TUJUAN_FILE):
+        raise ValueError(f"Tujuan arsip tidak dikenal: {tujuan} (pilihan: {TUJUAN_KOLEKSI}, {TUJUAN_FILE})")
+
+    kandidat = queries.ringkasan_submisi_sebelum(batas)
+    statistik = {"mahasiswa": len(kandidat), "kandidat": sum(kandidat.values()), "diarsipkan": 0, "gagal": 0}
+    if dry_run:
+        return statistik
+
+    for id_mahasiswa in kandidat:
+        try:
+            statistik["diarsipkan"] += arsipkan_submisi_mahasiswa(queries, id_mahasiswa, batas, tujuan, folder, batch_size)
+        except Exception as e:
+            logger.error(f"Gagal arsip submisi mahasiswa {id_mahasiswa}: {str(e)}")
+            statistik["gagal"] += 1
+    logger.info(f"Arsip submisi sebelum {batas:%Y-%m-%d} selesai: {statistik}")
+    return statistik
+
+
+# ==================== JOB ====================
+
+def jalankan_retensi(
+    queries: DatabaseQueries,
+    sekarang: Optional[datetime] = None,
+    retensi_metrik_hari: Optional[int] = None,
+    jumlah_semester: Optional[int] = None,
+    tujuan: Optional[str] = None,
+    folder: Optional[str] = None,
+    metrik: bool = True,
+    submisi: bool = True,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Job retensi harian: rollup & retensi metrik, lalu arsip submisi lama
+
+    Parameter kosong memakai settings (RETENSI_METRIK_HARI, RETENSI_SUBMISI_SEMESTER,
+    ARSIP_TUJUAN, ARSIP_DIR).
+    """
+    sekarang = sekarang or datetime.now()
+    hasil: Dict[str, Any] = {}
+    if metrik:
+        retensi_hari = settings.RETENSI_METRIK_HARI if retensi_metrik_hari is None else retensi_metrik_hari
+        hasil["metrik"] = {
+            jenis: terapkan_retensi_metrik(queries, jenis, retensi_hari, sekarang, dry_run)
+            for jenis in ("ai", "api")
+        }
+    if submisi:
+        batas = batas_arsip_submisi(jumlah_semester or settings.RETENSI_SUBMISI_SEMESTER, sekarang)
+        hasil["submisi"] = {
+            "batas": batas,
+            **arsipkan_submisi(
+                queries,
+                batas,
+                tujuan or settings.ARSIP_TUJUAN,
+                folder or settings.ARSIP_DIR,
+                dry_run=dry_run
+            )
+        }
+    return hasil
@@ -0,0 +1,188 @@
+"""
+Snapshot Service - Time series penguasaan per mahasiswa & topik (delta dan tren)
+
+CATATAN:
+- Setiap pasangan (mahasiswa, topik) punya satu dokumen di `snapshot_penguasaan` berisi
+  titik {"b": bucket hari, "p": tingkat_penguasaan, "e": jumlah_error_di_topik}
+- Append-only dengan downsampling: maksimal satu titik per hari (titik hari yang sama diganti),
+  array dipangkas ke settings.SNAPSHOT_MAKS_TITIK titik terakhir
+- Delta & tren dihitung dari N titik terakhir saja (projection $slice), lalu disimpan di
+  progress_belajar (tren_perbaikan, penguasaan_delta) - dashboard tidak perlu scan submisi_error
+- Titik dicatat saat analisis error (topik yang tersentuh) dan periodik untuk semua progress
+  (scripts/snapshot_penguasaan.py via systemd timer), supaya topik tanpa error baru tetap punya titik
+- Nilai "p" = penguasaan_saat (model peluruhan di penguasaan_service) pada waktu snapshot
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config import settings
+from database.queries import DatabaseQueries
+from services.penguasaan_service import penguasaan_saat
+
+logger = logging.getLogger(__name__)
+
+TREN_MEMBAIK = "membaik"
+TREN_STAGNAN = "stagnan"
+TREN_MENURUN = "menurun"
+
+# Perubahan laju error (paruh akhir vs paruh awal jendela) yang dianggap berarti
+TOLERANSI_LAJU_ERROR = 0.2
+
+
+# ==================== PERHITUNGAN TREN ====================
+
+def bucket_hari(waktu: Optional[datetime] = None) -> datetime:
+    """Bucket downsampling: awal hari (00:00)"""
+    waktu = waktu or datetime.now()
+    return waktu.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def titik_dari_progress(progress: Dict[str, Any], waktu: Optional[datetime] = None) -> Dict[str, Any]:
+    """Bangun satu titik snapshot dari dokumen progress_belajar (penguasaan diluruhkan ke `waktu`)"""
+    return {
+        "b": bucket_hari(waktu),
+        "p": float(penguasaan_saat(progress, waktu)),
+        "e": int(progress.get("jumlah_error_di_topik") or 0),
+    }
+
+
+def _kemiringan(x: Sequence[float], y: Sequence[float]) -> float:
+    """Kemiringan regresi linear (least squares) y terhadap x"""
+    n = len(x)
+    rata_x = sum(x) / n
+    rata_y = sum(y) / n
+    pembagi = sum((xi - rata_x) ** 2 for xi in x)
+    if pembagi == 0:
+        return 0.0
+    return sum((xi - rata_x) * (yi - rata_y) for xi, yi in zip(x, y)) / pembagi
+
+
+def hitung_tren(titik: Sequence[Dict[str, Any]], ambang: Optional[float] = None) -> Tuple[str, float]:
+    """
+    Hitung tren & delta penguasaan dari titik snapshot terakhir
+
+    - Penguasaan tersedia: kemiringan regresi (% per hari) dibanding ambang
+    - Penguasaan belum pernah dihitung (semua 0): laju error baru per hari,
+      paruh akhir jendela dibanding paruh awal (lebih jarang error = membaik)
+
+    Args:
+        titik: Titik snapshot urut waktu (yang terakhir = terbaru)
+        ambang: Kemiringan minimal untuk membaik/menurun (default settings.SNAPSHOT_AMBANG_TREN)
+
+    Returns:
+        Tuple (tren, delta penguasaan dalam jendela)
+    """
+    jendela = list(titik)[-settings.SNAPSHOT_JENDELA_TREN:]
+    if len(jendela) < 2:
+        return TREN_STAGNAN, 0.0
+
+    ambang = settings.SNAPSHOT_AMBANG_TREN if ambang is None else ambang
+    hari = [(item["b"] - jendela[0]["b"]).total_seconds() / 86400 for item in jendela]
+    penguasaan = [float(item.get("p") or 0) for item in jendela]
+    delta = round(penguasaan[-1] - penguasaan[0], 2)
+
+    if any(penguasaan):
+        kemiringan = _kemiringan(hari, penguasaan)
+        if kemiringan >= ambang:
+            return TREN_MEMBAIK, delta
+        if kemiringan <= -ambang:
+            return TREN_MENURUN, delta
+        return TREN_STAGNAN, delta
+
+    error = [int(item.get("e") or 0) for item in jendela]
+    tengah = len(jendela) // 2
+    laju_awal = (error[tengah] - error[0]) / max(hari[tengah] - hari[0], 1.0)
+    laju_akhir = (error[-1] - error[tengah]) / max(hari[-1] - hari[tengah], 1.0)
+    if laju_akhir < laju_awal * (1 - TOLERANSI_LAJU_ERROR):
+        return TREN_MEMBAIK, delta
+    if laju_akhir > laju_awal * (1 + TOLERANSI_LAJU_ERROR) and laju_akhir > 0:
+        return TREN_MENURUN, delta
+    return TREN_STAGNAN, delta
+
+
+# ==================== PENCATATAN ====================
+
+def snapshot_progress_batch(
+    queries: DatabaseQueries,
+    batch: Sequence[Dict[str, Any]],
+    waktu: Optional[datetime] = None,
+    statistik: Optional[Dict[str, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Catat titik snapshot untuk sekumpulan dokumen progress, lalu simpan tren, delta,
+    dan tingkat_penguasaan yang sudah diluruhkan ke `waktu`
+
+    Tiga round trip berapapun ukuran batch: satu read snapshot (N titik terakhir),
+    satu bulk write snapshot, satu bulk write progress. Tren dihitung lokal dari titik lama + titik baru.
+    Dipakai analisis error (topik yang tersentuh) dan snapshot periodik.
+
+    Returns:
+        Entri tren per progress {id_mahasiswa, topik, tren_perbaikan, penguasaan_delta, tingkat_penguasaan}
+    """
+    if not batch:
+        return []
+    waktu = waktu or datetime.now()
+    snapshot_lama = queries.ambil_snapshot_batch(
+        list({progress["id_mahasiswa"] for progress in batch}),
+        list({progress["topik"] for progress in batch}),
+        settings.SNAPSHOT_JENDELA_TREN
+    )
+
+    entri_snapshot: List[Dict[str, Any]] = []
+    entri_tren: List[Dict[str, Any]] = []
+    for progress in batch:
+        kunci = (str(progress["id_mahasiswa"]), progress["topik"])
+        titik = titik_dari_progress(progress, waktu)
+        lama = snapshot_lama.get(kunci, {})
+        riwayat = lama.get("titik", [])
+        ganti_bucket = lama.get("bucket_terakhir") == titik["b"] and bool(riwayat)
+
+        riwayat = (riwayat[:-1] if ganti_bucket else riwayat) + [titik]
+        tren, delta = hitung_tren(riwayat)
+
+        entri_snapshot.append({"id_mahasiswa": kunci[0], "topik": kunci[1],
+                               "titik": titik, "ganti_bucket": ganti_bucket})
+        entri_tren.append({"id_mahasiswa": kunci[0], "topik": kunci[1], "tren_perbaikan": tren,
+                           "penguasaan_delta": delta, "tingkat_penguasaan": int(titik["p"])})
+        if statistik is not None:
+            statistik["titik_diganti" if ganti_bucket else "titik_baru"] += 1
+            statistik[tren] += 1
+
+    queries.simpan_snapshot_bulk(entri_snapshot, settings.SNAPSHOT_MAKS_TITIK)
+    queries.simpan_tren_progress_bulk(entri_tren)
+    return entri_tren
+
+
+def snapshot_semua_progress(
+    queries: DatabaseQueries,
+    batch_size: int = 500,
+    waktu: Optional[datetime] = None
+) -> Dict[str, int]:
+    """
+    Snapshot periodik seluruh progress_belajar (dijalankan scripts/snapshot_penguasaan.py)
+
+    Selain titik & tren, skor penguasaan yang tersimpan ikut diperbarui ke waktu snapshot
+    (peluruhan beban error untuk topik tanpa error baru).
+
+    Returns:
+        Dict dengan jumlah progress, titik_baru, titik_diganti, per tren
+    """
+    statistik = {"progress": 0, "titik_baru": 0, "titik_diganti": 0,
+                 TREN_MEMBAIK: 0, TREN_STAGNAN: 0, TREN_MENURUN: 0}
+
+    for batch in queries.iterasi_batch_progress(batch_size):
+        snapshot_progress_batch(queries, batch, waktu, statistik)
+        statistik["progress"] += len(batch)
+
+    logger.info(f"Snapshot penguasaan selesai: {statistik}")
+    return statistik
+
+
+# ==================== RINGKASAN ====================
+
+def rata_rata_delta(progress_list: Sequence[Dict[str, Any]]) -> float:
+    """Rata-rata penguasaan_delta yang tersimpan di progress (tanpa query tambahan)"""
+    nilai = [float(progress.get("penguasaan_delta") or 0) for progress in progress_list]
+    return round(sum(nilai) / len(nilai), 2) if nilai else 0.0
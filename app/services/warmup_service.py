@@ -0,0 +1,300 @@
+"""
+Warmup Service - Startup warm-up & readiness endpoint
+
+CATATAN:
+- Setelah service restart, request pertama menanggung import berat, koneksi Cosmos DB,
+  konstruksi LLM client, dan cache kosong. Warm-up memindahkan biaya itu ke startup.
+- Dijalankan oleh app/startup.py (di proses yang sama dengan Streamlit server)
+- Readiness endpoint (HTTP kecil di localhost) dipakai nginx & systemd untuk gating
+- Database adalah tahap wajib (di-retry sampai berhasil); tahap lain boleh gagal
+"""
+
+import importlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== KONFIGURASI ====================
+
+# Modul berat yang di-import halaman saat render pertama
+MODUL_BERAT: List[str] = [
+    "pymongo",
+    "bcrypt",
+    "langchain_openai",
+    "langchain.prompts",
+    "langchain.output_parsers",
+    "pandas",
+    "plotly.express",
+    "plotly.graph_objects",
+    "streamlit_ace",
+    "database.queries",
+    "services.autentikasi_service",
+    "services.analisis_service",
+    "services.admin_service",
+    "components.sidebar",
+    "components.autentikasi",
+]
+
+# Jeda retry koneksi database (detik), naik bertahap sampai batas atas
+JEDA_RETRY_DATABASE = [1, 2, 5, 10, 30]
+
+
+# ==================== STATUS WARM-UP ====================
+
+_lock_status = threading.Lock()
+_status: Dict[str, Any] = {
+    "siap": False,
+    "dimulai_pada": None,
+    "selesai_pada": None,
+    "tahap": {}
+}
+_warmup_thread: Optional[threading.Thread] = None
+_server_kesiapan: Optional[ThreadingHTTPServer] = None
+
+
+def _catat_tahap(nama: str, status: str, durasi_ms: float = 0.0, error: Optional[str] = None) -> None:
+    """Update status satu tahap warm-up (thread-safe)"""
+    with _lock_status:
+        _status["tahap"][nama] = {
+            "status": status,
+            "durasi_ms": round(durasi_ms, 1),
+            "error": error
+        }
+
+
+def _jalankan_tahap(nama: str, fungsi: Callable[[], Any]) -> bool:
+    """Jalankan satu tahap warm-up, catat durasi & error tanpa melempar exception"""
+    _catat_tahap(nama, "berjalan")
+    mulai = time.perf_counter()
+    try:
+        fungsi()
+        durasi_ms = (time.perf_counter() - mulai) * 1000
+        _catat_tahap(nama, "ok", durasi_ms)
+        logger.info(f"Warm-up '{nama}' selesai dalam {durasi_ms:.0f}ms")
+        return True
+    except Exception as e:
+        durasi_ms = (time.perf_counter() - mulai) * 1000
+        _catat_tahap(nama, "gagal", durasi_ms, str(e))
+        logger.warning(f"Warm-up '{nama}' gagal: {str(e)}")
+        return False
+
+
+def status_kesiapan() -> Dict[str, Any]:
+    """
+    Ambil snapshot status warm-up
+
+    Returns:
+        Dictionary dengan siap (bool), waktu mulai/selesai, dan status per tahap
+    """
+    with _lock_status:
+        return {
+            "siap": _status["siap"],
+            "dimulai_pada": _status["dimulai_pada"],
+            "selesai_pada": _status["selesai_pada"],
+            "tahap": {nama: dict(info) for nama, info in _status["tahap"].items()}
+        }
+
+
+def apakah_siap() -> bool:
+    """Check apakah warm-up sudah selesai (aplikasi siap menerima traffic)"""
+    with _lock_status:
+        return bool(_status["siap"])
+
+
+# ==================== TAHAP WARM-UP ====================
+
+def _import_modul_berat() -> None:
+    """Pre-import modul berat supaya halaman tidak membayar cold import"""
+    gagal = []
+    for nama_modul in MODUL_BERAT:
+        try:
+            importlib.import_module(nama_modul)
+        except Exception as e:
+            gagal.append(f"{nama_modul} ({type(e).__name__})")
+    if gagal:
+        raise ImportError(f"Gagal import: {', '.join(gagal)}")
+
+
+def _buka_koneksi_database() -> Any:
+    """
+    Buka koneksi MongoDB (cached via st.cache_resource) dan ping server.
+    Di-retry dengan backoff karena database adalah syarat wajib readiness.
+    """
+    from database.koneksi import dapatkan_database
+
+    percobaan = 0
+    while True:
+        try:
+            db = dapatkan_database()
+            db.command("ping")
+            return db
+        except Exception as e:
+            jeda = JEDA_RETRY_DATABASE[min(percobaan, len(JEDA_RETRY_DATABASE) - 1)]
+            percobaan += 1
+            _catat_tahap("database", "retry", error=f"percobaan {percobaan}: {str(e)}")
+            logger.warning(f"Koneksi database gagal (percobaan {percobaan}), retry dalam {jeda}s")
+            time.sleep(jeda)
+
+
+def _buat_ai_client() -> None:
+    """Konstruksi LLM client (di-cache oleh dapatkan_llm)"""
+    from services.ai_service import dapatkan_llm, buat_prompt_analisis_semantik
+
+    dapatkan_llm()
+    buat_prompt_analisis_semantik()
+
+
+def _prime_cache_katalog(db: Any) -> None:
+    """Muat snapshot katalog (topik, sumber daya, exercises) ke cache in-memory"""
+    from database.queries import DatabaseQueries
+    from services.katalog_service import katalog_cache
+
+    katalog_cache.ambil_snapshot(DatabaseQueries(db))
+
+
+def _sambung_backend_bersama() -> None:
+    """Buka koneksi backend bersama antar worker (gagal → fitur bersama pakai fallback)"""
+    from utils.backend_bersama import BackendBersamaError, dapatkan_backend
+
+    if not dapatkan_backend().ping():
+        raise BackendBersamaError("PING tidak dibalas")
+
+
+def _mulai_watcher(db: Any) -> None:
+    """Start watcher perubahan database (invalidasi cache & live feed admin)"""
+    from services.watcher_service import mulai_watcher
+
+    mulai_watcher(db)
+
+
+def jalankan_warmup() -> bool:
+    """
+    Jalankan semua tahap warm-up secara berurutan (blocking)
+
+    Urutan:
+    1. Pre-import modul berat
+    2. Buka koneksi database (wajib, retry sampai berhasil)
+    3. Konstruksi AI client
+    4. Sambung backend bersama antar worker
+    5. Prime cache katalog
+    6. Start watcher perubahan
+
+    Returns:
+        True jika aplikasi siap (database berhasil terhubung)
+    """
+    with _lock_status:
+        _status["dimulai_pada"] = datetime.now().isoformat()
+
+    logger.info("Warm-up dimulai...")
+
+    _jalankan_tahap("import_modul", _import_modul_berat)
+
+    hasil_db: Dict[str, Any] = {}
+    db_ok = _jalankan_tahap("database", lambda: hasil_db.update(db=_buka_koneksi_database()))
+
+    _jalankan_tahap("ai_client", _buat_ai_client)
+    _jalankan_tahap("backend_bersama", _sambung_backend_bersama)
+
+    if db_ok:
+        _jalankan_tahap("cache_katalog", lambda: _prime_cache_katalog(hasil_db["db"]))
+        _jalankan_tahap("watcher", lambda: _mulai_watcher(hasil_db["db"]))
+
+    with _lock_status:
+        _status["siap"] = db_ok
+        _status["selesai_pada"] = datetime.now().isoformat()
+
+    logger.info(f"Warm-up selesai - siap: {db_ok}")
+    return db_ok
+
+
+def mulai_warmup_background() -> threading.Thread:
+    """
+    Jalankan warm-up di background thread (idempotent, sekali per proses)
+
+    Returns:
+        Thread warm-up yang sedang/sudah berjalan
+    """
+    global _warmup_thread
+
+    with _lock_status:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=jalankan_warmup,
+                name="pahamkode-warmup",
+                daemon=True
+            )
+            _warmup_thread.start()
+        return _warmup_thread
+
+
+# ==================== READINESS ENDPOINT ====================
+
+class _HandlerKesiapan(BaseHTTPRequestHandler):
+    """
+    HTTP handler untuk readiness & liveness
+    - GET /ready → 200 jika warm-up selesai, 503 jika belum (body: status JSON)
+    - GET /live  → 200 selama proses hidup
+    """
+
+    def do_GET(self) -> None:
+        if self.path.startswith("/ready"):
+            status = status_kesiapan()
+            self._kirim_json(200 if status["siap"] else 503, status)
+        elif self.path.startswith("/live"):
+            self._kirim_json(200, {"hidup": True})
+        else:
+            self._kirim_json(404, {"error": "not found"})
+
+    def _kirim_json(self, kode_status: int, data: Dict[str, Any]) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(kode_status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        if kode_status == 503:
+            self.send_header("Retry-After", "5")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Probe dari nginx/systemd terlalu sering untuk di-log
+        pass
+
+
+def mulai_server_kesiapan(
+    host: Optional[str] = None,
+    port: Optional[int] = None
+) -> ThreadingHTTPServer:
+    """
+    Start readiness HTTP server di background thread (idempotent)
+
+    Args:
+        host: Bind address (default settings.READINESS_HOST, localhost saja)
+        port: Port (default settings.READINESS_PORT)
+
+    Returns:
+        Instance ThreadingHTTPServer yang berjalan
+    """
+    global _server_kesiapan
+
+    if _server_kesiapan is None:
+        alamat = (host or settings.READINESS_HOST, port or settings.READINESS_PORT)
+        _server_kesiapan = ThreadingHTTPServer(alamat, _HandlerKesiapan)
+        _server_kesiapan.daemon_threads = True
+        threading.Thread(
+            target=_server_kesiapan.serve_forever,
+            name="pahamkode-readiness",
+            daemon=True
+        ).start()
+        logger.info(f"Readiness endpoint aktif di http://{alamat[0]}:{alamat[1]}/ready")
+
+    return _server_kesiapan
@@ -0,0 +1,276 @@
+"""
+Watcher Service - Pantau perubahan database dan terbitkan ke bus event in-process
+
+CATATAN:
+- Penulis data tersebar (admin_service CRUD, proses_analisis_error, init_database.py, script),
+  jadi cache tidak bisa mengandalkan pemanggil untuk invalidasi. Watcher membaca perubahan
+  langsung dari database dan menerbitkannya ke utils/bus_event.bus_perubahan
+- Mode change stream: satu cursor per collection (Cosmos DB tidak mendukung watch level
+  database), dibaca bergantian dengan try_next() di satu thread daemon; resume token disimpan
+  supaya cursor yang putus dilanjutkan tanpa kehilangan event
+- Cosmos DB: hanya insert/update/replace, $project wajib persis _id/fullDocument/ns/documentKey
+  dan operationType tidak dikirim (event memakai OPERASI_TIDAK_DIKETAHUI). Dokumen lengkap
+  (updateLookup) hanya diminta di Cosmos; MongoDB memproyeksikan fullDocument ke FIELD_EVENT
+- Update yang hanya menyentuh FIELD_COUNTER (total_error di-$inc setiap analisis) tidak
+  diterbitkan, supaya cache katalog di semua worker tidak reload per submisi. MongoDB memakai
+  updateDescription; Cosmos (tanpa updateDescription) membandingkan sidik dokumen tanpa counter
+- Fallback polling (standalone MongoDB, Cosmos tanpa change stream): versi katalog
+  (meta_aplikasi) dan insert baru submisi_error / users lewat _id > terakhir. Update & delete
+  di luar versi katalog tidak terdeteksi, cache tetap punya TTL cadangan
+- Satu watcher per proses (mulai_watcher idempotent), di-start oleh warm-up
+- Event hanya membawa field ringkas (FIELD_EVENT); password_hash dan teks submisi tidak ikut
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from pymongo.database import Database
+from pymongo.errors import OperationFailure, PyMongoError
+
+from config import settings
+from database.queries import DatabaseQueries
+from utils.bus_event import OPERASI_TIDAK_DIKETAHUI, BusEvent, bus_perubahan
+
+logger = logging.getLogger(__name__)
+
+MODE_AUTO = "auto"
+MODE_CHANGE_STREAM = "change_stream"
+MODE_POLLING = "polling"
+
+KOLEKSI_DIPANTAU = (
+    "topik_pembelajaran", "sumber_daya", "exercises", "meta_aplikasi", "submisi_error", "users"
+)
+# Field dokumen yang ikut di event (collection lain hanya membawa _id)
+FIELD_EVENT: Dict[str, Tuple[str, ...]] = {
+    "submisi_error": ("id_mahasiswa", "tipe_error", "bahasa", "level_bloom", "kesenjangan_konsep", "created_at"),
+    "users": ("nama", "email", "role", "status", "created_at"),
+}
+# Counter statistik yang di-$inc di setiap analisis, bukan isi katalog
+FIELD_COUNTER: Dict[str, FrozenSet[str]] = {
+    "topik_pembelajaran": frozenset({"total_error"}),
+}
+
+# try_next() menunggu maksimal selama ini per collection saat tidak ada perubahan
+MAX_AWAIT_MS = 250
+# Batas event yang dikuras dari satu cursor per siklus, supaya collection lain tetap terbaca
+MAKS_EVENT_PER_SIKLUS = 100
+JEDA_BUKA_ULANG_DETIK = 5.0
+
+
+def ringkas_dokumen(koleksi: str, dokumen: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Field event dari dokumen lengkap (None untuk collection tanpa FIELD_EVENT)"""
+    field = FIELD_EVENT.get(koleksi)
+    if not field or not dokumen:
+        return None
+    return {nama: dokumen.get(nama) for nama in field}
+
+
+def pipeline_change_stream(cosmos: bool, koleksi: str) -> List[Dict[str, Any]]:
+    """Pipeline watch(); Cosmos DB hanya menerima bentuk yang sangat terbatas"""
+    if cosmos:
+        return [
+            {"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}},
+            {"$project": {"_id": 1, "fullDocument": 1, "ns": 1, "documentKey": 1}}
+        ]
+    proyeksi: Dict[str, Any] = {"operationType": 1, "ns": 1, "documentKey": 1}
+    if koleksi in FIELD_COUNTER:
+        proyeksi["updateDescription"] = 1
+    proyeksi.update({f"fullDocument.{nama}": 1 for nama in FIELD_EVENT.get(koleksi, ())})
+    return [
+        {"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}},
+        {"$project": proyeksi}
+    ]
+
+
+def hanya_update_counter(koleksi: str, change: Dict[str, Any]) -> bool:
+    """True jika updateDescription hanya berisi FIELD_COUNTER (MongoDB, bukan Cosmos)"""
+    counter = FIELD_COUNTER.get(koleksi)
+    deskripsi = change.get("updateDescription")
+    if not counter or change.get("operationType") != "update" or not deskripsi:
+        return False
+    diubah = set(deskripsi.get("updatedFields") or {}) | set(deskripsi.get("removedFields") or [])
+    return bool(diubah) and diubah <= counter
+
+
+def sidik_dokumen(dokumen: Dict[str, Any], abaikan: FrozenSet[str]) -> int:
+    """Hash isi dokumen tanpa field counter (pembanding perubahan di Cosmos DB)"""
+    return hash(repr(sorted((nama, nilai) for nama, nilai in dokumen.items() if nama not in abaikan)))
+
+
+class WatcherPerubahan(threading.Thread):
+    """Thread daemon yang menerbitkan perubahan database ke bus"""
+
+    def __init__(
+        self,
+        db: Database,
+        bus: BusEvent,
+        mode: str = MODE_AUTO,
+        interval_polling: float = 5.0
+    ):
+        super().__init__(name="watcher-perubahan", daemon=True)
+        if mode not in (MODE_AUTO, MODE_CHANGE_STREAM, MODE_POLLING):
+            raise ValueError(f"Mode watcher tidak dikenal: {mode}")
+        self.db = db
+        self.bus = bus
+        self.mode_diminta = mode
+        self.mode = ""
+        self.interval_polling = interval_polling
+        self.cosmos = "cosmos.azure.com" in (settings.DATABASE_URL or "")
+        self._berhenti = threading.Event()
+        # Sidik terakhir per dokumen collection FIELD_COUNTER (hanya terisi di Cosmos DB)
+        self._sidik: Dict[str, Dict[Any, int]] = {}
+
+    def hentikan(self) -> None:
+        self._berhenti.set()
+
+    def run(self) -> None:
+        if self.mode_diminta != MODE_POLLING:
+            try:
+                self._jalankan_change_stream()
+                return
+            except OperationFailure as e:
+                if self.mode_diminta == MODE_CHANGE_STREAM:
+                    logger.error(f"Change stream tidak didukung, watcher berhenti: {str(e)}")
+                    return
+                logger.warning(f"Change stream tidak didukung, watcher beralih ke polling: {str(e)}")
+        self._jalankan_polling()
+
+    # ==================== CHANGE STREAM ====================
+
+    def _buka_stream(self, nama: str, resume_token: Any = None) -> Any:
+        return self.db[nama].watch(
+            pipeline_change_stream(self.cosmos, nama),
+            full_document="updateLookup" if self.cosmos else None,
+            resume_after=resume_token,
+            max_await_time_ms=MAX_AWAIT_MS
+        )
+
+    def _hanya_counter(self, nama: str, change: Dict[str, Any]) -> bool:
+        """Update yang hanya menaikkan counter (dilewati, bukan perubahan katalog)"""
+        if hanya_update_counter(nama, change):
+            return True
+        counter = FIELD_COUNTER.get(nama)
+        dokumen = change.get("fullDocument")
+        if not counter or not dokumen or "updateDescription" in change:
+            return False
+        sidik = sidik_dokumen(dokumen, counter)
+        terakhir = self._sidik.setdefault(nama, {})
+        sama = terakhir.get(dokumen.get("_id")) == sidik
+        terakhir[dokumen.get("_id")] = sidik
+        return sama
+
+    def _terbitkan_change(self, nama: str, change: Dict[str, Any]) -> None:
+        if self._hanya_counter(nama, change):
+            return
+        self.bus.terbitkan(
+            nama,
+            change.get("operationType", OPERASI_TIDAK_DIKETAHUI),
+            (change.get("documentKey") or {}).get("_id"),
+            ringkas_dokumen(nama, change.get("fullDocument"))
+        )
+
+    def _jalankan_change_stream(self) -> None:
+        """
+        Baca semua cursor bergantian sampai dihentikan
+
+        OperationFailure saat pembukaan pertama dilempar (change stream tidak didukung →
+        fallback polling, cursor yang sudah terbuka ditutup dulu); cursor yang putus di
+        tengah jalan dibuka ulang dari resume token.
+        """
+        stream: Dict[str, Any] = {}
+        token: Dict[str, Any] = {}
+        gagal_pada: Dict[str, float] = {}
+        try:
+            for nama in KOLEKSI_DIPANTAU:
+                stream[nama] = self._buka_stream(nama)
+            self.mode = MODE_CHANGE_STREAM
+            logger.info(f"Watcher perubahan: change stream {len(stream)} collection{' (Cosmos DB)' if self.cosmos else ''}")
+            while not self._berhenti.is_set():
+                for nama in KOLEKSI_DIPANTAU:
+                    try:
+                        if stream.get(nama) is None:
+                            if time.monotonic() - gagal_pada.get(nama, 0.0) < JEDA_BUKA_ULANG_DETIK:
+                                continue
+                            stream[nama] = self._buka_stream(nama, token.get(nama))
+                        for _ in range(MAKS_EVENT_PER_SIKLUS):
+                            change = stream[nama].try_next()
+                            token[nama] = stream[nama].resume_token
+                            if change is None:
+                                break
+                            self._terbitkan_change(nama, change)
+                    except PyMongoError as e:
+                        logger.warning(f"Change stream {nama} terputus, dibuka ulang: {str(e)}")
+                        if stream.get(nama) is not None:
+                            stream[nama].close()
+                        stream[nama] = None
+                        gagal_pada[nama] = time.monotonic()
+                self.bus.detak(MODE_CHANGE_STREAM)
+        finally:
+            for aliran in stream.values():
+                if aliran is not None:
+                    aliran.close()
+
+    # ==================== POLLING ====================
+
+    def _jalankan_polling(self) -> None:
+        """Polling versi katalog & insert baru sampai dihentikan (error per siklus hanya dicatat)"""
+        self.mode = MODE_POLLING
+        logger.info(f"Watcher perubahan: polling setiap {self.interval_polling}s")
+        queries = DatabaseQueries(self.db)
+        versi_katalog: Optional[int] = None
+        terakhir: Dict[str, Any] = {}
+        while True:
+            try:
+                versi = queries.ambil_versi_katalog()
+                if versi is not None:
+                    if versi_katalog is not None and versi != versi_katalog:
+                        self.bus.terbitkan("meta_aplikasi", "update", "versi_katalog")
+                    versi_katalog = versi
+
+                for nama, field in FIELD_EVENT.items():
+                    if nama not in terakhir:
+                        # Titik awal: hanya insert setelah watcher start yang diterbitkan
+                        terakhir[nama] = queries.id_dokumen_terbaru(nama)
+                        continue
+                    for dokumen in queries.ambil_dokumen_setelah(nama, terakhir[nama], field):
+                        terakhir[nama] = dokumen["_id"]
+                        self.bus.terbitkan(nama, "insert", dokumen["_id"], ringkas_dokumen(nama, dokumen))
+                self.bus.detak(MODE_POLLING)
+            except Exception as e:
+                logger.warning(f"Polling perubahan gagal: {str(e)}")
+            if self._berhenti.wait(self.interval_polling):
+                return
+
+
+# ==================== PUBLIC API ====================
+
+_lock_watcher = threading.Lock()
+_watcher: Optional[WatcherPerubahan] = None
+
+
+def mulai_watcher(db: Database) -> Optional[WatcherPerubahan]:
+    """
+    Start watcher sekali per proses (idempotent, di-start ulang jika thread mati)
+
+    Returns:
+        WatcherPerubahan yang berjalan, None jika dimatikan (settings.WATCHER_AKTIF)
+    """
+    global _watcher
+    if not settings.WATCHER_AKTIF:
+        return None
+    with _lock_watcher:
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = WatcherPerubahan(db, bus_perubahan, settings.WATCHER_MODE, settings.WATCHER_INTERVAL_POLLING)
+            _watcher.start()
+        return _watcher
+
+
+def status_watcher() -> Dict[str, Any]:
+    """Status watcher & bus untuk monitoring"""
+    return {
+        "berjalan": _watcher is not None and _watcher.is_alive(),
+        "mode": _watcher.mode if _watcher is not None else "",
+        **bus_perubahan.status(),
+    }
@@ -0,0 +1,44 @@
+"""
+Startup Entry Point - Warm-up + Streamlit server dalam satu proses
+
+CATATAN:
+- Dipakai oleh systemd (deployment/pahamkode.service, atau pahamkode@.service per worker
+  dengan READINESS_PORT sendiri) menggantikan `streamlit run app/main.py`
+- Readiness endpoint & warm-up jalan di background thread, lalu Streamlit server
+  di-start di main thread. Karena satu proses, modul yang sudah di-import,
+  koneksi MongoDB (st.cache_resource) dan LLM client langsung dipakai halaman.
+- Argumen tambahan diteruskan ke `streamlit run` (mis. --server.port 8501)
+
+Usage:
+    python app/startup.py --server.port 8501 --server.headless true
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+from config import settings
+from services.warmup_service import mulai_server_kesiapan, mulai_warmup_background
+
+logging.basicConfig(
+    level=settings.LOG_LEVEL,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    """Start readiness endpoint, warm-up, lalu Streamlit server (blocking)"""
+    mulai_server_kesiapan()
+    mulai_warmup_background()
+
+    from streamlit.web import cli as stcli
+
+    main_script = Path(__file__).parent / "main.py"
+    sys.argv = ["streamlit", "run", str(main_script), *sys.argv[1:]]
+    logger.info(f"Starting Streamlit server: {' '.join(sys.argv[1:])}")
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,74 @@
 """
 Package utils untuk PahamKode
-Mengelola utility functions dan helpers
+Mengelola utility functions dan helpers (re-export lazy, di-import saat dipakai)
 """
 
-from .prompts import buat_prompt_analisis_semantik
-from .helpers import (
-    format_datetime,
-    format_relative_time,
-    format_number,
-    format_percentage,
-    validasi_email,
-    validasi_password,
-    truncate_text,
-    get_severity_color,
-    get_status_color
-)
+from typing import TYPE_CHECKING
+
+from .lazy_loader import buat_lazy_loader
+
+if TYPE_CHECKING:
+    from .prompts import buat_prompt_analisis_semantik
+    from .indeks_topik import IndeksTopik, normalisasi_topik
+    from .pencarian import IndeksBM25, tokenisasi, buat_kata_cari
+    from .minhash import IndeksLSH, diff_kode
+    from .bus_event import BusEvent, EventPerubahan, bus_perubahan
+    from .backend_bersama import BackendBersama, BackendBersamaError, buat_backend, dapatkan_backend
+    from .helpers import (
+        format_datetime,
+        format_relative_time,
+        format_number,
+        format_percentage,
+        validasi_email,
+        validasi_password,
+        truncate_text,
+        get_severity_color,
+        get_status_color
+    )
+
+__getattr__, __dir__ = buat_lazy_loader(__name__, {
+    "buat_prompt_analisis_semantik": (".prompts", "buat_prompt_analisis_semantik"),
+    "IndeksTopik": (".indeks_topik", "IndeksTopik"),
+    "normalisasi_topik": (".indeks_topik", "normalisasi_topik"),
+    "IndeksBM25": (".pencarian", "IndeksBM25"),
+    "tokenisasi": (".pencarian", "tokenisasi"),
+    "buat_kata_cari": (".pencarian", "buat_kata_cari"),
+    "IndeksLSH": (".minhash", "IndeksLSH"),
+    "diff_kode": (".minhash", "diff_kode"),
+    "BusEvent": (".bus_event", "BusEvent"),
+    "EventPerubahan": (".bus_event", "EventPerubahan"),
+    "bus_perubahan": (".bus_event", "bus_perubahan"),
+    "BackendBersama": (".backend_bersama", "BackendBersama"),
+    "BackendBersamaError": (".backend_bersama", "BackendBersamaError"),
+    "buat_backend": (".backend_bersama", "buat_backend"),
+    "dapatkan_backend": (".backend_bersama", "dapatkan_backend"),
+    "format_datetime": (".helpers", "format_datetime"),
+    "format_relative_time": (".helpers", "format_relative_time"),
+    "format_number": (".helpers", "format_number"),
+    "format_percentage": (".helpers", "format_percentage"),
+    "validasi_email": (".helpers", "validasi_email"),
+    "validasi_password": (".helpers", "validasi_password"),
+    "truncate_text": (".helpers", "truncate_text"),
+    "get_severity_color": (".helpers", "get_severity_color"),
+    "get_status_color": (".helpers", "get_status_color"),
+})
 
 __all__ = [
     "buat_prompt_analisis_semantik",
+    "IndeksTopik",
+    "normalisasi_topik",
+    "IndeksBM25",
+    "tokenisasi",
+    "buat_kata_cari",
+    "IndeksLSH",
+    "diff_kode",
+    "BusEvent",
+    "EventPerubahan",
+    "bus_perubahan",
+    "BackendBersama",
+    "BackendBersamaError",
+    "buat_backend",
+    "dapatkan_backend",
     "format_datetime",
     "format_relative_time",
     "format_number",
@@ -0,0 +1,235 @@
+"""
+Anggaran Prompt - Susun input prompt analisis dalam batas token per request
+
+CATATAN:
+- Kode besar yang di-paste utuh menghabiskan kuota token harian dan memperlambat respons;
+  yang relevan untuk analisis biasanya hanya baris di sekitar lokasi error
+- Kode: jika melebihi anggaran, diambil jendela baris di sekitar nomor baris yang disebut
+  traceback (radius diperkecil sampai muat), bagian lain diganti penanda "baris a-b dipotong"
+- Traceback: frame yang berulang berturut-turut (rekursi) diringkas; jika masih terlalu panjang,
+  frame pertama + beberapa frame terakhir + baris exception dipertahankan
+- Riwayat error: dikelompokkan per tipe (dengan jumlah) dan kesenjangan konsep dipendekkan
+- Penghitung token dioper oleh caller (services/ai_service.py), jadi modul ini tidak
+  bergantung pada tokenizer tertentu
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+PenghitungToken = Callable[[str], int]
+
+# Porsi anggaran per bagian (sisanya untuk kode)
+PORSI_TRACEBACK = 0.25
+PORSI_RIWAYAT = 0.10
+MAKS_PANJANG_KESENJANGAN = 120
+FRAME_TERAKHIR_DIPERTAHANKAN = 4
+
+_POLA_NOMOR_BARIS = re.compile(r"(?:line |:)(\d+)")
+_POLA_FRAME = re.compile(r"^\s*File \".*\", line \d+")
+
+
+@dataclass
+class InputPrompt:
+    """Bagian variabel prompt analisis setelah dipangkas ke anggaran"""
+    kode: str
+    pesan_error: str
+    riwayat_error: str
+    token_asli: int
+    token_akhir: int
+
+    @property
+    def token_dihemat(self) -> int:
+        return max(self.token_asli - self.token_akhir, 0)
+
+
+# ==================== KODE ====================
+
+def baris_disebut(pesan_error: str, jumlah_baris: int) -> List[int]:
+    """Nomor baris kode yang disebut traceback (yang valid untuk kode ini saja), urut terakhir dulu"""
+    nomor = [int(item) for item in _POLA_NOMOR_BARIS.findall(pesan_error or "")]
+    valid = [item for item in reversed(nomor) if 1 <= item <= jumlah_baris]
+    return list(dict.fromkeys(valid))
+
+
+def _rentang_jendela(pusat: Sequence[int], radius: int, jumlah_baris: int) -> List[Tuple[int, int]]:
+    rentang: List[Tuple[int, int]] = []
+    for baris in sorted(pusat):
+        awal, akhir = max(1, baris - radius), min(jumlah_baris, baris + radius)
+        if rentang and awal <= rentang[-1][1] + 1:
+            rentang[-1] = (rentang[-1][0], max(rentang[-1][1], akhir))
+        else:
+            rentang.append((awal, akhir))
+    return rentang
+
+
+def _render_jendela(baris: List[str], rentang: List[Tuple[int, int]]) -> str:
+    hasil: List[str] = []
+    sebelumnya = 0
+    for awal, akhir in rentang:
+        if awal > sebelumnya + 1:
+            hasil.append(f"# ... baris {sebelumnya + 1}-{awal - 1} dipotong ...")
+        hasil.extend(f"{nomor:>4}| {baris[nomor - 1]}" for nomor in range(awal, akhir + 1))
+        sebelumnya = akhir
+    if sebelumnya < len(baris):
+        hasil.append(f"# ... baris {sebelumnya + 1}-{len(baris)} dipotong ...")
+    return "\n".join(hasil)
+
+
+def jendela_kode(kode: str, pesan_error: str, anggaran: int, hitung: PenghitungToken, radius: int = 8) -> str:
+    """
+    Kode utuh jika muat anggaran; jika tidak, jendela baris di sekitar lokasi error
+
+    Tanpa nomor baris di traceback: awal & akhir kode dipertahankan.
+    """
+    if hitung(kode) <= anggaran:
+        return kode
+    baris = kode.splitlines()
+    pusat = baris_disebut(pesan_error, len(baris)) or [1, len(baris)]
+
+    # Baris paling akhir di traceback = lokasi exception, diprioritaskan saat anggaran sempit
+    while True:
+        for jumlah_pusat in range(len(pusat), 0, -1):
+            hasil = _render_jendela(baris, _rentang_jendela(pusat[:jumlah_pusat], radius, len(baris)))
+            if hitung(hasil) <= anggaran:
+                return hasil
+        if radius == 0:
+            return hasil[:max(anggaran, 1) * 3]
+        radius //= 2
+
+
+# ==================== TRACEBACK ====================
+
+def _pecah_frame(pesan_error: str) -> Tuple[List[str], List[List[str]], List[str]]:
+    """Traceback → (baris pembuka, frame [File ... + baris kode], baris penutup/exception)"""
+    pembuka: List[str] = []
+    frame: List[List[str]] = []
+    penutup: List[str] = []
+    for baris in pesan_error.splitlines():
+        if _POLA_FRAME.match(baris):
+            frame.append([baris])
+        elif frame:
+            frame[-1].append(baris)
+        else:
+            pembuka.append(baris)
+    if frame:
+        # Frame terakhir: baris kode/caret (indentasi 4) milik frame, sisanya exception
+        terakhir = frame[-1]
+        batas = 1
+        while batas < len(terakhir) and terakhir[batas].startswith("    "):
+            batas += 1
+        frame[-1], penutup = terakhir[:batas], terakhir[batas:]
+    return pembuka, frame, penutup
+
+
+def ringkas_traceback(pesan_error: str, anggaran: int, hitung: PenghitungToken) -> str:
+    """Dedupe frame berulang berturut-turut, lalu potong frame tengah jika masih melebihi anggaran"""
+    if not pesan_error:
+        return ""
+    pembuka, frame, penutup = _pecah_frame(pesan_error)
+    if not frame:
+        teks = pesan_error
+    else:
+        ringkas: List[str] = []
+        indeks = 0
+        while indeks < len(frame):
+            ulang = 1
+            while indeks + ulang < len(frame) and frame[indeks + ulang] == frame[indeks]:
+                ulang += 1
+            ringkas.extend(frame[indeks])
+            if ulang > 1:
+                ringkas.append(f"  [frame di atas berulang {ulang - 1} kali lagi]")
+            indeks += ulang
+        teks = "\n".join(pembuka + ringkas + penutup)
+
+        if hitung(teks) > anggaran and len(frame) > FRAME_TERAKHIR_DIPERTAHANKAN + 1:
+            terakhir = [baris for item in frame[-FRAME_TERAKHIR_DIPERTAHANKAN:] for baris in item]
+            teks = "\n".join(
+                pembuka + frame[0]
+                + [f"  [... {len(frame) - FRAME_TERAKHIR_DIPERTAHANKAN - 1} frame dipotong ...]"]
+                + terakhir + penutup
+            )
+
+    if hitung(teks) > anggaran:
+        # Baris exception (paling akhir) paling penting
+        baris = teks.splitlines()
+        teks = "\n".join(["[... traceback dipotong ...]"] + baris[-3:])
+    return teks
+
+
+# ==================== RIWAYAT ====================
+
+def ringkas_riwayat(riwayat_error: Sequence[Dict[str, Any]], anggaran: int, hitung: PenghitungToken) -> str:
+    """Riwayat error dikelompokkan per tipe: '- NameError (3x): kesenjangan'"""
+    if not riwayat_error:
+        return "Belum ada riwayat error"
+    per_tipe: Dict[str, Dict[str, Any]] = {}
+    for err in riwayat_error[:5]:
+        tipe = err.get("tipe_error") or "Unknown"
+        entri = per_tipe.setdefault(tipe, {"jumlah": 0, "kesenjangan": err.get("kesenjangan_konsep") or "N/A"})
+        entri["jumlah"] += 1
+
+    baris: List[str] = []
+    for tipe, entri in per_tipe.items():
+        kesenjangan = entri["kesenjangan"]
+        if len(kesenjangan) > MAKS_PANJANG_KESENJANGAN:
+            kesenjangan = kesenjangan[:MAKS_PANJANG_KESENJANGAN].rsplit(" ", 1)[0] + "..."
+        jumlah = f" ({entri['jumlah']}x)" if entri["jumlah"] > 1 else ""
+        kandidat = baris + [f"- {tipe}{jumlah}: {kesenjangan}"]
+        if baris and hitung("\n".join(kandidat)) > anggaran:
+            break
+        baris = kandidat
+    return "\n".join(baris)
+
+
+def format_riwayat_lengkap(riwayat_error: Sequence[Dict[str, Any]]) -> str:
+    """Format riwayat tanpa peringkasan (pembanding untuk menghitung token dihemat)"""
+    if not riwayat_error:
+        return "Belum ada riwayat error"
+    return "\n".join(
+        f"- {err.get('tipe_error', 'Unknown')}: {err.get('kesenjangan_konsep', 'N/A')}"
+        for err in riwayat_error[:5]
+    )
+
+
+# ==================== PENYUSUN ====================
+
+def susun_input_prompt(
+    kode: str,
+    pesan_error: str,
+    riwayat_error: Sequence[Dict[str, Any]],
+    anggaran: int,
+    hitung: PenghitungToken,
+    radius: int = 8,
+    token_tetap_asli: int = 0,
+    token_tetap_akhir: Optional[int] = None
+) -> InputPrompt:
+    """
+    Pangkas kode, traceback, dan riwayat supaya total muat anggaran
+
+    Args:
+        anggaran: Anggaran token untuk bagian variabel (kode + traceback + riwayat)
+        hitung: Penghitung token
+        token_tetap_asli / token_tetap_akhir: Token bagian tetap prompt (template, format
+            instructions) sebelum & sesudah diringkas, ikut dihitung di token_asli / token_akhir
+    """
+    pesan_error = pesan_error or ""
+    kode = kode or ""
+    riwayat_asli = format_riwayat_lengkap(riwayat_error)
+    token_asli = hitung(kode) + hitung(pesan_error) + hitung(riwayat_asli) + token_tetap_asli
+
+    teks_riwayat = ringkas_riwayat(riwayat_error, int(anggaran * PORSI_RIWAYAT), hitung)
+    teks_error = ringkas_traceback(pesan_error, int(anggaran * PORSI_TRACEBACK), hitung)
+    sisa = max(anggaran - hitung(teks_riwayat) - hitung(teks_error), int(anggaran * 0.3))
+    teks_kode = jendela_kode(kode, pesan_error, sisa, hitung, radius)
+
+    token_akhir = hitung(teks_kode) + hitung(teks_error) + hitung(teks_riwayat) + (
+        token_tetap_asli if token_tetap_akhir is None else token_tetap_akhir
+    )
+    return InputPrompt(
+        kode=teks_kode,
+        pesan_error=teks_error,
+        riwayat_error=teks_riwayat,
+        token_asli=token_asli,
+        token_akhir=token_akhir,
+    )
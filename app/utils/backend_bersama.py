@@ -0,0 +1,465 @@
+"""
+Backend Bersama - Key-value store untuk state yang dibagi antar proses worker Streamlit
+
+CATATAN:
+- Dengan N proses worker di belakang nginx, counter / cache / token yang disimpan di memori
+  proses hanya terlihat oleh satu worker. State seperti itu disimpan lewat backend ini:
+  kuota token LLM, rate limit login, status job export kohort, cache dashboard admin
+- Dua implementasi, dipilih dari settings.BACKEND_BERSAMA_URL:
+  * memori://            → BackendMemori, dict thread-safe di proses ini (default, satu worker)
+  * redis://host:port/db → BackendResp, klien protokol Redis (RESP2) tanpa dependency tambahan;
+    bisa dilayani Redis sungguhan atau stand-in lokal scripts/server_cache.py
+- Nilai selalu string; objek (dict dengan datetime / ObjectId) lewat simpan_objek / ambil_objek
+  yang memakai bson.json_util
+- tambah() dengan ttl = fixed window: TTL hanya dipasang saat key baru dibuat, atomik dengan
+  pembuatan key (RESP: SET 0 NX PX lalu INCRBY), jadi counter tidak pernah tersisa tanpa TTL
+- Hanya perintah baca yang dicoba ulang setelah koneksi putus / timeout; perintah tulis tidak,
+  karena server bisa saja sudah mengeksekusinya (INCRBY terhitung dua kali)
+- Semua key diberi prefix settings.BACKEND_BERSAMA_PREFIX (beberapa app bisa berbagi server)
+- Error koneksi / balasan error server → BackendBersamaError; pemanggil memutuskan fallback
+"""
+
+import logging
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from bson import json_util
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sapu key kedaluwarsa di BackendMemori setiap N operasi tulis (selain expiry lazy saat dibaca)
+SAPU_SETIAP_OPERASI = 1024
+# Perintah RESP yang aman dikirim ulang setelah koneksi putus (tidak mengubah data)
+PERINTAH_BACA = frozenset({"GET", "EXISTS", "TTL", "PTTL", "HGET", "HGETALL", "PING", "DBSIZE"})
+
+
+class BackendBersamaError(Exception):
+    """Backend tidak bisa dihubungi atau menolak perintah"""
+
+
+class BackendBersama(ABC):
+    """Interface backend; subclass mengimplementasikan operasi dasar"""
+
+    jenis = ""
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+
+    def _k(self, kunci: str) -> str:
+        return self.prefix + kunci
+
+    # ==================== STRING & COUNTER ====================
+
+    @abstractmethod
+    def ambil(self, kunci: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def simpan(self, kunci: str, nilai: str, ttl: Optional[float] = None, hanya_baru: bool = False) -> bool:
+        """
+        Simpan nilai (ttl dalam detik, None = permanen)
+
+        Returns:
+            False jika hanya_baru dan key sudah ada (dipakai sebagai lock antar proses)
+        """
+        ...
+
+    @abstractmethod
+    def hapus(self, *kunci: str) -> int:
+        ...
+
+    @abstractmethod
+    def tambah(self, kunci: str, jumlah: int = 1, ttl: Optional[float] = None) -> int:
+        """Increment atomik, return nilai baru; ttl hanya dipasang saat key baru dibuat"""
+        ...
+
+    @abstractmethod
+    def kedaluwarsa(self, kunci: str, ttl: float) -> bool:
+        """Pasang / perpanjang TTL key yang sudah ada"""
+        ...
+
+    # ==================== HASH ====================
+
+    @abstractmethod
+    def hash_simpan(self, kunci: str, field: str, nilai: str) -> None:
+        ...
+
+    @abstractmethod
+    def hash_ambil(self, kunci: str, field: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def hash_semua(self, kunci: str) -> Dict[str, str]:
+        ...
+
+    @abstractmethod
+    def hash_hapus(self, kunci: str, *field: str) -> int:
+        ...
+
+    # ==================== UTILITAS ====================
+
+    @abstractmethod
+    def ping(self) -> bool:
+        ...
+
+    def ambil_objek(self, kunci: str) -> Any:
+        nilai = self.ambil(kunci)
+        return json_util.loads(nilai) if nilai is not None else None
+
+    def simpan_objek(self, kunci: str, nilai: Any, ttl: Optional[float] = None, hanya_baru: bool = False) -> bool:
+        return self.simpan(kunci, json_util.dumps(nilai), ttl, hanya_baru)
+
+    def lepas_kunci(self, kunci: str, pemilik: str) -> bool:
+        """Hapus lock hanya jika masih dipegang pemilik (cek-lalu-hapus, cukup untuk lock ber-TTL)"""
+        if self.ambil(kunci) != pemilik:
+            return False
+        return self.hapus(kunci) > 0
+
+    def status(self) -> Dict[str, Any]:
+        """Ringkasan untuk monitoring"""
+        try:
+            tersambung = self.ping()
+        except BackendBersamaError:
+            tersambung = False
+        return {"jenis": self.jenis, "tersambung": tersambung}
+
+
+# ==================== MEMORI ====================
+
+class BackendMemori(BackendBersama):
+    """Dict thread-safe di proses ini (juga dipakai sebagai storage scripts/server_cache.py)"""
+
+    jenis = "memori"
+
+    def __init__(self, prefix: str = ""):
+        super().__init__(prefix)
+        self._lock = threading.Lock()
+        # kunci → (nilai str atau dict untuk hash, waktu kedaluwarsa monotonic atau None)
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._operasi = 0
+
+    def _hidup(self, kunci: str) -> Optional[Tuple[Any, Optional[float]]]:
+        entri = self._data.get(kunci)
+        if entri is not None and entri[1] is not None and entri[1] <= time.monotonic():
+            del self._data[kunci]
+            return None
+        return entri
+
+    def _nilai(self, kunci: str, tipe: type) -> Any:
+        entri = self._hidup(kunci)
+        if entri is None:
+            return None
+        if not isinstance(entri[0], tipe):
+            raise BackendBersamaError(f"Tipe key {kunci} tidak cocok untuk operasi ini")
+        return entri[0]
+
+    def _catat_tulis(self) -> None:
+        self._operasi += 1
+        if self._operasi % SAPU_SETIAP_OPERASI == 0:
+            sekarang = time.monotonic()
+            for kunci in [k for k, (_, batas) in self._data.items() if batas is not None and batas <= sekarang]:
+                del self._data[kunci]
+
+    @staticmethod
+    def _batas(ttl: Optional[float]) -> Optional[float]:
+        return time.monotonic() + ttl if ttl is not None else None
+
+    def ambil(self, kunci: str) -> Optional[str]:
+        with self._lock:
+            return self._nilai(self._k(kunci), str)
+
+    def simpan(self, kunci: str, nilai: str, ttl: Optional[float] = None, hanya_baru: bool = False) -> bool:
+        kunci = self._k(kunci)
+        with self._lock:
+            if hanya_baru and self._hidup(kunci) is not None:
+                return False
+            self._data[kunci] = (str(nilai), self._batas(ttl))
+            self._catat_tulis()
+            return True
+
+    def hapus(self, *kunci: str) -> int:
+        dihapus = 0
+        with self._lock:
+            for item in kunci:
+                if self._hidup(self._k(item)) is not None:
+                    del self._data[self._k(item)]
+                    dihapus += 1
+        return dihapus
+
+    def tambah(self, kunci: str, jumlah: int = 1, ttl: Optional[float] = None) -> int:
+        kunci = self._k(kunci)
+        with self._lock:
+            entri = self._hidup(kunci)
+            if entri is None:
+                self._data[kunci] = (str(jumlah), self._batas(ttl))
+                self._catat_tulis()
+                return jumlah
+            try:
+                nilai = int(entri[0]) + jumlah
+            except (TypeError, ValueError):
+                raise BackendBersamaError(f"Nilai key {kunci} bukan integer")
+            self._data[kunci] = (str(nilai), entri[1])
+            return nilai
+
+    def kedaluwarsa(self, kunci: str, ttl: float) -> bool:
+        kunci = self._k(kunci)
+        with self._lock:
+            entri = self._hidup(kunci)
+            if entri is None:
+                return False
+            self._data[kunci] = (entri[0], self._batas(ttl))
+            return True
+
+    def sisa_ttl(self, kunci: str) -> Optional[float]:
+        """Sisa TTL detik (None = tidak ada key, -1 = permanen)"""
+        with self._lock:
+            entri = self._hidup(self._k(kunci))
+            if entri is None:
+                return None
+            return -1 if entri[1] is None else entri[1] - time.monotonic()
+
+    def hash_simpan(self, kunci: str, field: str, nilai: str) -> None:
+        kunci = self._k(kunci)
+        with self._lock:
+            data = self._nilai(kunci, dict)
+            if data is None:
+                data = {}
+                self._data[kunci] = (data, None)
+                self._catat_tulis()
+            data[field] = str(nilai)
+
+    def hash_ambil(self, kunci: str, field: str) -> Optional[str]:
+        with self._lock:
+            return (self._nilai(self._k(kunci), dict) or {}).get(field)
+
+    def hash_semua(self, kunci: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._nilai(self._k(kunci), dict) or {})
+
+    def hash_hapus(self, kunci: str, *field: str) -> int:
+        kunci = self._k(kunci)
+        with self._lock:
+            data = self._nilai(kunci, dict)
+            if data is None:
+                return 0
+            jumlah = sum(1 for item in field if data.pop(item, None) is not None)
+            if not data:
+                del self._data[kunci]
+            return jumlah
+
+    def ukuran(self) -> int:
+        with self._lock:
+            return sum(1 for kunci in list(self._data) if self._hidup(kunci) is not None)
+
+    def kosongkan(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def ping(self) -> bool:
+        return True
+
+
+# ==================== RESP (REDIS PROTOCOL) ====================
+
+class BackendResp(BackendBersama):
+    """
+    Klien minimal protokol Redis (RESP2) di atas satu socket TCP
+
+    Satu koneksi per proses, dipakai bergantian dengan lock (perintah lokal < 1 ms).
+    Koneksi yang putus selalu ditutup; perintah baca (PERINTAH_BACA) dicoba sekali lagi
+    di koneksi baru, perintah tulis langsung BackendBersamaError.
+    """
+
+    jenis = "resp"
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        prefix: str = "",
+        timeout: float = 1.0
+    ):
+        super().__init__(prefix)
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._socket: Optional[socket.socket] = None
+        self._berkas: Any = None
+
+    # ==================== PROTOKOL ====================
+
+    @staticmethod
+    def _encode(*args: Any) -> bytes:
+        bagian = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            bagian.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(bagian)
+
+    def _baca_balasan(self) -> Any:
+        baris = self._berkas.readline()
+        if not baris.endswith(b"\r\n"):
+            raise ConnectionError("Koneksi backend ditutup server")
+        jenis, isi = baris[:1], baris[1:-2]
+        if jenis == b"+":
+            return isi.decode("utf-8")
+        if jenis == b"-":
+            raise BackendBersamaError(isi.decode("utf-8", errors="replace"))
+        if jenis == b":":
+            return int(isi)
+        if jenis == b"$":
+            panjang = int(isi)
+            if panjang < 0:
+                return None
+            data = self._berkas.read(panjang + 2)
+            if len(data) != panjang + 2:
+                raise ConnectionError("Koneksi backend ditutup server")
+            return data[:-2].decode("utf-8")
+        if jenis == b"*":
+            panjang = int(isi)
+            return None if panjang < 0 else [self._baca_balasan() for _ in range(panjang)]
+        raise BackendBersamaError(f"Balasan RESP tidak dikenal: {baris[:20]!r}")
+
+    def _sambung(self) -> None:
+        self._socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._berkas = self._socket.makefile("rb")
+        try:
+            if self.password:
+                self._kirim("AUTH", self.password)
+            if self.db:
+                self._kirim("SELECT", self.db)
+        except BackendBersamaError:
+            # Koneksi tanpa AUTH / SELECT yang benar tidak boleh dipakai ulang
+            self._tutup()
+            raise
+
+    def _tutup(self) -> None:
+        for sumber in (self._berkas, self._socket):
+            try:
+                if sumber is not None:
+                    sumber.close()
+            except OSError:
+                pass
+        self._socket = None
+        self._berkas = None
+
+    def _kirim(self, *args: Any) -> Any:
+        self._socket.sendall(self._encode(*args))
+        return self._baca_balasan()
+
+    def perintah(self, *args: Any) -> Any:
+        """Kirim satu perintah RESP dan kembalikan balasannya"""
+        percobaan = 2 if str(args[0]).upper() in PERINTAH_BACA else 1
+        with self._lock:
+            for ke in range(percobaan):
+                try:
+                    if self._socket is None:
+                        self._sambung()
+                    return self._kirim(*args)
+                except (OSError, ConnectionError, ValueError) as e:
+                    self._tutup()
+                    if ke == percobaan - 1:
+                        raise BackendBersamaError(f"Backend {self.host}:{self.port} tidak bisa dihubungi: {str(e)}")
+
+    # ==================== OPERASI ====================
+
+    def ambil(self, kunci: str) -> Optional[str]:
+        return self.perintah("GET", self._k(kunci))
+
+    def simpan(self, kunci: str, nilai: str, ttl: Optional[float] = None, hanya_baru: bool = False) -> bool:
+        args: List[Any] = ["SET", self._k(kunci), nilai]
+        if ttl is not None:
+            args += ["PX", max(int(ttl * 1000), 1)]
+        if hanya_baru:
+            args.append("NX")
+        return self.perintah(*args) is not None
+
+    def hapus(self, *kunci: str) -> int:
+        if not kunci:
+            return 0
+        return self.perintah("DEL", *(self._k(item) for item in kunci))
+
+    def tambah(self, kunci: str, jumlah: int = 1, ttl: Optional[float] = None) -> int:
+        if ttl is not None:
+            # Key dibuat bersama TTL-nya; jika proses mati sebelum INCRBY, key 0 tetap kedaluwarsa
+            self.perintah("SET", self._k(kunci), 0, "PX", max(int(ttl * 1000), 1), "NX")
+        return self.perintah("INCRBY", self._k(kunci), jumlah)
+
+    def kedaluwarsa(self, kunci: str, ttl: float) -> bool:
+        return self.perintah("PEXPIRE", self._k(kunci), max(int(ttl * 1000), 1)) == 1
+
+    def hash_simpan(self, kunci: str, field: str, nilai: str) -> None:
+        self.perintah("HSET", self._k(kunci), field, nilai)
+
+    def hash_ambil(self, kunci: str, field: str) -> Optional[str]:
+        return self.perintah("HGET", self._k(kunci), field)
+
+    def hash_semua(self, kunci: str) -> Dict[str, str]:
+        data = self.perintah("HGETALL", self._k(kunci)) or []
+        return dict(zip(data[::2], data[1::2]))
+
+    def hash_hapus(self, kunci: str, *field: str) -> int:
+        if not field:
+            return 0
+        return self.perintah("HDEL", self._k(kunci), *field)
+
+    def ping(self) -> bool:
+        return self.perintah("PING") == "PONG"
+
+    def status(self) -> Dict[str, Any]:
+        return {**super().status(), "alamat": f"{self.host}:{self.port}/{self.db}"}
+
+
+# ==================== FACTORY ====================
+
+def buat_backend(url: str, prefix: str = "", timeout: float = 1.0) -> BackendBersama:
+    """
+    Buat backend dari URL: memori:// atau redis://[:password@]host[:port][/db]
+
+    Raises:
+        ValueError: Skema URL tidak dikenal
+    """
+    hasil = urlparse(url or "memori://")
+    if hasil.scheme in ("memori", "memory"):
+        return BackendMemori(prefix)
+    if hasil.scheme in ("redis", "resp"):
+        return BackendResp(
+            host=hasil.hostname or "127.0.0.1",
+            port=hasil.port or 6379,
+            db=int(hasil.path.lstrip("/") or 0),
+            password=unquote(hasil.password) if hasil.password else None,
+            prefix=prefix,
+            timeout=timeout
+        )
+    raise ValueError(f"Skema backend bersama tidak dikenal: {hasil.scheme} (pilihan: memori, redis)")
+
+
+_lock_backend = threading.Lock()
+_backend: Optional[BackendBersama] = None
+
+
+def dapatkan_backend() -> BackendBersama:
+    """Backend bersama process-wide dari settings (dibuat sekali)"""
+    global _backend
+    if _backend is None:
+        with _lock_backend:
+            if _backend is None:
+                _backend = buat_backend(
+                    settings.BACKEND_BERSAMA_URL,
+                    settings.BACKEND_BERSAMA_PREFIX,
+                    settings.BACKEND_BERSAMA_TIMEOUT_DETIK
+                )
+                logger.info(f"Backend bersama: {_backend.jenis}")
+    return _backend
@@ -0,0 +1,124 @@
+"""
+Bus Event - Pub/sub in-process untuk perubahan data (invalidasi cache & live feed admin)
+
+CATATAN:
+- Publisher utama: services/watcher_service.py (change stream, atau polling jika tidak didukung)
+- Subscriber dipanggil sinkron di thread publisher: harus cepat (set flag), bukan query database
+- Exception subscriber dicatat di log dan tidak menghentikan subscriber lain
+- Event terakhir disimpan di ring buffer bernomor urut, supaya halaman Streamlit (tanpa koneksi
+  push) bisa mengambil event baru sejak render sebelumnya dengan event_sejak()
+- `aktif` = publisher mengirim detak baru-baru ini; cache memakai TTL pendek jika tidak aktif
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cosmos DB tidak mengirim operationType di change stream (insert / update tidak bisa dibedakan)
+OPERASI_TIDAK_DIKETAHUI = "ubah"
+
+MAKS_RIWAYAT = 200
+# Bus dianggap tidak aktif jika publisher tidak mengirim detak selama ini (detik)
+BATAS_DETAK_DETIK = 30.0
+
+
+@dataclass(frozen=True)
+class EventPerubahan:
+    """Satu perubahan dokumen di database"""
+    koleksi: str
+    operasi: str  # insert, update, replace, delete, atau OPERASI_TIDAK_DIKETAHUI
+    id_dokumen: Any = None
+    dokumen: Optional[Dict[str, Any]] = None  # Field ringkas saja (lihat watcher_service.FIELD_EVENT)
+    waktu: datetime = field(default_factory=datetime.now)
+    urutan: int = 0
+
+
+class BusEvent:
+    """Bus event process-wide, thread-safe"""
+
+    def __init__(self, maks_riwayat: int = MAKS_RIWAYAT, batas_detak: float = BATAS_DETAK_DETIK):
+        self._lock = threading.Lock()
+        self._token = itertools.count(1)
+        self._pelanggan: Dict[int, Tuple[FrozenSet[str], Callable[[EventPerubahan], None]]] = {}
+        self._riwayat: Deque[EventPerubahan] = deque(maxlen=maks_riwayat)
+        self._urutan = 0
+        self._batas_detak = batas_detak
+        self._detak_terakhir: Optional[float] = None
+        self._sumber = ""
+
+    def langganan(self, koleksi: Iterable[str], callback: Callable[[EventPerubahan], None]) -> int:
+        """
+        Daftarkan callback untuk perubahan di collection tertentu
+
+        Returns:
+            Token untuk berhenti_langganan()
+        """
+        token = next(self._token)
+        with self._lock:
+            self._pelanggan[token] = (frozenset(koleksi), callback)
+        return token
+
+    def berhenti_langganan(self, token: int) -> None:
+        with self._lock:
+            self._pelanggan.pop(token, None)
+
+    def terbitkan(
+        self,
+        koleksi: str,
+        operasi: str,
+        id_dokumen: Any = None,
+        dokumen: Optional[Dict[str, Any]] = None
+    ) -> EventPerubahan:
+        """Catat event di riwayat lalu panggil semua subscriber collection tersebut"""
+        with self._lock:
+            self._urutan += 1
+            event = EventPerubahan(koleksi, operasi, id_dokumen, dokumen, urutan=self._urutan)
+            self._riwayat.append(event)
+            pelanggan = [callback for daftar, callback in self._pelanggan.values() if koleksi in daftar]
+        for callback in pelanggan:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Subscriber event {koleksi} gagal: {str(e)}")
+        return event
+
+    def event_sejak(self, urutan: int, koleksi: Optional[Iterable[str]] = None) -> List[EventPerubahan]:
+        """Event dengan nomor urut > urutan (yang masih ada di ring buffer), terlama dulu"""
+        saring = frozenset(koleksi) if koleksi is not None else None
+        with self._lock:
+            return [
+                event for event in self._riwayat
+                if event.urutan > urutan and (saring is None or event.koleksi in saring)
+            ]
+
+    @property
+    def urutan_terakhir(self) -> int:
+        return self._urutan
+
+    def detak(self, sumber: str) -> None:
+        """Dipanggil publisher setiap siklus, menandakan event masih mengalir"""
+        self._detak_terakhir = time.monotonic()
+        self._sumber = sumber
+
+    @property
+    def aktif(self) -> bool:
+        return self._detak_terakhir is not None and time.monotonic() - self._detak_terakhir < self._batas_detak
+
+    def status(self) -> Dict[str, Any]:
+        """Ringkasan untuk monitoring"""
+        return {
+            "aktif": self.aktif,
+            "sumber": self._sumber if self.aktif else "",
+            "urutan": self._urutan,
+            "pelanggan": len(self._pelanggan),
+        }
+
+
+bus_perubahan = BusEvent()
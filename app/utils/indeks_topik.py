@@ -0,0 +1,195 @@
+"""
+Indeks Topik - Inverted index dari topik ke dokumen katalog
+
+CATATAN:
+- Dipakai oleh services/katalog_service.py untuk rekomendasi sumber daya & exercises
+- Struktur: topik (dinormalisasi) → tingkat_kesulitan → tipe → {id_dokumen: dokumen}
+- Lookup O(jumlah match), bukan O(katalog × topik) seperti scan list dengan any(...)
+- Update incremental per dokumen (tambah / hapus / perbarui), aman dipakai multi-thread
+"""
+
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Kunci bucket untuk dokumen tanpa tingkat_kesulitan / tipe
+BUCKET_KOSONG = ""
+
+
+def normalisasi_topik(topik: Any) -> str:
+    """
+    Normalisasi nama topik supaya "Null Pointer", "null_pointer" dan " null-pointer "
+    masuk ke posting yang sama
+    """
+    if not topik:
+        return ""
+    return re.sub(r"[\s_\-]+", " ", str(topik)).strip().lower()
+
+
+def topik_dokumen(dokumen: Dict[str, Any]) -> Set[str]:
+    """Ambil semua topik (dinormalisasi) dari field `topik` dan `topik_terkait`"""
+    semua_topik = [dokumen.get("topik")] + list(dokumen.get("topik_terkait") or [])
+    return {nama for nama in map(normalisasi_topik, semua_topik) if nama}
+
+
+def _urutan_terbaru(dokumen: Dict[str, Any]) -> Tuple[bool, datetime]:
+    """Sort key: created_at terbaru dulu (sama dengan urutan katalog), tanpa tanggal di akhir"""
+    created_at = dokumen.get("created_at")
+    if isinstance(created_at, datetime):
+        return True, created_at
+    return False, datetime.min
+
+
+def hitung_selisih(
+    dokumen_lama: Iterable[Dict[str, Any]],
+    dokumen_baru: Iterable[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[str], List[Dict[str, Any]]]:
+    """
+    Bandingkan dua versi list dokumen berdasarkan _id
+
+    Returns:
+        Tuple (ditambah, diubah, id_dihapus, sama) - dokumen dari versi baru
+    """
+    lama = {str(item.get("_id")): item for item in dokumen_lama}
+    baru = {str(item.get("_id")): item for item in dokumen_baru}
+
+    ditambah: List[Dict[str, Any]] = []
+    diubah: List[Dict[str, Any]] = []
+    sama: List[Dict[str, Any]] = []
+    for id_dokumen, dokumen in baru.items():
+        sebelumnya = lama.get(id_dokumen)
+        if sebelumnya is None:
+            ditambah.append(dokumen)
+        elif sebelumnya != dokumen:
+            diubah.append(dokumen)
+        else:
+            sama.append(dokumen)
+
+    return ditambah, diubah, list(lama.keys() - baru.keys()), sama
+
+
+class IndeksTopik:
+    """Inverted index topik → dokumen, di-bucket per tingkat_kesulitan dan tipe"""
+
+    def __init__(self, dokumen: Optional[Iterable[Dict[str, Any]]] = None):
+        self._lock = threading.RLock()
+        # topik → tingkat → tipe → {id: dokumen}
+        self._posting: Dict[str, Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]] = {}
+        # id → (topik, tingkat, tipe) tempat dokumen terdaftar, untuk hapus O(posting dokumen)
+        self._lokasi: Dict[str, Tuple[Set[str], str, str]] = {}
+        for item in dokumen or []:
+            self.tambah(item)
+
+    def __len__(self) -> int:
+        return len(self._lokasi)
+
+    def tambah(self, dokumen: Dict[str, Any]) -> None:
+        """Daftarkan dokumen ke posting semua topiknya (menggantikan entry lama dengan id sama)"""
+        id_dokumen = str(dokumen.get("_id"))
+        tingkat = dokumen.get("tingkat_kesulitan") or BUCKET_KOSONG
+        tipe = dokumen.get("tipe") or BUCKET_KOSONG
+        semua_topik = topik_dokumen(dokumen)
+
+        with self._lock:
+            self.hapus(id_dokumen)
+            for topik in semua_topik:
+                bucket = self._posting.setdefault(topik, {}).setdefault(tingkat, {}).setdefault(tipe, {})
+                bucket[id_dokumen] = dokumen
+            self._lokasi[id_dokumen] = (semua_topik, tingkat, tipe)
+
+    def hapus(self, id_dokumen: Any) -> bool:
+        """Hapus dokumen dari index, return True jika sebelumnya terdaftar"""
+        id_dokumen = str(id_dokumen)
+        with self._lock:
+            lokasi = self._lokasi.pop(id_dokumen, None)
+            if lokasi is None:
+                return False
+
+            semua_topik, tingkat, tipe = lokasi
+            for topik in semua_topik:
+                per_tingkat = self._posting.get(topik, {})
+                per_tipe = per_tingkat.get(tingkat, {})
+                per_tipe.get(tipe, {}).pop(id_dokumen, None)
+                # Bersihkan bucket kosong supaya index tidak tumbuh terus
+                if not per_tipe.get(tipe):
+                    per_tipe.pop(tipe, None)
+                if not per_tipe:
+                    per_tingkat.pop(tingkat, None)
+                if not per_tingkat:
+                    self._posting.pop(topik, None)
+            return True
+
+    def perbarui(
+        self,
+        dokumen_lama: Iterable[Dict[str, Any]],
+        dokumen_baru: Iterable[Dict[str, Any]]
+    ) -> Dict[str, int]:
+        """
+        Terapkan selisih antara dua versi katalog secara incremental
+
+        Hanya dokumen yang ditambah, dihapus, atau isinya berubah yang disentuh.
+
+        Returns:
+            Dictionary jumlah dokumen ditambah / diubah / dihapus
+        """
+        ditambah, diubah, dihapus, sama = hitung_selisih(dokumen_lama, dokumen_baru)
+
+        with self._lock:
+            for id_dokumen in dihapus:
+                self.hapus(id_dokumen)
+            for dokumen in ditambah + diubah:
+                self.tambah(dokumen)
+            for dokumen in sama:
+                # Isi sama: tetap tunjuk ke objek dokumen baru milik snapshot terkini
+                self._ganti_referensi(str(dokumen.get("_id")), dokumen)
+
+        return {"ditambah": len(ditambah), "diubah": len(diubah), "dihapus": len(dihapus)}
+
+    def _ganti_referensi(self, id_dokumen: str, dokumen: Dict[str, Any]) -> None:
+        lokasi = self._lokasi.get(id_dokumen)
+        if lokasi is None:
+            self.tambah(dokumen)
+            return
+        semua_topik, tingkat, tipe = lokasi
+        for topik in semua_topik:
+            self._posting[topik][tingkat][tipe][id_dokumen] = dokumen
+
+    def cari(
+        self,
+        topik: Union[str, Iterable[str]],
+        tingkat_kesulitan: Optional[str] = None,
+        tipe: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Cari dokumen untuk satu atau beberapa topik
+
+        Args:
+            topik: Nama topik atau list nama topik (dinormalisasi otomatis)
+            tingkat_kesulitan: Filter bucket tingkat (None = semua)
+            tipe: Filter bucket tipe (None = semua)
+            limit: Batas jumlah hasil
+
+        Returns:
+            List dokumen unik, terbaru dulu
+        """
+        daftar_topik = [topik] if isinstance(topik, str) else list(topik)
+        hasil: Dict[str, Dict[str, Any]] = {}
+
+        with self._lock:
+            for nama in {normalisasi_topik(t) for t in daftar_topik}:
+                per_tingkat = self._posting.get(nama)
+                if not per_tingkat:
+                    continue
+                bucket_tingkat = (
+                    [per_tingkat.get(tingkat_kesulitan, {})] if tingkat_kesulitan
+                    else per_tingkat.values()
+                )
+                for per_tipe in bucket_tingkat:
+                    bucket_tipe = [per_tipe.get(tipe, {})] if tipe else per_tipe.values()
+                    for bucket in bucket_tipe:
+                        hasil.update(bucket)
+
+        urut = sorted(hasil.values(), key=_urutan_terbaru, reverse=True)
+        return urut[:limit] if limit is not None else urut
@@ -0,0 +1,158 @@
+"""
+Kompresi Teks - Field teks panjang submisi_error disimpan sebagai BSON Binary terkompresi
+
+CATATAN:
+- Storage & RU Cosmos DB sebanding ukuran dokumen; kode, pesan error, dan paragraf jawaban
+  LLM (penjelasan, saran) adalah bagian terbesar dokumen submisi_error
+- Teks ≥ AMBANG_BYTE (UTF-8) dikompres zstd jika `zstandard` terpasang, selain itu zlib (stdlib),
+  ke Binary subtype 0x80 (user-defined) dengan 1 byte header codec. Hasil hanya dipakai jika
+  lebih kecil dari teks asli
+- Baca transparan: dekompres_teks() menerima str (dokumen lama / teks pendek) maupun Binary,
+  jadi dokumen campuran aman selama migrasi (scripts/migrasi_kompresi_submisi.py)
+- Data zstd hanya bisa dibaca jika `zstandard` terpasang; pasang di semua instance sebelum
+  mengaktifkannya, atau kembalikan dengan `migrasi_kompresi_submisi.py --kembalikan`
+- Field yang dipakai filter / proyeksi ringkasan (tipe_error, kesenjangan_konsep, penyebab_utama)
+  tidak dikompres
+"""
+
+import logging
+import threading
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+from bson import Binary
+
+logger = logging.getLogger(__name__)
+
+SUBTYPE_KOMPRESI = 0x80
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+NAMA_CODEC = {CODEC_ZLIB: "zlib", CODEC_ZSTD: "zstd"}
+
+AMBANG_BYTE = 512
+LEVEL_ZLIB = 6
+LEVEL_ZSTD = 3
+
+# Field teks submisi_error yang dikompres (lihat database/models.SubmisiError)
+FIELD_SUBMISI = ("kode", "pesan_error", "penjelasan", "saran_perbaikan", "saran_latihan")
+
+# Compressor/decompressor zstd tidak thread-safe: satu per thread
+_lokal = threading.local()
+
+
+@lru_cache(maxsize=1)
+def _modul_zstd() -> Optional[Any]:
+    """Modul zstandard (None jika tidak terpasang)"""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def codec_default() -> int:
+    """Codec untuk data baru: zstd jika tersedia, selain itu zlib"""
+    return CODEC_ZSTD if _modul_zstd() is not None else CODEC_ZLIB
+
+
+def _kompres_bytes(data: bytes, codec: int, level: Optional[int]) -> bytes:
+    if codec == CODEC_ZSTD:
+        zstd = _modul_zstd()
+        if zstd is None:
+            raise RuntimeError("Codec zstd butuh paket `zstandard`")
+        level = LEVEL_ZSTD if level is None else level
+        compressor = getattr(_lokal, "compressor", None)
+        if compressor is None or getattr(_lokal, "level", None) != level:
+            compressor = _lokal.compressor = zstd.ZstdCompressor(level=level)
+            _lokal.level = level
+        return compressor.compress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.compress(data, LEVEL_ZLIB if level is None else level)
+    raise ValueError(f"Codec kompresi tidak dikenal: {codec}")
+
+
+def _dekompres_bytes(data: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        zstd = _modul_zstd()
+        if zstd is None:
+            raise RuntimeError("Teks terkompresi zstd, paket `zstandard` belum terpasang")
+        decompressor = getattr(_lokal, "decompressor", None)
+        if decompressor is None:
+            decompressor = _lokal.decompressor = zstd.ZstdDecompressor()
+        return decompressor.decompress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Codec kompresi tidak dikenal: {codec}")
+
+
+def terkompresi(nilai: Any) -> bool:
+    """True jika nilai adalah teks terkompresi (Binary subtype 0x80)"""
+    return isinstance(nilai, Binary) and nilai.subtype == SUBTYPE_KOMPRESI
+
+
+def kompres_teks(
+    teks: Optional[str],
+    ambang: int = AMBANG_BYTE,
+    codec: Optional[int] = None,
+    level: Optional[int] = None
+) -> Any:
+    """
+    Kompres teks jika panjang UTF-8 ≥ ambang dan hasilnya lebih kecil
+
+    Returns:
+        Binary subtype 0x80 (header codec + data), atau teks asli (None / pendek / tidak menyusut)
+    """
+    if not isinstance(teks, str) or ambang <= 0:
+        return teks
+    if len(teks) * 4 < ambang:
+        # Maksimal 4 byte UTF-8 per karakter: pasti di bawah ambang, tanpa encode
+        return teks
+    data = teks.encode("utf-8")
+    if len(data) < ambang:
+        return teks
+    codec = codec_default() if codec is None else codec
+    hasil = bytes([codec]) + _kompres_bytes(data, codec, level)
+    if len(hasil) >= len(data):
+        return teks
+    return Binary(hasil, SUBTYPE_KOMPRESI)
+
+
+def dekompres_teks(nilai: Any) -> Any:
+    """Kebalikan kompres_teks(); nilai selain Binary subtype 0x80 dikembalikan apa adanya"""
+    if not terkompresi(nilai):
+        return nilai
+    data = bytes(nilai)
+    return _dekompres_bytes(data[1:], data[0]).decode("utf-8")
+
+
+def kompres_dokumen(
+    dokumen: Dict[str, Any],
+    field: Iterable[str] = FIELD_SUBMISI,
+    ambang: int = AMBANG_BYTE
+) -> Dict[str, Any]:
+    """Kompres field teks dokumen (in-place), dokumen dikembalikan"""
+    for nama in field:
+        if isinstance(dokumen.get(nama), str):
+            dokumen[nama] = kompres_teks(dokumen[nama], ambang)
+    return dokumen
+
+
+def dekompres_dokumen(dokumen: Optional[Dict[str, Any]], field: Iterable[str] = FIELD_SUBMISI) -> Any:
+    """
+    Dekompres field teks dokumen hasil query (in-place), dokumen dikembalikan
+
+    Field yang gagal didekompres (mis. zstd tanpa paket `zstandard`) diganti string kosong
+    supaya halaman tetap tampil; error dicatat di log.
+    """
+    if not dokumen:
+        return dokumen
+    for nama in field:
+        nilai = dokumen.get(nama)
+        if terkompresi(nilai):
+            try:
+                dokumen[nama] = dekompres_teks(nilai)
+            except Exception as e:
+                logger.error(f"Gagal dekompres field {nama} dokumen {dokumen.get('_id')}: {str(e)}")
+                dokumen[nama] = ""
+    return dokumen
@@ -0,0 +1,262 @@
+"""
+Render laporan PDF (mahasiswa & kohort) dengan matplotlib
+
+CATATAN:
+- Fungsi di modul ini murni: input payload dict berisi tipe dasar (str, int, float, list, dict),
+  output file PDF di path tujuan. Tidak ada akses database / Streamlit
+- Dijalankan di worker process (lihat services/laporan_pdf_service.py), jadi matplotlib
+  di-import di dalam fungsi dengan backend Agg (tanpa GUI)
+- File ditulis ke path sementara lalu di-rename atomik
+- Memakai backend PDF bawaan matplotlib (PdfPages) - tidak butuh dependency tambahan
+"""
+
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+# Ukuran A4 portrait dalam inci
+UKURAN_HALAMAN = (8.27, 11.69)
+WARNA_UTAMA = "#1f77b4"
+WARNA_BAHAYA = "#d62728"
+MAKS_BARIS_TABEL = 25
+MAKS_PANJANG_SEL = 60
+
+
+def _potong(teks: Any, maks: int = MAKS_PANJANG_SEL) -> str:
+    teks = "" if teks is None else str(teks)
+    return teks if len(teks) <= maks else teks[: maks - 1] + "…"
+
+
+def _siapkan_matplotlib():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    return plt, PdfPages
+
+
+def _halaman_baru(plt, judul: str, sub_judul: str = ""):
+    fig = plt.figure(figsize=UKURAN_HALAMAN)
+    fig.text(0.07, 0.95, judul, fontsize=18, fontweight="bold")
+    if sub_judul:
+        fig.text(0.07, 0.925, sub_judul, fontsize=9, color="#555555")
+    return fig
+
+
+def _tulis_blok(fig, y: float, baris: Sequence[str], ukuran: int = 10) -> float:
+    """Tulis baris teks mulai dari posisi y, return posisi y berikutnya"""
+    for teks in baris:
+        fig.text(0.07, y, teks, fontsize=ukuran)
+        y -= 0.022
+    return y
+
+
+def _grafik_batang(fig, posisi: List[float], label: List[str], nilai: List[float], judul: str,
+                   warna: str = WARNA_UTAMA, batas_x: float = 0.0) -> None:
+    ax = fig.add_axes(posisi)
+    if not nilai:
+        ax.text(0.5, 0.5, "Tidak ada data", ha="center", va="center", color="#888888")
+        ax.set_axis_off()
+        ax.set_title(judul, fontsize=11, loc="left")
+        return
+    urutan = list(range(len(nilai)))[::-1]
+    ax.barh(urutan, nilai, color=warna)
+    ax.set_yticks(urutan)
+    ax.set_yticklabels([_potong(item, 30) for item in label], fontsize=8)
+    ax.tick_params(axis="x", labelsize=8)
+    if batas_x:
+        ax.set_xlim(0, batas_x)
+    ax.set_title(judul, fontsize=11, loc="left")
+    for sisi in ("top", "right"):
+        ax.spines[sisi].set_visible(False)
+
+
+def _tabel(fig, posisi: List[float], header: List[str], baris: List[List[Any]], judul: str) -> None:
+    ax = fig.add_axes(posisi)
+    ax.set_axis_off()
+    ax.set_title(judul, fontsize=11, loc="left")
+    if not baris:
+        ax.text(0.0, 0.9, "Tidak ada data", color="#888888", fontsize=9)
+        return
+    isi = [[_potong(sel) for sel in item] for item in baris[:MAKS_BARIS_TABEL]]
+    tabel = ax.table(cellText=isi, colLabels=header, loc="upper left", cellLoc="left")
+    tabel.auto_set_font_size(False)
+    tabel.set_fontsize(7)
+    tabel.auto_set_column_width(list(range(len(header))))
+    for (nomor_baris, _), sel in tabel.get_celld().items():
+        if nomor_baris == 0:
+            sel.set_text_props(fontweight="bold")
+            sel.set_facecolor("#e8eef7")
+
+
+# ==================== LAPORAN MAHASISWA ====================
+
+def render_laporan_mahasiswa(payload: Dict[str, Any], path_tujuan: str) -> str:
+    """
+    Render laporan progress satu mahasiswa ke PDF
+
+    Args:
+        payload: Dict dengan nama, email, tingkat_kemahiran, periode, dibuat_pada,
+            total_submisi, avg_penguasaan, top_errors [[tipe, jumlah]],
+            progress [{topik, tingkat_penguasaan, jumlah_error_di_topik, tren_perbaikan}],
+            pola [{jenis_kesalahan, frekuensi, kejadian_terakhir, deskripsi_miskonsepsi}]
+        path_tujuan: Path file PDF hasil
+
+    Returns:
+        path_tujuan
+    """
+    plt, PdfPages = _siapkan_matplotlib()
+    progress = payload.get("progress", [])
+    pola = payload.get("pola", [])
+    top_errors = payload.get("top_errors", [])
+
+    with PdfPages(path_tujuan) as pdf:
+        # Halaman 1: ringkasan + grafik
+        fig = _halaman_baru(
+            plt,
+            "Laporan Progress Belajar",
+            f"PahamKode · dibuat {payload.get('dibuat_pada', '')}"
+        )
+        y = _tulis_blok(fig, 0.88, [
+            f"Nama: {payload.get('nama', 'N/A')}",
+            f"Email: {payload.get('email', 'N/A')}",
+            f"Tingkat Kemahiran: {payload.get('tingkat_kemahiran', 'N/A')}",
+            f"Periode: {payload.get('periode', 'Semua')}",
+        ])
+        _tulis_blok(fig, y - 0.01, [
+            f"Total Submisi Error: {payload.get('total_submisi', 0)}",
+            f"Pola Terdeteksi: {len(pola)}",
+            f"Rata-rata Penguasaan: {payload.get('avg_penguasaan', 0.0):.1f}%",
+            f"Topik Dipelajari: {len(progress)}",
+        ], ukuran=11)
+        _grafik_batang(
+            fig, [0.3, 0.38, 0.62, 0.28],
+            [tipe for tipe, _ in top_errors],
+            [jumlah for _, jumlah in top_errors],
+            "Top Errors", warna=WARNA_BAHAYA
+        )
+        progress_urut = sorted(progress, key=lambda p: p.get("tingkat_penguasaan", 0))[:10]
+        _grafik_batang(
+            fig, [0.3, 0.06, 0.62, 0.26],
+            [p.get("topik", "N/A") for p in progress_urut],
+            [p.get("tingkat_penguasaan", 0) for p in progress_urut],
+            "Topik dengan Penguasaan Terendah (%)", batas_x=100
+        )
+        pdf.savefig(fig)
+        plt.close(fig)
+
+        # Halaman 2: tabel progress & pola
+        fig = _halaman_baru(plt, "Detail Progress & Pola Kesalahan")
+        _tabel(
+            fig, [0.07, 0.5, 0.86, 0.4],
+            ["Topik", "Penguasaan (%)", "Jumlah Error", "Tren"],
+            [
+                [p.get("topik", "N/A"), f"{p.get('tingkat_penguasaan', 0):.1f}",
+                 p.get("jumlah_error_di_topik", 0), p.get("tren_perbaikan", "N/A")]
+                for p in progress
+            ],
+            "Progress per Topik"
+        )
+        _tabel(
+            fig, [0.07, 0.05, 0.86, 0.4],
+            ["Jenis Kesalahan", "Frekuensi", "Kejadian Terakhir", "Miskonsepsi"],
+            [
+                [p.get("jenis_kesalahan", "N/A"), p.get("frekuensi", 0),
+                 p.get("kejadian_terakhir", ""), p.get("deskripsi_miskonsepsi") or "N/A"]
+                for p in pola
+            ],
+            "Pola Kesalahan Berulang"
+        )
+        pdf.savefig(fig)
+        plt.close(fig)
+
+    return path_tujuan
+
+
+# ==================== LAPORAN KOHORT ====================
+
+def render_laporan_kohort(payload: Dict[str, Any], path_tujuan: str) -> str:
+    """
+    Render laporan analitik global (kohort) ke PDF
+
+    Args:
+        payload: Dict dengan periode, dibuat_pada, top_errors [{tipe_error, jumlah, jumlah_mahasiswa}],
+            pola_global [{jenis_kesalahan, total_frekuensi, jumlah_mahasiswa, deskripsi_sample}],
+            topik_ranking [{nama, total_error}], ai_usage {total_request, total_token, total_biaya, success_rate}
+        path_tujuan: Path file PDF hasil
+
+    Returns:
+        path_tujuan
+    """
+    plt, PdfPages = _siapkan_matplotlib()
+    top_errors = payload.get("top_errors", [])
+    topik_ranking = payload.get("topik_ranking", [])
+    ai_usage = payload.get("ai_usage", {})
+
+    with PdfPages(path_tujuan) as pdf:
+        fig = _halaman_baru(
+            plt,
+            "Laporan Analitik Kohort",
+            f"PahamKode · periode {payload.get('periode', 'semua')} · dibuat {payload.get('dibuat_pada', '')}"
+        )
+        _tulis_blok(fig, 0.88, [
+            f"Total AI Request: {ai_usage.get('total_request', 0)}",
+            f"Total Token: {ai_usage.get('total_token', 0)}",
+            f"Total Biaya: ${ai_usage.get('total_biaya', 0.0):.4f}",
+            f"Success Rate: {ai_usage.get('success_rate', 0.0):.1f}%",
+        ], ukuran=11)
+        _grafik_batang(
+            fig, [0.3, 0.42, 0.62, 0.34],
+            [item.get("tipe_error", "Unknown") for item in top_errors[:15]],
+            [item.get("jumlah", 0) for item in top_errors[:15]],
+            "Top Errors (jumlah submisi)", warna=WARNA_BAHAYA
+        )
+        _grafik_batang(
+            fig, [0.3, 0.06, 0.62, 0.3],
+            [item.get("nama", "N/A") for item in topik_ranking[:15]],
+            [item.get("total_error", 0) for item in topik_ranking[:15]],
+            "Topik Paling Sulit (total error)"
+        )
+        pdf.savefig(fig)
+        plt.close(fig)
+
+        fig = _halaman_baru(plt, "Pola Kesalahan Global")
+        _tabel(
+            fig, [0.07, 0.05, 0.86, 0.85],
+            ["Jenis Kesalahan", "Frekuensi", "Mahasiswa", "Deskripsi"],
+            [
+                [p.get("jenis_kesalahan", "N/A"), p.get("total_frekuensi", 0),
+                 p.get("jumlah_mahasiswa", 0), p.get("deskripsi_sample") or "-"]
+                for p in payload.get("pola_global", [])
+            ],
+            "Top Pola Kesalahan"
+        )
+        pdf.savefig(fig)
+        plt.close(fig)
+
+    return path_tujuan
+
+
+RENDERER = {
+    "mahasiswa": render_laporan_mahasiswa,
+    "kohort": render_laporan_kohort,
+}
+
+
+def render_laporan(jenis: str, payload: Dict[str, Any], path_tujuan: str) -> str:
+    """
+    Entry point worker process: render laporan sesuai jenis ke path tujuan
+
+    Ditulis ke file sementara lalu di-rename atomik, jadi path tujuan tidak pernah
+    berisi PDF setengah jadi.
+    """
+    tujuan = Path(path_tujuan)
+    tujuan.parent.mkdir(parents=True, exist_ok=True)
+    sementara = tujuan.with_name(f"{tujuan.stem}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        RENDERER[jenis](payload, str(sementara))
+        os.replace(sementara, tujuan)
+    finally:
+        sementara.unlink(missing_ok=True)
+    return path_tujuan
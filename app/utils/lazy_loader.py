@@ -0,0 +1,46 @@
+"""
+Lazy Loader - Deferred re-export untuk package __init__
+
+CATATAN:
+- Package (services, components, utils, database) me-re-export banyak nama
+- Import eager di __init__ menarik langchain/pandas/plotly walaupun halaman tidak memakainya
+- Helper ini memakai module-level __getattr__ (PEP 562): submodule baru di-import saat nama diakses
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def buat_lazy_loader(
+    nama_paket: str,
+    peta_ekspor: Dict[str, Tuple[str, str]]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Buat pasangan __getattr__ dan __dir__ untuk package dengan lazy re-export
+
+    Args:
+        nama_paket: Nama package (biasanya __name__ dari __init__.py)
+        peta_ekspor: Mapping nama publik -> (nama modul relatif, nama atribut)
+
+    Returns:
+        Tuple of (__getattr__, __dir__) untuk di-assign di __init__.py
+    """
+
+    def __getattr__(nama: str) -> Any:
+        target = peta_ekspor.get(nama)
+        if target is None:
+            raise AttributeError(f"module {nama_paket!r} has no attribute {nama!r}")
+
+        nama_modul, nama_atribut = target
+        modul = importlib.import_module(nama_modul, nama_paket)
+        nilai = getattr(modul, nama_atribut)
+
+        # Simpan di namespace package supaya akses berikutnya tidak lewat __getattr__
+        setattr(sys.modules[nama_paket], nama, nilai)
+        return nilai
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[nama_paket])) | set(peta_ekspor))
+
+    return __getattr__, __dir__
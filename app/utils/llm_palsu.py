@@ -0,0 +1,151 @@
+"""
+LLM Palsu - Provider LLM deterministik untuk load test & pengukuran tanpa kuota GitHub Models
+
+CATATAN:
+- Dipakai oleh services/ai_service.dapatkan_llm() jika settings.USE_FAKE_LLM = True
+- Interface minimal yang dipakai ai_service: invoke(list pesan) → objek dengan `.content`
+  (tidak memicu callback LangChain, jadi token dihitung tokenizer offline)
+- Latensi diambil dari distribusi yang bisa diatur (konstan / normal / lognormal),
+  dengan sleep sungguhan supaya thread & koneksi tertahan seperti panggilan asli
+- tingkat_gagal: proporsi panggilan yang melempar exception (timeout / 429 simulasi)
+  tingkat_rusak: proporsi jawaban yang bukan JSON valid (menguji jalur parse gagal)
+- Jawaban kalengan dipilih dari tipe error di pesan user (NameError, TypeError, ...),
+  deterministik untuk input yang sama; urutan latensi & kegagalan deterministik per seed
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Sequence, Tuple
+
+DISTRIBUSI_LATENSI = ("konstan", "normal", "lognormal")
+
+_POLA_TIPE_ERROR = re.compile(r"\b([A-Z][A-Za-z]*(?:Error|Exception))\b")
+
+# Jawaban kalengan per tipe error (key = field HasilAnalisis)
+JAWABAN_KALENGAN: Dict[str, Dict[str, Any]] = {
+    "NameError": {
+        "tipe_error": "NameError",
+        "penyebab_utama": "Variabel dipakai sebelum didefinisikan atau salah ketik nama variabel",
+        "kesenjangan_konsep": "Pemahaman scope dan urutan definisi variabel",
+        "level_bloom": "Understand",
+        "penjelasan": "Python mencari nama di scope lokal lalu global; nama yang belum di-assign tidak ditemukan.",
+        "saran_perbaikan": "1. Periksa ejaan nama. 2. Pastikan variabel di-assign sebelum dipakai.",
+        "topik_terkait": ["Variables & Data Types", "Functions"],
+        "saran_latihan": "Tulis fungsi yang memakai variabel lokal & global, lalu telusuri scope-nya.",
+    },
+    "TypeError": {
+        "tipe_error": "TypeError",
+        "penyebab_utama": "Operasi dipakai pada tipe data yang tidak mendukungnya",
+        "kesenjangan_konsep": "Perbedaan tipe data dan konversi eksplisit",
+        "level_bloom": "Apply",
+        "penjelasan": "Python tidak mengonversi tipe secara implisit untuk sebagian besar operasi.",
+        "saran_perbaikan": "1. Cek tipe operand dengan type(). 2. Konversi dengan int()/str() sebelum operasi.",
+        "topik_terkait": ["Variables & Data Types"],
+        "saran_latihan": "Buat tabel operasi antar tipe (int, str, list) dan prediksi hasilnya.",
+    },
+    "IndexError": {
+        "tipe_error": "IndexError",
+        "penyebab_utama": "Indeks di luar rentang panjang list",
+        "kesenjangan_konsep": "Indeks berbasis nol dan batas perulangan",
+        "level_bloom": "Apply",
+        "penjelasan": "Indeks valid untuk list panjang n adalah 0 sampai n-1.",
+        "saran_perbaikan": "1. Gunakan range(len(data)). 2. Periksa kondisi berhenti loop.",
+        "topik_terkait": ["Loops (For/While)"],
+        "saran_latihan": "Iterasi list dengan for-in dan enumerate, bandingkan dengan indeks manual.",
+    },
+}
+JAWABAN_UMUM: Dict[str, Any] = {
+    "tipe_error": "Logic Error",
+    "penyebab_utama": "Alur program tidak sesuai dengan yang dimaksud",
+    "kesenjangan_konsep": "Penelusuran alur eksekusi program",
+    "level_bloom": "Analyze",
+    "penjelasan": "Jawaban simulasi dari LLM palsu untuk pengujian beban.",
+    "saran_perbaikan": "1. Telusuri program baris per baris. 2. Cetak nilai variabel penting.",
+    "topik_terkait": ["Control Flow (If/Else)"],
+    "saran_latihan": "Telusuri program kecil secara manual dan bandingkan dengan output sebenarnya.",
+}
+
+
+class KegagalanLLMPalsu(RuntimeError):
+    """Kegagalan simulasi provider (timeout / rate limit)"""
+
+
+@dataclass
+class PesanPalsu:
+    """Jawaban LLM palsu (meniru AIMessage: atribut content)"""
+    content: str
+
+
+class LLMPalsu:
+    """
+    Provider LLM palsu dengan latensi, kegagalan, dan jawaban yang bisa diatur
+
+    Args:
+        latensi_ms: Latensi rata-rata (median untuk lognormal)
+        distribusi: "konstan", "normal", atau "lognormal"
+        sebaran: Simpangan baku relatif (normal) / sigma log (lognormal)
+        tingkat_gagal: Proporsi panggilan yang melempar KegagalanLLMPalsu
+        tingkat_rusak: Proporsi jawaban yang bukan JSON valid
+        seed: Seed urutan latensi & kegagalan
+    """
+
+    def __init__(
+        self,
+        latensi_ms: float = 1500.0,
+        distribusi: str = "lognormal",
+        sebaran: float = 0.4,
+        tingkat_gagal: float = 0.0,
+        tingkat_rusak: float = 0.0,
+        seed: int = 42
+    ):
+        if distribusi not in DISTRIBUSI_LATENSI:
+            raise ValueError(f"Distribusi latensi tidak dikenal: {distribusi}")
+        self.latensi_ms = latensi_ms
+        self.distribusi = distribusi
+        self.sebaran = sebaran
+        self.tingkat_gagal = tingkat_gagal
+        self.tingkat_rusak = tingkat_rusak
+        self._acak = random.Random(seed)
+        self._lock = threading.Lock()
+        self.jumlah_panggilan = 0
+
+    def _undi(self) -> Tuple[float, bool, bool]:
+        """Latensi (detik), gagal?, rusak? untuk panggilan berikutnya"""
+        with self._lock:
+            self.jumlah_panggilan += 1
+            if self.distribusi == "konstan":
+                latensi = self.latensi_ms
+            elif self.distribusi == "normal":
+                latensi = self._acak.gauss(self.latensi_ms, self.latensi_ms * self.sebaran)
+            else:
+                latensi = self.latensi_ms * math.exp(self._acak.gauss(0.0, self.sebaran))
+            gagal = self._acak.random() < self.tingkat_gagal
+            rusak = self._acak.random() < self.tingkat_rusak
+        return max(latensi, 0.0) / 1000, gagal, rusak
+
+    @staticmethod
+    def jawaban_untuk(teks: str) -> Dict[str, Any]:
+        """Jawaban kalengan berdasarkan tipe error pertama yang dikenal di teks (pesan error mendahului riwayat)"""
+        for nama in _POLA_TIPE_ERROR.findall(teks or ""):
+            if nama in JAWABAN_KALENGAN:
+                return JAWABAN_KALENGAN[nama]
+        return JAWABAN_UMUM
+
+    def invoke(self, pesan: Sequence[Any], **kwargs: Any) -> PesanPalsu:
+        """Simulasi satu panggilan chat completion"""
+        latensi, gagal, rusak = self._undi()
+        time.sleep(latensi)
+        if gagal:
+            raise KegagalanLLMPalsu("Simulasi kegagalan provider (LLM palsu)")
+        if rusak:
+            return PesanPalsu(content="Maaf, saya tidak bisa menjawab dalam format JSON.")
+
+        # Pesan terakhir = prompt user (berisi kode & pesan error)
+        teks_user = str(getattr(pesan[-1], "content", pesan[-1])) if pesan else ""
+        return PesanPalsu(content=json.dumps(self.jawaban_untuk(teks_user), ensure_ascii=False))
+
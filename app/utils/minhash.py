@@ -0,0 +1,262 @@
+"""
+MinHash - Signature & index LSH untuk mendeteksi submisi kode yang hampir identik
+
+CATATAN:
+- Kode + pesan error dipecah jadi token (identifier, angka, string, operator); komentar
+  dan whitespace diabaikan, jadi beda indentasi / komentar tidak mengubah signature
+- Shingle = k token berurutan, di-hash ke 32-bit lalu dipermutasi vectorized (NumPy):
+  h(x) = (a*x + b) mod p, signature = minimum per permutasi
+- Signature disimpan sebagai bytes (JUMLAH_PERMUTASI * 4 byte) di dokumen submisi
+- Index LSH: signature dibagi BAND band x BARIS baris; dua submisi jadi kandidat jika
+  minimal satu band identik. Lookup = BAND kali dict lookup, tanpa scan semua submisi
+- kelompokkan() mengelompokkan submisi mirip lewat bucket LSH + union-find,
+  tanpa perbandingan berpasangan semua submisi
+"""
+
+import difflib
+import hashlib
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+JUMLAH_PERMUTASI = 64
+BAND = 16
+BARIS = JUMLAH_PERMUTASI // BAND  # Ambang kandidat LSH ≈ (1/BAND)^(1/BARIS) ≈ 0.5
+PANJANG_SHINGLE = 4
+
+_PRIMA = np.uint64(4294967291)  # Prima terbesar < 2^32, a*x + b tidak overflow uint64
+_acak = np.random.RandomState(20240517)
+_KOEF_A = _acak.randint(1, 2 ** 32 - 5, size=JUMLAH_PERMUTASI, dtype=np.int64).astype(np.uint64)
+_KOEF_B = _acak.randint(0, 2 ** 32 - 5, size=JUMLAH_PERMUTASI, dtype=np.int64).astype(np.uint64)
+
+_POLA_KOMENTAR = {
+    "python": re.compile(r"#[^\n]*"),
+}
+_POLA_KOMENTAR_DEFAULT = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_POLA_TOKEN = re.compile(r"\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'|[A-Za-z_]\w*|\d+(?:\.\d+)?|[^\s\w]")
+# Nomor baris & path file di traceback berubah tiap submisi, tidak relevan untuk kemiripan
+_POLA_BARIS_ERROR = re.compile(r"line \d+|File \"[^\"]*\"|0x[0-9a-fA-F]+")
+
+
+# ==================== SIGNATURE ====================
+
+def token_kode(kode: str, bahasa: str = "python") -> List[str]:
+    """Token kode tanpa komentar & whitespace"""
+    if not kode:
+        return []
+    pola_komentar = _POLA_KOMENTAR.get(bahasa, _POLA_KOMENTAR_DEFAULT)
+    return _POLA_TOKEN.findall(pola_komentar.sub(" ", kode))
+
+
+def token_pesan_error(pesan_error: str) -> List[str]:
+    """Token pesan error dengan nomor baris, path, dan alamat memori dinormalisasi"""
+    if not pesan_error:
+        return []
+    return ["E:" + token for token in _POLA_TOKEN.findall(_POLA_BARIS_ERROR.sub(" ", pesan_error))]
+
+
+def _hash32(teks: str) -> int:
+    return int.from_bytes(hashlib.blake2b(teks.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def shingle(token: List[str], panjang: int = PANJANG_SHINGLE) -> Set[int]:
+    """Hash 32-bit setiap k token berurutan (seluruh token jika lebih pendek dari k)"""
+    if not token:
+        return set()
+    if len(token) <= panjang:
+        return {_hash32("\x1f".join(token))}
+    return {_hash32("\x1f".join(token[i:i + panjang])) for i in range(len(token) - panjang + 1)}
+
+
+def signature(kode: str, pesan_error: str = "", bahasa: str = "python") -> Optional[np.ndarray]:
+    """
+    Signature MinHash (uint32[JUMLAH_PERMUTASI]) untuk kode + pesan error
+
+    Returns:
+        None jika kode & pesan error kosong
+    """
+    hash_shingle = shingle(token_kode(kode, bahasa)) | shingle(token_pesan_error(pesan_error))
+    if not hash_shingle:
+        return None
+    x = np.fromiter(hash_shingle, dtype=np.uint64, count=len(hash_shingle))
+    permutasi = (np.outer(x, _KOEF_A) + _KOEF_B) % _PRIMA
+    return permutasi.min(axis=0).astype(np.uint32)
+
+
+def ke_bytes(sig: np.ndarray) -> bytes:
+    """Signature → bytes untuk disimpan di MongoDB"""
+    return sig.astype("<u4").tobytes()
+
+
+def dari_bytes(data: Any) -> Optional[np.ndarray]:
+    """Bytes (atau bson Binary) dari MongoDB → signature; None jika tidak valid"""
+    if not data or len(data) != JUMLAH_PERMUTASI * 4:
+        return None
+    return np.frombuffer(bytes(data), dtype="<u4")
+
+
+def kemiripan(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimasi Jaccard similarity dua signature"""
+    return float(np.count_nonzero(sig_a == sig_b)) / JUMLAH_PERMUTASI
+
+
+def kemiripan_pesan_error(pesan_a: str, pesan_b: str) -> float:
+    """
+    Jaccard shingle pesan error saja (exact, tanpa MinHash)
+
+    Signature menggabungkan kode + pesan, jadi pada kode panjang kode mendominasi skor;
+    ini dipakai sebagai syarat terpisah bahwa error-nya sendiri juga sama.
+    """
+    shingle_a = shingle(token_pesan_error(pesan_a))
+    shingle_b = shingle(token_pesan_error(pesan_b))
+    if not shingle_a and not shingle_b:
+        return 1.0
+    return len(shingle_a & shingle_b) / len(shingle_a | shingle_b)
+
+
+def diff_kode(kode_lama: str, kode_baru: str) -> str:
+    """Unified diff antara kode submisi sebelumnya dan kode baru"""
+    return "".join(difflib.unified_diff(
+        (kode_lama or "").splitlines(keepends=True),
+        (kode_baru or "").splitlines(keepends=True),
+        fromfile="submisi sebelumnya",
+        tofile="submisi ini",
+    ))
+
+
+# ==================== INDEX LSH ====================
+
+class IndeksLSH:
+    """
+    Index LSH in-memory: kunci (id submisi) → signature + metadata
+
+    Aman multi-thread; tambah/hapus incremental. Metadata dipakai caller untuk
+    filter kandidat (mis. hanya submisi milik mahasiswa yang sama).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._bucket: Dict[Tuple[int, bytes], Set[str]] = {}
+        self._signature: Dict[str, np.ndarray] = {}
+        self._meta: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signature)
+
+    def __contains__(self, kunci: Any) -> bool:
+        return str(kunci) in self._signature
+
+    @staticmethod
+    def _kunci_band(sig: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, sig[band * BARIS:(band + 1) * BARIS].tobytes()) for band in range(BAND)]
+
+    def tambah(self, kunci: Any, sig: np.ndarray, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Index signature (menggantikan entry lama dengan kunci sama)"""
+        kunci = str(kunci)
+        with self._lock:
+            self.hapus(kunci)
+            self._signature[kunci] = sig
+            self._meta[kunci] = meta or {}
+            for kunci_band in self._kunci_band(sig):
+                self._bucket.setdefault(kunci_band, set()).add(kunci)
+
+    def hapus(self, kunci: Any) -> bool:
+        """Hapus entry dari index, return True jika sebelumnya terdaftar"""
+        kunci = str(kunci)
+        with self._lock:
+            sig = self._signature.pop(kunci, None)
+            if sig is None:
+                return False
+            self._meta.pop(kunci, None)
+            for kunci_band in self._kunci_band(sig):
+                anggota = self._bucket.get(kunci_band)
+                if anggota is not None:
+                    anggota.discard(kunci)
+                    if not anggota:
+                        del self._bucket[kunci_band]
+            return True
+
+    def meta(self, kunci: Any) -> Dict[str, Any]:
+        return self._meta.get(str(kunci), {})
+
+    def semua_kunci(self) -> List[str]:
+        """Snapshot daftar kunci yang terdaftar"""
+        with self._lock:
+            return list(self._signature)
+
+    def cari(
+        self,
+        sig: np.ndarray,
+        ambang: float,
+        filter_meta: Optional[Dict[str, Any]] = None,
+        kecuali: Optional[Dict[str, Any]] = None,
+        limit: int = 5
+    ) -> List[Tuple[str, float]]:
+        """
+        Cari entry mirip (kemiripan ≥ ambang), urut kemiripan turun
+
+        Args:
+            filter_meta: Hanya kandidat dengan metadata sama persis untuk key ini
+            kecuali: Buang kandidat dengan metadata sama untuk key ini
+        """
+        with self._lock:
+            kandidat: Set[str] = set()
+            for kunci_band in self._kunci_band(sig):
+                kandidat.update(self._bucket.get(kunci_band, ()))
+
+            hasil = []
+            for kunci in kandidat:
+                meta = self._meta[kunci]
+                if filter_meta and any(meta.get(k) != v for k, v in filter_meta.items()):
+                    continue
+                if kecuali and any(meta.get(k) == v for k, v in kecuali.items()):
+                    continue
+                skor = kemiripan(sig, self._signature[kunci])
+                if skor >= ambang:
+                    hasil.append((kunci, skor))
+
+        hasil.sort(key=lambda item: item[1], reverse=True)
+        return hasil[:limit]
+
+    def kelompokkan(self, ambang: float, kunci_terpilih: Optional[Iterable[str]] = None) -> List[List[str]]:
+        """
+        Kelompokkan entry mirip dengan union-find di atas bucket LSH
+
+        Tiap anggota bucket dibandingkan dengan perwakilan bucket saja (linear per bucket),
+        lalu komponen terhubung jadi satu klaster.
+
+        Args:
+            kunci_terpilih: Batasi ke subset kunci (mis. submisi dalam periode)
+
+        Returns:
+            List klaster (≥ 2 anggota), urut ukuran turun
+        """
+        with self._lock:
+            terpilih = set(self._signature) if kunci_terpilih is None else {
+                str(kunci) for kunci in kunci_terpilih if str(kunci) in self._signature
+            }
+            induk: Dict[str, str] = {kunci: kunci for kunci in terpilih}
+
+            def cari_akar(kunci: str) -> str:
+                while induk[kunci] != kunci:
+                    induk[kunci] = induk[induk[kunci]]
+                    kunci = induk[kunci]
+                return kunci
+
+            for anggota in self._bucket.values():
+                anggota = [kunci for kunci in anggota if kunci in terpilih]
+                if len(anggota) < 2:
+                    continue
+                wakil = anggota[0]
+                sig_wakil = self._signature[wakil]
+                for kunci in anggota[1:]:
+                    akar_a, akar_b = cari_akar(wakil), cari_akar(kunci)
+                    if akar_a != akar_b and kemiripan(sig_wakil, self._signature[kunci]) >= ambang:
+                        induk[akar_b] = akar_a
+
+        klaster: Dict[str, List[str]] = {}
+        for kunci in terpilih:
+            klaster.setdefault(cari_akar(kunci), []).append(kunci)
+        return sorted((item for item in klaster.values() if len(item) > 1), key=len, reverse=True)
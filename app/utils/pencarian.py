@@ -0,0 +1,324 @@
+"""
+Pencarian - Full-text search in-process (BM25) + helper prefix search pengguna
+
+CATATAN:
+- Tokenizer sadar Bahasa Indonesia: lowercase, pecah snake_case/camelCase,
+  buang stopword, stemming ringan (partikel, possessive, imbuhan umum)
+- Index BM25 per collection katalog (dipakai services/katalog_service.py),
+  ranking berdasarkan bobot field (judul > topik > deskripsi)
+- Token terakhir query di-expand sebagai prefix ("perula" → "perulangan") lewat
+  vocabulary terurut + bisect, jadi search-as-you-type tetap O(log V + match)
+- Update incremental per dokumen (tambah / hapus / perbarui), aman multi-thread
+- buat_kata_cari() menghasilkan field `kata_cari` di users untuk prefix search
+  ber-index (range query), menggantikan $regex tanpa anchor
+"""
+
+import bisect
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.indeks_topik import hitung_selisih
+
+
+# ==================== TOKENIZER ====================
+
+STOPWORDS = frozenset("""
+    ada adalah agar akan aku anda antara apa apabila atau bagaimana bagi bahwa
+    banyak baru belum beberapa begitu bisa boleh dalam dan dapat dari daripada
+    dengan di dia hal hanya harus hingga ia ialah ini itu jadi jika juga kalau
+    kami kamu karena ke kemudian kita lagi lain lebih maka masih mereka
+    namun oleh pada para saat saja sama sangat saya sebagai sebelum sedang
+    sehingga sejak seperti serta setelah suatu sudah supaya tanpa tentang
+    telah tetapi tidak untuk yaitu yang
+    a an and are as at be by for from how in is it of on or the to what with
+""".split())
+
+# Imbuhan untuk stemming ringan (urutan penting: yang lebih panjang dulu)
+_PARTIKEL = ("lah", "kah", "tah", "pun")
+_POSSESSIVE = ("nya", "ku", "mu")
+_AKHIRAN = ("kan", "an", "i")
+_AWALAN = ("meng", "meny", "mem", "men", "me", "peng", "peny", "pem", "pen",
+           "per", "pe", "ber", "be", "ter", "te", "di", "ke", "se")
+
+PANJANG_AKAR_MINIMAL = 3
+
+_POLA_KATA = re.compile(r"[a-z0-9]+")
+_POLA_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def normalisasi_teks(teks: Any) -> str:
+    """Lowercase + buang aksen (é → e) supaya index & query konsisten"""
+    if not teks:
+        return ""
+    teks = unicodedata.normalize("NFKD", str(teks))
+    return "".join(c for c in teks if not unicodedata.combining(c)).lower()
+
+
+def stem(kata: str) -> str:
+    """
+    Stemming ringan Bahasa Indonesia (bukan Nazief-Adriani penuh)
+
+    Cukup untuk menyatukan bentuk umum seperti "perulangannya" / "perulangan"
+    / "ulang", tanpa kamus kata dasar. Kata pendek & angka tidak disentuh.
+    """
+    if len(kata) <= 4 or kata.isdigit():
+        return kata
+
+    def potong_akhiran(kata: str, daftar: Tuple[str, ...]) -> str:
+        for akhiran in daftar:
+            if kata.endswith(akhiran) and len(kata) - len(akhiran) >= PANJANG_AKAR_MINIMAL + 1:
+                return kata[:-len(akhiran)]
+        return kata
+
+    kata = potong_akhiran(kata, _PARTIKEL)
+    kata = potong_akhiran(kata, _POSSESSIVE)
+
+    for awalan in _AWALAN:
+        if kata.startswith(awalan) and len(kata) - len(awalan) >= PANJANG_AKAR_MINIMAL + 1:
+            kata = kata[len(awalan):]
+            break
+
+    return potong_akhiran(kata, _AKHIRAN)
+
+
+def tokenisasi(teks: Any, pakai_stem: bool = True) -> List[str]:
+    """
+    Pecah teks menjadi token pencarian
+
+    Args:
+        teks: String (atau list string, mis. topik_terkait)
+        pakai_stem: Terapkan stemming ringan
+
+    Returns:
+        List token (stopword sudah dibuang)
+    """
+    if isinstance(teks, (list, tuple, set)):
+        return [token for item in teks for token in tokenisasi(item, pakai_stem)]
+    if not teks:
+        return []
+
+    # IndexError → index + error (+ indexerror utuh), null_pointer → null + pointer
+    teks = str(teks)
+    gabungan = [
+        kata.lower() for kata in re.findall(r"[A-Za-z0-9]+", teks)
+        if _POLA_CAMEL.search(kata)
+    ]
+    teks = _POLA_CAMEL.sub(" ", teks).replace("_", " ")
+    kata_kata = _POLA_KATA.findall(normalisasi_teks(teks)) + gabungan
+    return [
+        stem(kata) if pakai_stem else kata
+        for kata in kata_kata
+        if kata not in STOPWORDS
+    ]
+
+
+# ==================== INDEX BM25 ====================
+
+class IndeksBM25:
+    """
+    Inverted index dengan ranking Okapi BM25
+
+    Dokumen di-tokenisasi per field dengan bobot; term frequency adalah jumlah
+    bobot kemunculan, sehingga match di judul lebih tinggi dari deskripsi.
+    """
+
+    # Batas jumlah term hasil prefix expansion untuk token terakhir query
+    MAKS_EKSPANSI_PREFIX = 30
+    # Skor term hasil expansion didiskon dibanding match utuh
+    DISKON_PREFIX = 0.7
+
+    def __init__(
+        self,
+        bobot_field: Dict[str, float],
+        dokumen: Optional[Iterable[Dict[str, Any]]] = None,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        self.bobot_field = bobot_field
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._posting: Dict[str, Dict[str, float]] = {}
+        self._panjang: Dict[str, float] = {}
+        self._dokumen: Dict[str, Dict[str, Any]] = {}
+        self._term_dokumen: Dict[str, Set[str]] = {}
+        self._total_panjang = 0.0
+        # Bentuk kata asli (belum di-stem) → stem, untuk prefix expansion
+        self._kata_asli: Dict[str, Set[str]] = {}
+        self._kata_terurut: List[str] = []
+        self._kata_kotor = False
+        for item in dokumen or []:
+            self.tambah(item)
+
+    def __len__(self) -> int:
+        return len(self._dokumen)
+
+    def _bobot_term(self, dokumen: Dict[str, Any]) -> Tuple[Counter, Dict[str, Set[str]]]:
+        bobot: Counter = Counter()
+        asli: Dict[str, Set[str]] = {}
+        for nama_field, bobot_field in self.bobot_field.items():
+            for kata in tokenisasi(dokumen.get(nama_field), pakai_stem=False):
+                term = stem(kata)
+                bobot[term] += bobot_field
+                asli.setdefault(kata, set()).add(term)
+        return bobot, asli
+
+    def tambah(self, dokumen: Dict[str, Any]) -> None:
+        """Index dokumen (menggantikan entry lama dengan id sama)"""
+        id_dokumen = str(dokumen.get("_id"))
+        bobot, asli = self._bobot_term(dokumen)
+
+        with self._lock:
+            self.hapus(id_dokumen)
+            for term, tf in bobot.items():
+                self._posting.setdefault(term, {})[id_dokumen] = tf
+            panjang = float(sum(bobot.values()))
+            self._panjang[id_dokumen] = panjang
+            self._total_panjang += panjang
+            self._dokumen[id_dokumen] = dokumen
+            self._term_dokumen[id_dokumen] = set(bobot)
+            for kata, stems in asli.items():
+                if kata not in self._kata_asli:
+                    self._kata_kotor = True
+                self._kata_asli.setdefault(kata, set()).update(stems)
+
+    def hapus(self, id_dokumen: Any) -> bool:
+        """Hapus dokumen dari index, return True jika sebelumnya terdaftar"""
+        id_dokumen = str(id_dokumen)
+        with self._lock:
+            if id_dokumen not in self._dokumen:
+                return False
+            for term in self._term_dokumen.pop(id_dokumen, set()):
+                posting = self._posting.get(term, {})
+                posting.pop(id_dokumen, None)
+                if not posting:
+                    self._posting.pop(term, None)
+            self._total_panjang -= self._panjang.pop(id_dokumen, 0.0)
+            del self._dokumen[id_dokumen]
+            # Vocabulary prefix tidak dibersihkan per hapus (stem tanpa posting diabaikan saat cari)
+            return True
+
+    def perbarui(
+        self,
+        dokumen_lama: Iterable[Dict[str, Any]],
+        dokumen_baru: Iterable[Dict[str, Any]]
+    ) -> Dict[str, int]:
+        """Terapkan selisih antar versi katalog secara incremental"""
+        ditambah, diubah, dihapus, sama = hitung_selisih(dokumen_lama, dokumen_baru)
+        with self._lock:
+            for id_dokumen in dihapus:
+                self.hapus(id_dokumen)
+            for dokumen in ditambah + diubah:
+                self.tambah(dokumen)
+            for dokumen in sama:
+                self._dokumen[str(dokumen.get("_id"))] = dokumen
+        return {"ditambah": len(ditambah), "diubah": len(diubah), "dihapus": len(dihapus)}
+
+    def _ekspansi_prefix(self, prefix: str) -> Set[str]:
+        """Semua stem yang bentuk aslinya diawali prefix (maks MAKS_EKSPANSI_PREFIX kata)"""
+        if self._kata_kotor:
+            self._kata_terurut = sorted(self._kata_asli)
+            self._kata_kotor = False
+        hasil: Set[str] = set()
+        posisi = bisect.bisect_left(self._kata_terurut, prefix)
+        for kata in self._kata_terurut[posisi:posisi + self.MAKS_EKSPANSI_PREFIX]:
+            if not kata.startswith(prefix):
+                break
+            hasil.update(self._kata_asli[kata])
+        return hasil
+
+    def cari_dengan_skor(
+        self,
+        teks: str,
+        limit: Optional[int] = None,
+        prefix: bool = True
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Cari dokumen dengan ranking BM25
+
+        Args:
+            teks: Query pencarian bebas
+            limit: Batas jumlah hasil
+            prefix: Expand token terakhir sebagai prefix (search-as-you-type)
+
+        Returns:
+            List (dokumen, skor) urut skor tertinggi
+        """
+        kata_query = tokenisasi(teks, pakai_stem=False)
+        if not kata_query:
+            return []
+
+        with self._lock:
+            # term → faktor bobot query
+            term_query: Dict[str, float] = {}
+            for kata in kata_query:
+                term_query[stem(kata)] = 1.0
+            if prefix:
+                for term in self._ekspansi_prefix(kata_query[-1]):
+                    term_query.setdefault(term, self.DISKON_PREFIX)
+
+            jumlah_dokumen = len(self._dokumen)
+            if not jumlah_dokumen:
+                return []
+            rata_panjang = self._total_panjang / jumlah_dokumen or 1.0
+
+            skor: Dict[str, float] = {}
+            for term, faktor in term_query.items():
+                posting = self._posting.get(term)
+                if not posting:
+                    continue
+                df = len(posting)
+                idf = math.log(1 + (jumlah_dokumen - df + 0.5) / (df + 0.5))
+                for id_dokumen, tf in posting.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._panjang[id_dokumen] / rata_panjang)
+                    skor[id_dokumen] = skor.get(id_dokumen, 0.0) + faktor * idf * tf * (self.k1 + 1) / (tf + norm)
+
+            urut = sorted(skor.items(), key=lambda item: item[1], reverse=True)
+            if limit is not None:
+                urut = urut[:limit]
+            return [(self._dokumen[id_dokumen], nilai) for id_dokumen, nilai in urut]
+
+    def cari(self, teks: str, limit: Optional[int] = None, prefix: bool = True) -> List[Dict[str, Any]]:
+        """Cari dokumen, return list dokumen urut relevansi"""
+        return [dokumen for dokumen, _ in self.cari_dengan_skor(teks, limit, prefix)]
+
+
+# ==================== PREFIX SEARCH PENGGUNA ====================
+
+def buat_kata_cari(nama: Optional[str], email: Optional[str]) -> List[str]:
+    """
+    Bangun field `kata_cari` untuk users
+
+    Berisi nama lengkap, tiap kata nama, email, dan bagian lokal email
+    (semua dinormalisasi) supaya prefix query bisa memakai multikey index.
+    """
+    nama_normal = " ".join(_POLA_KATA.findall(normalisasi_teks(nama)))
+    email_normal = normalisasi_teks(email).strip()
+
+    kata: List[str] = []
+    for item in [nama_normal, *nama_normal.split(), email_normal, email_normal.split("@")[0]]:
+        if item and item not in kata:
+            kata.append(item)
+    return kata
+
+
+def query_prefix(teks: str) -> Optional[Dict[str, Any]]:
+    """
+    Buat range query ber-index untuk prefix search pada `kata_cari`
+
+    Returns:
+        Kondisi $elemMatch (pakai index kata_cari), atau None jika query kosong
+    """
+    teks_normal = normalisasi_teks(teks).strip()
+    if re.search(r"[@.]", teks_normal):
+        # Query berbentuk email: cocokkan apa adanya
+        prefix = teks_normal
+    else:
+        prefix = " ".join(_POLA_KATA.findall(teks_normal))
+    if not prefix:
+        return None
+    return {"$elemMatch": {"$gte": prefix, "$lt": prefix + "\uffff"}}
@@ -7,7 +7,10 @@ CATATAN:
 - Terstruktur dengan format instructions
 """
 
-from langchain.prompts import ChatPromptTemplate
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain.prompts import ChatPromptTemplate
 
 
 # ==================== SYSTEM PROMPTS ====================
@@ -69,13 +72,15 @@ PENTING: Penjelasan dalam Bahasa Indonesia yang mudah dipahami!"""
 
 # ==================== PROMPT BUILDERS ====================
 
-def buat_prompt_analisis_semantik() -> ChatPromptTemplate:
+def buat_prompt_analisis_semantik() -> "ChatPromptTemplate":
     """
     Buat prompt template untuk semantic error analysis
     
     Returns:
         ChatPromptTemplate untuk LangChain
     """
+    from langchain.prompts import ChatPromptTemplate
+    
     prompt = ChatPromptTemplate.from_messages([
         ("system", SYSTEM_PROMPT_SEMANTIC_ANALYSIS),
         ("user", USER_PROMPT_TEMPLATE)
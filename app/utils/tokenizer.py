@@ -0,0 +1,102 @@
+"""
+Tokenizer - Hitung token offline untuk metrik & anggaran prompt
+
+CATATAN:
+- Jumlah token resmi diambil dari usage respons provider (services/ai_service.py);
+  modul ini dipakai sebagai fallback dan untuk estimasi sebelum request dikirim
+- Jika `tiktoken` terpasang (dan file encoding tersedia di TIKTOKEN_CACHE_DIR untuk mode
+  offline), hitungan memakai BPE asli model
+- Tanpa tiktoken: pre-tokenizer meniru pola regex cl100k/o200k (kata, angka per 3 digit,
+  tanda baca, whitespace), lalu tiap potongan diperkirakan jumlah token BPE-nya.
+  Jauh lebih dekat ke hitungan asli dibanding len(teks) // 3, terutama untuk kode
+- Overhead format chat (token pembatas per pesan) ikut dihitung di hitung_token_pesan()
+"""
+
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Encoding tiktoken per keluarga model
+_ENCODING_MODEL = {
+    "gpt-4o": "o200k_base",
+    "gpt-4o-mini": "o200k_base",
+}
+_ENCODING_DEFAULT = "cl100k_base"
+
+# Overhead format chat OpenAI: token pembatas per pesan + priming jawaban assistant
+TOKEN_PER_PESAN = 3
+TOKEN_PRIMING_JAWABAN = 3
+
+# Pre-tokenizer ala cl100k/o200k (modul `re` tidak punya \p{L}, jadi pakai kelas \w)
+_POLA_PRETOKEN = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)"
+    r"| ?[^\W\d]+"
+    r"|\d{1,3}"
+    r"| ?[^\s\w]+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+",
+    re.IGNORECASE,
+)
+
+# Rata-rata karakter per token BPE untuk kata ASCII yang tidak umum (identifier, kata Indonesia)
+KARAKTER_PER_TOKEN_KATA = 4.0
+KARAKTER_PER_TOKEN_SIMBOL = 2.0
+
+
+@lru_cache(maxsize=4)
+def _encoding_tiktoken(nama_encoding: str) -> Optional[Any]:
+    """Encoding tiktoken (None jika tidak terpasang / file encoding tidak bisa dimuat)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(nama_encoding)
+    except ImportError:
+        return None
+    except Exception as e:
+        logger.warning(f"Encoding tiktoken {nama_encoding} tidak bisa dimuat, pakai tokenizer offline: {str(e)}")
+        return None
+
+
+def _token_potongan(potongan: str) -> int:
+    """Perkiraan token BPE untuk satu potongan hasil pre-tokenizer"""
+    inti = potongan.strip()
+    if not inti:
+        # Whitespace/indentasi: BPE menggabungkan run spasi, baris baru terpisah
+        return 1 + potongan.count("\n") // 2
+    if not inti.isascii():
+        # Karakter non-ASCII (emoji, aksara lain) umumnya 1 token per karakter atau lebih
+        return len(inti)
+    if inti[0].isalpha():
+        return max(1, math.ceil(len(inti) / KARAKTER_PER_TOKEN_KATA))
+    if inti[0].isdigit():
+        return 1
+    return max(1, math.ceil(len(inti) / KARAKTER_PER_TOKEN_SIMBOL))
+
+
+def hitung_token_offline(teks: str) -> int:
+    """Perkiraan jumlah token tanpa tiktoken (pre-tokenizer + estimasi per potongan)"""
+    if not teks:
+        return 0
+    return sum(_token_potongan(potongan) for potongan in _POLA_PRETOKEN.findall(teks))
+
+
+def hitung_token(teks: str, model: str = "gpt-4o-mini") -> int:
+    """Jumlah token teks untuk model (tiktoken jika tersedia, selain itu tokenizer offline)"""
+    if not teks:
+        return 0
+    encoding = _encoding_tiktoken(_ENCODING_MODEL.get(model, _ENCODING_DEFAULT))
+    if encoding is not None:
+        return len(encoding.encode(teks, disallowed_special=()))
+    return hitung_token_offline(teks)
+
+
+def hitung_token_pesan(isi_pesan: Iterable[str], model: str = "gpt-4o-mini") -> int:
+    """Token input request chat: isi setiap pesan + overhead format chat"""
+    total = TOKEN_PRIMING_JAWABAN
+    for isi in isi_pesan:
+        total += TOKEN_PER_PESAN + hitung_token(isi, model)
+    return total
@@ -5,6 +5,7 @@
 # ========================================
 # Script untuk deploy/update PahamKode di Azure VM
 # Usage: ./deploy.sh
+#        WORKERS=4 ./deploy.sh   (jumlah proses worker Streamlit, lihat skala_worker.sh)
 
 set -e  # Exit on error
 
@@ -16,6 +17,15 @@ APP_DIR="/home/ikhsan/PahamKodev2"
 SERVICE_NAME="pahamkode"
 VENV_DIR="$APP_DIR/venv"
 PYTHON_VERSION="python3.11"
+WORKERS="${WORKERS:-1}"  # 1 = pahamkode.service; N > 1 = pahamkode@0..N-1 + backend bersama
+
+if [ "$WORKERS" -gt 1 ]; then
+    UNITS=$(for ((i = 0; i < WORKERS; i++)); do echo -n "pahamkode@$i "; done)
+    PORTS_KESIAPAN=$(for ((i = 0; i < WORKERS; i++)); do echo -n "852$i "; done)
+else
+    UNITS="$SERVICE_NAME"
+    PORTS_KESIAPAN="8502"
+fi
 
 # Colors for output
 RED='\033[0;31m'
@@ -85,8 +95,16 @@ print_status "Dependencies installed"
 # Step 6: Update systemd service file
 echo ""
 echo "⚙️  Step 6: Update systemd service..."
-sudo cp deployment/pahamkode.service /etc/systemd/system/
+sudo cp deployment/pahamkode.service deployment/pahamkode@.service deployment/pahamkode-cache.service /etc/systemd/system/
+sudo cp deployment/pahamkode-snapshot.service deployment/pahamkode-snapshot.timer /etc/systemd/system/
+sudo cp deployment/pahamkode-retensi.service deployment/pahamkode-retensi.timer /etc/systemd/system/
 sudo systemctl daemon-reload
+sudo systemctl enable --now pahamkode-snapshot.timer
+sudo systemctl enable --now pahamkode-retensi.timer
+if [ "$WORKERS" -gt 1 ]; then
+    # Stand-in Redis untuk state bersama antar worker (lewati jika memakai Redis sungguhan)
+    sudo systemctl enable --now pahamkode-cache.service
+fi
 print_status "Service file updated"
 
 # Step 7: Update nginx configuration
@@ -94,17 +112,16 @@ echo ""
 echo "🌐 Step 7: Update nginx configuration..."
 if [ -f "/etc/nginx/sites-available/pahamkode" ]; then
     sudo cp deployment/nginx-pahamkode.conf /etc/nginx/sites-available/pahamkode
-    sudo nginx -t
+    # nginx -t & reload di Step 8, setelah upstream worker ditulis skala_worker.sh
     print_status "Nginx configuration updated"
 else
     print_warning "Nginx config not found - skip (first deployment?)"
 fi
 
-# Step 8: Restart services
+# Step 8: Restart services (berurutan per worker) & upstream nginx
 echo ""
-echo "🔄 Step 8: Restart services..."
-sudo systemctl restart $SERVICE_NAME
-sudo systemctl restart nginx
+echo "🔄 Step 8: Restart $WORKERS worker..."
+"$APP_DIR/deployment/skala_worker.sh" "$WORKERS" --restart
 print_status "Services restarted"
 
 # Step 9: Check service status
@@ -112,31 +129,35 @@ echo ""
 echo "🔍 Step 9: Verify deployment..."
 sleep 3
 
-if sudo systemctl is-active --quiet $SERVICE_NAME; then
-    print_status "Service $SERVICE_NAME is running"
-    
-    # Show service logs (last 20 lines)
-    echo ""
-    echo "📋 Recent logs:"
-    sudo journalctl -u $SERVICE_NAME -n 20 --no-pager
-else
-    print_error "Service $SERVICE_NAME is NOT running!"
-    echo ""
-    echo "📋 Error logs:"
-    sudo journalctl -u $SERVICE_NAME -n 50 --no-pager
-    exit 1
-fi
+for UNIT in $UNITS; do
+    if sudo systemctl is-active --quiet $UNIT; then
+        print_status "Service $UNIT is running"
+        
+        # Show service logs (last 20 lines)
+        echo ""
+        echo "📋 Recent logs:"
+        sudo journalctl -u $UNIT -n 20 --no-pager
+    else
+        print_error "Service $UNIT is NOT running!"
+        echo ""
+        echo "📋 Error logs:"
+        sudo journalctl -u $UNIT -n 50 --no-pager
+        exit 1
+    fi
+done
 
 # Step 10: Health check
 echo ""
 echo "🏥 Step 10: Health check..."
 sleep 2
 
-if curl -s http://localhost:8501 > /dev/null; then
-    print_status "App is responding on port 8501"
-else
-    print_warning "App not responding on port 8501 (might be starting up)"
-fi
+for PORT in $PORTS_KESIAPAN; do
+    if curl -sf http://127.0.0.1:$PORT/ready > /dev/null; then
+        print_status "Worker :$PORT is ready (warm-up selesai)"
+    else
+        print_warning "Worker belum ready - cek: curl http://127.0.0.1:$PORT/ready"
+    fi
+done
 
 # ==================== SUMMARY ====================
 
@@ -146,16 +167,15 @@ echo "🎉 Deployment Complete!"
 echo "================================================"
 echo ""
 echo "📊 Status:"
-sudo systemctl status $SERVICE_NAME --no-pager
+sudo systemctl status $UNITS --no-pager
 echo ""
 echo "🌐 Access URLs:"
-echo "  - Local: http://localhost:8501"
-echo "  - Public: http://$(curl -s ifconfig.me):8501"
+echo "  - Public: https://$(curl -s ifconfig.me) (nginx → $WORKERS worker)"
 echo ""
 echo "📝 Useful commands:"
-echo "  - View logs:    sudo journalctl -u $SERVICE_NAME -f"
-echo "  - Restart app:  sudo systemctl restart $SERVICE_NAME"
-echo "  - Stop app:     sudo systemctl stop $SERVICE_NAME"
-echo "  - Start app:    sudo systemctl start $SERVICE_NAME"
+echo "  - View logs:    sudo journalctl -u '$SERVICE_NAME*' -f"
+echo "  - Restart app:  ./deployment/skala_worker.sh $WORKERS --restart"
+echo "  - Scale:        ./deployment/skala_worker.sh <jumlah_worker>"
+echo "  - Stop app:     sudo systemctl stop $UNITS"
 echo ""
 print_status "Deployment successful! 🚀"
@@ -0,0 +1,94 @@
+#!/bin/bash
+
+# ========================================
+# PahamKode - Skala Worker
+# ========================================
+# Atur jumlah proses worker Streamlit di belakang nginx (sticky session ip_hash).
+#   1 worker  → pahamkode.service (Streamlit 8501, readiness 8502)
+#   N worker  → pahamkode@0 .. pahamkode@N-1 (Streamlit 851i, readiness 852i), maksimal 10
+# Worker di-(re)start berurutan: ExecStartPost menunggu warm-up, jadi worker lain tetap
+# melayani selama restart. Upstream nginx ditulis ulang lalu nginx di-reload.
+# Usage: ./skala_worker.sh [jumlah_worker] [--restart]
+
+set -e
+
+JUMLAH="${1:-$(nproc)}"
+RESTART="${2:-}"
+MAKS_WORKER=10
+
+APP_DIR="/home/ikhsan/PahamKodev2"
+UPSTREAM_WORKER="/etc/nginx/pahamkode-worker.conf"
+UPSTREAM_KESIAPAN="/etc/nginx/pahamkode-kesiapan.conf"
+
+if ! [[ "$JUMLAH" =~ ^[0-9]+$ ]] || [ "$JUMLAH" -lt 1 ] || [ "$JUMLAH" -gt "$MAKS_WORKER" ]; then
+    echo "❌ Jumlah worker harus 1-$MAKS_WORKER (diberikan: $JUMLAH)"
+    exit 1
+fi
+
+# (Re)start satu unit; tanpa --restart unit yang sudah jalan dibiarkan
+jalankan_unit() {
+    sudo systemctl enable "$1" > /dev/null 2>&1
+    if [ "$RESTART" = "--restart" ]; then
+        sudo systemctl restart "$1"
+    else
+        sudo systemctl start "$1"
+    fi
+    echo "✅ $1 siap"
+}
+
+# ==================== WORKER ====================
+
+if [ "$JUMLAH" -eq 1 ]; then
+    jalankan_unit pahamkode.service
+    PORT_WORKER="8501"
+    PORT_KESIAPAN="8502"
+else
+    if ! grep -qE '^BACKEND_BERSAMA_URL=(redis|resp)://' "$APP_DIR/.env" 2>/dev/null; then
+        echo "⚠️  BACKEND_BERSAMA_URL di .env bukan redis:// - kuota, rate limit login & job export tidak dibagi antar worker"
+        echo "   Tambahkan: BACKEND_BERSAMA_URL=redis://127.0.0.1:6390/0 (server: pahamkode-cache.service)"
+    fi
+    PORT_WORKER=""
+    PORT_KESIAPAN=""
+    for ((i = 0; i < JUMLAH; i++)); do
+        jalankan_unit "pahamkode@$i.service"
+        PORT_WORKER="$PORT_WORKER 851$i"
+        PORT_KESIAPAN="$PORT_KESIAPAN 852$i"
+    done
+fi
+
+# ==================== NGINX UPSTREAM ====================
+
+tulis_upstream() {
+    {
+        echo "# Dibuat oleh deployment/skala_worker.sh ($JUMLAH worker) - jangan diedit manual"
+        for port in $2; do
+            echo "server 127.0.0.1:$port max_fails=1 fail_timeout=5s;"
+        done
+    } | sudo tee "$1" > /dev/null
+}
+
+tulis_upstream "$UPSTREAM_WORKER" "$PORT_WORKER"
+tulis_upstream "$UPSTREAM_KESIAPAN" "$PORT_KESIAPAN"
+
+if [ -f "/etc/nginx/sites-enabled/pahamkode" ]; then
+    sudo nginx -t
+    sudo systemctl reload nginx
+    echo "✅ Upstream nginx: $JUMLAH worker"
+else
+    echo "⚠️  Site nginx pahamkode belum aktif - upstream ditulis, reload dilewati"
+fi
+
+# ==================== HENTIKAN WORKER BERLEBIH ====================
+
+# Setelah nginx tidak lagi mengarah ke sana
+if [ "$JUMLAH" -gt 1 ]; then
+    sudo systemctl disable --now pahamkode.service > /dev/null 2>&1 || true
+fi
+for ((i = (JUMLAH > 1 ? JUMLAH : 0); i < MAKS_WORKER; i++)); do
+    if systemctl is-enabled --quiet "pahamkode@$i.service" 2>/dev/null || systemctl is-active --quiet "pahamkode@$i.service"; then
+        sudo systemctl disable --now "pahamkode@$i.service" > /dev/null 2>&1 || true
+        echo "🛑 pahamkode@$i dihentikan"
+    fi
+done
+
+echo "🎉 PahamKode berjalan dengan $JUMLAH worker"
@@ -0,0 +1,24 @@
+#!/bin/bash
+
+# ========================================
+# PahamKode - Tunggu Readiness
+# ========================================
+# Dipanggil oleh systemd (ExecStartPost) setelah app start.
+# Blocking sampai warm-up selesai (GET /ready → 200), sehingga
+# `systemctl restart pahamkode` baru selesai saat app sudah hangat.
+# Usage: ./tunggu_siap.sh [url] [timeout_detik]
+
+READY_URL="${1:-http://127.0.0.1:8502/ready}"
+TIMEOUT="${2:-170}"
+
+for ((detik = 0; detik < TIMEOUT; detik++)); do
+    if curl -sf -o /dev/null "$READY_URL"; then
+        echo "✅ PahamKode siap setelah ${detik}s"
+        exit 0
+    fi
+    sleep 1
+done
+
+echo "❌ PahamKode belum siap setelah ${TIMEOUT}s"
+curl -s "$READY_URL"
+exit 1
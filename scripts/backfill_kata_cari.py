@@ -0,0 +1,74 @@
+"""
+Backfill field `kata_cari` untuk users lama (prefix search nama/email ber-index)
+Idempotent: aman dijalankan berulang, hanya dokumen yang berubah yang ditulis
+
+Usage:
+    python scripts/backfill_kata_cari.py
+    python scripts/backfill_kata_cari.py --batch 1000 --dry-run
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from dotenv import load_dotenv
+from pymongo import ASCENDING, MongoClient, UpdateOne
+
+from utils.pencarian import buat_kata_cari
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Backfill users.kata_cari")
+    parser.add_argument("--batch", type=int, default=500, help="Jumlah update per bulk_write")
+    parser.add_argument("--dry-run", action="store_true", help="Hitung saja, tanpa menulis")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL tidak ditemukan di .env")
+        sys.exit(1)
+
+    client = MongoClient(database_url)
+    db = client[os.getenv("DATABASE_NAME", "pahamkode-db")]
+    print(f"✅ Connected to database: {db.name}")
+
+    # Index untuk range query prefix (multikey, digabung role seperti filter daftar mahasiswa)
+    db.users.create_index(
+        [("role", ASCENDING), ("kata_cari", ASCENDING)],
+        name="role_1_kata_cari_1",
+        background=True
+    )
+    print("📍 Index users.role_1_kata_cari_1 siap")
+
+    operasi = []
+    total = diperbarui = 0
+    cursor = db.users.find({}, {"nama": 1, "email": 1, "kata_cari": 1}).batch_size(args.batch)
+    for user in cursor:
+        total += 1
+        kata_cari = buat_kata_cari(user.get("nama"), user.get("email"))
+        if user.get("kata_cari") == kata_cari:
+            continue
+
+        diperbarui += 1
+        operasi.append(UpdateOne({"_id": user["_id"]}, {"$set": {"kata_cari": kata_cari}}))
+        if len(operasi) >= args.batch and not args.dry_run:
+            db.users.bulk_write(operasi, ordered=False)
+            operasi = []
+
+    if operasi and not args.dry_run:
+        db.users.bulk_write(operasi, ordered=False)
+
+    status = "perlu diperbarui (dry run)" if args.dry_run else "diperbarui"
+    print(f"✅ {diperbarui} dari {total} users {status}")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
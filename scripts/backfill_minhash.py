@@ -0,0 +1,51 @@
+"""
+Hitung signature MinHash untuk submisi_error lama yang belum punya (field `minhash`),
+supaya ikut terdeteksi sebagai near-duplicate dan muncul di klaster kesalahan identik.
+Aman diulang: hanya submisi tanpa signature yang diproses.
+
+Usage:
+    python scripts/backfill_minhash.py
+    python scripts/backfill_minhash.py --batch 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+from database.queries import DatabaseQueries
+from services.duplikat_service import backfill_signature
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Backfill signature MinHash submisi_error")
+    parser.add_argument("--batch", type=int, default=500, help="Jumlah submisi per batch")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL tidak ditemukan di .env")
+        sys.exit(1)
+
+    client = MongoClient(database_url)
+    db = client[os.getenv("DATABASE_NAME", "pahamkode-db")]
+    print(f"✅ Connected to database: {db.name}")
+
+    mulai = time.perf_counter()
+    total = backfill_signature(DatabaseQueries(db), batch_size=args.batch)
+    print(f"🔏 {total} signature dihitung dalam {time.perf_counter() - mulai:.1f}s")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Benchmark analitik: loop per-dict (implementasi lama halaman) vs services/analitik_service (vectorized)
+Data sintetis kohort (default 100k submisi), tidak butuh database
+
+Usage:
+    python scripts/benchmark_analitik.py
+    python scripts/benchmark_analitik.py --submisi 100000 --mahasiswa 800 --ulang 5
+    python scripts/benchmark_analitik.py --json hasil_analitik.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from services.analitik_service import (
+    distribusi,
+    filter_urut_progress,
+    frame_pola,
+    frame_progress,
+    frame_submisi,
+    ringkasan_pola,
+    ringkasan_progress,
+    statistik_kohort,
+    urut_pola,
+)
+
+TIPE_ERROR = ["NameError", "TypeError", "IndexError", "KeyError", "SyntaxError", "AttributeError",
+              "ValueError", "ZeroDivisionError", "ImportError", "RecursionError", "IndentationError"]
+TOPIK = ["Variabel", "Percabangan", "Perulangan", "Fungsi", "List", "Dictionary", "String",
+         "Rekursi", "OOP", "Exception Handling", "File I/O", "Modul"]
+TREN = ["membaik", "stagnan", "menurun"]
+
+
+# ==================== DATA SINTETIS ====================
+
+def buat_kohort(jumlah_submisi: int, jumlah_mahasiswa: int, seed: int = 42) -> Dict[str, List[Dict[str, Any]]]:
+    """Dokumen berbentuk seperti hasil query MongoDB (dict per dokumen)"""
+    acak = random.Random(seed)
+    id_mahasiswa = [f"{nomor:024x}" for nomor in range(jumlah_mahasiswa)]
+    bobot_tipe = [1 / (peringkat + 1) for peringkat in range(len(TIPE_ERROR))]
+    sekarang = datetime.now()
+
+    submisi = [
+        {
+            "id_mahasiswa": acak.choice(id_mahasiswa),
+            "tipe_error": acak.choices(TIPE_ERROR, weights=bobot_tipe)[0],
+            "created_at": sekarang - timedelta(minutes=acak.randint(0, 90 * 24 * 60)),
+            "pesan_error": "contoh pesan error",
+        }
+        for _ in range(jumlah_submisi)
+    ]
+    progress = [
+        {
+            "id_mahasiswa": id_mhs,
+            "topik": topik,
+            "tingkat_penguasaan": round(acak.uniform(0, 100), 1),
+            "jumlah_error_di_topik": acak.randint(0, 50),
+            "tren_perbaikan": acak.choice(TREN),
+        }
+        for id_mhs in id_mahasiswa for topik in TOPIK
+    ]
+    pola = [
+        {
+            "id_mahasiswa": id_mhs,
+            "jenis_kesalahan": tipe,
+            "frekuensi": acak.randint(3, 40),
+            "kejadian_terakhir": sekarang - timedelta(days=acak.randint(0, 60)),
+        }
+        for id_mhs in id_mahasiswa for tipe in acak.sample(TIPE_ERROR, 6)
+    ]
+    return {"submisi": submisi, "progress": progress, "pola": pola}
+
+
+def kelompokkan(dokumen: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    hasil: Dict[str, List[Dict[str, Any]]] = {}
+    for item in dokumen:
+        hasil.setdefault(item["id_mahasiswa"], []).append(item)
+    return hasil
+
+
+# ==================== IMPLEMENTASI LAMA (LOOP) ====================
+
+def lama_progress(progress_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Logika halaman Progress sebelum analitik_service"""
+    avg = sum(p.get("tingkat_penguasaan", 0) for p in progress_list) / len(progress_list)
+    total_error = sum(p.get("jumlah_error_di_topik", 0) for p in progress_list)
+    membaik = len([p for p in progress_list if p.get("tren_perbaikan") == "membaik"])
+    urut = sorted(progress_list, key=lambda x: x.get("tingkat_penguasaan", 0))
+    lemah = [p for p in progress_list if p.get("tingkat_penguasaan", 0) < 60]
+    topik_membaik = [p for p in progress_list if p.get("tren_perbaikan") == "membaik"]
+    return {"avg": avg, "total_error": total_error, "membaik": membaik,
+            "urut": urut, "lemah": lemah, "topik_membaik": topik_membaik}
+
+
+def lama_pola(pola_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Logika halaman Pola sebelum analitik_service"""
+    total = sum(p.get("frekuensi", 0) for p in pola_list)
+    avg = total / len(pola_list) if pola_list else 0
+    urut = sorted(pola_list, key=lambda x: x.get("frekuensi", 0), reverse=True)
+    tinggi = [p for p in urut if p.get("frekuensi", 0) >= 5]
+    return {"total": total, "avg": avg, "urut": urut, "tinggi": tinggi}
+
+
+def lama_kohort(submisi: List[Dict[str, Any]], progress: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Breakdown tipe error, ranking mahasiswa & median penguasaan dengan dict + sorted"""
+    per_tipe: Dict[str, int] = {}
+    per_mahasiswa: Dict[str, int] = {}
+    for item in submisi:
+        tipe = item.get("tipe_error", "Unknown")
+        per_tipe[tipe] = per_tipe.get(tipe, 0) + 1
+        per_mahasiswa[item["id_mahasiswa"]] = per_mahasiswa.get(item["id_mahasiswa"], 0) + 1
+    ranking = sorted(per_mahasiswa.items(), key=lambda item: item[1], reverse=True)
+
+    total_penguasaan: Dict[str, float] = {}
+    jumlah_topik: Dict[str, int] = {}
+    for item in progress:
+        id_mhs = item["id_mahasiswa"]
+        total_penguasaan[id_mhs] = total_penguasaan.get(id_mhs, 0) + item.get("tingkat_penguasaan", 0)
+        jumlah_topik[id_mhs] = jumlah_topik.get(id_mhs, 0) + 1
+    rata = [total_penguasaan[id_mhs] / jumlah_topik[id_mhs] for id_mhs in total_penguasaan]
+    median = sorted(rata)[len(rata) // 2]
+    return {"per_tipe": per_tipe, "ranking": ranking, "median": median, "rata": sum(rata) / len(rata)}
+
+
+# ==================== IMPLEMENTASI VECTORIZED ====================
+
+def baru_progress(progress_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    df = frame_progress(progress_list)
+    return {"ringkasan": ringkasan_progress(df), "urut": filter_urut_progress(df, None, "penguasaan_asc")}
+
+
+def baru_pola(pola_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    df = urut_pola(frame_pola(pola_list))
+    return {"ringkasan": ringkasan_pola(df), "urut": df}
+
+
+def baru_kohort(submisi: List[Dict[str, Any]], progress: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return statistik_kohort(frame_submisi(submisi), frame_progress(progress))
+
+
+# ==================== PENGUKURAN ====================
+
+def ukur(fungsi: Callable[[], Any], ulang: int) -> float:
+    """Median durasi (ms) dari beberapa kali jalan"""
+    durasi = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        durasi.append((time.perf_counter() - mulai) * 1000)
+    return statistics.median(durasi)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark analitik loop vs vectorized")
+    parser.add_argument("--submisi", type=int, default=100_000, help="Jumlah submisi kohort")
+    parser.add_argument("--mahasiswa", type=int, default=500, help="Jumlah mahasiswa kohort")
+    parser.add_argument("--ulang", type=int, default=5, help="Pengulangan per pengukuran (diambil median)")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    print(f"🧪 Membuat kohort sintetis: {args.submisi:,} submisi, {args.mahasiswa:,} mahasiswa...")
+    kohort = buat_kohort(args.submisi, args.mahasiswa)
+    progress_per_mhs = list(kelompokkan(kohort["progress"]).values())
+    pola_per_mhs = list(kelompokkan(kohort["pola"]).values())
+
+    # Sanity check: hasil kedua implementasi harus sama
+    hasil_lama = lama_kohort(kohort["submisi"], kohort["progress"])
+    hasil_baru = baru_kohort(kohort["submisi"], kohort["progress"])
+    assert hasil_lama["per_tipe"] == hasil_baru["per_tipe_error"], "Breakdown tipe error berbeda"
+    assert abs(hasil_lama["rata"] - hasil_baru["distribusi_penguasaan"]["rata"]) < 1e-6, "Rata-rata berbeda"
+    print("✅ Hasil loop & vectorized konsisten\n")
+
+    skenario = {
+        "kohort (breakdown, ranking, distribusi)": (
+            lambda: lama_kohort(kohort["submisi"], kohort["progress"]),
+            lambda: baru_kohort(kohort["submisi"], kohort["progress"]),
+        ),
+        "progress per mahasiswa (semua mahasiswa)": (
+            lambda: [lama_progress(item) for item in progress_per_mhs],
+            lambda: [baru_progress(item) for item in progress_per_mhs],
+        ),
+        "pola per mahasiswa (semua mahasiswa)": (
+            lambda: [lama_pola(item) for item in pola_per_mhs],
+            lambda: [baru_pola(item) for item in pola_per_mhs],
+        ),
+        "median 100k nilai": (
+            lambda: sorted(item["tingkat_penguasaan"] for item in kohort["progress"])[len(kohort["progress"]) // 2],
+            lambda: distribusi([item["tingkat_penguasaan"] for item in kohort["progress"]])["median"],
+        ),
+    }
+
+    hasil: Dict[str, Dict[str, float]] = {}
+    print(f"{'Skenario':<45} {'Loop (ms)':>11} {'Vectorized (ms)':>16} {'Speedup':>9}")
+    for nama, (fungsi_lama, fungsi_baru) in skenario.items():
+        ms_lama = ukur(fungsi_lama, args.ulang)
+        ms_baru = ukur(fungsi_baru, args.ulang)
+        hasil[nama] = {"loop_ms": round(ms_lama, 2), "vectorized_ms": round(ms_baru, 2),
+                       "speedup": round(ms_lama / ms_baru, 2) if ms_baru else 0.0}
+        print(f"{nama:<45} {ms_lama:>11.2f} {ms_baru:>16.2f} {hasil[nama]['speedup']:>8.2f}x")
+
+    print("\nCatatan: angka vectorized sudah termasuk waktu memuat dict ke frame kolumnar.")
+    print("Untuk list kecil (satu mahasiswa, belasan topik) overhead pandas bisa lebih besar dari loop;")
+    print("keuntungan utama ada di agregasi level kohort.")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({
+                "submisi": args.submisi,
+                "mahasiswa": args.mahasiswa,
+                "dibuat_pada": datetime.now().isoformat(),
+                "hasil": hasil,
+            }, file, indent=2)
+        print(f"\n💾 Hasil disimpan ke {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark waktu import (cold start) untuk modul-modul PahamKode
+Memakai `python -X importtime` di subprocess terpisah supaya setiap target diukur dingin
+
+Usage:
+    python scripts/benchmark_import.py
+    python scripts/benchmark_import.py --modul services components.autentikasi --top 15
+    python scripts/benchmark_import.py --json hasil_import.json
+    python scripts/benchmark_import.py --bandingkan hasil_import.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Project root & folder app (modul di-import relatif ke app/, sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+app_dir = project_root / "app"
+
+# Modul yang di-import halaman saat render pertama
+MODUL_DEFAULT = [
+    "config",
+    "utils",
+    "utils.helpers",
+    "database",
+    "components",
+    "components.autentikasi",
+    "services",
+    "services.autentikasi_service",
+    "services.analisis_service",
+    "services.admin_service",
+    "services.ai_service",
+]
+
+
+# ==================== PENGUKURAN ====================
+
+def ukur_import(nama_modul: str) -> Dict[str, Any]:
+    """
+    Import satu modul di interpreter baru dengan -X importtime
+
+    Returns:
+        Dict dengan total_us (cumulative modul target) dan daftar semua import
+    """
+    kode = f"import sys; sys.path.insert(0, {str(app_dir)!r}); import {nama_modul}"
+    proses = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", kode],
+        capture_output=True,
+        text=True,
+        cwd=str(project_root)
+    )
+
+    semua_import: List[Dict[str, Any]] = []
+    for baris in proses.stderr.splitlines():
+        # Format: "import time:   self [us] |  cumulative | imported package"
+        if not baris.startswith("import time:") or "self [us]" in baris:
+            continue
+        try:
+            _, isi = baris.split(":", 1)
+            self_us, cumulative_us, nama = isi.split("|", 2)
+            # Kolom nama: satu spasi pemisah + 2 spasi per tingkat nesting (harus dihitung sebelum strip)
+            semua_import.append({
+                "modul": nama.strip(),
+                "level": (len(nama) - len(nama.lstrip()) - 1) // 2,
+                "self_us": int(self_us.strip()),
+                "cumulative_us": int(cumulative_us.strip())
+            })
+        except ValueError:
+            continue
+
+    # Baris terakhir dengan nama yang sama adalah modul target (cumulative paling luar)
+    total_us = next(
+        (item["cumulative_us"] for item in reversed(semua_import) if item["modul"] == nama_modul),
+        sum(item["self_us"] for item in semua_import)
+    )
+
+    return {
+        "modul": nama_modul,
+        "berhasil": proses.returncode == 0,
+        "error": proses.stderr.strip().splitlines()[-1] if proses.returncode != 0 and proses.stderr else None,
+        "total_us": total_us,
+        "jumlah_modul": len(semua_import),
+        "imports": semua_import
+    }
+
+
+def modul_terberat(hasil: Dict[str, Any], top: int) -> List[Dict[str, Any]]:
+    """Ambil N import langsung modul target (level 1) dengan cumulative time terbesar"""
+    level_atas = [item for item in hasil["imports"] if item["level"] == 1]
+    return sorted(level_atas, key=lambda x: x["cumulative_us"], reverse=True)[:top]
+
+
+# ==================== OUTPUT ====================
+
+def cetak_laporan(semua_hasil: List[Dict[str, Any]], top: int, baseline: Dict[str, Any]) -> None:
+    """Cetak ringkasan per modul (dan selisih terhadap baseline jika ada)"""
+    print(f"\n{'Modul':<34} {'Total (ms)':>11} {'#Modul':>8} {'Δ baseline':>12}")
+    print("-" * 68)
+    for hasil in semua_hasil:
+        total_ms = hasil["total_us"] / 1000
+        delta = ""
+        if hasil["modul"] in baseline:
+            selisih = total_ms - baseline[hasil["modul"]]["total_us"] / 1000
+            delta = f"{selisih:+.1f}"
+        status = "" if hasil["berhasil"] else "  ❌ " + (hasil["error"] or "gagal")
+        print(f"{hasil['modul']:<34} {total_ms:>11.1f} {hasil['jumlah_modul']:>8} {delta:>12}{status}")
+
+    for hasil in semua_hasil:
+        print(f"\n🔍 Top {top} import terberat untuk '{hasil['modul']}':")
+        for item in modul_terberat(hasil, top):
+            print(f"  {item['cumulative_us'] / 1000:>9.1f} ms  {item['modul']}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark import time modul PahamKode")
+    parser.add_argument("--modul", nargs="+", default=MODUL_DEFAULT, help="Modul yang diukur")
+    parser.add_argument("--top", type=int, default=10, help="Jumlah import terberat yang ditampilkan")
+    parser.add_argument("--json", type=Path, help="Simpan hasil ke file JSON")
+    parser.add_argument("--bandingkan", type=Path, help="File JSON baseline untuk dibandingkan")
+    args = parser.parse_args()
+
+    baseline: Dict[str, Any] = {}
+    if args.bandingkan and args.bandingkan.exists():
+        baseline = {item["modul"]: item for item in json.loads(args.bandingkan.read_text())}
+
+    print("⏱️  Mengukur import time (setiap modul di interpreter baru)...")
+    semua_hasil = [ukur_import(nama) for nama in args.modul]
+
+    cetak_laporan(semua_hasil, args.top, baseline)
+
+    if args.json:
+        ringkas = [
+            {key: value for key, value in hasil.items() if key != "imports"}
+            for hasil in semua_hasil
+        ]
+        args.json.write_text(json.dumps(ringkas, indent=2))
+        print(f"\n✅ Hasil disimpan ke {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Benchmark kompresi field teks submisi_error: ukuran dokumen BSON yang dihemat vs biaya encode/decode
+per codec (zlib / zstd) dan level, lihat utils/kompresi.py
+
+Default memakai dokumen sintetis dengan panjang realistis (kode 20-120 baris, traceback
+beberapa frame, penjelasan & saran berupa paragraf), tidak butuh database. --dari-database
+mengambil sampel acak ($sample) submisi_error asli dari DATABASE_URL.
+
+Usage:
+    python scripts/benchmark_kompresi.py
+    python scripts/benchmark_kompresi.py --dokumen 5000 --ambang 256,512,1024
+    python scripts/benchmark_kompresi.py --dari-database 2000
+    python scripts/benchmark_kompresi.py --json hasil_kompresi.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import bson
+
+from utils.kompresi import (
+    CODEC_ZLIB,
+    CODEC_ZSTD,
+    FIELD_SUBMISI,
+    NAMA_CODEC,
+    codec_default,
+    dekompres_dokumen,
+    kompres_teks,
+)
+
+BARIS_KODE = [
+    "def hitung_rata_rata(nilai):",
+    "    total = 0",
+    "    for n in nilai:",
+    "        total += n",
+    "    return total / len(nilai)",
+    "data = [int(x) for x in input('Masukkan angka: ').split()]",
+    "if len(data) > 0 and data[0] % 2 == 0:",
+    "    print('Genap', data[0])",
+    "class Mahasiswa:",
+    "    def __init__(self, nama, nim):",
+    "        self.nama = nama",
+    "        self.nim = nim",
+    "    def __str__(self):",
+    "        return f'{self.nama} ({self.nim})'",
+    "hasil = {k: v for k, v in zip(kunci, nilai) if v is not None}",
+    "while i < len(daftar):",
+    "    i += 1",
+    "try:",
+    "    berkas = open('nilai.txt')",
+    "except FileNotFoundError as e:",
+    "    print('Berkas tidak ditemukan:', e)",
+]
+KALIMAT = [
+    "Error ini terjadi karena variabel dipakai sebelum diberi nilai di dalam scope fungsi.",
+    "Python mengevaluasi ekspresi dari kiri ke kanan, sehingga operand pertama menentukan operasi yang dipanggil.",
+    "Perhatikan bahwa indeks list dimulai dari nol, jadi elemen terakhir berada di indeks len(data) - 1.",
+    "Konversi eksplisit dengan int() atau str() diperlukan karena Python tidak mengubah tipe secara otomatis.",
+    "Fungsi rekursif membutuhkan base case yang pasti tercapai supaya pemanggilan berhenti.",
+    "Dictionary melempar KeyError jika kunci tidak ada; gunakan get() untuk nilai default.",
+    "Pesan traceback dibaca dari bawah: baris terakhir menunjukkan tipe error dan lokasi penyebabnya.",
+    "Coba jalankan program langkah demi langkah dan cetak nilai variabel penting di setiap iterasi.",
+    "Kesalahan ini umum bagi pemula dan menunjukkan bahwa konsep alur eksekusi perlu diperkuat.",
+    "Sebelum memanggil method, pastikan objek memang memiliki atribut tersebut dengan dir() atau hasattr().",
+]
+
+
+def buat_dokumen(acak: random.Random) -> Dict[str, Any]:
+    """Satu dokumen submisi sintetis dengan panjang field mendekati data asli"""
+    kode = "\n".join(acak.choice(BARIS_KODE) for _ in range(acak.randint(20, 120)))
+    frame = "".join(
+        f'  File "main.py", line {acak.randint(1, 120)}, in fungsi_{acak.randint(1, 9)}\n    {acak.choice(BARIS_KODE).strip()}\n'
+        for _ in range(acak.randint(1, 6))
+    )
+
+    def paragraf(minimal: int, maksimal: int) -> str:
+        return " ".join(acak.choice(KALIMAT) for _ in range(acak.randint(minimal, maksimal)))
+
+    return {
+        "_id": bson.ObjectId(),
+        "id_mahasiswa": bson.ObjectId(),
+        "kode": kode,
+        "pesan_error": f"Traceback (most recent call last):\n{frame}NameError: name 'totl' is not defined",
+        "bahasa": "python",
+        "tipe_error": "NameError",
+        "penyebab_utama": acak.choice(KALIMAT),
+        "kesenjangan_konsep": "Scope variabel",
+        "level_bloom": "Understand",
+        "penjelasan": paragraf(6, 16),
+        "saran_perbaikan": "\n".join(f"{nomor}. {acak.choice(KALIMAT)}" for nomor in range(1, acak.randint(3, 7))),
+        "topik_terkait": ["Variables & Data Types", "Functions"],
+        "saran_latihan": paragraf(2, 5),
+    }
+
+
+def sampel_database(jumlah: int) -> List[Dict[str, Any]]:
+    """Sampel acak submisi_error dari database (field teks didekompres ke bentuk asli)"""
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL tidak ditemukan di .env")
+        sys.exit(1)
+    client = MongoClient(database_url)
+    db = client[os.getenv("DATABASE_NAME", "pahamkode-db")]
+    print(f"✅ Connected to database: {db.name}")
+    dokumen = [dekompres_dokumen(item) for item in db.submisi_error.aggregate(
+        [{"$sample": {"size": jumlah}}, {"$project": {"minhash": 0}}]
+    )]
+    client.close()
+    return dokumen
+
+
+def ukur_varian(dokumen: List[Dict[str, Any]], codec: int, level: int, ambang: int) -> Dict[str, Any]:
+    """Ukuran BSON sebelum/sesudah + waktu kompres & dekompres per dokumen untuk satu varian"""
+    ukuran_asli = sum(len(bson.encode(item)) for item in dokumen)
+
+    mulai = time.perf_counter()
+    terkompres = []
+    for item in dokumen:
+        salinan = dict(item)
+        for nama in FIELD_SUBMISI:
+            salinan[nama] = kompres_teks(salinan.get(nama), ambang, codec, level)
+        terkompres.append(salinan)
+    durasi_kompres = time.perf_counter() - mulai
+
+    ukuran_kompres = sum(len(bson.encode(item)) for item in terkompres)
+    field_dikompres = sum(1 for item in terkompres for nama in FIELD_SUBMISI if isinstance(item.get(nama), bson.Binary))
+
+    # Decode = biaya baca: BSON → dict + dekompres field (dibandingkan decode dokumen asli)
+    asli_encoded = [bson.encode(item) for item in dokumen]
+    kompres_encoded = [bson.encode(item) for item in terkompres]
+    mulai = time.perf_counter()
+    for data in asli_encoded:
+        bson.decode(data)
+    durasi_decode_asli = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    hasil = [dekompres_dokumen(bson.decode(data)) for data in kompres_encoded]
+    durasi_decode = time.perf_counter() - mulai
+
+    for item, kembali in zip(dokumen, hasil):
+        for nama in FIELD_SUBMISI:
+            if item.get(nama) != kembali.get(nama):
+                raise AssertionError(f"Round-trip {NAMA_CODEC[codec]}-{level} tidak sama untuk field {nama}")
+
+    jumlah = len(dokumen)
+    return {
+        "codec": NAMA_CODEC[codec],
+        "level": level,
+        "ambang": ambang,
+        "kb_asli": round(ukuran_asli / 1024, 1),
+        "kb_kompres": round(ukuran_kompres / 1024, 1),
+        "persen_hemat": round((1 - ukuran_kompres / ukuran_asli) * 100, 1) if ukuran_asli else 0.0,
+        "field_dikompres_persen": round(field_dikompres / (jumlah * len(FIELD_SUBMISI)) * 100, 1),
+        "kompres_us_per_dok": round(durasi_kompres / jumlah * 1e6, 1),
+        "decode_asli_us_per_dok": round(durasi_decode_asli / jumlah * 1e6, 1),
+        "decode_us_per_dok": round(durasi_decode / jumlah * 1e6, 1),
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark kompresi field teks submisi_error")
+    parser.add_argument("--dokumen", type=int, default=2000, help="Jumlah dokumen sintetis")
+    parser.add_argument("--dari-database", type=int, metavar="N", help="Pakai N sampel submisi_error dari database")
+    parser.add_argument("--ambang", default="512", help="Ambang byte, pisah koma")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    if args.dari_database:
+        dokumen = sampel_database(args.dari_database)
+    else:
+        acak = random.Random(args.seed)
+        dokumen = [buat_dokumen(acak) for _ in range(args.dokumen)]
+    if not dokumen:
+        print("❌ Tidak ada dokumen untuk diukur")
+        sys.exit(1)
+    rata_byte = statistics.mean(len(bson.encode(item)) for item in dokumen)
+    print(f"🧪 {len(dokumen):,} dokumen, rata-rata {rata_byte:,.0f} byte BSON\n")
+
+    varian: List[Tuple[int, int]] = [(CODEC_ZLIB, 1), (CODEC_ZLIB, 6), (CODEC_ZLIB, 9)]
+    if codec_default() == CODEC_ZSTD:
+        varian += [(CODEC_ZSTD, 1), (CODEC_ZSTD, 3), (CODEC_ZSTD, 9), (CODEC_ZSTD, 19)]
+    else:
+        print("ℹ️  Paket `zstandard` tidak terpasang, hanya zlib yang diukur\n")
+
+    hasil: List[Dict[str, Any]] = []
+    print(f"{'Codec':<10}{'Ambang':>8}{'KB asli':>11}{'KB kompres':>12}{'Hemat':>8}{'Field':>8}"
+          f"{'Kompres µs':>12}{'Decode µs':>11}{'(asli)':>9}")
+    for ambang in [int(item) for item in args.ambang.split(",") if item.strip()]:
+        for codec, level in varian:
+            item = ukur_varian(dokumen, codec, level, ambang)
+            hasil.append(item)
+            print(f"{item['codec'] + '-' + str(level):<10}{ambang:>8}{item['kb_asli']:>11,.0f}{item['kb_kompres']:>12,.0f}"
+                  f"{item['persen_hemat']:>7.1f}%{item['field_dikompres_persen']:>7.0f}%"
+                  f"{item['kompres_us_per_dok']:>12.1f}{item['decode_us_per_dok']:>11.1f}{item['decode_asli_us_per_dok']:>9.1f}")
+
+    print("\nField = persentase field teks yang disimpan terkompresi (sisanya di bawah ambang / tidak menyusut).")
+    print("Decode µs = BSON → dict + dekompres; (asli) = decode dokumen tanpa kompresi sebagai pembanding.")
+
+    if args.json:
+        konfigurasi = {key: value for key, value in vars(args).items() if key != "json"}
+        Path(args.json).write_text(json.dumps({"konfigurasi": konfigurasi, "rata_byte_dokumen": rata_byte,
+                                               "varian": hasil}, indent=2), encoding="utf-8")
+        print(f"\n💾 Hasil disimpan ke {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Benchmark model: dataclass biasa + to_dict tulisan tangan (implementasi lama database/models.py)
+vs @model_bson (slots + to_dict / from_dict generated). Data sintetis, tidak butuh database
+
+Diukur untuk list N submisi & progress: memori instance (tracemalloc), waktu decode dokumen
+→ model (from_dict) dan encode model → dict (to_dict).
+
+Usage:
+    python scripts/benchmark_model.py
+    python scripts/benchmark_model.py --jumlah 50000 --ulang 7
+    python scripts/benchmark_model.py --json hasil_model.json
+"""
+
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from bson import ObjectId
+
+from database.models import ProgressBelajar, SubmisiError
+from utils.kompresi import AMBANG_BYTE, kompres_dokumen
+
+TIPE_ERROR = ["NameError", "TypeError", "IndexError", "KeyError", "SyntaxError", "AttributeError"]
+TOPIK = ["Variabel", "Percabangan", "Perulangan", "Fungsi", "List", "Dictionary", "String", "Rekursi"]
+
+
+# ==================== IMPLEMENTASI LAMA ====================
+
+@dataclass
+class SubmisiErrorLama:
+    """SubmisiError sebelum @model_bson (dataclass biasa, __dict__ per instance)"""
+    id_mahasiswa: ObjectId
+    kode: str
+    pesan_error: str
+    bahasa: str = "python"
+    tipe_error: Optional[str] = None
+    penyebab_utama: Optional[str] = None
+    kesenjangan_konsep: Optional[str] = None
+    level_bloom: Optional[str] = None
+    penjelasan: Optional[str] = None
+    saran_perbaikan: Optional[str] = None
+    topik_terkait: List[str] = field(default_factory=list)
+    saran_latihan: Optional[str] = None
+    minhash: Optional[bytes] = None
+    duplikat_dari: Optional[ObjectId] = None
+    kemiripan: Optional[float] = None
+    diff_kode: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    _id: Optional[ObjectId] = None
+
+    def to_dict(self, ambang_kompresi: int = AMBANG_BYTE) -> Dict[str, Any]:
+        data = {
+            "id_mahasiswa": self.id_mahasiswa,
+            "kode": self.kode,
+            "pesan_error": self.pesan_error,
+            "bahasa": self.bahasa,
+            "tipe_error": self.tipe_error,
+            "penyebab_utama": self.penyebab_utama,
+            "kesenjangan_konsep": self.kesenjangan_konsep,
+            "level_bloom": self.level_bloom,
+            "penjelasan": self.penjelasan,
+            "saran_perbaikan": self.saran_perbaikan,
+            "topik_terkait": self.topik_terkait,
+            "saran_latihan": self.saran_latihan,
+            "created_at": self.created_at
+        }
+        kompres_dokumen(data, ambang=ambang_kompresi)
+        if self.minhash is not None:
+            data["minhash"] = self.minhash
+        if self.duplikat_dari:
+            data["duplikat_dari"] = self.duplikat_dari
+            data["kemiripan"] = self.kemiripan
+        if self._id:
+            data["_id"] = self._id
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SubmisiErrorLama":
+        """Gaya Pengguna.from_dict lama (keyword argument + data.get per field)"""
+        return cls(
+            id_mahasiswa=data["id_mahasiswa"],
+            kode=data["kode"],
+            pesan_error=data["pesan_error"],
+            bahasa=data.get("bahasa", "python"),
+            tipe_error=data.get("tipe_error"),
+            penyebab_utama=data.get("penyebab_utama"),
+            kesenjangan_konsep=data.get("kesenjangan_konsep"),
+            level_bloom=data.get("level_bloom"),
+            penjelasan=data.get("penjelasan"),
+            saran_perbaikan=data.get("saran_perbaikan"),
+            topik_terkait=data.get("topik_terkait", []),
+            saran_latihan=data.get("saran_latihan"),
+            minhash=data.get("minhash"),
+            duplikat_dari=data.get("duplikat_dari"),
+            kemiripan=data.get("kemiripan"),
+            created_at=data.get("created_at", datetime.now()),
+            _id=data.get("_id")
+        )
+
+
+@dataclass
+class ProgressBelajarLama:
+    """ProgressBelajar sebelum @model_bson"""
+    id_mahasiswa: ObjectId
+    topik: str
+    tingkat_penguasaan: int = 0
+    jumlah_error_di_topik: int = 0
+    tanggal_error_terakhir: Optional[datetime] = None
+    tren_perbaikan: Optional[str] = None
+    penguasaan_delta: float = 0.0
+    beban_error: float = 0.0
+    beban_diperbarui: Optional[datetime] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    _id: Optional[ObjectId] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id_mahasiswa": self.id_mahasiswa,
+            "topik": self.topik,
+            "tingkat_penguasaan": self.tingkat_penguasaan,
+            "jumlah_error_di_topik": self.jumlah_error_di_topik,
+            "tanggal_error_terakhir": self.tanggal_error_terakhir,
+            "tren_perbaikan": self.tren_perbaikan,
+            "penguasaan_delta": self.penguasaan_delta,
+            "beban_error": self.beban_error,
+            "beban_diperbarui": self.beban_diperbarui,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+        if self._id:
+            data["_id"] = self._id
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProgressBelajarLama":
+        return cls(
+            id_mahasiswa=data["id_mahasiswa"],
+            topik=data["topik"],
+            tingkat_penguasaan=data.get("tingkat_penguasaan", 0),
+            jumlah_error_di_topik=data.get("jumlah_error_di_topik", 0),
+            tanggal_error_terakhir=data.get("tanggal_error_terakhir"),
+            tren_perbaikan=data.get("tren_perbaikan"),
+            penguasaan_delta=data.get("penguasaan_delta", 0.0),
+            beban_error=data.get("beban_error", 0.0),
+            beban_diperbarui=data.get("beban_diperbarui"),
+            created_at=data.get("created_at", datetime.now()),
+            updated_at=data.get("updated_at", datetime.now()),
+            _id=data.get("_id")
+        )
+
+
+# ==================== DATA SINTETIS ====================
+
+def buat_dokumen(jumlah: int, seed: int = 42) -> Dict[str, List[Dict[str, Any]]]:
+    """Dokumen berbentuk seperti hasil query submisi_error & progress_belajar (teks tidak terkompres)"""
+    acak = random.Random(seed)
+    sekarang = datetime.now()
+    id_mahasiswa = [ObjectId() for _ in range(max(1, jumlah // 50))]
+    submisi = [
+        {
+            "_id": ObjectId(),
+            "id_mahasiswa": acak.choice(id_mahasiswa),
+            "kode": "def hitung(x):\n    return x / 0\n",
+            "pesan_error": "ZeroDivisionError: division by zero",
+            "bahasa": "python",
+            "tipe_error": acak.choice(TIPE_ERROR),
+            "penyebab_utama": "Pembagian dengan nol",
+            "kesenjangan_konsep": "Validasi input",
+            "level_bloom": "Apply",
+            "penjelasan": "Penjelasan singkat",
+            "saran_perbaikan": "Cek pembagi sebelum membagi",
+            "topik_terkait": acak.sample(TOPIK, 2),
+            "saran_latihan": "Latihan validasi",
+            "created_at": sekarang - timedelta(minutes=acak.randint(0, 90 * 24 * 60)),
+        }
+        for _ in range(jumlah)
+    ]
+    progress = [
+        {
+            "_id": ObjectId(),
+            "id_mahasiswa": acak.choice(id_mahasiswa),
+            "topik": acak.choice(TOPIK),
+            "tingkat_penguasaan": acak.randint(0, 100),
+            "jumlah_error_di_topik": acak.randint(0, 50),
+            "tren_perbaikan": "stagnan",
+            "created_at": sekarang,
+            "updated_at": sekarang,
+        }
+        for _ in range(jumlah)
+    ]
+    return {"submisi": submisi, "progress": progress}
+
+
+# ==================== PENGUKURAN ====================
+
+def ukur(fungsi: Callable[[], Any], ulang: int) -> float:
+    """Median durasi (ms) dari beberapa kali jalan"""
+    durasi = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        durasi.append((time.perf_counter() - mulai) * 1000)
+    return statistics.median(durasi)
+
+
+def ukur_memori(fungsi: Callable[[], Any]) -> float:
+    """Memori (MB) yang dialokasikan dan masih dipegang oleh hasil fungsi"""
+    gc.collect()
+    tracemalloc.start()
+    hasil = fungsi()
+    terpakai, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del hasil
+    return terpakai / (1024 * 1024)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark model dataclass biasa vs @model_bson")
+    parser.add_argument("--jumlah", type=int, default=20_000, help="Jumlah dokumen per koleksi")
+    parser.add_argument("--ulang", type=int, default=5, help="Pengulangan per pengukuran (diambil median)")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    print(f"🧪 Membuat {args.jumlah:,} dokumen submisi & progress sintetis...")
+    dokumen = buat_dokumen(args.jumlah)
+
+    pasangan = {
+        "submisi": (SubmisiErrorLama, SubmisiError, dokumen["submisi"], {}),
+        "progress": (ProgressBelajarLama, ProgressBelajar, dokumen["progress"], {}),
+    }
+
+    # Sanity check: dict hasil kedua implementasi harus sama
+    for nama, (lama, baru, daftar, opsi) in pasangan.items():
+        assert lama.from_dict(daftar[0]).to_dict(**opsi) == baru.from_dict(daftar[0]).to_dict(**opsi), \
+            f"to_dict {nama} berbeda"
+    print("✅ Hasil dataclass lama & @model_bson konsisten\n")
+
+    hasil: Dict[str, Dict[str, float]] = {}
+    print(f"{'Skenario':<32} {'Lama':>12} {'Slots':>12} {'Rasio':>8}")
+    for nama, (lama, baru, daftar, opsi) in pasangan.items():
+        objek_lama = [lama.from_dict(item) for item in daftar]
+        objek_baru = [baru.from_dict(item) for item in daftar]
+        skenario = {
+            f"{nama} memori (MB)": (
+                ukur_memori(lambda: [lama.from_dict(item) for item in daftar]),
+                ukur_memori(lambda: [baru.from_dict(item) for item in daftar]),
+            ),
+            f"{nama} from_dict (ms)": (
+                ukur(lambda: [lama.from_dict(item) for item in daftar], args.ulang),
+                ukur(lambda: [baru.from_dict(item) for item in daftar], args.ulang),
+            ),
+            f"{nama} to_dict (ms)": (
+                ukur(lambda: [item.to_dict(**opsi) for item in objek_lama], args.ulang),
+                ukur(lambda: [item.to_dict(**opsi) for item in objek_baru], args.ulang),
+            ),
+        }
+        for label, (nilai_lama, nilai_baru) in skenario.items():
+            rasio = nilai_lama / nilai_baru if nilai_baru else 0.0
+            hasil[label] = {"lama": round(nilai_lama, 2), "slots": round(nilai_baru, 2), "rasio": round(rasio, 2)}
+            print(f"{label:<32} {nilai_lama:>12.2f} {nilai_baru:>12.2f} {rasio:>7.2f}x")
+
+    print("\nCatatan: memori termasuk dict dokumen yang tidak dibuat ulang (nilai field dipakai bersama),")
+    print("jadi selisih memori = overhead instance (__dict__ per objek vs slots).")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({
+                "jumlah": args.jumlah,
+                "dibuat_pada": datetime.now().isoformat(),
+                "hasil": hasil,
+            }, file, indent=2)
+        print(f"\n💾 Hasil disimpan ke {args.json}")
+
+
+if __name__ == "__main__":
+    main()
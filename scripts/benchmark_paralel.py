@@ -0,0 +1,133 @@
+"""
+Benchmark query dashboard: berurutan vs paralel (database/kumpulan_query.py)
+Mengukur hitung_statistik_mahasiswa (dashboard mahasiswa) & ambil_dashboard_statistik (admin)
+dengan QUERY_PARALEL_WORKERS=0 lalu dengan thread pool, terhadap database di DATABASE_URL.
+
+Mongod lokal hampir tanpa latensi jaringan, jadi selisihnya kecil; --latensi menambahkan jeda
+per panggilan query untuk meniru round-trip ke Cosmos DB (VM → Azure ~20-40 ms).
+
+Usage:
+    python scripts/benchmark_paralel.py
+    python scripts/benchmark_paralel.py --database pahamkode-skala --ulang 20 --latensi 30
+    python scripts/benchmark_paralel.py --workers 4 --json hasil_paralel.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+
+class QueriesDenganLatensi:
+    """Proxy DatabaseQueries: setiap panggilan method ditunda dulu (simulasi round-trip)"""
+
+    def __init__(self, queries: Any, latensi_ms: float):
+        self._queries = queries
+        self._latensi = latensi_ms / 1000
+
+    def __getattr__(self, nama: str) -> Any:
+        atribut = getattr(self._queries, nama)
+        if not callable(atribut) or self._latensi <= 0:
+            return atribut
+
+        def tertunda(*args: Any, **kwargs: Any) -> Any:
+            time.sleep(self._latensi)
+            return atribut(*args, **kwargs)
+        return tertunda
+
+
+def ukur(fungsi: Callable[[], Any], ulang: int) -> Dict[str, float]:
+    """Median & p95 latensi (ms); satu panggilan pemanasan tidak ikut diukur"""
+    fungsi()
+    sampel: List[float] = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        sampel.append((time.perf_counter() - mulai) * 1000)
+    sampel.sort()
+    return {
+        "median_ms": statistics.median(sampel),
+        "p95_ms": sampel[min(len(sampel) - 1, int(len(sampel) * 0.95))],
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark query dashboard berurutan vs paralel")
+    parser.add_argument("--database", default=None, help="Nama database (default DATABASE_NAME)")
+    parser.add_argument("--id-mahasiswa", default=None, help="Default: mahasiswa dengan submisi terbanyak")
+    parser.add_argument("--ulang", type=int, default=10, help="Pengulangan per skenario")
+    parser.add_argument("--workers", type=int, default=8, help="Thread pool untuk skenario paralel")
+    parser.add_argument("--latensi", type=float, default=0.0, help="Jeda simulasi per query (ms)")
+    parser.add_argument("--json", default=None, help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL tidak ditemukan di .env")
+        sys.exit(1)
+
+    from config import settings
+    from database.queries import DatabaseQueries
+    from services.admin_service import ambil_dashboard_statistik
+    from services.analisis_service import hitung_statistik_mahasiswa
+
+    client = MongoClient(database_url, maxPoolSize=max(args.workers * 2, 10))
+    db = client[args.database or settings.DATABASE_NAME]
+    print(f"✅ Connected to database: {db.name}")
+
+    id_mahasiswa = args.id_mahasiswa
+    if not id_mahasiswa:
+        teratas = list(db.submisi_error.aggregate([
+            {"$group": {"_id": "$id_mahasiswa", "jumlah": {"$sum": 1}}},
+            {"$sort": {"jumlah": -1}},
+            {"$limit": 1}
+        ]))
+        if not teratas:
+            print("❌ ERROR: submisi_error kosong, isi dulu dengan scripts/generate_kohort.py")
+            sys.exit(1)
+        id_mahasiswa = str(teratas[0]["_id"])
+
+    queries = QueriesDenganLatensi(DatabaseQueries(db), args.latensi)
+    skenario = {
+        "dashboard_mahasiswa": lambda: hitung_statistik_mahasiswa(queries, id_mahasiswa),
+        "dashboard_admin": lambda: ambil_dashboard_statistik(queries),
+    }
+
+    print(f"⏱️  {args.ulang}x per skenario, latensi simulasi {args.latensi:.0f} ms, mahasiswa {id_mahasiswa}\n")
+    hasil: Dict[str, Dict[str, Any]] = {}
+    for nama, fungsi in skenario.items():
+        settings.QUERY_PARALEL_WORKERS = 0
+        berurutan = ukur(fungsi, args.ulang)
+        settings.QUERY_PARALEL_WORKERS = args.workers
+        paralel = ukur(fungsi, args.ulang)
+        percepatan = berurutan["median_ms"] / paralel["median_ms"] if paralel["median_ms"] else 0.0
+        hasil[nama] = {"berurutan": berurutan, "paralel": paralel, "percepatan": percepatan}
+        print(f"📊 {nama}")
+        print(f"   berurutan : median {berurutan['median_ms']:8.1f} ms   p95 {berurutan['p95_ms']:8.1f} ms")
+        print(f"   paralel   : median {paralel['median_ms']:8.1f} ms   p95 {paralel['p95_ms']:8.1f} ms")
+        print(f"   🚀 {percepatan:.2f}x lebih cepat\n")
+
+    if args.json:
+        konfigurasi = {key: value for key, value in vars(args).items() if key != "json"}
+        Path(args.json).write_text(json.dumps({"konfigurasi": konfigurasi, "hasil": hasil}, indent=2),
+                                   encoding="utf-8")
+        print(f"💾 Hasil disimpan ke {args.json}")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
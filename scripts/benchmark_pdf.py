@@ -0,0 +1,215 @@
+"""
+Benchmark throughput render laporan PDF (laporan/detik per core) & latensi cache hit
+Memakai payload sintetis, tidak butuh database
+
+Usage:
+    python scripts/benchmark_pdf.py
+    python scripts/benchmark_pdf.py --laporan 40 --workers 1 2 4
+    python scripts/benchmark_pdf.py --jenis kohort --json hasil_pdf.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from utils.laporan_pdf import render_laporan
+
+TIPE_ERROR = ["NameError", "TypeError", "IndexError", "KeyError", "SyntaxError",
+              "AttributeError", "ValueError", "ZeroDivisionError", "ImportError", "RecursionError"]
+TOPIK = ["Variabel", "Percabangan", "Perulangan", "Fungsi", "List", "Dictionary", "String",
+         "Rekursi", "OOP", "Exception Handling", "File I/O", "Modul"]
+
+
+# ==================== PAYLOAD SINTETIS ====================
+
+def data_laporan_sintetis(acak: random.Random) -> Dict[str, Any]:
+    """Data berbentuk hasil services.export_service.siapkan_data_laporan"""
+    top_errors = sorted(
+        [(tipe, acak.randint(1, 80)) for tipe in TIPE_ERROR], key=lambda item: item[1], reverse=True
+    )
+    progress = [
+        {
+            "topik": topik,
+            "tingkat_penguasaan": round(acak.uniform(10, 100), 1),
+            "jumlah_error_di_topik": acak.randint(0, 40),
+            "tren_perbaikan": acak.choice(["membaik", "stagnan", "menurun"]),
+        }
+        for topik in TOPIK
+    ]
+    pola = [
+        {
+            "jenis_kesalahan": tipe,
+            "frekuensi": acak.randint(3, 30),
+            "kejadian_terakhir": datetime.now() - timedelta(days=acak.randint(0, 30)),
+            "deskripsi_miskonsepsi": f"Miskonsepsi umum terkait {tipe} pada tugas praktikum",
+        }
+        for tipe in TIPE_ERROR[:6]
+    ]
+    return {
+        "total_submisi": sum(jumlah for _, jumlah in top_errors),
+        "top_errors": top_errors,
+        "pola": pola,
+        "progress": progress,
+        "avg_penguasaan": sum(p["tingkat_penguasaan"] for p in progress) / len(progress),
+    }
+
+
+def payload_sintetis(jenis: str, nomor: int) -> Dict[str, Any]:
+    """Payload tipe dasar seperti yang dikirim laporan_pdf_service ke worker"""
+    acak = random.Random(nomor)
+    if jenis == "mahasiswa":
+        data = data_laporan_sintetis(acak)
+        return {
+            "nama": f"Mahasiswa {nomor}",
+            "email": f"mhs{nomor}@contoh.ac.id",
+            "tingkat_kemahiran": acak.choice(["pemula", "menengah", "mahir"]),
+            "periode": "30 hari terakhir",
+            "dibuat_pada": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "total_submisi": data["total_submisi"],
+            "avg_penguasaan": data["avg_penguasaan"],
+            "top_errors": [list(item) for item in data["top_errors"]],
+            "progress": data["progress"],
+            "pola": [{**p, "kejadian_terakhir": p["kejadian_terakhir"].strftime("%Y-%m-%d %H:%M")}
+                     for p in data["pola"]],
+        }
+    return {
+        "periode": "30_hari",
+        "dibuat_pada": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "top_errors": [
+            {"tipe_error": tipe, "jumlah": acak.randint(50, 900), "jumlah_mahasiswa": acak.randint(5, 120)}
+            for tipe in TIPE_ERROR
+        ],
+        "pola_global": [
+            {"jenis_kesalahan": tipe, "total_frekuensi": acak.randint(20, 400),
+             "jumlah_mahasiswa": acak.randint(3, 90), "deskripsi_sample": f"Contoh miskonsepsi {tipe}"}
+            for tipe in TIPE_ERROR
+        ],
+        "topik_ranking": [{"nama": topik, "total_error": acak.randint(10, 500)} for topik in TOPIK],
+        "ai_usage": {"total_request": 1200, "total_token": 2_400_000, "total_biaya": 12.5, "success_rate": 98.2},
+    }
+
+
+# ==================== PENGUKURAN ====================
+
+def ukur_pool(jenis: str, jumlah_laporan: int, workers: int, folder: Path) -> Dict[str, Any]:
+    """Render jumlah_laporan PDF dengan pool berisi `workers` proses (spawn, seperti di app)"""
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        # Pemanasan: spawn worker & import matplotlib tidak ikut diukur
+        list(pool.map(render_laporan, [jenis] * workers, [payload_sintetis(jenis, -1)] * workers,
+                      [str(folder / f"pemanasan_{nomor}.pdf") for nomor in range(workers)]))
+
+        mulai = time.perf_counter()
+        list(pool.map(
+            render_laporan,
+            [jenis] * jumlah_laporan,
+            [payload_sintetis(jenis, nomor) for nomor in range(jumlah_laporan)],
+            [str(folder / f"{jenis}_{workers}_{nomor}.pdf") for nomor in range(jumlah_laporan)],
+        ))
+        durasi = time.perf_counter() - mulai
+
+    per_detik = jumlah_laporan / durasi
+    return {
+        "workers": workers,
+        "laporan": jumlah_laporan,
+        "durasi_s": round(durasi, 3),
+        "laporan_per_detik": round(per_detik, 2),
+        "laporan_per_detik_per_core": round(per_detik / workers, 2),
+        "ms_per_laporan": round(durasi / jumlah_laporan * 1000, 1),
+    }
+
+
+def ukur_cache_hit(folder: Path, ulangan: int = 50) -> Dict[str, Any]:
+    """Latensi buat_pdf_mahasiswa untuk laporan yang sama (render pertama vs cache hit)"""
+    os.environ.setdefault("EXPORT_DIR", str(folder))
+    from services import laporan_pdf_service
+
+    pengguna = {"_id": "benchmark", "nama": "Mahasiswa Benchmark", "email": "bench@contoh.ac.id"}
+    data_laporan = data_laporan_sintetis(random.Random(7))
+    date_to = datetime.now()
+    date_from = date_to - timedelta(days=30)
+
+    try:
+        mulai = time.perf_counter()
+        _, dari_cache = laporan_pdf_service.buat_pdf_mahasiswa(None, pengguna, date_from, date_to, data_laporan)
+        render_pertama_ms = (time.perf_counter() - mulai) * 1000
+
+        durasi: List[float] = []
+        semua_hit = True
+        for _ in range(ulangan):
+            mulai = time.perf_counter()
+            _, hit = laporan_pdf_service.buat_pdf_mahasiswa(None, pengguna, date_from, date_to, data_laporan)
+            durasi.append((time.perf_counter() - mulai) * 1000)
+            semua_hit = semua_hit and hit
+    finally:
+        laporan_pdf_service.hentikan_pool()
+
+    durasi.sort()
+    return {
+        "render_pertama_ms": round(render_pertama_ms, 1),
+        "render_pertama_dari_cache": dari_cache,
+        "cache_hit_p50_ms": round(durasi[len(durasi) // 2], 3),
+        "cache_hit_maks_ms": round(durasi[-1], 3),
+        "semua_cache_hit": semua_hit,
+    }
+
+
+# ==================== MAIN ====================
+
+def main():
+    """Main function"""
+    jumlah_cpu = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark render laporan PDF")
+    parser.add_argument("--jenis", choices=["mahasiswa", "kohort"], default="mahasiswa")
+    parser.add_argument("--laporan", type=int, default=24, help="Jumlah laporan per pengukuran")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, min(2, jumlah_cpu), jumlah_cpu}), help="Jumlah worker yang diuji")
+    parser.add_argument("--tanpa-cache", action="store_true", help="Lewati pengukuran cache hit (butuh config app)")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="pahamkode-bench-pdf-") as folder_tmp:
+        folder = Path(folder_tmp)
+        print(f"📄 Benchmark PDF '{args.jenis}': {args.laporan} laporan, {jumlah_cpu} CPU\n")
+        print(f"{'Workers':>8} {'Durasi (s)':>11} {'Lap/detik':>10} {'Lap/detik/core':>15} {'ms/laporan':>11}")
+
+        hasil_pool = []
+        for workers in args.workers:
+            hasil = ukur_pool(args.jenis, args.laporan, workers, folder)
+            hasil_pool.append(hasil)
+            print(f"{hasil['workers']:>8} {hasil['durasi_s']:>11} {hasil['laporan_per_detik']:>10} "
+                  f"{hasil['laporan_per_detik_per_core']:>15} {hasil['ms_per_laporan']:>11}")
+
+        hasil_cache = None
+        if not args.tanpa_cache:
+            hasil_cache = ukur_cache_hit(folder)
+            print(f"\n🗄️  Render pertama: {hasil_cache['render_pertama_ms']} ms (termasuk spawn worker)")
+            print(f"   Cache hit p50: {hasil_cache['cache_hit_p50_ms']} ms, "
+                  f"maks: {hasil_cache['cache_hit_maks_ms']} ms, semua hit: {hasil_cache['semua_cache_hit']}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({
+                "jenis": args.jenis,
+                "cpu": jumlah_cpu,
+                "dibuat_pada": datetime.now().isoformat(),
+                "pool": hasil_pool,
+                "cache": hasil_cache,
+            }, file, indent=2)
+        print(f"\n💾 Hasil disimpan ke {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,571 @@
+"""
+Benchmark query-level untuk semua method baca DatabaseQueries pada beberapa skala data
+
+Untuk setiap skala (jumlah mahasiswa sintetis dari scripts/generate_kohort.py, satu database
+per skala) setiap kasus benchmark dijalankan berulang terhadap mongod lokal, lalu dicatat:
+- Latensi median & p95 (iterator dihabiskan, jadi waktu fetch semua batch ikut terukur)
+- Round-trip database per panggilan (pymongo CommandListener)
+- Dari explain("executionStats") tiap command find/aggregate/count/distinct yang dikirim:
+  totalDocsExamined, totalKeysExamined, nReturned, stage plan (IXSCAN/COLLSCAN/...) & nama index
+
+Hasil disimpan sebagai baseline JSON per skala di benchmarks/ (urut & dibulatkan supaya
+perubahan terlihat di git diff). Baseline lama dibandingkan dulu; exit code 1 jika ada regresi
+(COLLSCAN baru, dokumen diperiksa / round-trip naik, p95 naik melewati ambang).
+
+Prioritas: agregasi admin (statistik, pertumbuhan, top error) & query riwayat per mahasiswa.
+Method tulis (buat_/simpan_/update_/...) tidak dijalankan, hanya dilaporkan sebagai dilewati;
+method baca baru tanpa kasus benchmark dilaporkan supaya registry tetap lengkap.
+
+Usage:
+    python scripts/benchmark_queries.py --siapkan
+    python scripts/benchmark_queries.py --skala 500,2000,5000 --ulang 30
+    python scripts/benchmark_queries.py --skala 2000 --kategori admin,riwayat
+    python scripts/benchmark_queries.py --skala 2000 --tanpa-simpan --ambang-latensi 30
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, monitoring
+
+PREFIX_EMAIL = "sintetis-"  # Sama dengan scripts/generate_kohort.py
+PREFIX_TULIS = ("buat_", "simpan_", "update_", "hapus_", "tambah_", "catat_", "increment_", "naikkan_", "pasang_")
+COMMAND_EXPLAIN = ("find", "aggregate", "count", "distinct")
+# Field sesi/driver yang ditolak (atau tidak relevan) di dalam command explain
+KUNCI_SESI = {"lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "readConcern",
+              "apiVersion", "apiStrict", "apiDeprecationErrors"}
+KATEGORI = ("admin", "riwayat", "mahasiswa", "katalog", "batch", "retensi")
+
+
+# ==================== PEREKAM COMMAND ====================
+
+class PerekamCommand(monitoring.CommandListener):
+    """Hitung (dan opsional simpan) command MongoDB yang dikirim thread benchmark"""
+
+    def __init__(self):
+        self._lokal = threading.local()
+
+    def mulai(self, rekam: bool = False) -> None:
+        self._lokal.aktif = True
+        self._lokal.rekam = rekam
+        self._lokal.jumlah = 0
+        self._lokal.command = []
+
+    def selesai(self) -> None:
+        self._lokal.aktif = False
+
+    def jumlah(self) -> int:
+        return getattr(self._lokal, "jumlah", 0)
+
+    def command(self) -> List[Dict[str, Any]]:
+        return getattr(self._lokal, "command", [])
+
+    def started(self, event: Any) -> None:
+        if not getattr(self._lokal, "aktif", False):
+            return
+        self._lokal.jumlah += 1
+        if self._lokal.rekam and event.command_name in COMMAND_EXPLAIN:
+            self._lokal.command.append(
+                {key: value for key, value in event.command.items() if key not in KUNCI_SESI}
+            )
+
+    def succeeded(self, event: Any) -> None:
+        pass
+
+    def failed(self, event: Any) -> None:
+        pass
+
+
+# ==================== EXPLAIN ====================
+
+def ringkas_explain(hasil: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ambil statistik eksekusi dari output explain (find & aggregate)
+
+    Aggregate menaruh executionStats di dalam stage $cursor (atau per shard), jadi dicari
+    rekursif. rejectedPlans / allPlansExecution dilewati supaya index yang tidak dipakai
+    tidak ikut tercatat.
+    """
+    ringkasan = {"docs_diperiksa": 0, "keys_diperiksa": 0, "n_returned": 0}
+    stage: Set[str] = set()
+    index: Set[str] = set()
+
+    def jelajah(node: Any) -> None:
+        if isinstance(node, list):
+            for item in node:
+                jelajah(item)
+            return
+        if not isinstance(node, dict):
+            return
+        statistik = node.get("executionStats")
+        if isinstance(statistik, dict) and "totalDocsExamined" in statistik:
+            ringkasan["docs_diperiksa"] += int(statistik.get("totalDocsExamined", 0))
+            ringkasan["keys_diperiksa"] += int(statistik.get("totalKeysExamined", 0))
+            ringkasan["n_returned"] += int(statistik.get("nReturned", 0))
+        if isinstance(node.get("stage"), str):
+            stage.add(node["stage"])
+        if isinstance(node.get("indexName"), str):
+            index.add(node["indexName"])
+        for key, value in node.items():
+            if key not in ("rejectedPlans", "allPlansExecution"):
+                jelajah(value)
+
+    jelajah(hasil)
+    ringkasan["stage"] = sorted(stage)
+    ringkasan["index"] = sorted(index)
+    return ringkasan
+
+
+def explain_command(db: Any, daftar_command: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Jalankan ulang command yang direkam dengan explain executionStats, gabungkan hasilnya"""
+    total = {"docs_diperiksa": 0, "keys_diperiksa": 0, "n_returned": 0, "stage": [], "index": [], "command": []}
+    stage: Set[str] = set()
+    index: Set[str] = set()
+    for command in daftar_command:
+        nama = next(iter(command))
+        total["command"].append(f"{nama}:{command[nama]}")
+        try:
+            hasil = ringkas_explain(db.command({"explain": command, "verbosity": "executionStats"}))
+        except Exception as e:
+            print(f"   ⚠️  explain {nama} {command[nama]} gagal: {str(e)}")
+            continue
+        for key in ("docs_diperiksa", "keys_diperiksa", "n_returned"):
+            total[key] += hasil[key]
+        stage.update(hasil["stage"])
+        index.update(hasil["index"])
+    total["stage"] = sorted(stage)
+    total["index"] = sorted(index)
+    total["collscan"] = "COLLSCAN" in stage
+    return total
+
+
+# ==================== KASUS BENCHMARK ====================
+
+@dataclass
+class Konteks:
+    """Sampel data nyata dari database skala (dipilih sekali sebelum pengukuran)"""
+    id_aktif: str
+    id_median: str
+    email: str
+    tipe_error: str
+    topik: str
+    topik_list: List[str]
+    id_submisi: Any
+    id_submisi_list: List[Any]
+    id_mahasiswa_list: List[Any]
+    sekarang: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class KasusBenchmark:
+    """Satu pemanggilan method DatabaseQueries dengan argumen dari Konteks"""
+    nama: str
+    metode: str
+    kategori: str
+    jalankan: Callable[[Any, Konteks], Any]
+
+
+def _batch_pertama(iterator: Any) -> List[Any]:
+    """Ambil batch pertama saja dari iterator batch yang menyapu seluruh collection"""
+    return next(iterator, [])
+
+
+# Kasus "@aktif" = mahasiswa dengan submisi terbanyak (kasus terburuk riwayat), "@median" = tipikal
+DAFTAR_KASUS: List[KasusBenchmark] = [
+    # Admin
+    KasusBenchmark("ambil_statistik_ai[7hari]", "ambil_statistik_ai", "admin",
+                   lambda q, k: q.ambil_statistik_ai(start_date=k.sekarang - timedelta(days=7))),
+    KasusBenchmark("ambil_statistik_ai[semua]", "ambil_statistik_ai", "admin",
+                   lambda q, k: q.ambil_statistik_ai()),
+    KasusBenchmark("ambil_statistik_api[7hari]", "ambil_statistik_api", "admin",
+                   lambda q, k: q.ambil_statistik_api(start_date=k.sekarang - timedelta(days=7))),
+    KasusBenchmark("total_token_llm_sejak[hari_ini]", "total_token_llm_sejak", "admin",
+                   lambda q, k: q.total_token_llm_sejak(k.sekarang.replace(hour=0, minute=0, second=0, microsecond=0))),
+    KasusBenchmark("pertumbuhan_mahasiswa[30]", "pertumbuhan_mahasiswa", "admin",
+                   lambda q, k: q.pertumbuhan_mahasiswa(30)),
+    KasusBenchmark("top_errors_global[10]", "top_errors_global", "admin",
+                   lambda q, k: q.top_errors_global(10)),
+    KasusBenchmark("mahasiswa_dengan_kesulitan_terbanyak[10]", "mahasiswa_dengan_kesulitan_terbanyak", "admin",
+                   lambda q, k: q.mahasiswa_dengan_kesulitan_terbanyak(10)),
+    KasusBenchmark("topik_paling_sulit[10]", "topik_paling_sulit", "admin",
+                   lambda q, k: q.topik_paling_sulit(10)),
+    KasusBenchmark("ambil_pola_global[20]", "ambil_pola_global", "admin",
+                   lambda q, k: q.ambil_pola_global(20)),
+    KasusBenchmark("hitung_total_submisi[semua]", "hitung_total_submisi", "admin",
+                   lambda q, k: q.hitung_total_submisi()),
+    KasusBenchmark("daftar_semua_mahasiswa[hal1]", "daftar_semua_mahasiswa", "admin",
+                   lambda q, k: q.daftar_semua_mahasiswa(skip=0, limit=50)),
+    KasusBenchmark("daftar_semua_mahasiswa[hal_akhir]", "daftar_semua_mahasiswa", "admin",
+                   lambda q, k: q.daftar_semua_mahasiswa(skip=max(len(k.id_mahasiswa_list) - 50, 0), limit=50)),
+    KasusBenchmark("daftar_semua_mahasiswa[cari]", "daftar_semua_mahasiswa", "admin",
+                   lambda q, k: q.daftar_semua_mahasiswa(search_query=k.email[:len(PREFIX_EMAIL) + 4])),
+    KasusBenchmark("hitung_total_mahasiswa[semua]", "hitung_total_mahasiswa", "admin",
+                   lambda q, k: q.hitung_total_mahasiswa()),
+    KasusBenchmark("hitung_total_mahasiswa[cari]", "hitung_total_mahasiswa", "admin",
+                   lambda q, k: q.hitung_total_mahasiswa(search_query=k.email[:len(PREFIX_EMAIL) + 4])),
+    KasusBenchmark("ambil_versi_katalog", "ambil_versi_katalog", "admin",
+                   lambda q, k: q.ambil_versi_katalog()),
+
+    # Riwayat per mahasiswa
+    KasusBenchmark("ambil_riwayat_submisi[@aktif,hal1]", "ambil_riwayat_submisi", "riwayat",
+                   lambda q, k: q.ambil_riwayat_submisi(k.id_aktif, limit=20, skip=0)),
+    KasusBenchmark("ambil_riwayat_submisi[@aktif,skip200]", "ambil_riwayat_submisi", "riwayat",
+                   lambda q, k: q.ambil_riwayat_submisi(k.id_aktif, limit=20, skip=200)),
+    KasusBenchmark("ambil_riwayat_submisi[@aktif,hal1,ringkasan]", "ambil_riwayat_submisi", "riwayat",
+                   lambda q, k: q.ambil_riwayat_submisi(k.id_aktif, limit=20, skip=0, tampilan="ringkasan")),
+    KasusBenchmark("ambil_riwayat_submisi[@median,hal1]", "ambil_riwayat_submisi", "riwayat",
+                   lambda q, k: q.ambil_riwayat_submisi(k.id_median, limit=20, skip=0)),
+    KasusBenchmark("iterasi_submisi_periode[@aktif,30hari]", "iterasi_submisi_periode", "riwayat",
+                   lambda q, k: q.iterasi_submisi_periode(k.id_aktif, date_from=k.sekarang - timedelta(days=30))),
+    KasusBenchmark("ringkasan_submisi_periode[@aktif,30hari]", "ringkasan_submisi_periode", "riwayat",
+                   lambda q, k: q.ringkasan_submisi_periode(k.id_aktif, k.sekarang - timedelta(days=30), k.sekarang)),
+    KasusBenchmark("hitung_submisi_by_tipe[@aktif]", "hitung_submisi_by_tipe", "riwayat",
+                   lambda q, k: q.hitung_submisi_by_tipe(k.id_aktif, k.tipe_error)),
+    KasusBenchmark("ambil_submisi_terakhir[@aktif,5]", "ambil_submisi_terakhir", "riwayat",
+                   lambda q, k: q.ambil_submisi_terakhir(k.id_aktif, 5)),
+    KasusBenchmark("hitung_total_submisi[@aktif]", "hitung_total_submisi", "riwayat",
+                   lambda q, k: q.hitung_total_submisi(k.id_aktif)),
+    KasusBenchmark("ambil_submisi_by_id", "ambil_submisi_by_id", "riwayat",
+                   lambda q, k: q.ambil_submisi_by_id(str(k.id_submisi))),
+    KasusBenchmark("ambil_detail_submisi", "ambil_detail_submisi", "riwayat",
+                   lambda q, k: q.ambil_detail_submisi(k.id_submisi, k.id_aktif)),
+    KasusBenchmark("ambil_submisi_by_ids[50]", "ambil_submisi_by_ids", "riwayat",
+                   lambda q, k: q.ambil_submisi_by_ids(k.id_submisi_list)),
+
+    # Dashboard & profil mahasiswa
+    KasusBenchmark("cari_pengguna_by_email", "cari_pengguna_by_email", "mahasiswa",
+                   lambda q, k: q.cari_pengguna_by_email(k.email)),
+    KasusBenchmark("cari_pengguna_by_id", "cari_pengguna_by_id", "mahasiswa",
+                   lambda q, k: q.cari_pengguna_by_id(k.id_aktif)),
+    KasusBenchmark("ambil_pola_mahasiswa[@aktif]", "ambil_pola_mahasiswa", "mahasiswa",
+                   lambda q, k: q.ambil_pola_mahasiswa(k.id_aktif)),
+    KasusBenchmark("ambil_pola_mahasiswa[@aktif,ringkasan]", "ambil_pola_mahasiswa", "mahasiswa",
+                   lambda q, k: q.ambil_pola_mahasiswa(k.id_aktif, tampilan="ringkasan")),
+    KasusBenchmark("ambil_progress_mahasiswa[@aktif]", "ambil_progress_mahasiswa", "mahasiswa",
+                   lambda q, k: q.ambil_progress_mahasiswa(k.id_aktif)),
+    KasusBenchmark("hitung_rata_rata_penguasaan[@aktif]", "hitung_rata_rata_penguasaan", "mahasiswa",
+                   lambda q, k: q.hitung_rata_rata_penguasaan(k.id_aktif)),
+    KasusBenchmark("ambil_progress_topik[@aktif]", "ambil_progress_topik", "mahasiswa",
+                   lambda q, k: q.ambil_progress_topik(k.id_aktif, k.topik_list)),
+    KasusBenchmark("ambil_snapshot_batch[50,7titik]", "ambil_snapshot_batch", "mahasiswa",
+                   lambda q, k: q.ambil_snapshot_batch(k.id_mahasiswa_list[:50], k.topik_list, 7)),
+
+    # Katalog
+    KasusBenchmark("ambil_semua_sumber_daya", "ambil_semua_sumber_daya", "katalog",
+                   lambda q, k: q.ambil_semua_sumber_daya()),
+    KasusBenchmark("ambil_sumber_daya_by_topik", "ambil_sumber_daya_by_topik", "katalog",
+                   lambda q, k: q.ambil_sumber_daya_by_topik(k.topik)),
+    KasusBenchmark("daftar_semua_sumber_daya", "daftar_semua_sumber_daya", "katalog",
+                   lambda q, k: q.daftar_semua_sumber_daya()),
+    KasusBenchmark("ambil_semua_topik", "ambil_semua_topik", "katalog",
+                   lambda q, k: q.ambil_semua_topik()),
+    KasusBenchmark("daftar_semua_topik", "daftar_semua_topik", "katalog",
+                   lambda q, k: q.daftar_semua_topik()),
+    KasusBenchmark("ambil_semua_exercises", "ambil_semua_exercises", "katalog",
+                   lambda q, k: q.ambil_semua_exercises()),
+    KasusBenchmark("ambil_exercises_by_topik", "ambil_exercises_by_topik", "katalog",
+                   lambda q, k: q.ambil_exercises_by_topik(k.topik)),
+    KasusBenchmark("daftar_semua_exercises", "daftar_semua_exercises", "katalog",
+                   lambda q, k: q.daftar_semua_exercises()),
+
+    # Batch & export
+    KasusBenchmark("iterasi_signature_submisi[7hari]", "iterasi_signature_submisi", "batch",
+                   lambda q, k: q.iterasi_signature_submisi(k.sekarang - timedelta(days=7))),
+    KasusBenchmark("iterasi_submisi_tanpa_minhash[batch1]", "iterasi_submisi_tanpa_minhash", "batch",
+                   lambda q, k: _batch_pertama(q.iterasi_submisi_tanpa_minhash(500))),
+    KasusBenchmark("iterasi_teks_submisi[batch1]", "iterasi_teks_submisi", "batch",
+                   lambda q, k: _batch_pertama(q.iterasi_teks_submisi(terkompresi=False, batch_size=500))),
+    KasusBenchmark("iterasi_batch_progress[batch1]", "iterasi_batch_progress", "batch",
+                   lambda q, k: _batch_pertama(q.iterasi_batch_progress(500))),
+    KasusBenchmark("ambil_id_mahasiswa_kohort", "ambil_id_mahasiswa_kohort", "batch",
+                   lambda q, k: q.ambil_id_mahasiswa_kohort()),
+    KasusBenchmark("iterasi_submisi_mahasiswa_kohort[50]", "iterasi_submisi_mahasiswa_kohort", "batch",
+                   lambda q, k: q.iterasi_submisi_mahasiswa_kohort(k.id_mahasiswa_list[:50])),
+    KasusBenchmark("id_dokumen_terbaru[submisi_error]", "id_dokumen_terbaru", "batch",
+                   lambda q, k: q.id_dokumen_terbaru("submisi_error")),
+    KasusBenchmark("ambil_dokumen_setelah[submisi_error,100]", "ambil_dokumen_setelah", "batch",
+                   lambda q, k: q.ambil_dokumen_setelah("submisi_error", k.id_submisi, ("tipe_error", "created_at"))),
+
+    # Retensi & arsip (job harian)
+    KasusBenchmark("agregasi_metrik_harian[ai,7hari]", "agregasi_metrik_harian", "retensi",
+                   lambda q, k: q.agregasi_metrik_harian("ai", k.sekarang - timedelta(days=7), k.sekarang)),
+    KasusBenchmark("waktu_metrik_tertua[ai]", "waktu_metrik_tertua", "retensi",
+                   lambda q, k: q.waktu_metrik_tertua("ai")),
+    KasusBenchmark("ambil_meta_retensi[ai]", "ambil_meta_retensi", "retensi",
+                   lambda q, k: q.ambil_meta_retensi("ai")),
+    KasusBenchmark("ringkasan_submisi_sebelum[30hari]", "ringkasan_submisi_sebelum", "retensi",
+                   lambda q, k: q.ringkasan_submisi_sebelum(k.sekarang - timedelta(days=30))),
+    KasusBenchmark("ambil_submisi_sebelum[@aktif,30hari]", "ambil_submisi_sebelum", "retensi",
+                   lambda q, k: q.ambil_submisi_sebelum(k.id_aktif, k.sekarang - timedelta(days=30))),
+    KasusBenchmark("ambil_ringkasan_arsip[@aktif]", "ambil_ringkasan_arsip", "retensi",
+                   lambda q, k: q.ambil_ringkasan_arsip(k.id_aktif)),
+    KasusBenchmark("hitung_dokumen_export[@aktif]", "hitung_dokumen_export", "batch",
+                   lambda q, k: q.hitung_dokumen_export("submisi_error", {"id_mahasiswa": k.id_mahasiswa_list[0]})),
+    KasusBenchmark("iterasi_batch_export[@aktif]", "iterasi_batch_export", "batch",
+                   lambda q, k: q.iterasi_batch_export("submisi_error", {"id_mahasiswa": k.id_mahasiswa_list[0]})),
+]
+
+
+def cakupan_method(kelas: Any) -> Dict[str, List[str]]:
+    """Method publik DatabaseQueries: yang dilewati (tulis) dan yang belum punya kasus benchmark"""
+    publik = sorted(nama for nama in dir(kelas) if not nama.startswith("_") and callable(getattr(kelas, nama)))
+    punya_kasus = {kasus.metode for kasus in DAFTAR_KASUS}
+    return {
+        "dilewati_tulis": [nama for nama in publik if nama.startswith(PREFIX_TULIS)],
+        "tanpa_kasus": [nama for nama in publik if not nama.startswith(PREFIX_TULIS) and nama not in punya_kasus],
+    }
+
+
+# ==================== PENGUKURAN ====================
+
+def habiskan(hasil: Any) -> int:
+    """Konsumsi hasil method (iterator dihabiskan) dan kembalikan jumlah item"""
+    if hasil is None:
+        return 0
+    if isinstance(hasil, (list, tuple, dict, set)):
+        return len(hasil)
+    if hasattr(hasil, "__next__"):
+        return sum(1 for _ in hasil)
+    return 1
+
+
+def persentil(nilai: List[float], p: float) -> float:
+    """Persentil nearest-rank"""
+    if not nilai:
+        return 0.0
+    urut = sorted(nilai)
+    return urut[max(0, math.ceil(p / 100 * len(urut)) - 1)]
+
+
+def ukur_kasus(queries: Any, db: Any, perekam: PerekamCommand, kasus: KasusBenchmark,
+               konteks: Konteks, ulang: int) -> Dict[str, Any]:
+    """Warm-up (sekaligus rekam command untuk explain), lalu ukur latensi `ulang` kali"""
+    perekam.mulai(rekam=True)
+    try:
+        dikembalikan = habiskan(kasus.jalankan(queries, konteks))
+    except Exception as e:
+        perekam.selesai()
+        return {"metode": kasus.metode, "kategori": kasus.kategori, "error": str(e)}
+    perekam.selesai()
+    round_trip = perekam.jumlah()
+    command = perekam.command()
+
+    latensi: List[float] = []
+    for _ in range(ulang):
+        perekam.mulai()
+        mulai = time.perf_counter()
+        habiskan(kasus.jalankan(queries, konteks))
+        latensi.append((time.perf_counter() - mulai) * 1000)
+        perekam.selesai()
+
+    explain = explain_command(db, command)
+    return {
+        "metode": kasus.metode,
+        "kategori": kasus.kategori,
+        "median_ms": round(statistics.median(latensi), 1) if latensi else 0.0,
+        "p95_ms": round(persentil(latensi, 95), 1),
+        "round_trip": round_trip,
+        "dikembalikan": dikembalikan,
+        "docs_diperiksa": explain["docs_diperiksa"],
+        "keys_diperiksa": explain["keys_diperiksa"],
+        "n_returned": explain["n_returned"],
+        "stage": explain["stage"],
+        "index": explain["index"],
+        "collscan": explain["collscan"],
+        "command": explain["command"],
+    }
+
+
+def pilih_konteks(db: Any) -> Optional[Konteks]:
+    """Pilih sampel mahasiswa (teraktif & median), submisi, tipe error, dan topik dari data skala"""
+    per_mahasiswa = list(db.submisi_error.aggregate([
+        {"$group": {"_id": "$id_mahasiswa", "jumlah": {"$sum": 1}}},
+        {"$sort": {"jumlah": -1, "_id": 1}},
+    ], allowDiskUse=True))
+    if not per_mahasiswa:
+        return None
+    aktif = per_mahasiswa[0]["_id"]
+    median = per_mahasiswa[len(per_mahasiswa) // 2]["_id"]
+    pengguna = db.users.find_one({"_id": aktif}, {"email": 1})
+    tipe = next(db.submisi_error.aggregate([
+        {"$match": {"id_mahasiswa": aktif}},
+        {"$group": {"_id": "$tipe_error", "jumlah": {"$sum": 1}}},
+        {"$sort": {"jumlah": -1}},
+        {"$limit": 1},
+    ]), {"_id": "NameError"})
+    topik_list = sorted(db.progress_belajar.distinct("topik", {"id_mahasiswa": aktif})) or ["Functions"]
+    id_submisi_list = [doc["_id"] for doc in db.submisi_error.find({"id_mahasiswa": aktif}, {"_id": 1}).limit(50)]
+    id_mahasiswa_list = [item["_id"] for item in per_mahasiswa]
+    # Mahasiswa teraktif di depan supaya kasus export "@aktif" memakai id_mahasiswa_list[0]
+    return Konteks(
+        id_aktif=str(aktif),
+        id_median=str(median),
+        email=(pengguna or {}).get("email", f"{PREFIX_EMAIL}000000"),
+        tipe_error=tipe["_id"],
+        topik=topik_list[0],
+        topik_list=topik_list,
+        id_submisi=id_submisi_list[0],
+        id_submisi_list=id_submisi_list,
+        id_mahasiswa_list=id_mahasiswa_list,
+    )
+
+
+# ==================== PERSIAPAN DATA ====================
+
+def siapkan_skala(db: Any, skala: int, database_url: str, args: argparse.Namespace) -> None:
+    """Pastikan database skala berisi tepat `skala` mahasiswa sintetis + index dari init_database.py"""
+    jumlah = db.users.count_documents({"email": {"$regex": f"^{PREFIX_EMAIL}"}})
+    if jumlah == skala:
+        return
+    env = {**os.environ, "DATABASE_URL": database_url, "DATABASE_NAME": db.name}
+    generator = [sys.executable, str(project_root / "scripts" / "generate_kohort.py"), "--database", db.name]
+    if jumlah:
+        print(f"   {jumlah:,} mahasiswa sintetis ≠ {skala:,}, data lama dibersihkan")
+        subprocess.run(generator + ["--bersihkan"], env=env, check=True)
+    print(f"   🌱 Generate {skala:,} mahasiswa ke {db.name}...")
+    subprocess.run([sys.executable, str(project_root / "scripts" / "init_database.py")], env=env, check=True)
+    subprocess.run(generator + ["--mahasiswa", str(skala), "--submisi-rata", str(args.submisi_rata),
+                                "--seed", str(args.seed)], env=env, check=True)
+
+
+# ==================== LAPORAN & BASELINE ====================
+
+def cetak_laporan(hasil: Dict[str, Dict[str, Any]]) -> None:
+    print(f"\n{'Kasus':<46}{'med ms':>9}{'p95 ms':>9}{'rt':>5}{'kembali':>9}{'diperiksa':>11}  plan")
+    for nama, item in hasil.items():
+        if "error" in item:
+            print(f"{nama:<46}  ❌ {item['error']}")
+            continue
+        plan = "COLLSCAN" if item["collscan"] else ",".join(item["index"]) or ",".join(item["stage"]) or "-"
+        print(f"{nama:<46}{item['median_ms']:>9.1f}{item['p95_ms']:>9.1f}{item['round_trip']:>5}"
+              f"{item['dikembalikan']:>9}{item['docs_diperiksa']:>11}  {plan}")
+
+
+def bandingkan_baseline(hasil: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                        ambang_latensi: float, ambang_diperiksa: float) -> bool:
+    """Bandingkan dengan baseline skala yang sama; True jika ada regresi"""
+    regresi = False
+    for nama, item in hasil.items():
+        acuan = baseline.get(nama)
+        if not acuan or "error" in item or "error" in acuan:
+            continue
+        catatan = []
+        if item["collscan"] and not acuan.get("collscan"):
+            catatan.append("COLLSCAN baru")
+        lama, baru = acuan.get("docs_diperiksa", 0), item["docs_diperiksa"]
+        if baru - lama > 100 and baru > lama * (1 + ambang_diperiksa / 100):
+            catatan.append(f"docs diperiksa {lama} → {baru}")
+        if item["round_trip"] > acuan.get("round_trip", 0):
+            catatan.append(f"round-trip {acuan.get('round_trip', 0)} → {item['round_trip']}")
+        lama, baru = acuan.get("p95_ms", 0.0), item["p95_ms"]
+        if baru - lama > 5 and baru > lama * (1 + ambang_latensi / 100):
+            catatan.append(f"p95 {lama:.1f} → {baru:.1f} ms")
+        if catatan:
+            regresi = True
+            print(f"⚠️  {nama}: {'; '.join(catatan)}")
+        elif item["index"] != acuan.get("index", []):
+            print(f"ℹ️  {nama}: index {acuan.get('index', [])} → {item['index']}")
+    return regresi
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark query-level DatabaseQueries")
+    parser.add_argument("--skala", default="500,2000,5000", help="Jumlah mahasiswa per skala, pisah koma")
+    parser.add_argument("--ulang", type=int, default=20, help="Pengulangan pengukuran per kasus")
+    parser.add_argument("--kategori", default=",".join(KATEGORI), help="Kategori kasus, pisah koma")
+    parser.add_argument("--prefix-database", default="pahamkode-bench", help="Database per skala: <prefix>-<skala>")
+    parser.add_argument("--siapkan", action="store_true", help="Generate data sintetis jika jumlahnya belum sesuai")
+    parser.add_argument("--submisi-rata", type=float, default=200, help="Rata-rata submisi per mahasiswa saat generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=str(project_root / "benchmarks"), help="Folder baseline JSON")
+    parser.add_argument("--tanpa-simpan", action="store_true", help="Bandingkan saja, jangan tulis baseline")
+    parser.add_argument("--ambang-latensi", type=float, default=50.0, help="Kenaikan p95 yang dianggap regresi (persen)")
+    parser.add_argument("--ambang-diperiksa", type=float, default=20.0,
+                        help="Kenaikan dokumen diperiksa yang dianggap regresi (persen)")
+    parser.add_argument("--izinkan-remote", action="store_true", help="Izinkan database selain localhost")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("BENCHMARK_DATABASE_URL", "mongodb://localhost:27017")
+    if not args.izinkan_remote and "localhost" not in database_url and "127.0.0.1" not in database_url:
+        print("❌ ERROR: benchmark membuat database per skala, hanya untuk mongod lokal (pakai --izinkan-remote)")
+        sys.exit(1)
+
+    os.environ["DATABASE_URL"] = database_url
+    logging.basicConfig(level=logging.WARNING)
+    from database.queries import DatabaseQueries
+
+    cakupan = cakupan_method(DatabaseQueries)
+    if cakupan["tanpa_kasus"]:
+        print(f"⚠️  Method baca tanpa kasus benchmark: {', '.join(cakupan['tanpa_kasus'])}")
+    kategori = {item.strip() for item in args.kategori.split(",") if item.strip()}
+    kasus_dipilih = [kasus for kasus in DAFTAR_KASUS if kasus.kategori in kategori]
+
+    perekam = PerekamCommand()
+    client = MongoClient(database_url, event_listeners=[perekam])
+    versi_server = client.server_info().get("version", "?")
+    folder = Path(args.output)
+    regresi = False
+
+    for skala in [int(item) for item in args.skala.split(",") if item.strip()]:
+        db = client[f"{args.prefix_database}-{skala}"]
+        print(f"\n📦 Skala {skala:,} mahasiswa ({db.name})")
+        if args.siapkan:
+            siapkan_skala(db, skala, database_url, args)
+        konteks = pilih_konteks(db)
+        if konteks is None:
+            print("   ⏭️  Database kosong, lewati (jalankan dengan --siapkan)")
+            continue
+        print(f"   {db.submisi_error.estimated_document_count():,} submisi, "
+              f"mahasiswa teraktif {konteks.id_aktif}, {len(kasus_dipilih)} kasus x {args.ulang}")
+
+        queries = DatabaseQueries(db)
+        hasil = {kasus.nama: ukur_kasus(queries, db, perekam, kasus, konteks, args.ulang) for kasus in kasus_dipilih}
+        hasil = dict(sorted(hasil.items()))
+        cetak_laporan(hasil)
+
+        path_baseline = folder / f"queries_{skala}.json"
+        if path_baseline.exists():
+            baseline = json.loads(path_baseline.read_text(encoding="utf-8")).get("kasus", {})
+            print(f"\n📏 Dibandingkan dengan {path_baseline}:")
+            regresi = bandingkan_baseline(hasil, baseline, args.ambang_latensi, args.ambang_diperiksa) or regresi
+        if not args.tanpa_simpan:
+            folder.mkdir(parents=True, exist_ok=True)
+            isi = {
+                "skala": skala,
+                "mongodb": versi_server,
+                "konfigurasi": {"ulang": args.ulang, "submisi_rata": args.submisi_rata, "seed": args.seed},
+                "dokumen": {nama: db[nama].estimated_document_count()
+                            for nama in ("users", "submisi_error", "metrik_ai", "progress_belajar")},
+                **cakupan,
+                "kasus": hasil,
+            }
+            path_baseline.write_text(json.dumps(isi, indent=2, sort_keys=True, ensure_ascii=False, default=str) + "\n",
+                                     encoding="utf-8")
+            print(f"💾 Baseline ditulis ke {path_baseline}")
+
+    client.close()
+    if regresi:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
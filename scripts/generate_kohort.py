@@ -0,0 +1,381 @@
+"""
+Generator kohort sintetis untuk uji skala (ribuan mahasiswa, jutaan submisi_error)
+
+Data dibuat konsisten satu sama lain:
+- Tipe error berdistribusi Zipf, tiap mahasiswa punya 2 tipe "favorit" yang lebih sering
+- Aktivitas per mahasiswa lognormal (sedikit mahasiswa sangat aktif, banyak yang jarang)
+- Waktu submisi bursty: sesi berisi beberapa submisi berdekatan, sesi menumpuk menjelang
+  deadline bersama dan di jam malam
+- pola_error dari submisi (≥3 kali tipe sama, sama seperti analisis_service)
+- progress_belajar & snapshot_penguasaan dari replay model penguasaan (services/penguasaan_service.py)
+  dan tren dari services/snapshot_service.hitung_tren
+- metrik_ai per submisi (campuran sumber llm / lokal / duplikat)
+
+Semua collection ditulis dengan insert_many (ordered=False) per batch, beberapa batch paralel.
+Default ke database terpisah (pahamkode-skala); buat index dulu supaya benchmark realistis:
+    DATABASE_NAME=pahamkode-skala python scripts/init_database.py
+
+Usage:
+    python scripts/generate_kohort.py
+    python scripts/generate_kohort.py --mahasiswa 5000 --submisi-rata 200 --hari 120
+    python scripts/generate_kohort.py --batch 5000 --workers 4 --seed 7
+    python scripts/generate_kohort.py --database pahamkode-skala --bersihkan
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+from config import settings
+from database.models import MetrikAI, Pengguna, PolaError, ProgressBelajar, SnapshotPenguasaan, SubmisiError
+from services.autentikasi_service import hash_password
+from services.penguasaan_service import hitung_dari_riwayat, luruhkan_beban, skor_penguasaan
+from services.snapshot_service import bucket_hari, hitung_tren
+
+PREFIX_EMAIL = "sintetis-"
+DOMAIN_EMAIL = "@sintetis.local"
+PASSWORD = "sintetis123"
+
+# (tipe_error, topik_terkait, kesenjangan_konsep, kode, pesan_error); urutan = peringkat Zipf
+KATALOG_ERROR: List[Tuple[str, List[str], str, str, str]] = [
+    ("NameError", ["Variables & Data Types"], "Scope dan urutan definisi variabel",
+     "total = 0\nfor x in [1, 2, 3]:\n    total += x\nprint(totl)\n",
+     "Traceback (most recent call last):\n  File \"main.py\", line 4, in <module>\n"
+     "NameError: name 'totl' is not defined"),
+    ("TypeError", ["Variables & Data Types"], "Konversi tipe data eksplisit",
+     "umur = input('Umur: ')\nprint('Tahun depan: ' + umur + 1)\n",
+     "Traceback (most recent call last):\n  File \"main.py\", line 2, in <module>\n"
+     "TypeError: can only concatenate str (not \"int\") to str"),
+    ("IndexError", ["Loops (For/While)", "Lists & Dictionaries"], "Indeks berbasis nol dan batas loop",
+     "nilai = [90, 80, 75]\nfor i in range(len(nilai) + 1):\n    print(nilai[i])\n",
+     "Traceback (most recent call last):\n  File \"main.py\", line 3, in <module>\nIndexError: list index out of range"),
+    ("SyntaxError", ["Control Flow (If/Else)"], "Aturan sintaks blok dan titik dua",
+     "if nilai > 70\n    print('lulus')\n",
+     "  File \"main.py\", line 1\n    if nilai > 70\n                ^\nSyntaxError: expected ':'"),
+    ("KeyError", ["Lists & Dictionaries"], "Akses key dictionary yang belum ada",
+     "data = {'a': 1}\nprint(data['b'])\n",
+     "Traceback (most recent call last):\n  File \"main.py\", line 2, in <module>\nKeyError: 'b'"),
+    ("AttributeError", ["Variables & Data Types"], "Method yang tersedia per tipe data",
+     "angka = 5\nangka.append(3)\n",
+     "Traceback (most recent call last):\n  File \"main.py\", line 2, in <module>\n"
+     "AttributeError: 'int' object has no attribute 'append'"),
+    ("IndentationError", ["Control Flow (If/Else)", "Functions"], "Indentasi sebagai penanda blok",
+     "def sapa(nama):\nprint('Halo', nama)\n",
+     "  File \"main.py\", line 2\n    print('Halo', nama)\n    ^\nIndentationError: expected an indented block"),
+    ("ZeroDivisionError", ["Functions"], "Validasi input sebelum operasi aritmetika",
+     "def rata(data):\n    return sum(data) / len(data)\n\nprint(rata([]))\n",
+     "Traceback (most recent call last):\n  File \"main.py\", line 4, in <module>\n"
+     "  File \"main.py\", line 2, in rata\nZeroDivisionError: division by zero"),
+    ("ValueError", ["Variables & Data Types"], "Validasi format input sebelum konversi",
+     "umur = int(input('Umur: '))\n",
+     "Traceback (most recent call last):\n  File \"main.py\", line 1, in <module>\n"
+     "ValueError: invalid literal for int() with base 10: 'dua puluh'"),
+    ("RecursionError", ["Functions"], "Base case pada rekursi",
+     "def faktorial(n):\n    return n * faktorial(n - 1)\n\nprint(faktorial(5))\n",
+     "Traceback (most recent call last):\n  File \"main.py\", line 4, in <module>\n"
+     "  File \"main.py\", line 2, in faktorial\n  [Previous line repeated 996 more times]\n"
+     "RecursionError: maximum recursion depth exceeded"),
+]
+EKSPONEN_ZIPF = 1.1
+BOOST_FAVORIT = 4.0
+LEVEL_BLOOM = (["Remember", "Understand", "Apply", "Analyze"], [1, 4, 3, 1])
+KEMAHIRAN = (["pemula", "menengah", "mahir"], [6, 3, 1])
+SUMBER_METRIK = (["llm", "lokal", "duplikat"], [7, 2, 1])
+
+# Bobot jam dalam sehari (0-23): sepi dini hari, ramai sore-malam
+BOBOT_JAM = [1, 1, 1, 1, 1, 1, 2, 3, 5, 6, 6, 6, 5, 6, 7, 7, 7, 8, 9, 10, 10, 9, 6, 3]
+RATA_SUBMISI_PER_SESI = 6
+RATA_JEDA_DALAM_SESI_DETIK = 150
+PROPORSI_SESI_DEADLINE = 0.6
+RATA_JAM_SEBELUM_DEADLINE = 18
+INTERVAL_DEADLINE_HARI = 14
+
+
+# ==================== PENULIS BULK ====================
+
+class PenulisBulk:
+    """Buffer per collection, flush insert_many paralel (jumlah batch in-flight dibatasi)"""
+
+    def __init__(self, db: Any, ukuran_batch: int, workers: int):
+        self.db = db
+        self.ukuran_batch = ukuran_batch
+        self._buffer: Dict[str, List[Dict[str, Any]]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pahamkode-generate")
+        self._slot = threading.Semaphore(workers * 2)
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+        self.jumlah: Dict[str, int] = {}
+
+    def _tulis(self, koleksi: str, dokumen: List[Dict[str, Any]]) -> None:
+        try:
+            self.db[koleksi].insert_many(dokumen, ordered=False)
+            with self._lock:
+                self.jumlah[koleksi] = self.jumlah.get(koleksi, 0) + len(dokumen)
+        finally:
+            self._slot.release()
+
+    def _flush(self, koleksi: str) -> None:
+        dokumen = self._buffer.pop(koleksi, [])
+        if not dokumen:
+            return
+        self._slot.acquire()
+        self._futures.append(self._executor.submit(self._tulis, koleksi, dokumen))
+
+    def tambah(self, koleksi: str, dokumen: List[Dict[str, Any]]) -> None:
+        buffer = self._buffer.setdefault(koleksi, [])
+        buffer.extend(dokumen)
+        if len(buffer) >= self.ukuran_batch:
+            self._flush(koleksi)
+
+    def selesai(self) -> None:
+        for koleksi in list(self._buffer):
+            self._flush(koleksi)
+        self._executor.shutdown(wait=True)
+        for future in self._futures:
+            future.result()  # Lempar ulang error insert (jika ada)
+
+
+# ==================== DISTRIBUSI ====================
+
+def bobot_zipf(jumlah: int, eksponen: float = EKSPONEN_ZIPF) -> List[float]:
+    return [1 / (peringkat + 1) ** eksponen for peringkat in range(jumlah)]
+
+
+def jumlah_submisi(acak: random.Random, rata: float, sigma: float = 1.0, maks: int = 5000) -> int:
+    """Jumlah submisi per mahasiswa, lognormal dengan rata-rata `rata`"""
+    mu = math.log(max(rata, 1.0)) - sigma ** 2 / 2
+    return max(1, min(maks, int(acak.lognormvariate(mu, sigma))))
+
+
+def waktu_sesi(acak: random.Random, awal: datetime, akhir: datetime, deadline: List[datetime]) -> datetime:
+    """Awal sesi: menjelang deadline (eksponensial) atau hari acak di jam ramai"""
+    if deadline and acak.random() < PROPORSI_SESI_DEADLINE:
+        waktu = acak.choice(deadline) - timedelta(hours=acak.expovariate(1 / RATA_JAM_SEBELUM_DEADLINE))
+    else:
+        hari = acak.uniform(0, max((akhir - awal).days, 1))
+        jam = acak.choices(range(24), weights=BOBOT_JAM)[0]
+        waktu = (awal + timedelta(days=int(hari))).replace(hour=jam, minute=acak.randint(0, 59))
+    return min(max(waktu, awal), akhir)
+
+
+def waktu_submisi(acak: random.Random, jumlah: int, awal: datetime, akhir: datetime,
+                  deadline: List[datetime]) -> List[datetime]:
+    """Waktu submisi bursty (urut naik)"""
+    waktu: List[datetime] = []
+    while len(waktu) < jumlah:
+        mulai = waktu_sesi(acak, awal, akhir, deadline)
+        panjang = min(jumlah - len(waktu), 1 + int(acak.expovariate(1 / RATA_SUBMISI_PER_SESI)))
+        for _ in range(panjang):
+            waktu.append(min(mulai, akhir))
+            mulai += timedelta(seconds=acak.expovariate(1 / RATA_JEDA_DALAM_SESI_DETIK))
+    waktu.sort()
+    return waktu
+
+
+# ==================== PER MAHASISWA ====================
+
+def titik_snapshot(waktu_error: List[datetime], sekarang: datetime) -> List[Dict[str, Any]]:
+    """Titik harian (SNAPSHOT_JENDELA_TREN hari terakhir) dari replay model penguasaan satu topik"""
+    titik = []
+    for mundur in range(settings.SNAPSHOT_JENDELA_TREN - 1, -1, -1):
+        bucket = bucket_hari(sekarang - timedelta(days=mundur))
+        batas = min(bucket + timedelta(days=1), sekarang)
+        beban, terakhir, jumlah = 0.0, None, 0
+        for waktu in waktu_error:
+            if waktu > batas:
+                break
+            beban = luruhkan_beban(beban, terakhir, waktu) + 1
+            terakhir, jumlah = waktu, jumlah + 1
+        if jumlah:
+            titik.append({"b": bucket, "p": float(skor_penguasaan(luruhkan_beban(beban, terakhir, batas))),
+                          "e": jumlah})
+    return titik
+
+
+def buat_mahasiswa(
+    acak: random.Random,
+    nomor: int,
+    args: argparse.Namespace,
+    password_hash: str,
+    awal: datetime,
+    sekarang: datetime,
+    deadline: List[datetime]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Semua dokumen milik satu mahasiswa sintetis"""
+    id_mahasiswa = ObjectId()
+    email = f"{PREFIX_EMAIL}{nomor:06d}{DOMAIN_EMAIL}"
+    dokumen: Dict[str, List[Dict[str, Any]]] = {
+        "users": [Pengguna(
+            email=email, nama=f"Mahasiswa Sintetis {nomor}", password_hash=password_hash,
+            tingkat_kemahiran=acak.choices(*KEMAHIRAN)[0],
+            created_at=awal - timedelta(days=acak.randint(0, 30)), _id=id_mahasiswa
+        ).to_dict()],
+        "submisi_error": [], "metrik_ai": [], "pola_error": [], "progress_belajar": [], "snapshot_penguasaan": [],
+    }
+
+    bobot = bobot_zipf(len(KATALOG_ERROR))
+    for favorit in acak.sample(range(len(KATALOG_ERROR)), 2):
+        bobot[favorit] *= BOOST_FAVORIT
+
+    submisi: List[Dict[str, Any]] = []
+    waktu_per_tipe: Dict[int, List[datetime]] = {}
+    for waktu in waktu_submisi(acak, jumlah_submisi(acak, args.submisi_rata), awal, sekarang, deadline):
+        indeks = acak.choices(range(len(KATALOG_ERROR)), weights=bobot)[0]
+        tipe, topik, kesenjangan, kode, pesan_error = KATALOG_ERROR[indeks]
+        waktu_per_tipe.setdefault(indeks, []).append(waktu)
+        item = SubmisiError(
+            id_mahasiswa=id_mahasiswa,
+            kode=f"# tugas {acak.randint(1, 12)}\n{kode}",
+            pesan_error=pesan_error,
+            tipe_error=tipe,
+            penyebab_utama=f"{tipe} karena {kesenjangan.lower()}",
+            kesenjangan_konsep=kesenjangan,
+            level_bloom=acak.choices(*LEVEL_BLOOM)[0],
+            penjelasan=f"Penjelasan sintetis untuk {tipe}.",
+            saran_perbaikan="1. Baca pesan error. 2. Periksa baris yang disebut traceback.",
+            topik_terkait=topik,
+            saran_latihan=f"Latihan {topik[0]}",
+            created_at=waktu,
+            _id=ObjectId.from_datetime(waktu) if args.id_dari_waktu else ObjectId()
+        ).to_dict()
+        submisi.append(item)
+        if args.metrik:
+            sumber = acak.choices(*SUMBER_METRIK)[0]
+            token_input = int(acak.lognormvariate(6.8, 0.3)) if sumber == "llm" else 0
+            token_output = int(acak.lognormvariate(6.2, 0.3)) if sumber == "llm" else 0
+            dokumen["metrik_ai"].append(MetrikAI(
+                id_submisi=item["_id"],
+                model="gpt-4o-mini" if sumber == "llm" else ("minhash" if sumber == "duplikat" else "aturan:sintetis"),
+                token_input=token_input, token_output=token_output, total_token=token_input + token_output,
+                waktu_respons=acak.lognormvariate(0.8, 0.4) if sumber == "llm" else acak.uniform(0.01, 0.1),
+                sumber=sumber, sumber_token="provider" if sumber == "llm" else "tokenizer",
+                created_at=waktu
+            ).to_dict())
+    dokumen["submisi_error"] = submisi
+
+    # Pola: tipe yang muncul ≥3 kali, kejadian_pertama = saat ambang tercapai
+    for indeks, waktu in waktu_per_tipe.items():
+        if len(waktu) >= 3:
+            tipe, topik, kesenjangan, _, _ = KATALOG_ERROR[indeks]
+            dokumen["pola_error"].append(PolaError(
+                id_mahasiswa=id_mahasiswa, jenis_kesalahan=tipe, frekuensi=len(waktu),
+                kejadian_pertama=waktu[2], kejadian_terakhir=waktu[-1], deskripsi_miskonsepsi=kesenjangan,
+                sumber_daya_direkomendasikan=topik, created_at=waktu[2], updated_at=waktu[-1]
+            ).to_dict())
+
+    # Progress & snapshot dari replay model penguasaan (sama dengan recompute_penguasaan)
+    waktu_per_topik: Dict[str, List[datetime]] = {}
+    for item in submisi:
+        for topik in item["topik_terkait"]:
+            waktu_per_topik.setdefault(topik, []).append(item["created_at"])
+    for (_, topik), state in hitung_dari_riwayat(submisi, sekarang).items():
+        titik = titik_snapshot(waktu_per_topik[topik], sekarang)
+        tren, delta = hitung_tren(titik)
+        dokumen["progress_belajar"].append(ProgressBelajar(
+            id_mahasiswa=id_mahasiswa, topik=topik, tingkat_penguasaan=state["tingkat_penguasaan"],
+            jumlah_error_di_topik=state["jumlah_error_di_topik"],
+            tanggal_error_terakhir=state["tanggal_error_terakhir"], tren_perbaikan=tren, penguasaan_delta=delta,
+            beban_error=state["beban_error"], beban_diperbarui=state["beban_diperbarui"],
+            created_at=waktu_per_topik[topik][0], updated_at=sekarang
+        ).to_dict())
+        if titik:
+            dokumen["snapshot_penguasaan"].append(SnapshotPenguasaan(
+                id_mahasiswa=id_mahasiswa, topik=topik, titik=titik,
+                bucket_terakhir=titik[-1]["b"], updated_at=sekarang
+            ).to_dict())
+    return dokumen
+
+
+# ==================== BERSIHKAN ====================
+
+def bersihkan(db: Any) -> None:
+    """Hapus mahasiswa sintetis & semua data turunannya"""
+    id_mahasiswa = [item["_id"] for item in db.users.find({"email": {"$regex": f"^{PREFIX_EMAIL}"}}, {"_id": 1})]
+    for awal in range(0, len(id_mahasiswa), 500):
+        chunk = id_mahasiswa[awal:awal + 500]
+        id_submisi = [item["_id"] for item in db.submisi_error.find({"id_mahasiswa": {"$in": chunk}}, {"_id": 1})]
+        db.metrik_ai.delete_many({"id_submisi": {"$in": id_submisi}})
+        for koleksi in ["submisi_error", "submisi_error_arsip", "pola_error", "progress_belajar", "snapshot_penguasaan"]:
+            db[koleksi].delete_many({"id_mahasiswa": {"$in": chunk}})
+        db.ringkasan_arsip_mahasiswa.delete_many({"_id": {"$in": chunk}})
+        db.users.delete_many({"_id": {"$in": chunk}})
+    print(f"🧹 {len(id_mahasiswa)} mahasiswa sintetis & datanya dihapus")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Generator kohort sintetis untuk uji skala")
+    parser.add_argument("--mahasiswa", type=int, default=5000, help="Jumlah mahasiswa")
+    parser.add_argument("--submisi-rata", type=float, default=200, help="Rata-rata submisi per mahasiswa")
+    parser.add_argument("--hari", type=int, default=120, help="Rentang waktu submisi (hari ke belakang)")
+    parser.add_argument("--batch", type=int, default=5000, help="Dokumen per insert_many")
+    parser.add_argument("--workers", type=int, default=4, help="Batch insert paralel")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default="pahamkode-skala", help="Nama database tujuan")
+    parser.add_argument("--tanpa-metrik", dest="metrik", action="store_false", help="Jangan buat metrik_ai")
+    parser.add_argument("--id-dari-waktu", action="store_true",
+                        help="_id submisi dari created_at (urutan _id = urutan waktu, seperti data lama)")
+    parser.add_argument("--bersihkan", action="store_true", help="Hapus data sintetis lalu keluar")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL tidak ditemukan di .env")
+        sys.exit(1)
+
+    client = MongoClient(database_url, maxPoolSize=max(args.workers * 2, 10))
+    db = client[args.database]
+    print(f"✅ Connected to database: {db.name}")
+
+    if args.bersihkan:
+        bersihkan(db)
+        client.close()
+        return
+
+    acak = random.Random(args.seed)
+    sekarang = datetime.now()
+    awal = sekarang - timedelta(days=args.hari)
+    # Deadline tugas bersama tiap INTERVAL_DEADLINE_HARI, pukul 23:59
+    deadline = [(awal + timedelta(days=hari)).replace(hour=23, minute=59)
+                for hari in range(INTERVAL_DEADLINE_HARI, args.hari + 1, INTERVAL_DEADLINE_HARI)]
+    password_hash = hash_password(PASSWORD)  # Satu hash untuk semua (bcrypt ~250ms per hash)
+
+    penulis = PenulisBulk(db, args.batch, args.workers)
+    mulai = time.perf_counter()
+    for nomor in range(args.mahasiswa):
+        for koleksi, dokumen in buat_mahasiswa(acak, nomor, args, password_hash, awal, sekarang, deadline).items():
+            penulis.tambah(koleksi, dokumen)
+        if (nomor + 1) % 500 == 0:
+            lewat = time.perf_counter() - mulai
+            total = sum(penulis.jumlah.values())
+            print(f"   {nomor + 1:,}/{args.mahasiswa:,} mahasiswa, {total:,} dokumen ({total / lewat:,.0f}/s)")
+    penulis.selesai()
+    durasi = time.perf_counter() - mulai
+
+    total = sum(penulis.jumlah.values())
+    print(f"\n🏁 {total:,} dokumen dalam {durasi:.1f}s ({total / durasi:,.0f} dokumen/s)")
+    for koleksi, jumlah in sorted(penulis.jumlah.items()):
+        print(f"   {koleksi:<22}{jumlah:>12,}")
+    print(f"\n💡 Login mahasiswa sintetis: {PREFIX_EMAIL}000000{DOMAIN_EMAIL} / {PASSWORD}")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
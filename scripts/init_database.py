@@ -4,6 +4,7 @@ Auto-create collections dengan indexes yang dibutuhkan
 
 Usage:
     python scripts/init_database.py
+    DATABASE_NAME=pahamkode-skala python scripts/init_database.py
 """
 
 import os
@@ -30,7 +31,7 @@ if not DATABASE_URL:
 # Connect to database
 print("🔗 Connecting to Azure Cosmos DB...")
 client = MongoClient(DATABASE_URL)
-db = client["pahamkode-db"]
+db = client[os.getenv("DATABASE_NAME", "pahamkode-db")]
 
 print(f"✅ Connected to database: {db.name}")
 
@@ -42,6 +43,7 @@ collections_config = {
             ("email", ASCENDING),  # Unique index
             ("created_at", DESCENDING),
             ("status", ASCENDING),
+            [("role", ASCENDING), ("kata_cari", ASCENDING)],  # Prefix search nama/email
         ]
     },
     "submisi_error": {
@@ -50,6 +52,7 @@ collections_config = {
             ("created_at", DESCENDING),
             ("tipe_error", ASCENDING),
             [("id_mahasiswa", ASCENDING), ("tipe_error", ASCENDING)],  # Compound index
+            [("id_mahasiswa", ASCENDING), ("created_at", DESCENDING)],  # Riwayat & export per periode
         ]
     },
     "pola_error": {
@@ -67,6 +70,11 @@ collections_config = {
             ("tingkat_penguasaan", DESCENDING),
         ]
     },
+    "snapshot_penguasaan": {
+        "indexes": [
+            [("id_mahasiswa", ASCENDING), ("topik", ASCENDING)],  # Compound unique (1 time series per topik)
+        ]
+    },
     "sumber_daya": {
         "indexes": [
             ("kategori", ASCENDING),
@@ -90,17 +98,32 @@ collections_config = {
     },
     "metrik_ai": {
         "indexes": [
+            ("created_at", DESCENDING),
             ("timestamp", DESCENDING),
             ("model_used", ASCENDING),
         ]
     },
     "metrik_api": {
         "indexes": [
+            ("created_at", DESCENDING),  # Statistik per periode & retensi (jadi TTL index, lihat retensi_service)
             ("timestamp", DESCENDING),
             ("endpoint", ASCENDING),
             ("status_code", ASCENDING),
         ]
     },
+    "metrik_harian": {
+        "indexes": [
+            [("jenis", ASCENDING), ("tanggal", ASCENDING)],  # Rollup harian metrik_ai / metrik_api
+        ]
+    },
+    "submisi_error_arsip": {
+        "indexes": [
+            [("id_mahasiswa", ASCENDING), ("created_at", DESCENDING)],
+        ]
+    },
+    "ringkasan_arsip_mahasiswa": {
+        "indexes": []  # _id = id_mahasiswa
+    },
 }
 
 print("\n📦 Creating collections & indexes...")
@@ -116,6 +139,7 @@ for collection_name, config in collections_config.items():
         
         # Create indexes
         collection = db[collection_name]
+        existing_indexes = collection.index_information()
         for index_spec in config["indexes"]:
             if isinstance(index_spec, tuple):
                 # Single field index
@@ -131,6 +155,11 @@ for collection_name, config in collections_config.items():
                 elif collection_name == "pola_error" and field == "jenis_kesalahan":
                     unique = False  # Will be compound unique instead
                 
+                # Index yang sudah diubah jadi TTL oleh job retensi tidak dibuat ulang
+                if existing_indexes.get(index_name, {}).get("expireAfterSeconds") is not None:
+                    print(f"  ⏳ TTL index exists: {collection_name}.{index_name}")
+                    continue
+                
                 collection.create_index(
                     [(field, direction)],
                     name=index_name,
@@ -149,6 +178,8 @@ for collection_name, config in collections_config.items():
                 unique = False
                 if collection_name == "pola_error":
                     unique = True  # id_mahasiswa + jenis_kesalahan unique
+                elif collection_name == "snapshot_penguasaan":
+                    unique = True  # id_mahasiswa + topik unique
                 
                 collection.create_index(
                     index_fields,
@@ -294,4 +325,6 @@ print(f"  Email: admin@pahamkode.com")
 print(f"  Password: admin123")
 print("  ⚠️  GANTI PASSWORD SETELAH LOGIN PERTAMA!")
 
+print("\n🔎 Users lama tanpa field kata_cari: jalankan python scripts/backfill_kata_cari.py")
+
 print("\n✅ Ready to use! Run: streamlit run app/main.py")
@@ -0,0 +1,322 @@
+"""
+Load test end-to-end: N mahasiswa simulasi menjalankan flow login → analisis → dashboard → riwayat
+terhadap MongoDB lokal (mongod) dengan LLM palsu (tanpa kuota GitHub Models).
+Laporan per flow: throughput, latensi p50/p95/p99, dan round-trip database (pymongo CommandListener).
+
+Flow memanggil service yang sama dengan halaman Streamlit (login_pengguna, proses_analisis_error,
+hitung_statistik_mahasiswa, ambil_riwayat_submisi), tanpa rendering UI.
+
+Usage:
+    python scripts/load_test.py
+    python scripts/load_test.py --mahasiswa 50 --konkurensi 10 --iterasi 5
+    python scripts/load_test.py --latensi-llm 800 --distribusi lognormal --gagal-llm 0.02
+    python scripts/load_test.py --json hasil_load_test.json
+    python scripts/load_test.py --baseline benchmarks/load_test.json --ambang-regresi 20
+    python scripts/load_test.py --bersihkan
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, monitoring
+
+PREFIX_EMAIL = "loadtest-"
+DOMAIN_EMAIL = "@loadtest.local"
+PASSWORD = "loadtest123"
+FLOW = ["login", "analisis", "dashboard", "riwayat"]
+
+# Template kode & error; {nama} / {angka} diacak supaya tidak semua submisi terdeteksi duplikat
+SAMPEL_ERROR = [
+    (
+        "def hitung_{nama}(data):\n    total = 0\n    for x in data:\n        total += x\n    return totl\n\n"
+        "print(hitung_{nama}([{angka}, 2, 3]))\n",
+        "Traceback (most recent call last):\n  File \"main.py\", line 7, in <module>\n"
+        "  File \"main.py\", line 5, in hitung_{nama}\nNameError: name 'totl' is not defined",
+    ),
+    (
+        "umur_{nama} = input('Umur: ')\nprint('Tahun depan: ' + umur_{nama} + {angka})\n",
+        "Traceback (most recent call last):\n  File \"main.py\", line 2, in <module>\n"
+        "TypeError: can only concatenate str (not \"int\") to str",
+    ),
+    (
+        "nilai_{nama} = [{angka}, 80, 75]\nfor i in range(len(nilai_{nama}) + 1):\n    print(nilai_{nama}[i])\n",
+        "Traceback (most recent call last):\n  File \"main.py\", line 3, in <module>\n"
+        "IndexError: list index out of range",
+    ),
+    (
+        "def rata_{nama}(data):\n    return sum(data) / len(data)\n\nprint(rata_{nama}([]))  # {angka}\n",
+        "Traceback (most recent call last):\n  File \"main.py\", line 4, in <module>\n"
+        "  File \"main.py\", line 2, in rata_{nama}\nZeroDivisionError: division by zero",
+    ),
+    (
+        "data_{nama} = {{'a': {angka}}}\nif data_{nama}['b'] > 0:\n    print('positif')\n",
+        "Traceback (most recent call last):\n  File \"main.py\", line 2, in <module>\nKeyError: 'b'",
+    ),
+]
+
+
+# ==================== ROUND-TRIP DATABASE ====================
+
+class PenghitungRoundTrip(monitoring.CommandListener):
+    """Hitung command MongoDB per thread (flow berjalan di satu thread, jadi hitungan = per flow)"""
+
+    def __init__(self):
+        self._lokal = threading.local()
+
+    def mulai(self) -> None:
+        self._lokal.jumlah = 0
+
+    def jumlah(self) -> int:
+        return getattr(self._lokal, "jumlah", 0)
+
+    def started(self, event: Any) -> None:
+        self._lokal.jumlah = getattr(self._lokal, "jumlah", 0) + 1
+
+    def succeeded(self, event: Any) -> None:
+        pass
+
+    def failed(self, event: Any) -> None:
+        pass
+
+
+# ==================== PENCATAT HASIL ====================
+
+class Pencatat:
+    """Kumpulkan latensi, round-trip, dan kegagalan per flow (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latensi: Dict[str, List[float]] = {flow: [] for flow in FLOW}
+        self.round_trip: Dict[str, List[int]] = {flow: [] for flow in FLOW}
+        self.gagal: Dict[str, int] = {flow: 0 for flow in FLOW}
+
+    def catat(self, flow: str, durasi_ms: float, round_trip: int, berhasil: bool) -> None:
+        with self._lock:
+            self.latensi[flow].append(durasi_ms)
+            self.round_trip[flow].append(round_trip)
+            if not berhasil:
+                self.gagal[flow] += 1
+
+
+def persentil(nilai: List[float], p: float) -> float:
+    """Persentil nearest-rank"""
+    if not nilai:
+        return 0.0
+    urut = sorted(nilai)
+    return urut[max(0, math.ceil(p / 100 * len(urut)) - 1)]
+
+
+def ringkas(pencatat: Pencatat, durasi_total: float) -> Dict[str, Dict[str, float]]:
+    """Statistik per flow"""
+    hasil = {}
+    for flow in FLOW:
+        latensi = pencatat.latensi[flow]
+        if not latensi:
+            continue
+        hasil[flow] = {
+            "jumlah": len(latensi),
+            "gagal": pencatat.gagal[flow],
+            "throughput_per_detik": len(latensi) / durasi_total if durasi_total > 0 else 0.0,
+            "p50_ms": persentil(latensi, 50),
+            "p95_ms": persentil(latensi, 95),
+            "p99_ms": persentil(latensi, 99),
+            "round_trip_rata": sum(pencatat.round_trip[flow]) / len(latensi),
+            "round_trip_maks": max(pencatat.round_trip[flow]),
+        }
+    return hasil
+
+
+# ==================== SKENARIO ====================
+
+def siapkan_mahasiswa(queries: Any, jumlah: int) -> List[str]:
+    """Registrasi mahasiswa simulasi (dilewati jika sudah ada)"""
+    from services.autentikasi_service import registrasi_pengguna
+
+    email = [f"{PREFIX_EMAIL}{nomor:04d}{DOMAIN_EMAIL}" for nomor in range(jumlah)]
+    for item in email:
+        if not queries.cari_pengguna_by_email(item):
+            registrasi_pengguna(queries, item, PASSWORD, nama=f"Load Test {item[len(PREFIX_EMAIL):][:4]}")
+    return email
+
+
+def jalankan_mahasiswa(
+    queries: Any,
+    email: str,
+    iterasi: int,
+    jeda_detik: float,
+    seed: int,
+    pencatat: Pencatat,
+    penghitung: PenghitungRoundTrip
+) -> None:
+    """Satu mahasiswa simulasi: login sekali, lalu iterasi analisis → dashboard → riwayat"""
+    from services.analisis_service import hitung_statistik_mahasiswa, proses_analisis_error
+    from services.autentikasi_service import login_pengguna
+
+    acak = random.Random(f"{seed}:{email}")
+
+    def ukur(flow: str, fungsi: Callable[[], Any], cek: Callable[[Any], bool]) -> Any:
+        penghitung.mulai()
+        mulai = time.perf_counter()
+        try:
+            hasil = fungsi()
+            berhasil = cek(hasil)
+        except Exception:
+            hasil, berhasil = None, False
+        pencatat.catat(flow, (time.perf_counter() - mulai) * 1000, penghitung.jumlah(), berhasil)
+        return hasil
+
+    login = ukur("login", lambda: login_pengguna(queries, email, PASSWORD), lambda hasil: hasil[0])
+    if not login or not login[0]:
+        return
+    id_mahasiswa = str(login[1]["_id"])
+
+    for _ in range(iterasi):
+        kode, pesan_error = acak.choice(SAMPEL_ERROR)
+        variasi = {"nama": acak.choice(["nilai", "skor", "data", "angka", "item"]) + str(acak.randint(0, 999)),
+                   "angka": acak.randint(1, 100)}
+        ukur("analisis",
+             lambda: proses_analisis_error(queries, id_mahasiswa, kode.format(**variasi),
+                                           pesan_error.format(**variasi), "python"),
+             lambda hasil: hasil[0] is not None)
+        ukur("dashboard", lambda: hitung_statistik_mahasiswa(queries, id_mahasiswa), lambda hasil: bool(hasil))
+        ukur("riwayat", lambda: queries.ambil_riwayat_submisi(id_mahasiswa, limit=10, skip=0),
+             lambda hasil: hasil is not None)
+        if jeda_detik > 0:
+            time.sleep(acak.uniform(0, 2 * jeda_detik))
+
+
+def bersihkan(db: Any) -> None:
+    """Hapus mahasiswa simulasi & semua data turunannya"""
+    id_mahasiswa = [item["_id"] for item in db.users.find({"email": {"$regex": f"^{PREFIX_EMAIL}"}}, {"_id": 1})]
+    id_submisi = [item["_id"] for item in db.submisi_error.find({"id_mahasiswa": {"$in": id_mahasiswa}}, {"_id": 1})]
+    db.metrik_ai.delete_many({"id_submisi": {"$in": id_submisi}})
+    for koleksi in ["submisi_error", "pola_error", "progress_belajar", "snapshot_penguasaan"]:
+        db[koleksi].delete_many({"id_mahasiswa": {"$in": id_mahasiswa}})
+    db.users.delete_many({"_id": {"$in": id_mahasiswa}})
+    print(f"🧹 {len(id_mahasiswa)} mahasiswa simulasi & {len(id_submisi)} submisi dihapus")
+
+
+# ==================== LAPORAN ====================
+
+def cetak_laporan(hasil: Dict[str, Dict[str, float]], durasi_total: float) -> None:
+    print(f"\n⏱️  Durasi total: {durasi_total:.1f}s\n")
+    print(f"{'Flow':<11}{'n':>6}{'gagal':>7}{'ops/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'DB rt':>8}")
+    for flow, item in hasil.items():
+        print(f"{flow:<11}{item['jumlah']:>6}{item['gagal']:>7}{item['throughput_per_detik']:>9.2f}"
+              f"{item['p50_ms']:>10.1f}{item['p95_ms']:>10.1f}{item['p99_ms']:>10.1f}{item['round_trip_rata']:>8.1f}")
+
+
+def bandingkan_baseline(hasil: Dict[str, Dict[str, float]], path_baseline: str, ambang_persen: float) -> bool:
+    """Bandingkan p95 & round-trip dengan baseline; True jika ada regresi melebihi ambang"""
+    baseline = json.loads(Path(path_baseline).read_text(encoding="utf-8")).get("flow", {})
+    regresi = False
+    print(f"\n📏 Dibandingkan dengan baseline {path_baseline} (ambang {ambang_persen:.0f}%):")
+    for flow, item in hasil.items():
+        acuan = baseline.get(flow)
+        if not acuan:
+            continue
+        for metrik in ("p95_ms", "round_trip_rata"):
+            lama, baru = acuan.get(metrik, 0), item[metrik]
+            perubahan = ((baru - lama) / lama * 100) if lama else 0.0
+            tanda = "⚠️ " if perubahan > ambang_persen else "  "
+            regresi = regresi or perubahan > ambang_persen
+            print(f"{tanda}{flow:<11}{metrik:<16}{lama:>10.1f} → {baru:>10.1f} ({perubahan:+.1f}%)")
+    return regresi
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Load test end-to-end dengan LLM palsu")
+    parser.add_argument("--mahasiswa", type=int, default=20, help="Jumlah mahasiswa simulasi")
+    parser.add_argument("--konkurensi", type=int, default=10, help="Mahasiswa yang berjalan bersamaan")
+    parser.add_argument("--iterasi", type=int, default=3, help="Siklus analisis → dashboard → riwayat per mahasiswa")
+    parser.add_argument("--jeda", type=float, default=0.0, help="Rata-rata jeda antar siklus (detik, think time)")
+    parser.add_argument("--latensi-llm", type=float, default=1500.0, help="Median latensi LLM palsu (ms)")
+    parser.add_argument("--distribusi", default="lognormal", choices=["konstan", "normal", "lognormal"])
+    parser.add_argument("--sebaran", type=float, default=0.4, help="Sebaran latensi LLM palsu")
+    parser.add_argument("--gagal-llm", type=float, default=0.0, help="Proporsi panggilan LLM palsu yang gagal")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Simpan hasil ke file JSON (bisa dipakai sebagai baseline)")
+    parser.add_argument("--baseline", help="File JSON hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument("--ambang-regresi", type=float, default=20.0, help="Kenaikan p95 / round-trip (persen)")
+    parser.add_argument("--bersihkan", action="store_true", help="Hapus data mahasiswa simulasi lalu keluar")
+    parser.add_argument("--izinkan-remote", action="store_true", help="Izinkan DATABASE_URL selain localhost")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("LOAD_TEST_DATABASE_URL", "mongodb://localhost:27017")
+    if not args.izinkan_remote and "localhost" not in database_url and "127.0.0.1" not in database_url:
+        print("❌ ERROR: load test menulis data, hanya untuk mongod lokal (pakai --izinkan-remote jika sengaja)")
+        sys.exit(1)
+
+    # Settings dibaca saat config di-import: LLM palsu & tanpa kuota harian harus diset sebelumnya
+    os.environ.update({
+        "DATABASE_URL": database_url,
+        "USE_FAKE_LLM": "true",
+        "FAKE_LLM_LATENSI_MS": str(args.latensi_llm),
+        "FAKE_LLM_DISTRIBUSI": args.distribusi,
+        "FAKE_LLM_SEBARAN": str(args.sebaran),
+        "FAKE_LLM_TINGKAT_GAGAL": str(args.gagal_llm),
+        "FAKE_LLM_SEED": str(args.seed),
+        "LLM_KUOTA_TOKEN_HARIAN": "0",
+    })
+    from database.queries import DatabaseQueries
+
+    penghitung = PenghitungRoundTrip()
+    client = MongoClient(database_url, event_listeners=[penghitung], maxPoolSize=max(args.konkurensi * 2, 10))
+    db = client[os.getenv("LOAD_TEST_DATABASE_NAME", "pahamkode-loadtest")]
+    print(f"✅ Connected to database: {db.name}")
+
+    if args.bersihkan:
+        bersihkan(db)
+        client.close()
+        return
+
+    queries = DatabaseQueries(db)
+    print(f"👥 Menyiapkan {args.mahasiswa} mahasiswa simulasi...")
+    email = siapkan_mahasiswa(queries, args.mahasiswa)
+
+    print(f"🚀 {args.mahasiswa} mahasiswa x {args.iterasi} iterasi, konkurensi {args.konkurensi}, "
+          f"LLM palsu {args.distribusi} {args.latensi_llm:.0f}ms...")
+    pencatat = Pencatat()
+    mulai = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.konkurensi), thread_name_prefix="pahamkode-loadtest") as executor:
+        futures = [
+            executor.submit(jalankan_mahasiswa, queries, item, args.iterasi, args.jeda, args.seed, pencatat, penghitung)
+            for item in email
+        ]
+        for future in futures:
+            future.result()
+    durasi_total = time.perf_counter() - mulai
+
+    hasil = ringkas(pencatat, durasi_total)
+    cetak_laporan(hasil, durasi_total)
+
+    if args.json:
+        konfigurasi = {key: value for key, value in vars(args).items() if key not in ("json", "baseline")}
+        Path(args.json).write_text(json.dumps({"konfigurasi": konfigurasi, "durasi_detik": durasi_total,
+                                               "flow": hasil}, indent=2), encoding="utf-8")
+        print(f"\n💾 Hasil disimpan ke {args.json}")
+
+    regresi = bandingkan_baseline(hasil, args.baseline, args.ambang_regresi) if args.baseline else False
+    client.close()
+    if regresi:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
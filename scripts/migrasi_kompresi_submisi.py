@@ -0,0 +1,96 @@
+"""
+Migrasi field teks submisi_error lama ke format terkompresi (utils/kompresi.py), atau sebaliknya.
+
+Submisi baru sudah dikompres saat disimpan (SubmisiError.to_dict); script ini untuk dokumen
+yang disimpan sebelum kompresi aktif. Aman diulang: field yang sudah Binary dilewati, teks
+pendek / yang tidak menyusut tetap string (dan ikut terbaca lagi di run berikutnya).
+
+--kembalikan menulis ulang semua field Binary menjadi string, dipakai sebelum kembali ke
+versi aplikasi tanpa dukungan kompresi atau sebelum melepas paket `zstandard`.
+
+Usage:
+    python scripts/migrasi_kompresi_submisi.py --dry-run
+    python scripts/migrasi_kompresi_submisi.py --batch 1000 --ambang 512
+    python scripts/migrasi_kompresi_submisi.py --kembalikan
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+from database.queries import DatabaseQueries
+from utils.kompresi import AMBANG_BYTE, FIELD_SUBMISI, NAMA_CODEC, codec_default, dekompres_teks, kompres_teks
+
+
+def ukuran(nilai: Any) -> int:
+    """Ukuran isi field (byte UTF-8 untuk string, panjang data untuk Binary)"""
+    if isinstance(nilai, str):
+        return len(nilai.encode("utf-8"))
+    if isinstance(nilai, bytes):
+        return len(nilai)
+    return 0
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Migrasi kompresi field teks submisi_error")
+    parser.add_argument("--batch", type=int, default=500, help="Jumlah submisi per batch")
+    parser.add_argument("--ambang", type=int, default=AMBANG_BYTE, help="Minimal byte teks yang dikompres")
+    parser.add_argument("--kembalikan", action="store_true", help="Dekompres semua field Binary ke string")
+    parser.add_argument("--dry-run", action="store_true", help="Hitung penghematan tanpa menulis")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL tidak ditemukan di .env")
+        sys.exit(1)
+
+    client = MongoClient(database_url)
+    db = client[os.getenv("DATABASE_NAME", "pahamkode-db")]
+    queries = DatabaseQueries(db)
+    arah = "dekompres" if args.kembalikan else f"kompres ({NAMA_CODEC[codec_default()]}, ambang {args.ambang} byte)"
+    print(f"✅ Connected to database: {db.name} — {arah}{' [dry-run]' if args.dry_run else ''}")
+
+    mulai = time.perf_counter()
+    diperiksa = diubah = byte_sebelum = byte_sesudah = 0
+    for batch in queries.iterasi_teks_submisi(terkompresi=args.kembalikan, batch_size=args.batch):
+        entri: List[Tuple[Any, Dict[str, Any]]] = []
+        for dokumen in batch:
+            perubahan: Dict[str, Any] = {}
+            for nama in FIELD_SUBMISI:
+                nilai = dokumen.get(nama)
+                baru = dekompres_teks(nilai) if args.kembalikan else kompres_teks(nilai, args.ambang)
+                if baru is not nilai:
+                    perubahan[nama] = baru
+                    byte_sebelum += ukuran(nilai)
+                    byte_sesudah += ukuran(baru)
+            if perubahan:
+                entri.append((dokumen["_id"], perubahan))
+        diperiksa += len(batch)
+        diubah += len(entri)
+        if entri and not args.dry_run:
+            queries.simpan_teks_submisi_bulk(entri)
+        print(f"   {diperiksa:,} submisi diperiksa, {diubah:,} diubah")
+
+    durasi = time.perf_counter() - mulai
+    selisih = byte_sebelum - byte_sesudah
+    persen = (selisih / byte_sebelum * 100) if byte_sebelum else 0.0
+    print(f"\n🗜️  {diubah:,}/{diperiksa:,} submisi dalam {durasi:.1f}s")
+    print(f"   Field teks: {byte_sebelum / 1024:,.0f} KB → {byte_sesudah / 1024:,.0f} KB", end="")
+    print(f" ({persen:.1f}% dihemat)" if not args.kembalikan else "")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Bangun ulang tingkat penguasaan semua mahasiswa dari riwayat submisi_error
+(mis. setelah parameter model di config berubah, atau untuk data lama sebelum model peluruhan).
+Submisi yang sudah diarsipkan (submisi_error_arsip & file JSONL di ARSIP_DIR) ikut di-replay.
+Aman diulang: hasil hanya bergantung pada riwayat submisi.
+
+Usage:
+    python scripts/recompute_penguasaan.py
+    python scripts/recompute_penguasaan.py --chunk 200 --workers 4
+    python scripts/recompute_penguasaan.py --dry-run
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+from database.queries import DatabaseQueries
+from services.penguasaan_service import recompute_semua_penguasaan
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Recompute tingkat penguasaan dari riwayat submisi")
+    parser.add_argument("--chunk", type=int, default=200, help="Jumlah mahasiswa per chunk")
+    parser.add_argument("--workers", type=int, default=4, help="Jumlah chunk yang diproses paralel")
+    parser.add_argument("--dry-run", action="store_true", help="Hitung saja, tanpa menulis ke database")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL tidak ditemukan di .env")
+        sys.exit(1)
+
+    client = MongoClient(database_url)
+    db = client[os.getenv("DATABASE_NAME", "pahamkode-db")]
+    print(f"✅ Connected to database: {db.name}")
+
+    hasil = recompute_semua_penguasaan(
+        DatabaseQueries(db),
+        ukuran_chunk=args.chunk,
+        workers=args.workers,
+        dry_run=args.dry_run
+    )
+
+    mode = " (dry run, tidak ditulis)" if args.dry_run else ""
+    print(f"🧮 {hasil['mahasiswa']} mahasiswa, {hasil['chunk']} chunk, "
+          f"{hasil['progress']} progress dihitung ulang dalam {hasil['durasi_detik']:.1f}s{mode}")
+    if hasil["chunk_gagal"]:
+        print(f"⚠️  {hasil['chunk_gagal']} chunk gagal, lihat log")
+        client.close()
+        sys.exit(1)
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Job retensi harian: rollup metrik_ai / metrik_api ke metrik_harian, hapus metrik mentah lama
+(+ TTL index), dan arsipkan submisi_error lebih tua dari N semester (lihat services/retensi_service.py).
+Aman diulang: rollup per hari di-upsert, arsip submisi memakai kursor per mahasiswa.
+Dijalankan harian oleh deployment/pahamkode-retensi.timer
+
+Usage:
+    python scripts/retensi_data.py --dry-run
+    python scripts/retensi_data.py
+    python scripts/retensi_data.py --semester 6 --tujuan file --folder /srv/arsip-pahamkode
+    python scripts/retensi_data.py --tanpa-submisi --retensi-metrik-hari 30
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+from config import settings
+from database.queries import DatabaseQueries
+from services.retensi_service import TUJUAN_FILE, TUJUAN_KOLEKSI, jalankan_retensi
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Retensi metrik & arsip submisi lama")
+    parser.add_argument("--retensi-metrik-hari", type=int, default=settings.RETENSI_METRIK_HARI,
+                        help="Hari metrik mentah disimpan (lebih lama cukup rollup harian)")
+    parser.add_argument("--semester", type=int, default=settings.RETENSI_SUBMISI_SEMESTER,
+                        help="Semester terakhir (termasuk berjalan) yang tetap di submisi_error")
+    parser.add_argument("--tujuan", choices=[TUJUAN_KOLEKSI, TUJUAN_FILE], default=settings.ARSIP_TUJUAN,
+                        help="Arsip ke collection submisi_error_arsip atau file JSONL gzip")
+    parser.add_argument("--folder", default=settings.ARSIP_DIR, help="Folder arsip untuk --tujuan file")
+    parser.add_argument("--tanpa-metrik", dest="metrik", action="store_false", help="Lewati retensi metrik")
+    parser.add_argument("--tanpa-submisi", dest="submisi", action="store_false", help="Lewati arsip submisi")
+    parser.add_argument("--dry-run", action="store_true", help="Hitung kandidat tanpa menulis / menghapus")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL tidak ditemukan di .env")
+        sys.exit(1)
+
+    client = MongoClient(database_url)
+    db = client[os.getenv("DATABASE_NAME", "pahamkode-db")]
+    print(f"✅ Connected to database: {db.name}{' [dry-run]' if args.dry_run else ''}")
+
+    folder = args.folder if Path(args.folder).is_absolute() else str(project_root / args.folder)
+    mulai = time.perf_counter()
+    hasil = jalankan_retensi(
+        DatabaseQueries(db),
+        retensi_metrik_hari=args.retensi_metrik_hari,
+        jumlah_semester=args.semester,
+        tujuan=args.tujuan,
+        folder=folder,
+        metrik=args.metrik,
+        submisi=args.submisi,
+        dry_run=args.dry_run
+    )
+    durasi = time.perf_counter() - mulai
+
+    for jenis, statistik in hasil.get("metrik", {}).items():
+        print(f"📊 metrik_{jenis}: {statistik['hari']} hari di-rollup ({statistik['entri']} entri), "
+              f"{statistik['dihapus']:,} dokumen mentah dihapus, TTL: {statistik['ttl'] or '-'}")
+    if "submisi" in hasil:
+        statistik = hasil["submisi"]
+        tujuan = folder if args.tujuan == TUJUAN_FILE else "submisi_error_arsip"
+        print(f"🗄️  Submisi sebelum {statistik['batas']:%Y-%m-%d}: {statistik['kandidat']:,} dari "
+              f"{statistik['mahasiswa']} mahasiswa, {statistik['diarsipkan']:,} dipindah ke {tujuan}")
+        if statistik["gagal"]:
+            print(f"   ⚠️  {statistik['gagal']} mahasiswa gagal diarsipkan, lihat log")
+    print(f"⏱️  Selesai dalam {durasi:.1f}s")
+    client.close()
+    if hasil.get("submisi", {}).get("gagal"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
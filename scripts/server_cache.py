@@ -0,0 +1,214 @@
+"""
+Server cache stand-in: subset protokol Redis (RESP2) untuk backend bersama antar worker,
+dipakai jika Redis tidak terpasang di VM (lihat app/utils/backend_bersama.py).
+Storage = BackendMemori (in-memory, hilang saat restart: kuota disinkron ulang dari metrik_ai,
+counter login kedaluwarsa, job export yang berjalan tetap dipegang worker-nya).
+Dijalankan oleh deployment/pahamkode-cache.service
+
+Perintah: PING, ECHO, AUTH, SELECT, GET, SET [EX|PX] [NX], DEL, EXISTS, INCR, INCRBY,
+EXPIRE, PEXPIRE, TTL, PTTL, HSET, HGET, HGETALL, HDEL, DBSIZE, FLUSHDB, QUIT
+
+Usage:
+    python scripts/server_cache.py
+    python scripts/server_cache.py --host 127.0.0.1 --port 6390 --password rahasia
+    (app: BACKEND_BERSAMA_URL=redis://:rahasia@127.0.0.1:6390/0)
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from utils.backend_bersama import BackendBersamaError, BackendMemori
+
+logger = logging.getLogger("server_cache")
+
+JUMLAH_DATABASE = 16
+INTERVAL_SAPU_DETIK = 10.0
+
+
+class Balasan:
+    """Simple string RESP (+OK), dibedakan dari bulk string"""
+
+    def __init__(self, teks: str):
+        self.teks = teks
+
+
+def encode_balasan(nilai: Any) -> bytes:
+    """Encode nilai Python ke RESP2"""
+    if isinstance(nilai, Balasan):
+        return b"+%s\r\n" % nilai.teks.encode("utf-8")
+    if isinstance(nilai, BackendBersamaError):
+        return b"-ERR %s\r\n" % str(nilai).encode("utf-8")
+    if isinstance(nilai, bool):
+        return b":%d\r\n" % int(nilai)
+    if isinstance(nilai, int):
+        return b":%d\r\n" % nilai
+    if nilai is None:
+        return b"$-1\r\n"
+    if isinstance(nilai, (list, tuple)):
+        return b"*%d\r\n" % len(nilai) + b"".join(encode_balasan(item) for item in nilai)
+    data = str(nilai).encode("utf-8")
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+async def baca_perintah(reader: asyncio.StreamReader) -> Optional[List[str]]:
+    """Baca satu perintah (array bulk string atau inline); None jika koneksi ditutup"""
+    baris = await reader.readline()
+    if not baris:
+        return None
+    if not baris.startswith(b"*"):
+        return baris.decode("utf-8").split()
+    args = []
+    for _ in range(int(baris[1:-2])):
+        header = await reader.readline()
+        panjang = int(header[1:-2])
+        data = await reader.readexactly(panjang + 2)
+        args.append(data[:-2].decode("utf-8"))
+    return args
+
+
+class ServerCache:
+    """Dispatcher perintah RESP ke BackendMemori per database"""
+
+    def __init__(self, password: Optional[str] = None):
+        self.password = password
+        self.database: Dict[int, BackendMemori] = {}
+
+    def _db(self, indeks: int) -> BackendMemori:
+        if indeks not in self.database:
+            self.database[indeks] = BackendMemori()
+        return self.database[indeks]
+
+    @staticmethod
+    def _ttl(backend: BackendMemori, kunci: str, pengali: int) -> int:
+        sisa = backend.sisa_ttl(kunci)
+        if sisa is None:
+            return -2
+        return -1 if sisa == -1 else int(sisa * pengali)
+
+    def jalankan(self, sesi: Dict[str, Any], args: List[str]) -> Any:
+        """Eksekusi satu perintah, return nilai balasan"""
+        nama = args[0].upper()
+        if nama == "AUTH":
+            sesi["terautentikasi"] = self.password is None or args[-1] == self.password
+            return Balasan("OK") if sesi["terautentikasi"] else BackendBersamaError("invalid password")
+        if not sesi["terautentikasi"]:
+            return BackendBersamaError("NOAUTH Authentication required")
+        if nama == "PING":
+            return Balasan("PONG") if len(args) == 1 else args[1]
+        if nama == "ECHO":
+            return args[1]
+        if nama == "SELECT":
+            if not 0 <= int(args[1]) < JUMLAH_DATABASE:
+                return BackendBersamaError("DB index is out of range")
+            sesi["db"] = int(args[1])
+            return Balasan("OK")
+
+        backend = self._db(sesi["db"])
+        if nama == "GET":
+            return backend.ambil(args[1])
+        if nama == "SET":
+            opsi = [item.upper() for item in args[3:]]
+            ttl = None
+            if "EX" in opsi:
+                ttl = float(args[3 + opsi.index("EX") + 1])
+            elif "PX" in opsi:
+                ttl = float(args[3 + opsi.index("PX") + 1]) / 1000
+            berhasil = backend.simpan(args[1], args[2], ttl, hanya_baru="NX" in opsi)
+            return Balasan("OK") if berhasil else None
+        if nama == "DEL":
+            return backend.hapus(*args[1:])
+        if nama == "EXISTS":
+            return sum(1 for kunci in args[1:] if backend.sisa_ttl(kunci) is not None)
+        if nama in ("INCR", "INCRBY"):
+            return backend.tambah(args[1], int(args[2]) if nama == "INCRBY" else 1)
+        if nama in ("EXPIRE", "PEXPIRE"):
+            return backend.kedaluwarsa(args[1], float(args[2]) / (1000 if nama == "PEXPIRE" else 1))
+        if nama in ("TTL", "PTTL"):
+            return self._ttl(backend, args[1], 1000 if nama == "PTTL" else 1)
+        if nama == "HSET":
+            baru = 0
+            for field, nilai in zip(args[2::2], args[3::2]):
+                baru += backend.hash_ambil(args[1], field) is None
+                backend.hash_simpan(args[1], field, nilai)
+            return baru
+        if nama == "HGET":
+            return backend.hash_ambil(args[1], args[2])
+        if nama == "HGETALL":
+            return [item for pasangan in backend.hash_semua(args[1]).items() for item in pasangan]
+        if nama == "HDEL":
+            return backend.hash_hapus(args[1], *args[2:])
+        if nama == "DBSIZE":
+            return backend.ukuran()
+        if nama == "FLUSHDB":
+            backend.kosongkan()
+            return Balasan("OK")
+        return BackendBersamaError(f"unknown command '{args[0]}'")
+
+    async def layani(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Satu koneksi klien: baca perintah sampai QUIT / koneksi ditutup"""
+        sesi = {"db": 0, "terautentikasi": self.password is None}
+        try:
+            while True:
+                args = await baca_perintah(reader)
+                if not args:
+                    if args is None:
+                        break
+                    continue
+                if args[0].upper() == "QUIT":
+                    writer.write(encode_balasan(Balasan("OK")))
+                    break
+                try:
+                    balasan = self.jalankan(sesi, args)
+                except (IndexError, ValueError):
+                    balasan = BackendBersamaError(f"wrong number or type of arguments for '{args[0]}'")
+                except BackendBersamaError as e:
+                    balasan = e
+                writer.write(encode_balasan(balasan))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def sapu_berkala(self) -> None:
+        """Buang key kedaluwarsa yang tidak pernah dibaca lagi"""
+        while True:
+            await asyncio.sleep(INTERVAL_SAPU_DETIK)
+            for backend in list(self.database.values()):
+                backend.ukuran()
+
+
+async def serve(host: str, port: int, password: Optional[str]) -> None:
+    server_cache = ServerCache(password)
+    server = await asyncio.start_server(server_cache.layani, host, port)
+    asyncio.get_running_loop().create_task(server_cache.sapu_berkala())
+    print(f"✅ Server cache mendengarkan di {host}:{port}{' (AUTH)' if password else ''}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Stand-in server RESP untuk backend bersama PahamKode")
+    parser.add_argument("--host", default="127.0.0.1", help="Alamat bind (default hanya lokal)")
+    parser.add_argument("--port", type=int, default=6390, help="Port (default 6390, tidak bentrok dengan Redis)")
+    parser.add_argument("--password", default=None, help="Password AUTH (opsional)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    try:
+        asyncio.run(serve(args.host, args.port, args.password))
+    except KeyboardInterrupt:
+        print("\n👋 Server cache dihentikan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Snapshot periodik penguasaan semua mahasiswa & topik (time series untuk delta dan tren)
+Idempotent dalam satu hari: titik hari yang sama diganti, bukan ditambah.
+Dijalankan harian oleh deployment/pahamkode-snapshot.timer
+
+Usage:
+    python scripts/snapshot_penguasaan.py
+    python scripts/snapshot_penguasaan.py --batch 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Modul app di-import relatif ke app/ (sama seperti streamlit run)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+from database.queries import DatabaseQueries
+from services.snapshot_service import snapshot_semua_progress
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Snapshot penguasaan progress_belajar")
+    parser.add_argument("--batch", type=int, default=500, help="Jumlah progress per batch")
+    args = parser.parse_args()
+
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL tidak ditemukan di .env")
+        sys.exit(1)
+
+    client = MongoClient(database_url)
+    db = client[os.getenv("DATABASE_NAME", "pahamkode-db")]
+    print(f"✅ Connected to database: {db.name}")
+
+    mulai = time.perf_counter()
+    statistik = snapshot_semua_progress(DatabaseQueries(db), batch_size=args.batch)
+    durasi = time.perf_counter() - mulai
+
+    print(f"📸 {statistik['progress']} progress di-snapshot dalam {durasi:.1f}s "
+          f"({statistik['titik_baru']} titik baru, {statistik['titik_diganti']} diganti)")
+    print(f"   Tren: {statistik['membaik']} membaik, {statistik['stagnan']} stagnan, {statistik['menurun']} menurun")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+Konfigurasi pytest: modul app di-import relatif ke app/ (sama seperti streamlit run)
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
@@ -0,0 +1,65 @@
+"""
+Test analisis: pakai ulang analisis duplikat tetap tercatat di metrik_ai (sumber duplikat)
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from bson import ObjectId
+
+from services import analisis_service, duplikat_service
+from services.duplikat_service import daftarkan_submisi
+from utils.minhash import signature
+
+KODE = "def rata_rata(data):\n    return sum(data) / len(dta)\n\nprint(rata_rata([1, 2, 3]))\n" * 5
+PESAN = 'Traceback (most recent call last):\n  File "main.py", line 4\nNameError: name \'dta\' is not defined'
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    monkeypatch.setattr(duplikat_service, "_indeks", duplikat_service._IndeksSubmisi())
+    id_asal = ObjectId()
+    pemilik = ObjectId()
+    asal = {
+        "_id": id_asal, "id_mahasiswa": pemilik, "kode": KODE, "pesan_error": PESAN,
+        "tipe_error": "NameError", "penjelasan": "Variabel dta belum dibuat",
+        "topik_terkait": ["Variables & Data Types"], "created_at": datetime.now(),
+    }
+    daftarkan_submisi(id_asal, signature(KODE, PESAN), pemilik, "NameError", asal["created_at"])
+
+    queries = MagicMock()
+    queries.iterasi_signature_submisi.return_value = []
+    queries.ambil_submisi_by_ids.return_value = [asal]
+    queries.ambil_submisi_by_id.return_value = asal
+    queries.cari_pengguna_by_id.return_value = {"_id": pemilik, "tingkat_kemahiran": "pemula"}
+    queries.simpan_submisi_error.return_value = ObjectId()
+    queries.hitung_submisi_by_tipe.return_value = 1
+    queries.ambil_progress_topik.return_value = {}
+    queries.pemilik = pemilik
+    return queries
+
+
+def metrik_tercatat(queries):
+    return [panggilan.args[0] for panggilan in queries.simpan_metrik_ai.call_args_list]
+
+
+def test_duplikat_sendiri_dicatat_dengan_token_dihemat(queries):
+    submisi, _ = analisis_service.proses_analisis_error(queries, str(queries.pemilik), KODE, PESAN)
+
+    assert submisi.duplikat_dari is not None
+    queries.simpan_submisi_error.assert_not_called()
+    [metrik] = metrik_tercatat(queries)
+    assert metrik["sumber"] == "duplikat"
+    assert metrik["token_dihemat"] > 0
+
+
+def test_duplikat_global_dicatat_dengan_token_dihemat(queries, monkeypatch):
+    monkeypatch.setattr(analisis_service, "snapshot_progress_batch", lambda *args, **kwargs: [])
+    submisi, _ = analisis_service.proses_analisis_error(queries, str(ObjectId()), KODE, PESAN)
+
+    assert submisi.duplikat_dari is not None
+    queries.simpan_submisi_error.assert_called_once()
+    [metrik] = metrik_tercatat(queries)
+    assert metrik["sumber"] == "duplikat"
+    assert metrik["token_dihemat"] > 0
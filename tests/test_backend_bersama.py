@@ -0,0 +1,95 @@
+"""
+Test backend bersama: TTL counter rate limit login & perintah tulis tidak dikirim ulang
+"""
+
+import asyncio
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from utils.backend_bersama import BackendBersama, BackendBersamaError, BackendMemori, BackendResp
+
+project_root = Path(__file__).parent.parent
+
+
+def muat_server_cache():
+    spec = importlib.util.spec_from_file_location("server_cache", project_root / "scripts" / "server_cache.py")
+    modul = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modul)
+    return modul
+
+
+@pytest.fixture
+def backend_resp():
+    """BackendResp yang tersambung ke scripts/server_cache.py di thread terpisah"""
+    server_cache = muat_server_cache()
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(
+        asyncio.start_server(server_cache.ServerCache().layani, "127.0.0.1", 0)
+    )
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    backend = BackendResp(port=server.sockets[0].getsockname()[1], prefix="tes:")
+    yield backend
+    backend._tutup()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    loop.close()
+
+
+def test_interface_abstrak():
+    with pytest.raises(TypeError):
+        BackendBersama()
+
+
+def test_memori_ttl_hanya_dipasang_saat_key_baru():
+    backend = BackendMemori()
+    assert backend.tambah("login_gagal:a", ttl=0.2) == 1
+    sisa = backend.sisa_ttl("login_gagal:a")
+    assert backend.tambah("login_gagal:a", ttl=60) == 2
+    assert backend.sisa_ttl("login_gagal:a") <= sisa
+    time.sleep(0.25)
+    assert backend.ambil("login_gagal:a") is None
+    assert backend.tambah("login_gagal:a", ttl=60) == 1
+
+
+def test_resp_counter_selalu_punya_ttl(backend_resp):
+    assert backend_resp.tambah("login_gagal:a", ttl=60) == 1
+    assert backend_resp.tambah("login_gagal:a", ttl=60) == 2
+    assert 0 < backend_resp.perintah("PTTL", "tes:login_gagal:a") <= 60_000
+    assert backend_resp.tambah("tanpa_ttl") == 1
+    assert backend_resp.perintah("PTTL", "tes:tanpa_ttl") == -1
+
+
+def test_resp_ttl_fixed_window(backend_resp):
+    assert backend_resp.tambah("login_gagal:b", ttl=0.2) == 1
+    assert backend_resp.tambah("login_gagal:b", ttl=60) == 2
+    time.sleep(0.25)
+    assert backend_resp.ambil("login_gagal:b") is None
+    assert backend_resp.tambah("login_gagal:b", ttl=60) == 1
+
+
+def test_resp_perintah_tulis_tidak_dikirim_ulang(monkeypatch):
+    backend = BackendResp()
+    terkirim = []
+
+    def kirim_putus(*args):
+        terkirim.append(args[0])
+        raise ConnectionError("timeout")
+
+    monkeypatch.setattr(backend, "_sambung", lambda: setattr(backend, "_socket", object()))
+    monkeypatch.setattr(backend, "_tutup", lambda: setattr(backend, "_socket", None))
+    monkeypatch.setattr(backend, "_kirim", kirim_putus)
+
+    with pytest.raises(BackendBersamaError):
+        backend.perintah("INCRBY", "tes:a", 1)
+    assert terkirim == ["INCRBY"]
+
+    with pytest.raises(BackendBersamaError):
+        backend.perintah("GET", "tes:a")
+    assert terkirim == ["INCRBY", "GET", "GET"]
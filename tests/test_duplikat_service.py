@@ -0,0 +1,79 @@
+"""
+Test deteksi duplikat: analisis hanya dipakai ulang jika error-nya sendiri juga sama
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pytest
+from bson import ObjectId
+
+from services import duplikat_service
+from services.duplikat_service import cari_submisi_mirip, daftarkan_submisi
+from utils.minhash import signature
+
+KODE = "\n".join(
+    f"def hitung_{i}(data):\n    total = 0\n    for x in data:\n        total += x * {i}\n    return total\n"
+    for i in range(80)
+) + "\nprint(hitung_3(angka))\n"
+
+PESAN_NAME_ERROR = (
+    'Traceback (most recent call last):\n  File "main.py", line 401, in <module>\n'
+    "    print(hitung_3(angka))\nNameError: name 'angka' is not defined"
+)
+PESAN_TYPE_ERROR = (
+    'Traceback (most recent call last):\n  File "main.py", line 401, in <module>\n'
+    "    print(hitung_3(angka))\n  File \"main.py\", line 14, in hitung_3\n"
+    "    total += x * 3\nTypeError: unsupported operand type(s) for +=: 'int' and 'str'"
+)
+
+
+class QueriesPalsu:
+    """Index dimulai kosong; pesan_error kandidat dibaca dari dict"""
+
+    def __init__(self):
+        self.submisi: Dict[str, Dict[str, Any]] = {}
+
+    def iterasi_signature_submisi(self, sejak: datetime) -> List[Dict[str, Any]]:
+        return []
+
+    def ambil_submisi_by_ids(self, id_list: List[Any], proyeksi: Any = None) -> List[Dict[str, Any]]:
+        return [self.submisi[str(id_submisi)] for id_submisi in id_list if str(id_submisi) in self.submisi]
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    monkeypatch.setattr(duplikat_service, "_indeks", duplikat_service._IndeksSubmisi())
+    return QueriesPalsu()
+
+
+def simpan(queries: QueriesPalsu, id_mahasiswa: Any, pesan_error: str, tipe_error: str) -> str:
+    id_submisi = ObjectId()
+    queries.submisi[str(id_submisi)] = {"_id": id_submisi, "pesan_error": pesan_error}
+    daftarkan_submisi(id_submisi, signature(KODE, pesan_error), id_mahasiswa, tipe_error, datetime.now())
+    return str(id_submisi)
+
+
+def test_kode_sama_exception_berbeda_tidak_dipakai_ulang(queries):
+    id_mahasiswa = str(ObjectId())
+    simpan(queries, id_mahasiswa, PESAN_NAME_ERROR, "NameError")
+
+    sig = signature(KODE, PESAN_TYPE_ERROR)
+    assert cari_submisi_mirip(queries, id_mahasiswa, sig, PESAN_TYPE_ERROR, "TypeError") is None
+    # Tanpa tipe hasil parse pun, pesan error yang berbeda tetap menolak kandidat
+    assert cari_submisi_mirip(queries, id_mahasiswa, sig, PESAN_TYPE_ERROR, None) is None
+    assert cari_submisi_mirip(queries, str(ObjectId()), sig, PESAN_TYPE_ERROR, "TypeError") is None
+
+
+def test_duplikat_sebenarnya_dipakai_ulang(queries):
+    id_mahasiswa = str(ObjectId())
+    id_submisi = simpan(queries, id_mahasiswa, PESAN_NAME_ERROR, "NameError")
+    kode_ulang = KODE.replace("total = 0", "total = 0  # mulai dari nol", 1)
+    pesan_ulang = PESAN_NAME_ERROR.replace("line 401", "line 402")
+    sig = signature(kode_ulang, pesan_ulang)
+
+    sendiri = cari_submisi_mirip(queries, id_mahasiswa, sig, pesan_ulang, "NameError")
+    assert sendiri is not None and sendiri.id_submisi == id_submisi and sendiri.milik_sendiri
+
+    lain = cari_submisi_mirip(queries, str(ObjectId()), sig, pesan_ulang, "NameError")
+    assert lain is not None and lain.id_submisi == id_submisi and not lain.milik_sendiri
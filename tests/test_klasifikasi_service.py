@@ -0,0 +1,140 @@
+"""
+Test pre-classifier lokal: setiap aturan, ambang keyakinan, dan traceback yang tidak sesuai kode
+"""
+
+import pytest
+
+from config import settings
+from services.klasifikasi_service import klasifikasi_lokal, parse_traceback
+
+
+def traceback_dari(tipe: str, detail: str, baris: int = 1) -> str:
+    return (
+        f'Traceback (most recent call last):\n  File "main.py", line {baris}, in <module>\n'
+        f"{tipe}: {detail}"
+    )
+
+
+def traceback_sintaks(kode: str) -> str:
+    """Traceback asli dari meng-compile kode (pesan mengikuti versi Python yang menjalankan test)"""
+    try:
+        compile(kode, "main.py", "exec")
+    except SyntaxError as e:
+        return f'  File "main.py", line {e.lineno}\n{type(e).__name__}: {e.msg}'
+    raise AssertionError("kode seharusnya tidak valid")
+
+
+@pytest.fixture(autouse=True)
+def klasifikasi_aktif(monkeypatch):
+    monkeypatch.setattr(settings, "KLASIFIKASI_LOKAL_AKTIF", True)
+
+
+# ==================== PARSE TRACEBACK ====================
+
+def test_parse_traceback_ambil_exception_dan_baris_terakhir():
+    pesan = traceback_dari("NameError", "name 'totl' is not defined", baris=7)
+    assert parse_traceback(pesan) == ("NameError", "name 'totl' is not defined", 7)
+    assert parse_traceback("") == (None, "", None)
+
+
+# ==================== ATURAN ====================
+
+@pytest.mark.parametrize("kode, aturan", [
+    ("if x > 0:\nprint(x)\n", "blok_tanpa_indentasi"),
+    ("x = 1\n    y = 2\n", "indentasi_berlebih"),
+    ("if x:\n        a = 1\n    b = 2\n", "indentasi_tidak_konsisten"),
+])
+def test_aturan_indentasi(kode, aturan):
+    hasil = klasifikasi_lokal(kode, traceback_sintaks(kode))
+    assert (hasil.hasil.tipe_error, hasil.aturan, hasil.keyakinan) == ("IndentationError", aturan, 0.95)
+
+
+@pytest.mark.parametrize("kode, aturan", [
+    ("x = 5\nif x > 0\n    print(x)\n", "titik_dua_hilang"),
+    ("x = hitung(1, 2\n", "kurung_tidak_ditutup"),
+    ("nama = 'budi\n", "string_tidak_ditutup"),
+    ("x = 5\nif x = 5:\n    print(x)\n", "assignment_di_kondisi"),
+])
+def test_aturan_sintaks(kode, aturan):
+    hasil = klasifikasi_lokal(kode, traceback_sintaks(kode))
+    assert (hasil.hasil.tipe_error, hasil.aturan, hasil.keyakinan) == ("SyntaxError", aturan, 0.9)
+
+
+def test_sintaks_tanpa_traceback_dikonfirmasi_dari_ast():
+    hasil = klasifikasi_lokal("for i in range(3)\n    print(i)\n", "")
+    assert (hasil.aturan, hasil.keyakinan) == ("titik_dua_hilang", 0.9)
+
+
+def test_sintaks_tidak_jelas_diserahkan_ke_llm():
+    kode = "x = = 2\n"
+    assert klasifikasi_lokal(kode, traceback_sintaks(kode)) is None
+
+
+@pytest.mark.parametrize("kode, nama, aturan, keyakinan", [
+    ("selesai = true\n", "true", "kapitalisasi_konstanta", 0.95),
+    ("total = 10\nprint(totl)\n", "totl", "salah_ketik_nama", 0.9),
+    ("print(jumlah_siswa)\n", "jumlah_siswa", "nama_belum_didefinisikan", 0.85),
+])
+def test_aturan_nama(kode, nama, aturan, keyakinan):
+    hasil = klasifikasi_lokal(kode, traceback_dari("NameError", f"name '{nama}' is not defined", baris=2))
+    assert (hasil.hasil.tipe_error, hasil.aturan, hasil.keyakinan) == ("NameError", aturan, keyakinan)
+
+
+def test_nama_terdefinisi_tapi_error_diserahkan_ke_llm():
+    kode = "def f():\n    print(hasil_akhir)\n    hasil_akhir = 1\n"
+    pesan = traceback_dari("NameError", "name 'hasil_akhir' is not defined", baris=2)
+    assert klasifikasi_lokal(kode, pesan) is None
+
+
+def test_aturan_pembagian_nol():
+    kode = "data = []\nrata = sum(data) / len(data)\n"
+    hasil = klasifikasi_lokal(kode, traceback_dari("ZeroDivisionError", "division by zero", baris=2))
+    assert (hasil.hasil.tipe_error, hasil.aturan, hasil.keyakinan) == ("ZeroDivisionError", "pembagian_nol", 0.85)
+    assert "rata = sum(data) / len(data)" in hasil.hasil.saran_perbaikan
+
+
+# ==================== AMBANG & BATASAN ====================
+
+def test_sintaks_tanpa_konfirmasi_ast_di_bawah_ambang():
+    # Kode yang dikirim sudah valid (mis. sudah diperbaiki sebagian): hanya traceback yang bisa dipakai
+    pesan = traceback_dari("SyntaxError", "'(' was never closed", baris=3)
+    hasil = klasifikasi_lokal("x = hitung(1, 2)\n", pesan)
+    assert (hasil.aturan, hasil.keyakinan) == ("kurung_tidak_ditutup", 0.7)
+    assert hasil.keyakinan < settings.KLASIFIKASI_LOKAL_AMBANG
+
+
+def test_aturan_terkonfirmasi_lolos_ambang():
+    kode = "if x > 0:\nprint(x)\n"
+    assert klasifikasi_lokal(kode, traceback_sintaks(kode)).keyakinan >= settings.KLASIFIKASI_LOKAL_AMBANG
+
+
+@pytest.mark.parametrize("kode, pesan, bahasa", [
+    ("x = [1]\nprint(x[5])\n", traceback_dari("IndexError", "list index out of range", baris=2), "python"),
+    ("if (x > 0 {\n}\n", "", "javascript"),
+])
+def test_error_sulit_atau_bukan_python_tidak_diklasifikasi(kode, pesan, bahasa):
+    assert klasifikasi_lokal(kode, pesan, bahasa=bahasa) is None
+
+
+def test_klasifikasi_nonaktif(monkeypatch):
+    monkeypatch.setattr(settings, "KLASIFIKASI_LOKAL_AKTIF", False)
+    assert klasifikasi_lokal("selesai = true\n", traceback_dari("NameError", "name 'true' is not defined")) is None
+
+
+# ==================== TRACEBACK TIDAK SESUAI KODE ====================
+
+def test_potongan_kode_tidak_mengalahkan_traceback_name_error():
+    pesan = traceback_dari("NameError", "name 'totl' is not defined", baris=2)
+    assert klasifikasi_lokal("x = hitung(\nprint(totl)", pesan) is None
+
+
+def test_potongan_kode_tidak_mengalahkan_traceback_pembagian_nol():
+    kode = "rata = total / n\n  if n:\n"
+    hasil = klasifikasi_lokal(kode, traceback_dari("ZeroDivisionError", "division by zero"))
+    assert hasil.aturan == "pembagian_nol"
+
+
+def test_indentasi_dari_ast_tidak_dipakai_untuk_exception_lain():
+    kode = "if x > 0:\nprint(x)\n"
+    pesan = traceback_dari("TypeError", "'>' not supported between instances of 'str' and 'int'")
+    assert klasifikasi_lokal(kode, pesan) is None
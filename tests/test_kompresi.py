@@ -0,0 +1,53 @@
+"""
+Test kompresi teks submisi_error: kompres → dekompres mengembalikan teks asli
+"""
+
+import zlib
+
+import pytest
+from bson import BSON, Binary
+
+from utils.kompresi import (
+    CODEC_ZLIB,
+    CODEC_ZSTD,
+    SUBTYPE_KOMPRESI,
+    dekompres_dokumen,
+    dekompres_teks,
+    kompres_dokumen,
+    kompres_teks,
+)
+
+TEKS_PANJANG = "def hitung(n):\n    return hitung(n - 1) * n  # rekursi tanpa base case 😅\n" * 20
+
+
+@pytest.mark.parametrize("codec", [CODEC_ZLIB, CODEC_ZSTD])
+def test_round_trip_per_codec(codec):
+    if codec == CODEC_ZSTD:
+        pytest.importorskip("zstandard")
+    hasil = kompres_teks(TEKS_PANJANG, codec=codec)
+    assert isinstance(hasil, Binary) and hasil.subtype == SUBTYPE_KOMPRESI
+    assert hasil[0] == codec
+    assert len(hasil) < len(TEKS_PANJANG.encode("utf-8"))
+    assert dekompres_teks(hasil) == TEKS_PANJANG
+
+
+def test_teks_pendek_dan_bukan_teks_tidak_diubah():
+    assert kompres_teks("NameError") == "NameError"
+    assert kompres_teks(None) is None
+    assert kompres_teks(TEKS_PANJANG, ambang=0) == TEKS_PANJANG
+    assert dekompres_teks("teks lama") == "teks lama"
+
+
+def test_round_trip_dokumen_lewat_bson():
+    dokumen = {"kode": TEKS_PANJANG, "pesan_error": "RecursionError", "tipe_error": "RecursionError"}
+    tersimpan = BSON.encode(kompres_dokumen(dict(dokumen)))
+    dibaca = BSON(tersimpan).decode()
+    assert isinstance(dibaca["kode"], bytes)
+    assert dekompres_dokumen(dibaca) == dokumen
+
+
+def test_dekompres_gagal_diganti_string_kosong():
+    rusak = Binary(bytes([CODEC_ZLIB]) + b"bukan zlib", SUBTYPE_KOMPRESI)
+    with pytest.raises(zlib.error):
+        dekompres_teks(rusak)
+    assert dekompres_dokumen({"kode": rusak})["kode"] == ""
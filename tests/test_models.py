@@ -0,0 +1,78 @@
+"""
+Test model @model_bson: to_dict → from_dict menghasilkan model yang sama
+"""
+
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from database.models import MetrikAI, Pengguna, ProgressBelajar, SubmisiError, TopikPembelajaran
+
+
+@pytest.fixture
+def submisi():
+    return SubmisiError(
+        id_mahasiswa=ObjectId(),
+        kode="for i in range(10):\n    print(daftar[i])\n" * 40,
+        pesan_error="IndexError: list index out of range",
+        tipe_error="IndexError",
+        penjelasan="Indeks melebihi panjang list. " * 30,
+        topik_terkait=["List", "Perulangan"],
+        minhash=b"\x01\x02\x03",
+        duplikat_dari=ObjectId(),
+        kemiripan=0.93,
+        created_at=datetime(2026, 3, 1, 10, 30),
+        _id=ObjectId(),
+    )
+
+
+def test_submisi_round_trip_terkompresi(submisi):
+    data = submisi.to_dict()
+    assert isinstance(data["kode"], bytes)
+    assert isinstance(data["penjelasan"], bytes)
+    assert data["pesan_error"] == submisi.pesan_error
+
+    hasil = SubmisiError.from_dict(data)
+    assert hasil == submisi
+    assert isinstance(data["kode"], bytes), "from_dict tidak boleh mengubah dokumen asal"
+
+
+def test_submisi_field_ui_tidak_disimpan(submisi):
+    submisi.diff_kode = "--- a\n+++ b\n"
+    assert "diff_kode" not in submisi.to_dict()
+
+
+def test_submisi_tanpa_kompresi(submisi):
+    data = submisi.to_dict(ambang_kompresi=0)
+    assert data["kode"] == submisi.kode
+    assert SubmisiError.from_dict(data) == submisi
+
+
+def test_default_untuk_field_yang_tidak_ada():
+    id_mahasiswa = ObjectId()
+    progress = ProgressBelajar.from_dict({"id_mahasiswa": id_mahasiswa, "topik": "Rekursi"})
+    assert progress.tingkat_penguasaan == 0
+    assert progress._id is None
+    assert "_id" not in progress.to_dict()
+    assert ProgressBelajar.from_dict(progress.to_dict()).to_dict() == progress.to_dict()
+
+
+def test_key_di_luar_field_diabaikan():
+    pengguna = Pengguna(email="a@kampus.ac.id", nama="Ani", password_hash="x", _id=ObjectId())
+    data = pengguna.to_dict()
+    assert data["kata_cari"]
+    assert Pengguna.from_dict(data) == pengguna
+
+
+@pytest.mark.parametrize("model", [
+    MetrikAI(model="gpt-4o-mini", token_input=120, token_output=40, total_token=160, _id=ObjectId()),
+    TopikPembelajaran.from_dict({"nama": "Fungsi", "kategori": "Dasar", "total_error": 7}),
+])
+def test_round_trip_model_generated(model):
+    assert type(model).from_dict(model.to_dict()) == model
+
+
+def test_model_slots_menolak_atribut_baru():
+    with pytest.raises(AttributeError):
+        MetrikAI().atribut_lain = 1
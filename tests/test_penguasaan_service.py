@@ -0,0 +1,82 @@
+"""
+Test recompute penguasaan: replay urutan bebas & submisi arsip ikut terhitung
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from config import settings
+from services import penguasaan_service
+from services.penguasaan_service import hitung_dari_riwayat
+from services.retensi_service import baca_arsip_file, tulis_arsip_file
+
+WAKTU_AKHIR = datetime(2026, 6, 1)
+
+
+def buat_submisi(id_mahasiswa, jumlah, mulai, seed=7):
+    acak = random.Random(seed)
+    return [
+        {
+            "_id": ObjectId(),
+            "id_mahasiswa": id_mahasiswa,
+            "topik_terkait": acak.sample(["List", "Fungsi", "Rekursi"], 2),
+            "created_at": mulai + timedelta(hours=acak.randint(0, 24 * 120)),
+        }
+        for _ in range(jumlah)
+    ]
+
+
+def test_replay_urutan_bebas_sama_dengan_urut_waktu():
+    submisi = buat_submisi(ObjectId(), 200, datetime(2026, 1, 1))
+    urut = hitung_dari_riwayat(sorted(submisi, key=lambda item: item["created_at"]), WAKTU_AKHIR)
+    acak = hitung_dari_riwayat(random.Random(1).sample(submisi, len(submisi)), WAKTU_AKHIR)
+    assert urut.keys() == acak.keys()
+    for kunci, nilai in urut.items():
+        assert acak[kunci]["beban_error"] == pytest.approx(nilai["beban_error"])
+        assert acak[kunci]["jumlah_error_di_topik"] == nilai["jumlah_error_di_topik"]
+        assert acak[kunci]["tingkat_penguasaan"] == nilai["tingkat_penguasaan"]
+
+
+def test_arsip_file_round_trip(tmp_path):
+    id_mahasiswa = ObjectId()
+    submisi = buat_submisi(id_mahasiswa, 5, datetime(2025, 1, 1))
+    tulis_arsip_file(str(tmp_path), str(id_mahasiswa), submisi)
+    assert list(baca_arsip_file(str(tmp_path), str(id_mahasiswa))) == submisi
+    assert list(baca_arsip_file(str(tmp_path), str(ObjectId()))) == []
+
+
+class QueriesPalsu:
+    """Submisi panas + arsip collection; simpan_penguasaan_bulk mencatat state"""
+
+    def __init__(self, panas, arsip):
+        self.panas = panas
+        self.arsip = arsip
+        self.disimpan = None
+
+    def iterasi_submisi_mahasiswa_kohort(self, id_mahasiswa_list, batch_size=1000, termasuk_arsip=False):
+        yield from self.panas
+        if termasuk_arsip:
+            yield from self.arsip
+
+    def simpan_penguasaan_bulk(self, state):
+        self.disimpan = state
+
+
+def test_recompute_menyertakan_submisi_arsip(tmp_path, monkeypatch):
+    id_mahasiswa = ObjectId()
+    panas = buat_submisi(id_mahasiswa, 10, datetime(2026, 3, 1), seed=1)
+    arsip_collection = buat_submisi(id_mahasiswa, 7, datetime(2025, 3, 1), seed=2)
+    arsip_file = buat_submisi(id_mahasiswa, 4, datetime(2024, 9, 1), seed=3)
+    tulis_arsip_file(str(tmp_path), str(id_mahasiswa), arsip_file)
+    monkeypatch.setattr(settings, "ARSIP_DIR", str(tmp_path))
+
+    queries = QueriesPalsu(panas, arsip_collection)
+    penguasaan_service._recompute_chunk(queries, [id_mahasiswa], WAKTU_AKHIR, dry_run=False)
+
+    semua = panas + arsip_collection + arsip_file
+    assert queries.disimpan == hitung_dari_riwayat(semua, WAKTU_AKHIR)
+    total = sum(nilai["jumlah_error_di_topik"] for nilai in queries.disimpan.values())
+    assert total == sum(len(item["topik_terkait"]) for item in semua)
@@ -0,0 +1,111 @@
+"""
+Test watcher perubahan: update counter total_error tidak menginvalidasi cache katalog
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from services.katalog_service import CacheKatalog
+from services.watcher_service import (
+    KOLEKSI_DIPANTAU,
+    WatcherPerubahan,
+    hanya_update_counter,
+    pipeline_change_stream,
+)
+from utils.bus_event import BusEvent
+
+
+class StreamPalsu:
+    def __init__(self):
+        self.ditutup = False
+
+    def close(self) -> None:
+        self.ditutup = True
+
+
+class DatabasePalsu:
+    """db[nama].watch() mengembalikan StreamPalsu, gagal mulai collection `gagal_di`"""
+
+    def __init__(self, gagal_di: Optional[str] = None):
+        self.gagal_di = gagal_di
+        self.stream: List[StreamPalsu] = []
+
+    def __getitem__(self, nama: str) -> "DatabasePalsu":
+        self._nama = nama
+        return self
+
+    def watch(self, *args: Any, **kwargs: Any) -> StreamPalsu:
+        if self._nama == self.gagal_di:
+            raise OperationFailure("change stream tidak didukung")
+        stream = StreamPalsu()
+        self.stream.append(stream)
+        return stream
+
+
+def buat_watcher(bus: BusEvent, cosmos: bool = False, db: Any = None) -> WatcherPerubahan:
+    watcher = WatcherPerubahan(db or DatabasePalsu(), bus)
+    watcher.cosmos = cosmos
+    return watcher
+
+
+def update_topik(field: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "operationType": "update",
+        "documentKey": {"_id": "topik-1"},
+        "updateDescription": {"updatedFields": field, "removedFields": []},
+    }
+
+
+def test_hanya_update_counter():
+    assert hanya_update_counter("topik_pembelajaran", update_topik({"total_error": 5}))
+    assert not hanya_update_counter("topik_pembelajaran", update_topik({"total_error": 5, "nama": "Loop"}))
+    assert not hanya_update_counter("topik_pembelajaran", {"operationType": "insert"})
+    assert not hanya_update_counter("sumber_daya", update_topik({"total_error": 5}))
+
+
+def test_update_counter_tidak_menginvalidasi_katalog():
+    bus = BusEvent()
+    cache = CacheKatalog()
+    cache.hubungkan_bus(bus)
+    watcher = buat_watcher(bus)
+
+    watcher._terbitkan_change("topik_pembelajaran", update_topik({"total_error": 5}))
+    assert not cache._paksa_reload
+    assert bus.urutan_terakhir == 0
+
+    watcher._terbitkan_change("topik_pembelajaran", update_topik({"deskripsi": "baru"}))
+    assert cache._paksa_reload
+
+
+def test_cosmos_membandingkan_sidik_tanpa_counter():
+    bus = BusEvent()
+    watcher = buat_watcher(bus, cosmos=True)
+
+    def change(**dokumen: Any) -> Dict[str, Any]:
+        return {"documentKey": {"_id": "topik-1"}, "fullDocument": {"_id": "topik-1", **dokumen}}
+
+    watcher._terbitkan_change("topik_pembelajaran", change(nama="Loop", total_error=1))
+    watcher._terbitkan_change("topik_pembelajaran", change(nama="Loop", total_error=2))
+    assert bus.urutan_terakhir == 1
+    watcher._terbitkan_change("topik_pembelajaran", change(nama="Perulangan", total_error=3))
+    assert bus.urutan_terakhir == 2
+
+
+def test_pipeline_memproyeksikan_field_event():
+    proyeksi = pipeline_change_stream(False, "submisi_error")[-1]["$project"]
+    assert "fullDocument" not in proyeksi
+    assert proyeksi["fullDocument.id_mahasiswa"] == 1
+    assert "fullDocument.kode" not in proyeksi
+    assert "updateDescription" in pipeline_change_stream(False, "topik_pembelajaran")[-1]["$project"]
+
+
+def test_stream_yang_sudah_dibuka_ditutup_saat_watch_gagal():
+    db = DatabasePalsu(gagal_di=KOLEKSI_DIPANTAU[-1])
+    watcher = buat_watcher(BusEvent(), db=db)
+
+    with pytest.raises(OperationFailure):
+        watcher._jalankan_change_stream()
+    assert len(db.stream) == len(KOLEKSI_DIPANTAU) - 1
+    assert all(stream.ditutup for stream in db.stream)